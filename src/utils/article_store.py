@@ -0,0 +1,319 @@
+"""
+Append-only article storage engine.
+Articles are stored as JSON lines in numbered segment files. New articles
+are appended and fsynced, so a run never rewrites the corpus, and small
+sealed segments are merged by a background compaction thread. Reads stream
+records from memory-mapped segments instead of loading the corpus.
+"""
+
+import json
+import logging
+import mmap
+import os
+import re
+import threading
+from dataclasses import asdict
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from scraper_config import ScraperConfig
+from models import Article
+
+SEGMENT_PATTERN = re.compile(r'^seg-(\d{6})\.jsonl$')
+HEADER_PREFIX = b'{"_'
+
+
+def iter_segment_lines(handle, newest_first: bool) -> Iterator[bytes]:
+    """Yield the lines of an open segment file through mmap, optionally in reverse."""
+    size = os.fstat(handle.fileno()).st_size
+    if size == 0:
+        return
+    with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if newest_first:
+            end = size - 1 if mapped[size - 1:size] == b'\n' else size
+            while end > 0:
+                start = mapped.rfind(b'\n', 0, end) + 1
+                yield mapped[start:end]
+                end = start - 1
+        else:
+            start = 0
+            while start < size:
+                end = mapped.find(b'\n', start)
+                if end == -1:
+                    end = size
+                yield mapped[start:end]
+                start = end + 1
+
+
+def article_to_record(article: Article) -> dict:
+    return asdict(article)
+
+
+def record_to_article(record: dict) -> Article:
+    return Article(**record)
+
+
+class ArticleStore:
+    """Segmented JSONL article store with crash-safe appends."""
+
+    def __init__(self, store_dir: Optional[str] = None, legacy_file: Optional[str] = None):
+        self.store_dir = store_dir or ScraperConfig.ARTICLE_STORE_DIR
+        self.segment_max_bytes = ScraperConfig.STORE_SEGMENT_MAX_BYTES
+        os.makedirs(self.store_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._compaction_thread: Optional[threading.Thread] = None
+
+        self._recover()
+        if legacy_file and not self.segment_numbers():
+            self.import_json(legacy_file)
+
+    # -- segment bookkeeping -------------------------------------------------
+
+    def segment_path(self, number: int) -> str:
+        return os.path.join(self.store_dir, f"seg-{number:06d}.jsonl")
+
+    def segment_numbers(self) -> List[int]:
+        """Numbers of all segment files, oldest first."""
+        numbers = []
+        for name in os.listdir(self.store_dir):
+            match = SEGMENT_PATTERN.match(name)
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    def _read_header(self, number: int) -> dict:
+        with open(self.segment_path(number), 'rb') as f:
+            first_line = f.readline()
+        if first_line.startswith(HEADER_PREFIX):
+            try:
+                return json.loads(first_line)
+            except ValueError:
+                pass
+        return {}
+
+    def _recover(self):
+        """Repair the store after a crash during an append or a compaction."""
+        numbers = self.segment_numbers()
+
+        # A compacted segment names the range it replaced; drop leftovers of that range
+        for number in reversed(numbers):
+            if not os.path.exists(self.segment_path(number)):
+                continue
+            start = self._read_header(number).get('_compacted_from')
+            if start is None:
+                continue
+            for stale in range(start, number):
+                if os.path.exists(self.segment_path(stale)):
+                    logging.warning(f"Removing segment {stale} left over from an interrupted compaction")
+                    os.remove(self.segment_path(stale))
+
+        for name in os.listdir(self.store_dir):
+            if name.endswith('.tmp'):
+                os.remove(os.path.join(self.store_dir, name))
+
+        # Cut off a torn final line in the active segment
+        numbers = self.segment_numbers()
+        if numbers:
+            path = self.segment_path(numbers[-1])
+            with open(path, 'rb+') as f:
+                data = f.read()
+                if data and not data.endswith(b'\n'):
+                    keep = data.rfind(b'\n') + 1
+                    logging.warning(f"Truncating torn write at the end of {path}")
+                    f.truncate(keep)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+    # -- writes -------------------------------------------------------------
+
+    def append(self, articles: Iterable[Article]) -> int:
+        """Append articles (oldest first) atomically to the active segment."""
+        return self.append_lines(
+            json.dumps(article_to_record(article), ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+            for article in articles
+        )
+
+    def append_lines(self, lines: Iterable[bytes]) -> int:
+        """Append already serialized records (newline-terminated JSON, oldest first)."""
+        payload = b''.join(lines)
+        if not payload:
+            return 0
+
+        with self._lock:
+            numbers = self.segment_numbers()
+            number = numbers[-1] if numbers else 1
+            path = self.segment_path(number)
+            if os.path.exists(path) and os.path.getsize(path) >= self.segment_max_bytes:
+                number += 1
+                path = self.segment_path(number)
+
+            with open(path, 'ab') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+
+        self.maybe_compact()
+        return payload.count(b'\n')
+
+    def import_json(self, path: str):
+        """One-time import of a legacy newest-first JSON array file."""
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.append(record_to_article(item) for item in reversed(data))
+            logging.info(f"Imported {len(data)} articles from {path} into {self.store_dir}")
+        except Exception as e:
+            logging.error(f"Error importing articles from {path}: {e}")
+
+    # -- compaction ---------------------------------------------------------
+
+    def _compaction_run(self) -> List[int]:
+        """Pick the oldest run of small sealed segments worth merging."""
+        numbers = self.segment_numbers()[:-1]  # Never touch the active segment
+        run, total = [], 0
+        for number in numbers:
+            size = os.path.getsize(self.segment_path(number))
+            if total + size > ScraperConfig.STORE_COMPACT_TARGET_BYTES:
+                if len(run) >= ScraperConfig.STORE_COMPACT_MIN_SEGMENTS:
+                    break
+                run, total = [], 0
+                if size > ScraperConfig.STORE_COMPACT_TARGET_BYTES:
+                    continue
+            run.append(number)
+            total += size
+        return run if len(run) >= ScraperConfig.STORE_COMPACT_MIN_SEGMENTS else []
+
+    def maybe_compact(self):
+        """Start a background compaction if enough small segments have piled up."""
+        if self._compaction_thread and self._compaction_thread.is_alive():
+            return
+        if not self._compaction_run():
+            return
+        self._compaction_thread = threading.Thread(target=self.compact, name='article-store-compaction', daemon=True)
+        self._compaction_thread.start()
+
+    def compact(self):
+        """Merge a run of sealed segments into one, dropping duplicate article IDs."""
+        run = self._compaction_run()
+        if not run:
+            return
+        try:
+            last = run[-1]
+            tmp_path = self.segment_path(last) + '.tmp'
+
+            # Later copies of an ID win; keep the position of the latest copy
+            latest: Dict[str, int] = {}
+            lines = []
+            for number in run:
+                with open(self.segment_path(number), 'rb') as f:
+                    for line in f:
+                        if line.startswith(HEADER_PREFIX) or not line.strip():
+                            continue
+                        record_id = json.loads(line).get('id')
+                        latest[record_id] = len(lines)
+                        lines.append(line)
+
+            with open(tmp_path, 'wb') as f:
+                f.write(json.dumps({'_compacted_from': run[0]}).encode('utf-8') + b'\n')
+                for index, line in enumerate(lines):
+                    if latest.get(json.loads(line).get('id')) == index:
+                        f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+            with self._lock:
+                os.replace(tmp_path, self.segment_path(last))
+                for number in run[:-1]:
+                    os.remove(self.segment_path(number))
+            logging.info(f"Compacted article segments {run[0]}-{last} ({len(lines)} records)")
+        except Exception as e:
+            logging.error(f"Error compacting article store: {e}")
+
+    # -- reads --------------------------------------------------------------
+
+    def _open_segments(self) -> list:
+        """Open every segment up front so a concurrent compaction cannot pull one away."""
+        with self._lock:
+            return [open(self.segment_path(number), 'rb', buffering=0) for number in self.segment_numbers()]
+
+    def iter_records(self, newest_first: bool = True) -> Iterator[dict]:
+        """Yield stored records as dicts, newest first by default."""
+        for line in self.iter_lines(newest_first):
+            yield json.loads(line)
+
+    def iter_lines(self, newest_first: bool = True) -> Iterator[bytes]:
+        """Yield raw record lines from memory-mapped segments, one at a time."""
+        handles = self._open_segments()
+        try:
+            if newest_first:
+                handles.reverse()
+            for handle in handles:
+                for line in iter_segment_lines(handle, newest_first):
+                    if line and not line.startswith(HEADER_PREFIX):
+                        yield line
+        finally:
+            for handle in handles:
+                handle.close()
+
+    def query(self, source: Optional[str] = None, category: Optional[str] = None,
+              since: Optional[Union[str, datetime]] = None, until: Optional[Union[str, datetime]] = None,
+              limit: Optional[int] = None, newest_first: bool = True) -> Iterator[Article]:
+        """Stream stored articles matching the filters, building an Article only for yielded ones.
+
+        since/until bound scraped_at (inclusive since, exclusive until).
+        """
+        since = since.isoformat() if isinstance(since, datetime) else since
+        until = until.isoformat() if isinstance(until, datetime) else until
+
+        # Cheap byte-level prefilters; records are written with compact separators
+        needles = []
+        if source:
+            needles.append(json.dumps({'source': source}, ensure_ascii=False, separators=(',', ':'))[1:-1].encode('utf-8'))
+        if category:
+            needles.append(json.dumps({'category': category}, ensure_ascii=False, separators=(',', ':'))[1:-1].encode('utf-8'))
+
+        yielded = 0
+        if limit is not None and limit <= 0:
+            return
+        for line in self.iter_lines(newest_first):
+            if any(needle not in line for needle in needles):
+                continue
+            record = json.loads(line)
+            if source and record.get('source') != source:
+                continue
+            if category and record.get('category') != category:
+                continue
+            scraped_at = record.get('scraped_at', '')
+            if since and scraped_at < since:
+                continue
+            if until and scraped_at >= until:
+                continue
+
+            yield record_to_article(record)
+            yielded += 1
+            if limit is not None and yielded >= limit:
+                return
+
+    def export_json(self, path: str):
+        """Write the whole corpus as a newest-first JSON array (legacy format)."""
+        tmp_path = path + '.tmp'
+        count = 0
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('[')
+            for record in self.iter_records():
+                f.write(',\n  ' if count else '\n  ')
+                f.write(json.dumps(record, ensure_ascii=False))
+                count += 1
+            f.write('\n]\n' if count else ']\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        logging.info(f"Exported {count} articles to {path}")
+        return count
+
+    def close(self):
+        """Wait for a running compaction to finish."""
+        if self._compaction_thread:
+            self._compaction_thread.join()
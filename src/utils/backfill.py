@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Historical backfill of every source.
+Walks each source's listing pagination (the page's own next link, else
+the 'page_url' template in ScraperConfig.WEBSITES) and runs every article
+found through the normal pipeline. Listing pages and articles still to crawl are kept in a SQLite
+frontier, deduplicated by normalized URL, so memory stays flat however
+many URLs are queued. Articles are saved and marked done in checkpoints;
+after a crash or Ctrl+C the next run continues from the frontier.
+
+The crawl rate is bounded by the per-host limits of the scraper's HTTP
+client (robots.txt and the adaptive rate in rate_limiter.py), which
+--delay can tighten for a run.
+
+Usage: python backfill.py [--sources gov,mai,ms] [--max-pages N] [--delay 1.0] [--restart]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urljoin
+
+from fetch_engine import ConcurrentFetcher
+from html_document import parse_html
+from scraper import MultiWebsiteScraper, PendingArticles
+from scraper_config import ScraperConfig
+from seen_store import normalize_url
+
+
+def page_url(source: str, page: int) -> str:
+    """URL of a listing page; page 1 is the source's news_url."""
+    website_config = ScraperConfig.WEBSITES[source]
+    if page == 1:
+        return website_config['news_url']
+    return website_config['page_url'].format(page=page)
+
+
+def next_page_link(doc, url: str) -> Optional[str]:
+    """Absolute URL of the listing page's own link to the next page, if it has one."""
+    for selector in ScraperConfig.NEXT_PAGE_SELECTORS:
+        element = doc.select_one(selector)
+        if element is not None and element.get('href'):
+            return urljoin(url, element.get('href'))
+    return None
+
+
+@dataclass
+class FrontierItem:
+    seq: int
+    url: str
+    source: str
+    kind: str  # 'listing' or 'article'
+    page: Optional[int] = None  # Listing page number
+    link: Optional[tuple] = None  # Article link as returned by listing_links
+
+
+class Frontier:
+    """SQLite queue of listing pages and articles, each URL at most once."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or ScraperConfig.BACKFILL_FRONTIER_FILE
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS frontier (
+                seq INTEGER PRIMARY KEY,
+                url_key TEXT NOT NULL UNIQUE,
+                url TEXT NOT NULL,
+                source TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                page INTEGER,
+                link TEXT,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0
+            )"""
+        )
+        # Rows of one state come back in seq order through this index
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_frontier_state ON frontier(state)")
+        # Every link on the listing pages read so far, queued or not (already seen articles are not)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS listed (url_key TEXT PRIMARY KEY) WITHOUT ROWID")
+        self._conn.commit()
+        self._cursor = 0
+        self._claimed: Deque[FrontierItem] = deque()
+
+    def _insert(self, items: Iterable[tuple]):
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO frontier (url_key, url, source, kind, page, link) VALUES (?, ?, ?, ?, ?, ?)",
+            ((normalize_url(url), url, source, kind, page, json.dumps(link, ensure_ascii=False) if link else None)
+             for url, source, kind, page, link in items)
+        )
+
+    def seed(self, sources: List[str]):
+        """Queue the first listing page of each source (no-op for sources already queued)."""
+        with self._lock:
+            self._insert((page_url(source, 1), source, 'listing', 1, None) for source in sources)
+            self._conn.commit()
+
+    def requeue_failed(self, max_attempts: int) -> int:
+        """Put failed URLs with attempts left back in the queue."""
+        with self._lock:
+            count = self._conn.execute(
+                "UPDATE frontier SET state = 'pending' WHERE state = 'failed' AND attempts < ?", (max_attempts,)
+            ).rowcount
+            self._conn.commit()
+        return count
+
+    def next(self) -> Optional[FrontierItem]:
+        """The next pending item, oldest first; rows are read a batch at a time."""
+        if not self._claimed:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT seq, url, source, kind, page, link FROM frontier "
+                    "WHERE state = 'pending' AND seq > ? ORDER BY seq LIMIT ?",
+                    (self._cursor, ScraperConfig.BACKFILL_CLAIM_SIZE)
+                ).fetchall()
+            for seq, url, source, kind, page, link in rows:
+                self._claimed.append(FrontierItem(seq, url, source, kind, page, tuple(json.loads(link)) if link else None))
+            if rows:
+                self._cursor = rows[-1][0]
+        return self._claimed.popleft() if self._claimed else None
+
+    def finish_listing(self, item: FrontierItem, links: List[tuple], next_page: Optional[int],
+                       listed: Iterable[str] = (), next_url: Optional[str] = None):
+        """Queue a listing page's articles and the page after it (at next_url, or by the page_url
+        template), record the normalized URLs the page listed, and mark the page done, in one transaction."""
+        items = [(link[1], item.source, 'article', None, link) for link in links]
+        if next_page is not None:
+            items.append((next_url or page_url(item.source, next_page), item.source, 'listing', next_page, None))
+        with self._lock:
+            self._insert(items)
+            self._conn.executemany("INSERT OR IGNORE INTO listed (url_key) VALUES (?)", ((key,) for key in listed))
+            self._conn.execute("UPDATE frontier SET state = 'done' WHERE seq = ?", (item.seq,))
+            self._conn.commit()
+
+    def listed(self, keys: Iterable[str]) -> Set[str]:
+        """The normalized URLs among keys that an earlier listing page already listed."""
+        keys = list(keys)
+        if not keys:
+            return set()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT url_key FROM listed WHERE url_key IN ({', '.join('?' * len(keys))})", keys
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def mark_done(self, seqs: List[int]):
+        with self._lock:
+            self._conn.executemany("UPDATE frontier SET state = 'done' WHERE seq = ?", ((seq,) for seq in seqs))
+            self._conn.commit()
+
+    def mark_failed(self, item: FrontierItem):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE frontier SET state = 'failed', attempts = attempts + 1 WHERE seq = ?", (item.seq,)
+            )
+            self._conn.commit()
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._conn.execute("SELECT state, COUNT(*) FROM frontier GROUP BY state").fetchall())
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class Backfill:
+    """Crawls the frontier to the end with a bounded number of requests in flight."""
+
+    def __init__(self, scraper: Optional[MultiWebsiteScraper] = None, frontier: Optional[Frontier] = None,
+                 delay: Optional[float] = None, max_pages: Optional[int] = None):
+        self.scraper = scraper or MultiWebsiteScraper()
+        self.frontier = frontier or Frontier()
+        if delay:
+            # About one request per delay seconds to each host, starting at that rate
+            limiter = self.scraper.rate_limiter
+            limiter.max_rate = limiter.initial_rate = 1.0 / delay
+        self.max_pages = max_pages or ScraperConfig.BACKFILL_MAX_PAGES
+        self.counts = {'listings': 0, 'articles': 0, 'skipped': 0, 'failed': 0}
+
+    def fetch_listing(self, item: FrontierItem) -> Tuple[List[tuple], Optional[str]]:
+        """The page's article links and its link to the next page."""
+        response = self.scraper.http.get(item.url)
+        if response.status_code == 404:
+            # Past the last page
+            return [], None
+        response.raise_for_status()
+        with self.scraper.metrics.stage('listing'):
+            doc = parse_html(response.content)
+            # Older articles must not get the crawl date
+            links = self.scraper.listing_links(item.source, doc, crawl_date=False)
+        return links, next_page_link(doc, item.url)
+
+    def fetch_article(self, item: FrontierItem) -> Tuple[str, object]:
+        return self.scraper.scrape_article_content(item.url, item.source)
+
+    def run(self, sources: Optional[List[str]] = None) -> Dict[str, int]:
+        sources = sources or list(ScraperConfig.WEBSITES)
+        self.frontier.seed(sources)
+        requeued = self.frontier.requeue_failed(ScraperConfig.BACKFILL_MAX_ATTEMPTS)
+        if requeued:
+            logging.info(f"Retrying {requeued} URLs that failed in earlier runs")
+        logging.info(f"Backfilling {', '.join(s.upper() for s in sources)}: {self.frontier.counts()}")
+
+        self.scraper.metrics.start_run(sources)
+        started = time.perf_counter()
+        pending, done = PendingArticles(), []
+        try:
+            with ConcurrentFetcher() as fetcher:
+                # Enough requests in flight to keep every host busy, and no more
+                window = fetcher.max_workers * 2
+                in_flight = {}
+                while True:
+                    while len(in_flight) < window:
+                        item = self.frontier.next()
+                        if item is None:
+                            break
+                        if item.kind == 'article' and self.scraper.seen.has_url(item.url):
+                            # Saved just before an interrupted run could mark it done
+                            done.append(item.seq)
+                            continue
+                        fetch = self.fetch_listing if item.kind == 'listing' else self.fetch_article
+                        in_flight[fetcher.submit(item.url, fetch, item)] = item
+                    if not in_flight:
+                        break
+
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        item = in_flight.pop(future)
+                        if item.kind == 'listing':
+                            self.handle_listing(item, future)
+                        elif self.handle_article(item, future, pending):
+                            done.append(item.seq)
+
+                    if len(pending) >= ScraperConfig.BACKFILL_CHECKPOINT_ARTICLES:
+                        self.checkpoint(pending, done, started)
+                        pending, done = PendingArticles(), []
+        except BaseException as e:
+            # Keep what was processed; everything else is still pending in the frontier
+            self.checkpoint(pending, done, started)
+            self.scraper.metrics.count_error('run', f"Backfill stopped: {type(e).__name__}: {e}")
+            self.scraper.record_run(self.counts['articles'], failed=True)
+            raise
+
+        self.checkpoint(pending, done, started)
+        self.scraper.record_run(self.counts['articles'])
+        logging.info(
+            f"Backfill finished: {self.counts['articles']} articles from {self.counts['listings']} listing pages, "
+            f"{self.counts['skipped']} duplicates skipped, {self.counts['failed']} failed"
+        )
+        return self.counts
+
+    def handle_listing(self, item: FrontierItem, future):
+        try:
+            links, next_url = future.result()
+        except Exception as e:
+            logging.error(f"Error fetching {item.source.upper()} listing page {item.page}: {e}")
+            self.scraper.metrics.count_error(item.source, f"Error fetching listing {item.url}: {e}")
+            self.frontier.mark_failed(item)
+            self.counts['failed'] += 1
+            return
+
+        self.counts['listings'] += 1
+        new_links = [link for link in links if not self.scraper.seen.has_url(link[1])]
+        # Pagination ends at an empty page, or at one with nothing new to this crawl: sites that
+        # clamp or wrap out-of-range page numbers serve pages already read
+        keys = {normalize_url(link[1]) for link in links}
+        unread = keys - self.frontier.listed(keys)
+        next_page = None
+        if unread and 'page_url' in ScraperConfig.WEBSITES[item.source]:
+            if not self.max_pages or item.page < self.max_pages:
+                next_page = item.page + 1
+        elif links:
+            logging.info(f"{item.source.upper()} listing page {item.page} repeats earlier pages; "
+                         f"stopping the pagination there")
+        self.frontier.finish_listing(item, new_links, next_page, keys, next_url)
+        logging.info(f"{item.source.upper()} listing page {item.page}: {len(new_links)} of {len(links)} articles are new")
+
+    def handle_article(self, item: FrontierItem, future, pending: PendingArticles) -> bool:
+        """Process a fetched article; returns whether it can be marked done at the next checkpoint."""
+        try:
+            original_content, doc = future.result()
+            if not original_content:
+                logging.warning(f"No content found for {item.source.upper()} article: {item.url}")
+                self.frontier.mark_failed(item)
+                self.counts['failed'] += 1
+                return False
+            if self.scraper.accept_article(item.link, original_content, doc, pending):
+                self.counts['articles'] += 1
+            else:
+                self.counts['skipped'] += 1
+            return True
+        except Exception as e:
+            logging.error(f"Error processing {item.source.upper()} article {item.url}: {e}")
+            self.scraper.metrics.count_error(item.source, f"Error processing {item.url}: {e}")
+            self.frontier.mark_failed(item)
+            self.counts['failed'] += 1
+            return False
+
+    def checkpoint(self, pending: PendingArticles, done: List[int], started: float):
+        """Save the pending articles, then mark them done in the frontier."""
+        self.scraper.save_pending(pending)
+        self.frontier.mark_done(done)
+        elapsed = time.perf_counter() - started
+        logging.info(
+            f"Backfill checkpoint: {self.counts['articles']} articles in {elapsed:.0f}s "
+            f"({self.counts['articles'] / max(elapsed, 1e-9):.2f}/s), frontier {self.frontier.counts()}"
+        )
+        logging.info(f"Rate limits: {self.scraper.rate_limiter.report()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl the older listing pages of every source")
+    parser.add_argument('--sources', help="comma-separated sources (default: all)")
+    parser.add_argument('--max-pages', type=int, help="listing pages to walk per source (default: all)")
+    parser.add_argument('--delay', type=float,
+                        help="at least this many seconds between requests to one host")
+    parser.add_argument('--restart', action='store_true', help="forget the frontier of an earlier backfill")
+    args = parser.parse_args()
+
+    sources = [source.strip() for source in args.sources.split(',')] if args.sources else None
+    unknown = set(sources or []) - set(ScraperConfig.WEBSITES)
+    if unknown:
+        parser.error(f"unknown sources: {', '.join(sorted(unknown))}")
+    if args.restart:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(ScraperConfig.BACKFILL_FRONTIER_FILE + suffix):
+                os.remove(ScraperConfig.BACKFILL_FRONTIER_FILE + suffix)
+        logging.info(f"Starting a new backfill frontier in {ScraperConfig.BACKFILL_FRONTIER_FILE}")
+
+    backfill = Backfill(delay=args.delay, max_pages=args.max_pages)
+    try:
+        backfill.run(sources)
+    except KeyboardInterrupt:
+        logging.info("Backfill stopped; run again to continue")
+    finally:
+        backfill.frontier.close()
+
+
+if __name__ == '__main__':
+    main()
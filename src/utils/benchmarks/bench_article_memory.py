@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Measure the memory of a corpus held in Python, per representation.
+Decodes --articles JSON records, as read back from the article store, into
+  dataclass    the previous plain @dataclass (per-instance __dict__, list
+               points, a fresh copy of source/category strings per record)
+  Article      the slotted dataclass with interned fields and tuple points
+  ArticleBatch the column container
+each in a fresh process, and reports resident memory per article next to
+the size of the free text alone. Also times the build and a count of
+articles per category. Checks that the new types round-trip records.
+
+Linux only (reads /proc/self/statm).
+
+Usage: python benchmarks/bench_article_memory.py [--articles 1000000] [--content-chars 300]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Article, ArticleBatch
+from scraper_config import ScraperConfig
+
+SENTENCES = (
+    "Guvernul a aprobat finanțarea lucrărilor de reabilitare a școlilor din județele afectate de inundații. ",
+    "Ministerul Sănătății anunță extinderea programului național de screening în spitalele județene. ",
+    "Poliția Română și Inspectoratul pentru Situații de Urgență au intervenit în peste 300 de cazuri. ",
+    "Bugetul alocat pentru pensii și alocații crește de la 1 ianuarie, potrivit ordonanței adoptate. ",
+)
+TEXT = ''.join(SENTENCES) * 40
+MONTHS = ('ianuarie', 'februarie', 'martie', 'aprilie', 'mai', 'iunie')
+CATEGORIES = list(ScraperConfig.CATEGORIES)
+
+
+@dataclass
+class DictArticle:
+    """Article as it was: a plain dataclass."""
+    id: str
+    date: str
+    title: str
+    original_content: str
+    simplified_content: str
+    detailed_points: List[str]
+    category: str
+    category_emoji: str
+    category_name: str
+    url: str
+    scraped_at: str
+    source: str
+    is_new: bool = True
+
+
+def record_line(number: int, content_chars: int) -> str:
+    """A stored record as JSON; every text field is unique to the article."""
+    source = ('gov', 'mai', 'ms')[number % 3]
+    category = CATEGORIES[number * 7 % len(CATEGORIES)]
+    offset = number * 13 % 1000
+    return json.dumps({
+        'id': f"{source}_{number:012x}",
+        'date': f"{number % 28 + 1} {MONTHS[number % 6]} 2025",
+        'title': f"{TEXT[offset:offset + 70]} ({number})",
+        'original_content': f"{TEXT[offset:offset + content_chars]} {number}",
+        'simplified_content': f"{TEXT[offset + 5:offset + 5 + content_chars // 3]} {number}",
+        'detailed_points': [f"{TEXT[offset + i * 50:offset + i * 50 + 60]} {number}" for i in range(4)],
+        'category': category,
+        'category_emoji': ScraperConfig.CATEGORIES[category]['emoji'],
+        'category_name': ScraperConfig.CATEGORIES[category]['name'],
+        'url': f"https://www.{source}.ro/comunicate/{number}-anunt",
+        'scraped_at': f"2025-{number % 12 + 1:02d}-{number % 28 + 1:02d}T09:{number % 60:02d}:{number % 59:02d}.{number:06d}",
+        'source': source,
+        'is_new': True,
+    }, ensure_ascii=False)
+
+
+def resident_bytes() -> int:
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def measure(kind: str, count: int, content_chars: int) -> tuple:
+    """Build the corpus in this (fresh) process; returns (bytes, build seconds, count-by-category seconds)."""
+    records = (json.loads(record_line(number, content_chars)) for number in range(count))
+    before = resident_bytes()
+    started = time.perf_counter()
+    if kind == 'ArticleBatch':
+        corpus = ArticleBatch(Article(**record) for record in records)
+    else:
+        cls = Article if kind == 'Article' else DictArticle
+        corpus = [cls(**record) for record in records]
+    built = time.perf_counter() - started
+    used = resident_bytes() - before
+
+    started = time.perf_counter()
+    if kind == 'ArticleBatch':
+        corpus.count_by('category')
+    else:
+        Counter(article.category for article in corpus)
+    return used, built, time.perf_counter() - started
+
+
+def text_bytes(count: int, content_chars: int) -> float:
+    """Average size of one article's free-text strings as Python objects."""
+    total = 0
+    for number in range(count):
+        record = json.loads(record_line(number, content_chars))
+        total += sum(sys.getsizeof(record[name]) for name in
+                     ('id', 'date', 'title', 'original_content', 'simplified_content', 'url', 'scraped_at'))
+        total += sum(sys.getsizeof(point) for point in record['detailed_points'])
+    return total / count
+
+
+def check_round_trip(failures: list):
+    records = [json.loads(record_line(number, 300)) for number in range(300)]
+    articles = [Article(**record) for record in records]
+    batch = ArticleBatch(articles)
+    if hasattr(articles[0], '__dict__'):
+        failures.append("Article still has a __dict__")
+    if list(batch) != articles or batch[-1] != articles[-1] or batch[10:12] != articles[10:12]:
+        failures.append("ArticleBatch does not give back the articles it was built from")
+    if [json.loads(json.dumps(asdict(article), ensure_ascii=False)) for article in batch] != records:
+        failures.append("a record does not survive Article -> asdict -> JSON")
+    if batch.count_by('category') != Counter(record['category'] for record in records):
+        failures.append("count_by disagrees with the records")
+    expected = [i for i, record in enumerate(records) if record['source'] == 'ms' and record['category'] == 'health']
+    if batch.indices(source='ms', category='health') != expected:
+        failures.append("indices disagrees with the records")
+    if batch.column('detailed_points') != [article.detailed_points for article in articles]:
+        failures.append("the detailed_points column is wrong")
+    if articles[0].category is not records[1]['category'] and articles[0].category is not articles[len(CATEGORIES)].category:
+        failures.append("category strings are not interned")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=1000000)
+    parser.add_argument('--content-chars', type=int, default=300, help='length of original_content')
+    args = parser.parse_args()
+
+    failures = []
+    check_round_trip(failures)
+
+    text = text_bytes(2000, args.content_chars)
+    print(f"{args.articles} articles, free text {text:.0f} bytes per article as Python strings")
+    print(f"{'representation':<14} {'MB':>8} {'bytes/article':>14} {'overhead':>9} {'build s':>8} {'count ms':>9}")
+    context = multiprocessing.get_context('fork')
+    results = {}
+    for kind in ('dataclass', 'Article', 'ArticleBatch'):
+        with context.Pool(1) as pool:
+            used, built, counted = pool.apply(measure, (kind, args.articles, args.content_chars))
+        per_article = used / args.articles
+        results[kind] = per_article
+        print(f"{kind:<14} {used / 1e6:>8.0f} {per_article:>14.0f} {per_article - text:>9.0f} "
+              f"{built:>8.1f} {counted * 1000:>9.0f}")
+
+    saved = 1 - results['Article'] / results['dataclass']
+    print(f"Article saves {saved:.0%}, ArticleBatch {1 - results['ArticleBatch'] / results['dataclass']:.0%} "
+          f"of the dataclass corpus")
+    if results['Article'] >= results['dataclass'] or results['ArticleBatch'] >= results['Article']:
+        failures.append("the compact representations do not use less memory")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
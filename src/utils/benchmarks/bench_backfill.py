@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Backfill paginated stub sites, killing the crawl part-way and resuming it.
+The first run is SIGKILLed once some articles are saved; the second picks
+up from the frontier. Every article must end up stored exactly once and
+every frontier row done. Also checks that the crawl runs close to the
+rate the per-host delay allows, i.e. it is bound by politeness and not by
+the Python work per page. Finally crawls sites that serve their last page
+again for any later page number, which must end after that repeat.
+
+Usage: python benchmarks/bench_backfill.py [--pages 20] [--articles 10] [--delay 0.05]
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_sites import article_date, start_stub_sites, stop_stub_sites
+
+
+def stored_records(store_dir: str) -> list:
+    from article_store import ArticleStore
+    if not os.path.isdir(store_dir):
+        return []
+    return list(ArticleStore(store_dir).iter_records(newest_first=False))
+
+
+def stored_ids(store_dir: str) -> list:
+    return [record['id'] for record in stored_records(store_dir)]
+
+
+def crawl(delay: float):
+    from backfill import Backfill
+    logging.getLogger().setLevel(logging.ERROR)
+    Backfill(delay=delay).run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, default=20, help='listing pages per source')
+    parser.add_argument('--articles', type=int, default=10, help='articles per listing page')
+    parser.add_argument('--delay', type=float, default=0.05, help='seconds between requests to one host')
+    args = parser.parse_args()
+
+    # Importing the scraper creates scraper.log in the working directory
+    workdir = tempfile.mkdtemp(prefix='bench_backfill_')
+    os.chdir(workdir)
+    from backfill import Backfill, Frontier
+    from scraper_config import ScraperConfig
+    logging.getLogger().setLevel(logging.ERROR)
+    ScraperConfig.SIMPLIFIER_BACKEND = 'rules'
+    ScraperConfig.BACKFILL_CHECKPOINT_ARTICLES = 50
+
+    servers = start_stub_sites(latency=0.005, count=args.articles, pages=args.pages)
+    expected = 3 * args.pages * args.articles
+    # Per host: every listing page, the 404 after the last one and every article
+    requests_per_host = args.pages + 1 + args.pages * args.articles
+    try:
+        # The child inherits the stub-site config through fork
+        process = multiprocessing.get_context('fork').Process(target=crawl, args=(args.delay,))
+        process.start()
+        while process.is_alive() and len(stored_ids(ScraperConfig.ARTICLE_STORE_DIR)) < expected // 3:
+            time.sleep(0.05)
+        os.kill(process.pid, signal.SIGKILL)
+        process.join()
+        interrupted_at = len(stored_ids(ScraperConfig.ARTICLE_STORE_DIR))
+
+        started = time.perf_counter()
+        backfill = Backfill(delay=args.delay)
+        counts = backfill.run()
+        elapsed = time.perf_counter() - started
+        frontier_counts = backfill.frontier.counts()
+        backfill.frontier.close()
+        backfill.scraper.store.close()
+    finally:
+        stop_stub_sites(servers)
+
+    records = stored_records(ScraperConfig.ARTICLE_STORE_DIR)
+    ids = [record['id'] for record in records]
+    fetched = counts['listings'] + counts['articles'] + counts['skipped'] + counts['failed']
+    # The resumed run fetches what the killed one had not finished, on three hosts at once
+    floor = (fetched / 3 - 1) * args.delay
+    print(f"{expected} articles on {args.pages} pages x 3 sources, {args.delay * 1000:.0f} ms between requests per host")
+    print(f"killed after {interrupted_at} saved articles; resume stored {counts['articles']} more "
+          f"({counts['skipped']} skipped, {counts['failed']} failed)")
+    print(f"resume:    {elapsed:>6.2f} s for {fetched} requests ({fetched / elapsed:.1f}/s), "
+          f"politeness floor {floor:.2f} s ({elapsed / max(floor, 1e-9):.2f}x)")
+    print(f"frontier:  {frontier_counts}")
+
+    failures = []
+    # MAI stub pages have no date anywhere, MS article pages a <time> element
+    today = datetime.now().strftime('%d %B %Y')
+    for record in records:
+        digits = ''.join(ch for ch in record['url'].rsplit('/', 2)[-2] if ch.isdigit())
+        expected_date = {'mai': '', 'ms': datetime.fromisoformat(article_date(int(digits or 0))).strftime('%d %B %Y')}
+        if record['source'] in expected_date and record['date'] != expected_date[record['source']]:
+            failures.append(f"{record['source']} article {record['url']} dated {record['date']!r}"
+                            f"{' (the crawl date)' if record['date'] == today else ''}")
+            break
+
+    clamped_pages = 3
+    os.mkdir('clamped')
+    os.chdir('clamped')
+    servers = start_stub_sites(latency=0.001, count=args.articles, pages=clamped_pages, clamp=True)
+    try:
+        clamped = Backfill()
+        clamped_counts = clamped.run()
+        clamped.frontier.close()
+        clamped.scraper.store.close()
+    finally:
+        stop_stub_sites(servers)
+    print(f"clamping sites: {clamped_counts['listings']} listing pages read for {clamped_pages} pages x 3 sources")
+    if clamped_counts['listings'] != 3 * (clamped_pages + 1):
+        failures.append(f"pagination did not stop at the repeated page: {clamped_counts['listings']} listings read")
+    if clamped_counts['articles'] != 3 * clamped_pages * args.articles:
+        failures.append(f"clamping sites: {clamped_counts['articles']} articles stored")
+
+    if len(ids) != expected:
+        failures.append(f"expected {expected} stored articles, got {len(ids)}")
+    if len(set(ids)) != len(ids):
+        failures.append(f"{len(ids) - len(set(ids))} articles stored twice")
+    if set(frontier_counts) != {'done'} or frontier_counts['done'] != 3 * requests_per_host:
+        failures.append(f"frontier not fully done: {frontier_counts}")
+    if elapsed < floor * 0.95:
+        failures.append("requests to one host were closer together than the delay")
+    if elapsed > floor * 1.5 + 1:
+        failures.append("the crawl was well below the rate the delay allows")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
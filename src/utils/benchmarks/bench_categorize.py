@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark categorize_content on long gov.ro pageDescription-style texts.
+Compares the previous per-keyword substring scan (first match wins), the same
+scan extended to count every keyword (what score-based ranking needs), and the
+compiled single-pass matcher.
+
+Usage: python benchmarks/bench_categorize.py [--sizes 2000,20000,200000] [--repeat 20]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keyword_matcher import KeywordMatcher
+from scraper_config import ScraperConfig
+from stub_sites import GOV_DECISION
+
+# Agenda text without any category keyword, as in long meeting summaries
+FILLER = (
+    "Guvernul a aprobat prin memorandum mandatul delegației române pentru negocierile "
+    "privind acordul de cooperare, precum și proiectul pentru modificarea unor acte "
+    "în domeniul administrației publice locale. "
+)
+
+
+def legacy_categorize(text: str, source: str) -> str:
+    """The previous algorithm: one substring scan per keyword, first match wins."""
+    text_lower = text.lower()
+    preferred = ScraperConfig.WEBSITES[source].get('categories', [])
+    for key in preferred:
+        if key != 'general' and any(k in text_lower for k in ScraperConfig.CATEGORIES[key]['keywords']):
+            return key
+    for key, data in ScraperConfig.CATEGORIES.items():
+        if key != 'general' and key not in preferred and any(k in text_lower for k in data['keywords']):
+            return key
+    return 'general'
+
+
+def legacy_counts(text: str) -> dict:
+    """Per-keyword substring counts for every category."""
+    text_lower = text.lower()
+    return {
+        key: sum(text_lower.count(k) for k in data['keywords'])
+        for key, data in ScraperConfig.CATEGORIES.items()
+    }
+
+
+def page_description(size: int) -> str:
+    # Keywords only near the end, as in long agendas: the worst case for the old scan
+    text = FILLER * (size // len(FILLER) + 1)
+    return text[:size] + GOV_DECISION.replace('ș', 'ş').replace('ț', 'ţ')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='2000,20000,200000', help='comma-separated text sizes in characters')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    matcher = KeywordMatcher.from_categories(ScraperConfig.CATEGORIES)
+    print(f"{'chars':>8} {'legacy first':>13} {'legacy counts':>14} {'compiled':>12}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        text = page_description(size)
+        legacy = min(timeit.repeat(lambda: legacy_categorize(text, 'mai'), number=args.repeat, repeat=3)) / args.repeat
+        counts = min(timeit.repeat(lambda: legacy_counts(text), number=args.repeat, repeat=3)) / args.repeat
+        compiled = min(timeit.repeat(lambda: matcher.count(text), number=args.repeat, repeat=3)) / args.repeat
+        print(f"{len(text):>8} {legacy * 1000:>10.3f} ms {counts * 1000:>11.3f} ms {compiled * 1000:>9.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark check_for_new_articles against local stub sites with injected latency.
+Compares a sequential run (one request at a time) with the concurrent engine.
+
+Usage: python benchmarks/bench_concurrent_fetch.py [--latency 0.2] [--articles 10]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_sites import start_stub_sites, stop_stub_sites
+
+
+def timed_run(scraper_module, workdir: str, max_workers: int, max_per_host: int) -> tuple:
+    config = scraper_module.ScraperConfig
+    config.MAX_CONCURRENT_REQUESTS = max_workers
+    config.MAX_REQUESTS_PER_HOST = max_per_host
+
+    label = f'{max_workers}_{max_per_host}'
+    scraper = scraper_module.MultiWebsiteScraper()
+    scraper.data_file = os.path.join(workdir, f'articles_{label}.json')
+    scraper.seen = scraper_module.SeenArticleStore(os.path.join(workdir, f'seen_{label}.db'))
+    scraper.near_duplicates = scraper_module.NearDuplicateIndex(os.path.join(workdir, f'near_{label}.db'))
+
+    started = time.perf_counter()
+    articles = scraper.check_for_new_articles()
+    return time.perf_counter() - started, [article.url for article in articles]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.2, help='seconds added to every response')
+    parser.add_argument('--articles', type=int, default=10, help='articles per listing page')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_fetch_')
+    os.chdir(workdir)  # keep scraper.log out of the source tree
+
+    import logging
+    import scraper as scraper_module
+    logging.getLogger().setLevel(logging.ERROR)
+
+    servers = start_stub_sites(latency=args.latency, count=args.articles)
+    try:
+        sequential, sequential_urls = timed_run(scraper_module, workdir, 1, 1)
+        concurrent, concurrent_urls = timed_run(scraper_module, workdir, 8, 2)
+    finally:
+        stop_stub_sites(servers)
+
+    assert sequential_urls == concurrent_urls, "concurrent run changed the result order"
+
+    pages = 3 + len(sequential_urls)
+    print(f"pages fetched:       {pages} ({args.latency * 1000:.0f} ms injected latency each)")
+    print(f"sequential (1/1):    {sequential:.2f} s")
+    print(f"concurrent (8/2):    {concurrent:.2f} s")
+    print(f"speedup:             {sequential / concurrent:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
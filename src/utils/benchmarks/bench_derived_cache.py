@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark the derived-data cache on re-processed articles.
+Builds every article twice (cold, then warm), then changes WORD_REPLACEMENTS
+and builds again: only the stages that depend on that table may miss. Also
+times the LLM stage against the stub completion server with a warm cache,
+and checks the cache stays within a small size budget.
+
+Usage: python benchmarks/bench_derived_cache.py [--articles 50] [--llm-latency 0.2]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def build_all(scraper, pages: list, simplify: bool = True) -> float:
+    started = time.perf_counter()
+    for link, content, doc in pages:
+        scraper.build_article(link, content, doc, simplify=simplify)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=50, help='articles per source')
+    parser.add_argument('--llm-latency', type=float, default=0.2)
+    args = parser.parse_args()
+
+    # Importing the scraper creates scraper.log in the working directory
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)
+    import scraper as scraper_module
+    from derived_cache import DerivedCache
+    from html_document import parse_html
+    from llm_simplifier import LLMSimplifier, OpenAICompatibleBackend
+    from scraper_config import ScraperConfig
+    from stub_llm import StubLLMServer
+    from stub_sites import article_html
+    logging.getLogger().setLevel(logging.ERROR)
+
+    scraper = scraper_module.MultiWebsiteScraper()
+    pages = []
+    for source in ('gov', 'mai', 'ms'):
+        for number in range(args.articles):
+            doc = parse_html(article_html(source, number).encode('utf-8'))
+            content = doc.content_text(ScraperConfig.WEBSITES[source]['content_selectors'])
+            link = (f'{source}_{number}', f'https://example.ro/{source}/{number}', f'Articol {number}', '', source)
+            pages.append((link, content, doc))
+
+    print(f"{len(pages)} articles")
+    print(f"cold:  {build_all(scraper, pages) * 1000:>8.1f} ms  {scraper.derived.report()}")
+    scraper.derived.hits.clear()
+    scraper.derived.misses.clear()
+    print(f"warm:  {build_all(scraper, pages) * 1000:>8.1f} ms  {scraper.derived.report()}")
+
+    ScraperConfig.WORD_REPLACEMENTS = dict(ScraperConfig.WORD_REPLACEMENTS, **{'comunicat': 'mesaj'})
+    scraper.register_derived_stages()
+    scraper.derived.hits.clear()
+    scraper.derived.misses.clear()
+    build_all(scraper, pages)
+    print(f"after WORD_REPLACEMENTS change: {scraper.derived.report()}")
+    if scraper.derived.misses['category'] or scraper.derived.hits['points'] or scraper.derived.hits['simplified']:
+        print("FAIL: changing WORD_REPLACEMENTS must invalidate points and simplified text only")
+        sys.exit(1)
+
+    # LLM stage: the second pass is served from the cache
+    server = StubLLMServer(latency=args.llm_latency)
+    backend = OpenAICompatibleBackend(base_url=server.base_url, api_key='stub')
+    simplifier = LLMSimplifier(lambda text, category: '', backend, cache=scraper.derived)
+    for label in ('LLM cold', 'LLM warm'):
+        started = time.perf_counter()
+        futures = [simplifier.submit(content, 'general') for _, content, _ in pages]
+        [future.result() for future in futures]
+        print(f"{label}: {time.perf_counter() - started:>6.2f} s, {server.counts['requests']} requests so far")
+    simplifier.close()
+    server.stop()
+
+    # Size budget
+    budget = 64 * 1024
+    small = DerivedCache(os.path.join(workdir, 'small.db'), max_bytes=budget)
+    small.register_stage('bench')
+    for _, content, _ in pages:
+        small.put('bench', content, content)
+    on_disk = small._conn.execute("SELECT SUM(size) FROM derived").fetchone()[0]
+    print(f"size budget {budget // 1024} KiB: {on_disk / 1024:.0f} KiB kept, {small.evictions} evicted")
+    if on_disk > budget or on_disk != small.total_bytes:
+        print("FAIL: cache exceeds its size budget or lost track of its size")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
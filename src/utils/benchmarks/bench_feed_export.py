@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Benchmark the sharded JSON feed against the single-file export.
+Fills a temporary article store with --articles synthetic articles over a
+year, writes the feed from it, then simulates a scraper run: --new fresh
+articles plus one re-saved article are merged in. Reports sizes (raw,
+gzip, brotli) next to the monolithic scraped_articles.json, the bytes a
+client needs for one shard, and the time of a full rebuild against an
+incremental update.
+
+Checks that only the touched shards got new files, that the manifest
+hashes and the compressed copies match the shard contents, that an
+identical re-run writes nothing, and that replaced files are kept for
+FEED_RETAIN_SECONDS and then removed.
+
+Usage: python benchmarks/bench_feed_export.py [--articles 20000] [--new 20]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from article_store import ArticleStore
+from feed_export import ENCODING_SUFFIXES, FeedExporter
+from models import Article
+from scraper_config import ScraperConfig
+from stub_sites import FILLER_WORDS
+
+START = datetime(2025, 1, 1)
+SOURCES = ('gov', 'mai', 'ms')
+
+
+def make_article(rng: random.Random, number: int, scraped_at: datetime) -> Article:
+    source = SOURCES[number % 3]
+    category = rng.choice(list(ScraperConfig.CATEGORIES))
+    return Article(
+        id=f"{source}_{number:012x}",
+        date=scraped_at.strftime('%d.%m.%Y'),
+        title=' '.join(rng.choices(FILLER_WORDS, k=10)).capitalize(),
+        original_content=' '.join(rng.choices(FILLER_WORDS, k=280))[:2000],
+        simplified_content=' '.join(rng.choices(FILLER_WORDS, k=60)),
+        detailed_points=[' '.join(rng.choices(FILLER_WORDS, k=12)) for _ in range(5)],
+        category=category,
+        category_emoji=ScraperConfig.CATEGORIES[category]['emoji'],
+        category_name=ScraperConfig.CATEGORIES[category]['name'],
+        url=f"https://example.ro/{source}/{number}",
+        scraped_at=scraped_at.isoformat(),
+        source=source
+    )
+
+
+def directory_files(path: str) -> dict:
+    files = {}
+    for root, _, names in os.walk(path):
+        for name in names:
+            full = os.path.join(root, name)
+            files[os.path.relpath(full, path)] = os.path.getsize(full)
+    return files
+
+
+def check_manifest(feed_dir: str, failures: list):
+    with open(os.path.join(feed_dir, 'manifest.json'), 'rb') as f:
+        manifest = json.loads(f.read())
+    for key, entry in manifest['shards'].items():
+        with open(os.path.join(feed_dir, entry['path']), 'rb') as f:
+            body = f.read()
+        if hashlib.sha256(body).hexdigest() != entry['sha256'] or len(json.loads(body)) != entry['articles']:
+            failures.append(f"{key}: manifest does not match the shard")
+        with open(os.path.join(feed_dir, entry['path'] + '.gz'), 'rb') as f:
+            if gzip.decompress(f.read()) != body:
+                failures.append(f"{key}: gzip copy differs")
+        if 'br' in entry['encodings']:
+            import brotli
+            with open(os.path.join(feed_dir, entry['path'] + '.br'), 'rb') as f:
+                if brotli.decompress(f.read()) != body:
+                    failures.append(f"{key}: brotli copy differs")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=20000)
+    parser.add_argument('--new', type=int, default=20, help='articles found by the simulated run')
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.ERROR)
+    failures = []
+
+    workdir = tempfile.mkdtemp(prefix='bench_feed_')
+    feed_dir = os.path.join(workdir, 'feed')
+    try:
+        rng = random.Random(1)
+        year = 365 * 24 * 60
+        articles = [make_article(rng, number, START + timedelta(minutes=number * year // args.articles))
+                    for number in range(args.articles)]
+        store = ArticleStore(os.path.join(workdir, 'article_store'))
+        store.append(articles)
+        store.close()
+
+        monolithic = os.path.join(workdir, 'scraped_articles.json')
+        store.export_json(monolithic)
+        with open(monolithic, 'rb') as f:
+            monolithic_gzip = len(gzip.compress(f.read(), compresslevel=9))
+        monolithic_bytes = os.path.getsize(monolithic)
+
+        feed = FeedExporter(feed_dir)
+        started = time.perf_counter()
+        feed.rebuild(store.iter_lines())
+        rebuild_seconds = time.perf_counter() - started
+        manifest = check_manifest(feed_dir, failures)
+        shards = manifest['shards']
+        raw = sum(entry['bytes'] for entry in shards.values())
+        gz = sum(entry['encodings'].get('gzip', 0) for entry in shards.values())
+        br = sum(entry['encodings'].get('br', 0) for entry in shards.values())
+        latest = max(shards.values(), key=lambda entry: entry['newest'])
+        manifest_gz = os.path.getsize(os.path.join(feed_dir, 'manifest.json.gz'))
+
+        print(f"{args.articles} articles, {len(shards)} shards, rebuild {rebuild_seconds:.2f} s")
+        print(f"scraped_articles.json:  {monolithic_bytes / 1e6:8.2f} MB, {monolithic_gzip / 1e6:8.2f} MB gzip")
+        print(f"all shards:             {raw / 1e6:8.2f} MB, {gz / 1e6:8.2f} MB gzip, {br / 1e6:8.2f} MB brotli")
+        print(f"one shard ({latest['path'].rsplit('.', 2)[0]}): {latest['articles']} articles, "
+              f"{latest['encodings'].get('br', latest['encodings']['gzip']) / 1e3:.1f} kB compressed, "
+              f"manifest {manifest_gz / 1e3:.1f} kB gzip")
+
+        # A run: new articles in the latest month and one article saved again with new text
+        before = {key: entry['path'] for key, entry in shards.items()}
+        files_before = directory_files(feed_dir)
+        newest = datetime.fromisoformat(articles[-1].scraped_at)
+        fresh = [make_article(rng, args.articles + number, newest + timedelta(minutes=number + 1))
+                 for number in range(args.new)]
+        resaved = articles[-5]
+        resaved.simplified_content += ' Actualizat.'
+        started = time.perf_counter()
+        changed = feed.update(fresh + [resaved])
+        update_seconds = time.perf_counter() - started
+        manifest = check_manifest(feed_dir, failures)
+        touched = {feed_key for feed_key, entry in manifest['shards'].items() if before.get(feed_key) != entry['path']}
+        print(f"run with {args.new} new + 1 re-saved article: {len(changed)} of {len(manifest['shards'])} shards "
+              f"rewritten in {update_seconds * 1000:.0f} ms ({rebuild_seconds / update_seconds:.0f}x faster than a rebuild)")
+
+        expected = {f"{article.source}/{article.category}/{article.scraped_at[:7]}" for article in fresh + [resaved]}
+        if touched != expected or set(changed) != expected:
+            failures.append(f"rewritten shards {sorted(touched)} are not the touched ones {sorted(expected)}")
+        resaved_shard = feed.read_shard(f"{resaved.source}/{resaved.category}/{resaved.scraped_at[:7]}")
+        if [record['simplified_content'] for record in resaved_shard if record['id'] == resaved.id] != \
+                [resaved.simplified_content]:
+            failures.append("the re-saved article was not replaced in its shard")
+        if any(name not in directory_files(feed_dir) for name in files_before):
+            failures.append("replaced shard files were deleted before FEED_RETAIN_SECONDS")
+        if feed.update(fresh + [resaved]):
+            failures.append("an identical re-run rewrote shards")
+
+        ScraperConfig.FEED_RETAIN_SECONDS = 0
+        feed.update([make_article(rng, args.articles + args.new, newest + timedelta(hours=1))])
+        current = {entry['path'] for entry in json.load(open(os.path.join(feed_dir, 'manifest.json')))['shards'].values()}
+        stale = [name for name in directory_files(feed_dir) if name.endswith('.json')
+                 and name != 'manifest.json' and name not in current]
+        if stale:
+            failures.append(f"{len(stale)} replaced shard files left after FEED_RETAIN_SECONDS")
+        if 'br' in ScraperConfig.FEED_COMPRESSIONS and not any(name.endswith(ENCODING_SUFFIXES['br'])
+                                                                for name in directory_files(feed_dir)):
+            print("brotli is not installed; only gzip copies were written")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark the HTML parser backends on the saved gov/MAI/MS fixture pages.
+For every installed backend, times parsing plus the extraction the scraper
+does on that page, and checks the extracted text matches the bs4 fallback.
+
+Usage: python benchmarks/bench_html_parsers.py [--repeat 50]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from html_document import BACKENDS, backend_available, parse_html
+from scraper_config import ScraperConfig
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def extract_listing(content: bytes, source: str, backend: str) -> list:
+    doc = parse_html(content, backend)
+    config = ScraperConfig.WEBSITES[source]
+    if source == 'gov':
+        return [(div.get('id'), a.get('href'), a.text(strip=True))
+                for div in doc.select('div.sedinte_lista') for a in div.select('a[href]')]
+    links = []
+    for item in doc.select(config['article_selector']):
+        title = item.select_one(config['title_selector'])
+        if title is not None:
+            links.append((title.get('href'), title.text(strip=True)))
+    return links
+
+
+def extract_article(content: bytes, source: str, backend: str) -> tuple:
+    doc = parse_html(content, backend)
+    text = doc.content_text(ScraperConfig.WEBSITES[source]['content_selectors'])
+    if source == 'gov':
+        node = doc.select_one('div.pageDescription')
+        structured = node.text(separator='\n', strip=True) if node else ''
+    else:
+        structured = doc.full_text('\n')
+    return text, structured
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    backends = [name for name in BACKENDS if backend_available(name)]
+    print(f"installed backends: {', '.join(backends)}")
+    print(f"{'page':<18}" + ''.join(f"{name:>14}" for name in backends))
+
+    mismatches = []
+    for source in ('gov', 'mai', 'ms'):
+        for kind, extract in (('listing', extract_listing), ('article', extract_article)):
+            with open(os.path.join(FIXTURES, f'{source}_{kind}.html'), 'rb') as f:
+                content = f.read()
+            reference = extract(content, source, 'bs4')
+            row = f"{source + ' ' + kind:<18}"
+            for name in backends:
+                if extract(content, source, name) != reference:
+                    mismatches.append(f"{name} on {source} {kind}")
+                seconds = min(timeit.repeat(lambda: extract(content, source, name), number=args.repeat, repeat=3))
+                row += f"{seconds / args.repeat * 1000:>11.2f} ms"
+            print(row)
+
+    if mismatches:
+        print("FAIL: output differs from bs4 for " + ', '.join(mismatches))
+        sys.exit(1)
+    print("OK: every backend extracts the same text as bs4")
+
+
+if __name__ == '__main__':
+    main()
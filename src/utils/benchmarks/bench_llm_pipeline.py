@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark the LLM simplification stage against a local stub completion server.
+Runs the same articles (a third of them long gov.ro decisions that need
+several chunks) one request at a time, concurrently, concurrently with
+batched prompts, against a server that rate-limits, and against one slower
+than the article deadline, where every article must fall back to the rules.
+
+Usage: python benchmarks/bench_llm_pipeline.py [--articles 24] [--latency 0.2]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm_simplifier import LLMSimplifier, OpenAICompatibleBackend, chunk_text
+from scraper_config import ScraperConfig
+from stub_llm import StubLLMServer
+from stub_sites import GOV_DECISION
+
+FALLBACK_TEXT = "rule-based"
+
+
+def make_articles(count: int) -> list:
+    articles = []
+    for i in range(count):
+        repeat = 40 if i % 3 == 0 else 3
+        articles.append(f"Comunicat nr. {i}. " + (GOV_DECISION * repeat).replace('\n', ' '))
+    return articles
+
+
+def run(articles: list, server: StubLLMServer, style: str, concurrency: int, article_timeout: float) -> tuple:
+    ScraperConfig.LLM_MAX_CONCURRENCY = concurrency
+    ScraperConfig.LLM_ARTICLE_TIMEOUT = article_timeout
+    backend = OpenAICompatibleBackend(base_url=server.base_url, api_key='stub', style=style)
+    simplifier = LLMSimplifier(lambda text, category: FALLBACK_TEXT, backend)
+    started = time.perf_counter()
+    futures = [simplifier.submit(text, 'general') for text in articles]
+    results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - started
+    simplifier.close()
+    return elapsed, results, simplifier.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=24)
+    parser.add_argument('--latency', type=float, default=0.2, help='seconds per stub completion request')
+    args = parser.parse_args()
+
+    articles = make_articles(args.articles)
+    chunks = sum(len(chunk_text(text, ScraperConfig.LLM_CHUNK_TOKENS)) for text in articles)
+    print(f"{len(articles)} articles, {chunks} chunks of at most {ScraperConfig.LLM_CHUNK_TOKENS} tokens")
+    print(f"{'scenario':<26} {'time':>7} {'requests':>9} {'429s':>5} {'LLM':>4} {'rules':>6}")
+
+    scenarios = [
+        ('sequential (1, chat)', dict(latency=args.latency), 'chat', 1, 600),
+        ('concurrent (4, chat)', dict(latency=args.latency), 'chat', 4, 600),
+        ('batched (4 x 8 prompts)', dict(latency=args.latency), 'completions', 4, 600),
+        ('rate-limited (2 allowed)', dict(latency=args.latency, max_in_flight=2), 'chat', 4, 600),
+        ('deadline 0.5 s', dict(latency=2.0), 'chat', 4, 0.5),
+    ]
+    failures = []
+    for name, server_options, style, concurrency, deadline in scenarios:
+        server = StubLLMServer(**server_options)
+        elapsed, results, stats = run(articles, server, style, concurrency, deadline)
+        server.stop()
+        fallbacks = results.count(FALLBACK_TEXT)
+        print(f"{name:<26} {elapsed:>5.2f} s {server.counts['requests']:>9} "
+              f"{server.counts['rate_limited']:>5} {len(results) - fallbacks:>4} {fallbacks:>6}")
+
+        if deadline < 600:
+            if fallbacks != len(results) or elapsed > deadline + 1:
+                failures.append(f"{name}: expected every article to fall back within the deadline")
+        elif fallbacks:
+            failures.append(f"{name}: {fallbacks} articles fell back")
+        if server.counts['peak_in_flight'] > concurrency:
+            failures.append(f"{name}: {server.counts['peak_in_flight']} requests in flight, limit {concurrency}")
+
+    if failures:
+        print("FAIL: " + '; '.join(failures))
+        sys.exit(1)
+    print("OK: concurrency stays bounded, rate limits are retried, slow responses fall back to rules")
+
+
+if __name__ == '__main__':
+    main()
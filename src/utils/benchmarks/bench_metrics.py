@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Check the run metrics against local stub sites and time their overhead.
+Runs check_for_new_articles once, prints the run summary, validates the
+Prometheus text and the scraper_runs-shaped JSON line, then measures the
+cost of a fetch observation and a stage timer.
+
+Usage: python benchmarks/bench_metrics.py [--latency 0.05] [--articles 10]
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_sites import start_stub_sites, stop_stub_sites
+
+SAMPLE_LINE = re.compile(r'^[a-z_]+(\{[a-z]+="[^"]*"(,[a-z]+="[^"]*")*\})? -?[0-9.e+-]+$')
+RUN_COLUMNS = ('started_at', 'completed_at', 'status', 'articles_found', 'errors', 'sources_scraped')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds added to every response')
+    parser.add_argument('--articles', type=int, default=10, help='articles per listing page')
+    args = parser.parse_args()
+
+    # Importing the scraper creates scraper.log in the working directory
+    workdir = tempfile.mkdtemp(prefix='bench_metrics_')
+    os.chdir(workdir)
+    import scraper as scraper_module
+    from metrics import ScraperMetrics
+    from scraper_config import ScraperConfig
+    logging.getLogger().setLevel(logging.ERROR)
+
+    servers = start_stub_sites(latency=args.latency, count=args.articles)
+    try:
+        scraper = scraper_module.MultiWebsiteScraper()
+        articles = scraper.check_for_new_articles()
+    finally:
+        stop_stub_sites(servers)
+
+    summary = scraper.metrics.last_run
+    print(f"{len(articles)} articles, status {summary['status']}, "
+          f"{summary['articles_per_second']:.1f} articles/s over {summary['duration_seconds']:.2f} s")
+    for host, stats in summary['hosts'].items():
+        print(f"  {host:<22} {stats['requests']:>3} requests {stats['bytes'] / 1024:>7.1f} KiB "
+              f"avg {stats['avg_seconds'] * 1000:>5.0f} ms max {stats['max_seconds'] * 1000:>5.0f} ms")
+    for stage, stats in summary['stages'].items():
+        print(f"  {stage:<22} {stats['calls']:>3} calls {stats['seconds'] * 1000:>9.1f} ms")
+
+    failures = []
+    with open(ScraperConfig.METRICS_FILE, encoding='utf-8') as f:
+        bad = [line for line in f.read().splitlines() if not line.startswith('#') and not SAMPLE_LINE.match(line)]
+    if bad:
+        failures.append(f"malformed Prometheus lines: {bad[:3]}")
+    with open(ScraperConfig.SCRAPER_RUNS_FILE, encoding='utf-8') as f:
+        runs = [json.loads(line) for line in f]
+    if len(runs) != 1 or any(column not in runs[0] for column in RUN_COLUMNS):
+        failures.append("run summary missing or lacks scraper_runs columns")
+    elif runs[0]['articles_found'] != len(articles) or sum(runs[0]['articles_by_source'].values()) != len(articles):
+        failures.append("run summary article count does not match the run")
+    # Plus each host's robots.txt, fetched once through the same client
+    robots = len(summary['hosts']) if ScraperConfig.RESPECT_ROBOTS_TXT else 0
+    if sum(stats['requests'] for stats in summary['hosts'].values()) != 3 + len(articles) + robots:
+        failures.append("expected one request per listing, per article and per robots.txt")
+
+    # Overhead per call, with a run open so both tallies are updated
+    metrics = ScraperMetrics()
+    metrics.start_run(['gov'])
+    number = 100_000
+    fetch = timeit.timeit(lambda: metrics.observe_fetch('https://gov.ro/x', 0.2, 50_000), number=number)
+
+    def timed_stage():
+        with metrics.stage('parse'):
+            pass
+    stage = timeit.timeit(timed_stage, number=number)
+    print(f"overhead: {fetch / number * 1e6:.2f} µs per fetch observation, {stage / number * 1e6:.2f} µs per stage timer")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
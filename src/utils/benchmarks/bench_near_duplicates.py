@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark the near-duplicate index as the corpus grows.
+Indexes synthetic articles, then looks up lightly edited copies (should be
+found) and unrelated articles (should not). Reports recall, false matches
+and lookup time for the LSH index against a linear scan of all signatures.
+"copy sim" is the mean estimated similarity of the edited copies to their
+originals; copies below the threshold are correctly not reported.
+
+Usage: python benchmarks/bench_near_duplicates.py [--sizes 1000,4000,16000] [--queries 200] [--edit 0.03]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from near_duplicates import NearDuplicateIndex, similarity
+
+SYLLABLES = "ba ce di fo gu la me ni po ru sa te vi zo ma ne ri to pa de mi so".split()
+
+
+def make_vocabulary(rng: random.Random, size: int = 5000) -> list:
+    return [''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(size)]
+
+
+def make_text(rng: random.Random, vocabulary: list, words: int = 200) -> list:
+    return [rng.choice(vocabulary) for _ in range(words)]
+
+
+def edit(rng: random.Random, words: list, vocabulary: list, fraction: float) -> list:
+    """Replace a fraction of the words, as a republished update would."""
+    edited = list(words)
+    for i in rng.sample(range(len(edited)), int(len(edited) * fraction)):
+        edited[i] = rng.choice(vocabulary)
+    return edited
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,4000,16000', help='comma-separated corpus sizes')
+    parser.add_argument('--queries', type=int, default=200, help='edited copies and unrelated texts looked up')
+    parser.add_argument('--edit', type=float, default=0.03, help='fraction of words changed in a copy')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    vocabulary = make_vocabulary(rng)
+    sizes = [int(s) for s in args.sizes.split(',')]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        index = NearDuplicateIndex(os.path.join(workdir, 'near.db'))
+        print(f"threshold {index.threshold}, {index.bands} bands x {index.rows} rows")
+        print(f"{'corpus':>7} {'copy sim':>9} {'recall':>7} {'false':>6} {'LSH lookup':>11} {'linear scan':>12}")
+
+        texts, signatures = [], []
+        for size in sizes:
+            batch = []
+            while len(texts) < size:
+                words = make_text(rng, vocabulary)
+                signature = index.signature(' '.join(words))
+                batch.append((f'a{len(texts)}', 'gov', signature))
+                texts.append(words)
+                signatures.append(signature)
+            index.add_many(batch)
+
+            copies, copy_similarity = [], 0.0
+            for _ in range(args.queries):
+                original = rng.randrange(len(texts))
+                copy = index.signature(' '.join(edit(rng, texts[original], vocabulary, args.edit)))
+                copy_similarity += similarity(copy, signatures[original]) / args.queries
+                copies.append(copy)
+            unrelated = [index.signature(' '.join(make_text(rng, vocabulary))) for _ in range(args.queries)]
+
+            started = time.perf_counter()
+            found = sum(1 for signature in copies if index.find_similar(signature))
+            false = sum(1 for signature in unrelated if index.find_similar(signature))
+            lsh = (time.perf_counter() - started) / (2 * args.queries)
+
+            started = time.perf_counter()
+            for signature in copies[:20] + unrelated[:20]:
+                max(similarity(signature, other) for other in signatures)
+            scan = (time.perf_counter() - started) / 40
+
+            print(f"{size:>7} {copy_similarity:>9.2f} {found / args.queries:>6.0%} {false:>6} {lsh * 1000:>8.2f} ms {scan * 1000:>9.2f} ms")
+
+        index.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Check the per-host rate limiter against a stub host that enforces its own limit.
+The host answers 429 past --capacity requests per second. Compares an
+unthrottled client with the adaptive limiter (throughput and share of
+429s), halves the host's capacity mid-run and restores it to show the
+limiter backing off and ramping up again, and checks that robots.txt
+Disallow and Crawl-delay rules are applied with robots.txt fetched once.
+
+Time constants (increase step, cooldown) are scaled down so the run takes
+seconds instead of minutes.
+
+Usage: python benchmarks/bench_rate_limiter.py [--capacity 20] [--seconds 4]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_sites import StubServer
+
+ROBOTS_TXT = "User-agent: *\nDisallow: /private/\nCrawl-delay: {delay}\n"
+
+
+class LimitedHost:
+    """Server-side token bucket: what a site's own rate limiting looks like from outside."""
+
+    def __init__(self, capacity: float, crawl_delay: float = 0):
+        self.capacity = capacity
+        self.crawl_delay = crawl_delay
+        self.tokens = capacity / 4
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.counts = {'ok': 0, '429': 0, 'robots': 0, 'private': 0}
+        self.times = []
+
+    def admit(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity / 4, self.tokens + (now - self.updated) * self.capacity)
+            self.updated = now
+            self.times.append(now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                self.counts['ok'] += 1
+                return True
+            self.counts['429'] += 1
+            return False
+
+    def serve(self) -> StubServer:
+        host = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                status, body = 200, b'<html><body><p>ok</p></body></html>'
+                if self.path == '/robots.txt':
+                    host.counts['robots'] += 1
+                    body = ROBOTS_TXT.format(delay=host.crawl_delay).encode('utf-8') if host.crawl_delay \
+                        else b"User-agent: *\nDisallow: /private/\n"
+                elif self.path.startswith('/private/'):
+                    host.counts['private'] += 1
+                elif not host.admit():
+                    status, body = 429, b'slow down'
+                time.sleep(0.005)
+                self.send_response(status)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = StubServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def hammer(client, base_url: str, seconds: float, threads: int = 4) -> int:
+    """Request pages from several threads for a while; returns the number of requests sent."""
+    deadline = time.monotonic() + seconds
+    sent = [0] * threads
+
+    def worker(index: int):
+        while time.monotonic() < deadline:
+            client.get(f"{base_url}/page-{index}-{sent[index]}")
+            sent[index] += 1
+
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(worker, range(threads)))
+    return sum(sent)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--capacity', type=float, default=20, help='requests per second the host accepts')
+    parser.add_argument('--seconds', type=float, default=4, help='length of each phase')
+    args = parser.parse_args()
+
+    from http_client import HTTPClient
+    from rate_limiter import HostRateLimiter, RobotsDisallowed
+    from scraper_config import ScraperConfig
+    logging.getLogger().setLevel(logging.ERROR)
+    ScraperConfig.HTTP_MAX_RETRIES = 0  # Count every 429 instead of retrying it
+    ScraperConfig.RATE_LIMIT_MAX_PER_SECOND = args.capacity * 5
+    ScraperConfig.RATE_LIMIT_INITIAL_PER_SECOND = args.capacity / 4
+    ScraperConfig.RATE_LIMIT_INCREASE = 0.5
+    ScraperConfig.RATE_LIMIT_COOLDOWN_SECONDS = 0.5
+    failures = []
+
+    # Unthrottled
+    host = LimitedHost(args.capacity)
+    server = host.serve()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    sent = hammer(HTTPClient(), base_url, args.seconds)
+    unthrottled_429 = host.counts['429'] / sent
+    print(f"host accepts {args.capacity:.0f} requests/s")
+    print(f"unthrottled:  {host.counts['ok'] / args.seconds:>5.1f} ok/s, {sent / args.seconds:>6.1f} sent/s, "
+          f"{unthrottled_429:>5.1%} answered 429")
+    server.shutdown()
+
+    # Adaptive limiter: steady, then the host halves its capacity, then recovers
+    host = LimitedHost(args.capacity)
+    server = host.serve()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    limiter = HostRateLimiter()
+    client = HTTPClient(limiter=limiter)
+    phases = []
+    for label, capacity in (('adaptive', args.capacity), ('capacity/2', args.capacity / 2),
+                            ('recovered', args.capacity)):
+        host.capacity = capacity
+        before = dict(host.counts)
+        sent = hammer(client, base_url, args.seconds)
+        ok = host.counts['ok'] - before['ok']
+        rejected = host.counts['429'] - before['429']
+        rate = limiter.rates()[f"{base_url}"]
+        phases.append((label, capacity, ok / args.seconds, rejected / max(sent, 1), rate))
+        print(f"{label + ':':<13} {ok / args.seconds:>5.1f} ok/s of {capacity:.0f}, {rejected / max(sent, 1):>5.1%} "
+              f"answered 429, limiter at {rate:.1f}/s")
+
+    # Robots rules on the same host: /private/ is never requested
+    try:
+        client.get(f"{base_url}/private/report")
+        failures.append("a disallowed URL was requested")
+    except RobotsDisallowed:
+        pass
+    if host.counts['private']:
+        failures.append("the disallowed URL reached the host")
+    if host.counts['robots'] != 1:
+        failures.append(f"robots.txt fetched {host.counts['robots']} times, expected once")
+    server.shutdown()
+
+    # Crawl-delay caps the rate below what the host would accept
+    delay = 0.1
+    host = LimitedHost(args.capacity * 10, crawl_delay=delay)
+    server = host.serve()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    hammer(HTTPClient(limiter=HostRateLimiter()), base_url, 1.5)
+    gaps = [b - a for a, b in zip(host.times, host.times[1:])]
+    average_gap = sum(gaps) / len(gaps)
+    print(f"crawl-delay:  {delay * 1000:.0f} ms asked, {average_gap * 1000:.0f} ms average between requests")
+    server.shutdown()
+
+    adaptive, halved, recovered = phases
+    if adaptive[3] > unthrottled_429 / 3:
+        failures.append("the limiter did not cut the share of 429s")
+    if adaptive[2] < args.capacity * 0.5:
+        failures.append("the limiter used less than half the host's capacity")
+    if halved[4] >= adaptive[4]:
+        failures.append("the limiter did not slow down when the host's capacity dropped")
+    if recovered[4] <= halved[4]:
+        failures.append("the limiter did not ramp up after the host recovered")
+    if average_gap < delay * 0.9:
+        failures.append("requests were closer together than the Crawl-delay")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
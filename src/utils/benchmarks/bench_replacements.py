@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark WORD_REPLACEMENTS application: ReplacementEngine next to the previous
+chain of str.replace calls, on inputs of growing size.
+The two run at about the same speed from 10k characters up (the engine's one
+regex scan costs about what 35 str.replace passes do), but only the engine is
+correct: the chain rewrites parts of words ("bugetul" -> "banii pe care îi
+avemul") and its output depends on the table's order, so it is not kept as a
+fast path for long texts. Prints a few such outputs of the chain, and fails
+if the engine gets more than SLOWDOWN_LIMIT times slower than the chain.
+Correctness is covered by tests/test_replacement_engine.py.
+
+Usage: python benchmarks/bench_replacements.py [--sizes 10000,100000,1000000] [--shuffles 25]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from replacement_engine import ReplacementEngine
+from scraper_config import ScraperConfig
+
+SAMPLE = (
+    "guvernul a adoptat în ședința de astăzi o hotărâre de guvern privind implementarea "
+    "strategiei de digitalizare și un regulament pentru investiție în infrastructură. "
+    "ministrul a prezentat măsuri de eficiență pentru cetățeni, iar parlamentul va discuta "
+    "bugetul. pompierii de la situații de urgență și poliția au primit imobile de utilitate publică. "
+)
+SLOWDOWN_LIMIT = 2.0  # Well above the run-to-run noise of the ratio
+
+
+def legacy_apply(text: str, table: dict) -> str:
+    for old, new in table.items():
+        text = text.replace(old, new)
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10000,100000,1000000', help='comma-separated input sizes in characters')
+    parser.add_argument('--shuffles', type=int, default=25, help='shuffled table orders to compare')
+    args = parser.parse_args()
+
+    table = ScraperConfig.WORD_REPLACEMENTS
+    engine = ReplacementEngine(table)
+    failures = []
+
+    print(f"{'chars':>9} {'str.replace chain':>18} {'engine':>10} {'ratio':>6}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        text = (SAMPLE * (size // len(SAMPLE) + 1))[:size]
+        repeat = max(1, 1000000 // size)
+        legacy = min(timeit.repeat(lambda: legacy_apply(text, table), number=repeat, repeat=5)) / repeat
+        compiled = min(timeit.repeat(lambda: engine.apply(text), number=repeat, repeat=5)) / repeat
+        print(f"{size:>9} {legacy * 1000:>15.2f} ms {compiled * 1000:>7.2f} ms {compiled / legacy:>5.2f}x")
+        if compiled > legacy * SLOWDOWN_LIMIT:
+            failures.append(f"the engine is {compiled / legacy:.1f}x slower than the chain at {size} chars")
+
+    rng = random.Random(42)
+    items = list(table.items())
+    legacy_outputs = set()
+    for _ in range(args.shuffles):
+        rng.shuffle(items)
+        legacy_outputs.add(legacy_apply(SAMPLE, dict(items)))
+    print(f"str.replace chain: {len(legacy_outputs)} distinct outputs over {args.shuffles} table orders")
+    for source in ('bugetul anual', 'implementarea planului', 'o hotărâre de guvern nouă'):
+        print(f"  {source!r}: chain {legacy_apply(source, table)!r}, engine {engine.apply(source)!r}")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Record a run against the stub sites, then replay it offline.
+The replayed runs must produce the same articles as the recorded one (and
+as each other), without any network access. Prints the time of each run
+and the archive size against the raw bytes received.
+
+Usage: python benchmarks/bench_replay.py [--latency 0.2] [--articles 10]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_sites import start_stub_sites, stop_stub_sites
+
+
+def comparable(articles) -> list:
+    """Article fields that must match between runs (scraped_at never does)."""
+    return [
+        (a.id, a.url, a.title, a.category, a.original_content, a.simplified_content, tuple(a.detailed_points))
+        for a in articles
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.2, help='seconds added to every live response')
+    parser.add_argument('--articles', type=int, default=10, help='articles per listing page')
+    args = parser.parse_args()
+
+    # Importing the scraper creates scraper.log in the working directory
+    workdir = tempfile.mkdtemp(prefix='bench_replay_')
+    os.chdir(workdir)
+    import scraper as scraper_module
+    from replay_archive import ArchiveWriter, RecordingHTTPClient
+    logging.getLogger().setLevel(logging.ERROR)
+
+    archive = os.path.join(workdir, 'http_archive.gz')
+    record_dir = os.path.join(workdir, 'recorded')
+    os.makedirs(record_dir)
+    os.chdir(record_dir)
+
+    servers = start_stub_sites(latency=args.latency, count=args.articles)
+    try:
+        scraper = scraper_module.MultiWebsiteScraper()
+        scraper.http = RecordingHTTPClient(scraper.http, ArchiveWriter(archive))
+        started = time.perf_counter()
+        recorded = scraper.check_for_new_articles()
+        record_time = time.perf_counter() - started
+        raw_bytes = sum(stats['bytes'] for stats in scraper.metrics.last_run['hosts'].values())
+        scraper.http.writer.close()
+    finally:
+        # Replays below must not need the sites
+        stop_stub_sites(servers)
+
+    replays = []
+    for label in ('replay_1', 'replay_2'):
+        started = time.perf_counter()
+        articles = scraper_module.run_replay(archive, os.path.join(workdir, label))
+        replays.append((time.perf_counter() - started, articles))
+
+    print(f"{len(recorded)} articles, {args.latency * 1000:.0f} ms latency per live request")
+    print(f"recorded run:  {record_time:>6.2f} s")
+    for label, (elapsed, _) in zip(('replay 1', 'replay 2'), replays):
+        print(f"{label}:      {elapsed:>6.2f} s  ({record_time / elapsed:.0f}x faster)")
+    print(f"archive:       {os.path.getsize(archive) / 1024:.1f} KiB for {raw_bytes / 1024:.1f} KiB of responses")
+
+    if not recorded or any(comparable(articles) != comparable(recorded) for _, articles in replays):
+        print("FAIL: replayed runs differ from the recorded run")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk reprocessing of a synthetic stored corpus.
+Times the reprocessor with a growing number of worker processes, then
+kills a run part-way (SIGKILL), resumes it and checks the result matches
+an uninterrupted run: same articles, same order, no duplicates, and every
+stale category and simplification recomputed.
+
+Usage: python benchmarks/bench_reprocess.py [--articles 20000] [--workers 1,2,4]
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import replace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_storage_ingest import make_article
+
+UTILS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STALE = 'stale'
+
+
+def build_corpus(path: str, count: int):
+    from article_store import ArticleStore
+    store = ArticleStore(path)
+    batch = []
+    for number in range(count):
+        # Stale derived fields that reprocessing has to replace
+        batch.append(replace(make_article(number), category='general', simplified_content=STALE))
+        if len(batch) == 1000:
+            store.append(batch)
+            batch = []
+    store.append(batch)
+    # A re-stored copy of an early article; only this latest copy may survive
+    store.append([replace(make_article(0), title='Informatie de presa 0 (corectat)', simplified_content=STALE)])
+    store.close()
+
+
+def store_lines(path: str) -> list:
+    from article_store import ArticleStore
+    return [bytes(line) for line in ArticleStore(path).iter_lines(newest_first=False)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=20000)
+    parser.add_argument('--workers', default=','.join(str(n) for n in sorted({1, 2, os.cpu_count() or 1})))
+    args = parser.parse_args()
+
+    # Importing the scraper creates scraper.log in the working directory
+    workdir = tempfile.mkdtemp(prefix='bench_reprocess_')
+    os.chdir(workdir)
+    from reprocess import Reprocessor
+    logging.getLogger().setLevel(logging.ERROR)
+
+    corpus = os.path.join(workdir, 'corpus')
+    build_corpus(corpus, args.articles)
+    print(f"{args.articles} articles, {os.cpu_count()} cores")
+
+    reference = None
+    for workers in [int(n) for n in args.workers.split(',')]:
+        store_dir = os.path.join(workdir, f'store_{workers}')
+        shutil.copytree(corpus, store_dir)
+        started = time.perf_counter()
+        Reprocessor(store_dir, workers=workers).run()
+        elapsed = time.perf_counter() - started
+        print(f"{workers} workers: {elapsed:>6.2f} s  {args.articles / elapsed:>7.0f} articles/s")
+        lines = store_lines(store_dir)
+        if reference is None:
+            reference = lines
+        elif lines != reference:
+            print(f"FAIL: {workers} workers produced a different store")
+            sys.exit(1)
+
+    # Kill a run part-way, then resume it
+    store_dir = os.path.join(workdir, 'store_resumed')
+    shutil.copytree(corpus, store_dir)
+    command = [sys.executable, os.path.join(UTILS_DIR, 'reprocess.py'), '--store-dir', store_dir,
+               '--workers', '1', '--chunk-size', '200']
+    process = subprocess.Popen(command, stderr=subprocess.DEVNULL, start_new_session=True)
+    output_dir = os.path.join(store_dir + '.reprocess', 'store')
+    while process.poll() is None:
+        written = sum(os.path.getsize(os.path.join(output_dir, name)) for name in os.listdir(output_dir)) \
+            if os.path.isdir(output_dir) else 0
+        if written > 200_000:
+            os.killpg(process.pid, signal.SIGKILL)
+            break
+        time.sleep(0.05)
+    process.wait()
+    interrupted_at = len(store_lines(output_dir))
+    started = time.perf_counter()
+    counts = Reprocessor(store_dir, workers=1).run()
+    print(f"killed after {interrupted_at} articles; resume reprocessed "
+          f"{counts['from_text']} more in {time.perf_counter() - started:.2f} s")
+
+    failures = []
+    if store_lines(store_dir) != reference:
+        failures.append("resumed run differs from an uninterrupted one")
+    if len(reference) != args.articles:
+        failures.append(f"expected {args.articles} articles, got {len(reference)}")
+    if any(STALE.encode() in line or b'"category":"general"' in line for line in reference):
+        failures.append("some articles kept stale fields")
+    # Like compaction, the latest copy is kept at the latest copy's position
+    if b'(corectat)' not in reference[-1] or sum(b'"id":"gov_000000000000"' in line for line in reference) != 1:
+        failures.append("the latest copy of a re-stored article was not the only one kept")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Benchmark the full-text search index on a synthetic corpus.
+Indexes --articles generated articles (Zipf-distributed vocabulary, three
+sources, a year of scraped_at dates), then times rare, common, multi-word,
+prefix and filtered queries (warm cache) and reports the index size.
+Also checks diacritic folding, field weighting, filters and replacement of
+a re-indexed article.
+
+Fails if the median of any query exceeds --max-ms.
+
+Usage: python benchmarks/bench_search_index.py [--articles 200000] [--repeat 20] [--max-ms 250]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from itertools import accumulate
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Article
+from scraper_config import ScraperConfig
+from search_index import SearchIndex
+from stub_sites import FILLER_WORDS
+
+SOURCES = ('gov', 'mai', 'ms')
+CATEGORIES = list(ScraperConfig.CATEGORIES)
+START = datetime(2024, 1, 1)
+
+
+def vocabulary(size: int) -> list:
+    """Real words first (the most frequent), then made-up ones for the long tail."""
+    words = list(dict.fromkeys(
+        FILLER_WORDS + [keyword for category in ScraperConfig.CATEGORIES.values() for keyword in category['keywords']]
+    ))
+    rng = random.Random(7)
+    syllables = ['ba', 'ce', 'di', 'fo', 'gu', 'la', 'me', 'ni', 'po', 'ru', 'sa', 'te', 'vi', 'zo', 'tru', 'str']
+    while len(words) < size:
+        words.append(''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) + str(len(words)))
+    return words
+
+
+class CorpusGenerator:
+    def __init__(self, vocabulary_size: int = 50000, seed: int = 1):
+        self.words = vocabulary(vocabulary_size)
+        weights = [1 / rank for rank in range(1, len(self.words) + 1)]
+        self.cum_weights = list(accumulate(weights))
+        self.rng = random.Random(seed)
+
+    def text(self, count: int) -> str:
+        return ' '.join(self.rng.choices(self.words, cum_weights=self.cum_weights, k=count))
+
+    def article(self, number: int) -> Article:
+        source = SOURCES[number % 3]
+        return Article(
+            id=f"{source}_{number:012x}",
+            date="",
+            title=self.text(8),
+            original_content=self.text(250),
+            simplified_content="",
+            detailed_points=[self.text(12) for _ in range(3)],
+            category=self.rng.choice(CATEGORIES),
+            category_emoji="",
+            category_name="",
+            url=f"https://example.ro/{source}/{number}",
+            scraped_at=(START + timedelta(minutes=self.rng.randrange(365 * 24 * 60))).isoformat(),
+            source=source
+        )
+
+
+def timed(index: SearchIndex, repeat: int, *args, **kwargs) -> tuple:
+    index.search(*args, **kwargs)  # Warm up
+    times, hits = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        hits = index.search(*args, **kwargs)
+        times.append((time.perf_counter() - started) * 1000)
+    times.sort()
+    return statistics.median(times), times[max(0, int(len(times) * 0.95) - 1)], hits
+
+
+def check_behaviour(failures: list):
+    index = SearchIndex(':memory:')
+    base = dict(date="", simplified_content="", category_emoji="", category_name="",
+                scraped_at="2025-01-01T09:00:00", detailed_points=[])
+    index.add_many([
+        Article(id='a', title='Școala din sat', original_content='Elevii se întorc la școală.', url='u/a',
+                category='education', source='gov', **base),
+        Article(id='b', title='Anunț', original_content='Şcoala cu cedilă a fost renovată.', url='u/b',
+                category='education', source='ms', **base),
+        Article(id='c', title='Spitalul județean', original_content='Medicii din spital.', url='u/c',
+                category='health', source='ms', **base),
+    ])
+    for query in ('scoala', 'școala', 'ŞCOALA', 'şcoala'):
+        if {hit.article_id for hit in index.search(query)} != {'a', 'b'}:
+            failures.append(f"diacritic folding: {query!r} did not find both spellings")
+    if [hit.article_id for hit in index.search('scoala')][:1] != ['a']:
+        failures.append("a title match did not rank first")
+    if [hit.article_id for hit in index.search('scoala', source='ms')] != ['b']:
+        failures.append("source filter")
+    if [hit.article_id for hit in index.search('spit*')] != ['c']:
+        failures.append("prefix query")
+    if index.search('judetean medicii') == [] or index.search('judetean elevii') != []:
+        failures.append("every query word must match")
+    index.add_many([Article(id='c', title='Dispensar', original_content='Medicii din dispensar.', url='u/c',
+                            category='health', source='ms', **base)])
+    if index.search('spitalul') or [hit.article_id for hit in index.search('dispensar')] != ['c']:
+        failures.append("re-indexing an article did not replace it")
+    index.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--max-ms', type=float, default=250, help='slowest acceptable median query time')
+    args = parser.parse_args()
+
+    failures = []
+    check_behaviour(failures)
+
+    workdir = tempfile.mkdtemp(prefix='bench_search_')
+    path = os.path.join(workdir, 'search_index.db')
+    index = SearchIndex(path)
+    generator = CorpusGenerator()
+    started = time.perf_counter()
+    batch = []
+    for number in range(args.articles):
+        batch.append(generator.article(number))
+        if len(batch) == 5000:
+            index.add_many(batch)
+            batch = []
+    index.add_many(batch)
+    ingest = time.perf_counter() - started
+    started = time.perf_counter()
+    index.optimize()
+    optimize = time.perf_counter() - started
+    size = sum(os.path.getsize(os.path.join(workdir, name)) for name in os.listdir(workdir))
+
+    print(f"{args.articles} articles indexed in {ingest:.1f} s ({args.articles / ingest:.0f}/s), "
+          f"optimize {optimize:.1f} s")
+    print(f"index size: {size / 1024 / 1024:.1f} MiB ({size / args.articles:.0f} bytes per article)")
+
+    words = generator.words
+    queries = [
+        ('rare word', (words[20000],), {}),
+        ('mid word', (words[2000],), {}),
+        ('common word', (words[5],), {}),
+        ('two common words', (f"{words[3]} {words[8]}",), {}),
+        ('common + rare', (f"{words[3]} {words[20000]}",), {}),
+        ('prefix', (words[300][:4] + '*',), {}),
+        ('common, filtered', (words[5],), {'source': 'ms', 'category': CATEGORIES[0]}),
+        ('common, one month', (words[5],), {'since': '2024-03-01', 'until': '2024-04-01'}),
+    ]
+    print(f"{'query':<20} {'p50 ms':>8} {'p95 ms':>8}  hits")
+    slowest = 0.0
+    for label, query_args, filters in queries:
+        p50, p95, hits = timed(index, args.repeat, *query_args, **filters)
+        slowest = max(slowest, p50)
+        print(f"{label:<20} {p50:>8.2f} {p95:>8.2f}  {len(hits)}")
+        if not hits:
+            failures.append(f"{label}: no results")
+        if 'source' in filters and any(hit.source != filters['source'] or hit.category != filters['category']
+                                       for hit in hits):
+            failures.append(f"{label}: filter not applied")
+    index.close()
+    shutil.rmtree(workdir, ignore_errors=True)
+    if slowest > args.max_ms:
+        failures.append(f"slowest query took {slowest:.0f} ms, more than {args.max_ms:.0f} ms")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
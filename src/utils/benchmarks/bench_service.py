@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Benchmark the service mode against local stub sites.
+Measures how long `import service` takes next to `import scraper` (in
+fresh interpreters) and checks that it loads none of the heavy modules,
+then runs a ScraperService on a free port in a temporary directory and
+reports the time to the first /health answer, the time until it is
+ready, and /articles latency from the hot set.
+
+Checks that the first scheduled run fills the hot set, that filters and
+bad parameters are handled, that POST /run triggers a run, that /metrics
+serves Prometheus text and JSON, and that a stop during a run waits for
+the run to finish and closes the port.
+
+Usage: python benchmarks/bench_service.py [--articles 10] [--latency 0.02] [--requests 500]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+UTILS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, UTILS_DIR)
+
+from stub_sites import start_stub_sites, stop_stub_sites
+
+HEAVY_MODULES = ('scraper', 'requests', 'bs4', 'lxml', 'selectolax', 'article_store', 'sqlite3')
+
+
+def import_seconds(module: str) -> tuple:
+    """Best of three fresh-interpreter imports; returns (seconds, heavy modules loaded)."""
+    code = (
+        "import sys, time\n"
+        "started = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - started\n"
+        f"print(elapsed, ','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))\n"
+    )
+    workdir = tempfile.mkdtemp(prefix='bench_service_import_')
+    try:
+        runs = []
+        for _ in range(3):
+            output = subprocess.run([sys.executable, '-c', code], cwd=workdir, check=True, capture_output=True,
+                                    env={**os.environ, 'PYTHONPATH': UTILS_DIR}, text=True).stdout.split()
+            runs.append((float(output[0]), output[1] if len(output) > 1 else ''))
+        return min(runs)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def request(port: int, path: str, method: str = 'GET') -> tuple:
+    """(status, content type, body) of one request to the service."""
+    req = urllib.request.Request(f'http://127.0.0.1:{port}{path}', method=method)
+    try:
+        with urllib.request.urlopen(req, timeout=10) as response:
+            return response.status, response.headers['Content-Type'], response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers['Content-Type'], e.read()
+
+
+def wait_until(condition, timeout: float = 30.0, interval: float = 0.005) -> bool:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if condition():
+                return True
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(interval)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=10, help='articles per stub listing page')
+    parser.add_argument('--latency', type=float, default=0.02, help='seconds added to every stub response')
+    parser.add_argument('--requests', type=int, default=500, help='/articles requests timed')
+    args = parser.parse_args()
+    failures = []
+
+    service_import, loaded = import_seconds('service')
+    scraper_import, _ = import_seconds('scraper')
+    print(f"import service: {service_import * 1000:6.0f} ms   import scraper: {scraper_import * 1000:6.0f} ms")
+    if loaded:
+        failures.append(f"import service loads {loaded}")
+
+    workdir = tempfile.mkdtemp(prefix='bench_service_')
+    os.chdir(workdir)  # every store path in ScraperConfig is relative
+    logging.getLogger().setLevel(logging.ERROR)
+    import service as service_module
+    from scraper_config import ScraperConfig
+
+    servers = start_stub_sites(latency=args.latency, count=args.articles, pages=2)
+    ScraperConfig.SERVICE_SHUTDOWN_TIMEOUT = 30
+    service = service_module.ScraperService(port=0)
+    thread = threading.Thread(target=asyncio.run, args=(service.serve(),), daemon=True)
+    try:
+        started = time.perf_counter()
+        thread.start()
+        wait_until(lambda: service.server is not None and service.port)
+        port = service.port
+        wait_until(lambda: request(port, '/health')[0] in (200, 503), interval=0.001)
+        first_answer = time.perf_counter() - started
+        wait_until(lambda: request(port, '/health')[0] == 200)
+        ready = time.perf_counter() - started
+        print(f"first /health answer: {first_answer * 1000:.0f} ms, ready: {ready * 1000:.0f} ms")
+
+        # The first run checks every source: new sources are due right away
+        if not wait_until(lambda: 'last_run' in json.loads(request(port, '/health')[2]), timeout=60):
+            failures.append("no scheduled run finished")
+        expected = 3 * args.articles
+        status, content_type, body = request(port, f'/articles?limit={expected + 10}')
+        articles = json.loads(body)
+        if status != 200 or not content_type.startswith('application/json') or len(articles) != expected:
+            failures.append(f"/articles returned {status} with {len(articles)} articles, expected {expected}")
+        if [article['scraped_at'] for article in articles] != sorted((a['scraped_at'] for a in articles), reverse=True):
+            failures.append("/articles is not newest first")
+        gov = json.loads(request(port, '/articles?source=gov&limit=500')[2])
+        if len(gov) != args.articles or any(article['source'] != 'gov' for article in gov):
+            failures.append("the source filter is wrong")
+        category = articles[0]['category']
+        in_category = json.loads(request(port, f'/articles?category={category}&limit=500')[2])
+        if len(in_category) != sum(article['category'] == category for article in articles):
+            failures.append("the category filter is wrong")
+        for path, method, want in (('/articles?source=nope', 'GET', 400), ('/articles?limit=x', 'GET', 400),
+                                   ('/run?source=nope', 'POST', 400), ('/run', 'GET', 405), ('/nope', 'GET', 404)):
+            if request(port, path, method)[0] != want:
+                failures.append(f"{method} {path} did not answer {want}")
+
+        timings = []
+        for _ in range(args.requests):
+            request_started = time.perf_counter()
+            request(port, '/articles?source=mai&limit=20')
+            timings.append(time.perf_counter() - request_started)
+        timings.sort()
+        print(f"/articles?source=mai&limit=20: p50 {statistics.median(timings) * 1000:.2f} ms, "
+              f"p99 {timings[int(len(timings) * 0.99) - 1] * 1000:.2f} ms over {args.requests} requests")
+
+        status, content_type, body = request(port, '/metrics')
+        if status != 200 or b'scraper_runs_total' not in body or not content_type.startswith('text/plain'):
+            failures.append("/metrics did not serve Prometheus text")
+        if json.loads(request(port, '/metrics?format=json')[2])['runs'].get('completed', 0) < 1:
+            failures.append("/metrics?format=json shows no completed run")
+
+        # Trigger a run, stop while it is going and check it still finished
+        runs_before = sum(service.scraper.metrics.runs.values())
+        status, _, body = request(port, '/run?source=mai,ms', 'POST')
+        if status != 202 or json.loads(body)['queued'] != ['mai', 'ms']:
+            failures.append(f"POST /run answered {status} {body!r}")
+        if not wait_until(lambda: service.running or sum(service.scraper.metrics.runs.values()) > runs_before):
+            failures.append("the triggered run did not start")
+        in_progress = bool(service.running)
+        stop_started = time.perf_counter()
+        service._loop.call_soon_threadsafe(service.stop)
+        thread.join(timeout=60)
+        stopped = time.perf_counter() - stop_started
+        print(f"stopped {stopped * 1000:.0f} ms after the stop request"
+              f"{' (a run was in progress)' if in_progress else ''}")
+        if thread.is_alive():
+            failures.append("the service did not stop")
+        if sum(service.scraper.metrics.runs.values()) != runs_before + 1:
+            failures.append("the run in progress did not finish before the service stopped")
+        try:
+            request(port, '/health')
+            failures.append("the port is still open after stopping")
+        except urllib.error.URLError:
+            pass
+    finally:
+        stop_stub_sites(servers)
+        os.chdir(UTILS_DIR)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cost of storing one run's worth of new articles as the corpus grows.
+Compares the legacy full-file JSON rewrite with the append-only ArticleStore.
+
+Usage: python benchmarks/bench_storage_ingest.py [--sizes 1000,10000,100000,200000] [--batch 20]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from article_store import ArticleStore
+from models import Article
+
+BODY = (
+    "Guvernul a adoptat o hotărâre privind finanțarea lucrărilor de infrastructură "
+    "pentru drumuri și poduri, cu investiții de 120 milioane lei din bugetul de stat. "
+) * 12
+
+
+def make_article(number: int) -> Article:
+    return Article(
+        id=f"gov_{number:012x}",
+        date="04 Iunie 2025",
+        title=f"Informatie de presa {number}",
+        original_content=BODY,
+        simplified_content=BODY.lower(),
+        detailed_points=["Au hotărât cum să cheltuie banii țării! 💰📊"] * 4,
+        category="budget",
+        category_emoji="💰",
+        category_name="Buget și Finanțe",
+        url=f"https://gov.ro/ro/guvernul/sedinte-guvern/informatie-{number}",
+        scraped_at="2025-06-04T09:00:00",
+        source="gov"
+    )
+
+
+def legacy_save(path: str, new_articles: list):
+    """The previous save path: load everything, prepend, rewrite with indent=2."""
+    existing = []
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            existing = [Article(**item) for item in json.load(f)]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([asdict(a) for a in new_articles + existing], f, ensure_ascii=False, indent=2)
+
+
+def time_batches(save, batch: int, start: int, repeats: int = 3) -> float:
+    timings = []
+    for r in range(repeats):
+        articles = [make_article(start + r * batch + i) for i in range(batch)]
+        started = time.perf_counter()
+        save(articles)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000,200000', help='comma-separated corpus sizes')
+    parser.add_argument('--batch', type=int, default=20, help='new articles per simulated run')
+    parser.add_argument('--legacy-max', type=int, default=10000, help='largest size to time the legacy path at')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    workdir = tempfile.mkdtemp(prefix='bench_store_')
+    legacy_path = os.path.join(workdir, 'scraped_articles.json')
+    store = ArticleStore(os.path.join(workdir, 'article_store'))
+
+    print(f"{'corpus':>10} {'legacy rewrite':>16} {'append-only':>14}")
+    loaded = 0
+    try:
+        for size in sizes:
+            # Grow the store to the target size, and write the legacy file in one go
+            while loaded < size:
+                chunk = [make_article(n) for n in range(loaded, min(size, loaded + 10000))]
+                store.append(chunk)
+                loaded += len(chunk)
+            if size <= args.legacy_max:
+                with open(legacy_path, 'w', encoding='utf-8') as f:
+                    json.dump([asdict(make_article(n)) for n in range(size)], f, ensure_ascii=False, indent=2)
+
+            appended = time_batches(store.append, args.batch, 10 ** 9)
+            legacy = '-'
+            if size <= args.legacy_max:
+                legacy = f"{time_batches(lambda a: legacy_save(legacy_path, a), args.batch, 2 * 10 ** 9) * 1000:.1f} ms"
+            print(f"{size:>10} {legacy:>16} {appended * 1000:>11.2f} ms")
+    finally:
+        store.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
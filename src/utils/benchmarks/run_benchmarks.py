@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Offline microbenchmarks for the scraper hot paths.
+Serves the recorded fixtures in benchmarks/fixtures (plus synthetic large
+listing and article pages) from memory and times each stage on its own:
+listing parse, article extraction, categorization, gov section parsing,
+detailed points, simplification and saving. Results are written as JSON
+and can be compared with a stored baseline; any stage slower than the
+baseline by more than the tolerance makes the run fail.
+
+Each stage is timed over many short runs, every one paired with a run of a
+fixed pure-Python calibration workload, and compared as the median of the
+per-pair ratios: load that comes and goes on the machine slows both halves
+of a pair alike. A stage fails when that ratio grew by more than the
+tolerance, or by three times the stage's own spread if it is noisier. Record a
+fresh baseline (--save-baseline) when moving to a very different machine
+or parser backend.
+
+Usage: python benchmarks/run_benchmarks.py [--output results.json] [--baseline benchmarks/baseline.json]
+                                           [--tolerance 0.3] [--save-baseline] [--only listing]
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import timeit
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(BENCH_DIR, 'fixtures')
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+SOURCES = ('gov', 'mai', 'ms')
+
+# Each timing run lasts about this long; the median of many short runs is steadier than the
+# minimum of a few long ones
+RUN_SECONDS = 0.05
+# A stage's allowed slowdown is at least this many times its own spread
+NOISE_FACTOR = 3
+
+CALIBRATION_TEXT = "guvernul a adoptat o hotărâre privind bugetul pentru spitale și școli " * 200
+CALIBRATION_PATTERN = re.compile(r'\b\w+re\b')
+
+
+class FixtureResponse:
+    def __init__(self, url: str, content: bytes):
+        self.url = url
+        self.content = content
+        self.status_code = 200
+        self.headers: Dict[str, str] = {}
+
+    def raise_for_status(self):
+        pass
+
+
+class FixtureHTTPClient:
+    """Stands in for HTTPClient, answering every URL from recorded pages in memory."""
+
+    def __init__(self):
+        self.pages: Dict[str, bytes] = {}
+        self.requests = 0
+
+    def get(self, url: str, **kwargs) -> FixtureResponse:
+        self.requests += 1
+        # Every response differs so the listing cache never short-circuits the parse
+        return FixtureResponse(url, self.pages[url] + b'<!-- %d -->' % self.requests)
+
+    def stats(self) -> dict:
+        return {'requests': self.requests, 'retries': 0, 'connections_reused': 0, 'connections_opened': 0}
+
+
+def read_fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+
+def calls_per_run(timer: timeit.Timer) -> int:
+    """Calls that make one timing run last about RUN_SECONDS."""
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= RUN_SECONDS:
+            return number
+        number = max(number * 2, int(number * RUN_SECONDS / max(elapsed, 1e-9) * 1.2))
+
+
+def measure(func: Callable, repeat: int, reference: Optional[Tuple[timeit.Timer, int]] = None) -> dict:
+    """Time func over `repeat` short runs; with a reference (timer, calls), each run is paired
+    with a run of the reference and 'relative' is the median of the per-pair ratios."""
+    timer = timeit.Timer(func)
+    number = calls_per_run(timer)
+    runs, ratios = [], []
+    for _ in range(repeat):
+        runs.append(timer.timeit(number) / number * 1000)
+        if reference is not None:
+            reference_timer, reference_number = reference
+            ratios.append(runs[-1] / (reference_timer.timeit(reference_number) / reference_number * 1000))
+    result = {'min_ms': round(min(runs), 4), 'median_ms': round(statistics.median(runs), 4), 'calls': number * repeat}
+    if ratios:
+        quartiles = statistics.quantiles(ratios, n=4)
+        result['relative'] = round(quartiles[1], 4)
+        # Interquartile range as a share of the median: how noisy this stage is
+        result['spread'] = round((quartiles[2] - quartiles[0]) / quartiles[1], 4)
+    return result
+
+
+def calibration():
+    """Fixed workload of the same flavour as the scraper's: string, dict and regex work."""
+    words = CALIBRATION_TEXT.split()
+    counts: Dict[str, int] = {}
+    for word in words:
+        counts[word] = counts.get(word, 0) + 1
+    CALIBRATION_PATTERN.findall(CALIBRATION_TEXT)
+    return sorted(counts.items())
+
+
+def build_stages(scraper_module, workdir: str) -> Tuple[object, Dict[str, Callable]]:
+    from article_store import ArticleStore
+    from scraper_config import ScraperConfig
+    from stub_sites import article_html, listing_html
+
+    scraper = scraper_module.MultiWebsiteScraper()
+    client = FixtureHTTPClient()
+    scraper.http = client
+
+    article_urls = {}
+    for source in SOURCES:
+        news_url = ScraperConfig.WEBSITES[source]['news_url']
+        client.pages[news_url] = read_fixture(f'{source}_listing.html')
+        client.pages[f'{news_url}#large'] = listing_html(source, 1000).encode('utf-8')
+        article_urls[source] = f"{ScraperConfig.WEBSITES[source]['base_url']}/bench/{source}-article"
+        client.pages[article_urls[source]] = read_fixture(f'{source}_article.html')
+        client.pages[article_urls[source] + '-large'] = article_html(source, 1, repeat=500).encode('utf-8')
+
+    stages: Dict[str, Callable] = {}
+
+    def listing(source: str, large: bool) -> Callable:
+        news_url = ScraperConfig.WEBSITES[source]['news_url']
+        page = client.pages[f'{news_url}#large' if large else news_url]
+        client.pages[news_url] = page
+        expected = len(scraper.get_latest_articles(source))
+        if not expected:
+            raise RuntimeError(f"the {source} listing{' (large)' if large else ''} gives no links to time")
+
+        def run():
+            client.pages[news_url] = page
+            # A swallowed error shows up as a different link count
+            if len(scraper.get_latest_articles(source)) != expected:
+                raise RuntimeError(f"{source} listing result changed between runs")
+        return run
+
+    for source in SOURCES:
+        stages[f'listing.{source}'] = listing(source, large=False)
+        stages[f'listing.{source}.large'] = listing(source, large=True)
+
+    # Extraction and the stages that consume its output
+    for source in SOURCES:
+        for suffix, url in (('', article_urls[source]), ('.large', article_urls[source] + '-large')):
+            content, doc = scraper.scrape_article_content(url, source)
+            if not content or doc is None:
+                raise RuntimeError(f"no content extracted from the {source}{suffix} article")
+            category = scraper.categorize_content(content, source)[0]
+            structured = scraper.structured_text(doc, source)
+
+            stages[f'extract.{source}{suffix}'] = lambda url=url, source=source: scraper.scrape_article_content(url, source)
+            stages[f'categorize.{source}{suffix}'] = lambda c=content, s=source: scraper.categorize_content(c, s)
+            stages[f'points.{source}{suffix}'] = (
+                lambda d=doc, s=source: scraper.extract_detailed_points_from_structured_content(d, s)
+            )
+            stages[f'simplify.{source}{suffix}'] = lambda c=content, k=category: scraper.simplify_text_for_kids(c, k)
+            if source == 'gov':
+                stages[f'gov_sections{suffix}'] = lambda t=structured: scraper.parse_government_sections(t)
+
+    # Saving one run's worth of articles to an append-only store
+    from bench_storage_ingest import make_article
+    scraper.store = ArticleStore(os.path.join(workdir, 'article_store'))
+    batch = [make_article(n) for n in range(20)]
+    stages['save_articles.20'] = lambda: scraper.save_articles(batch)
+    return scraper, stages
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Stages whose time relative to the calibration workload regressed beyond their tolerance.
+
+    A stage may be slower by the given tolerance, or by NOISE_FACTOR times its spread
+    (in the baseline or this run, whichever is wider) if it is noisier than that.
+    """
+    regressions = []
+    for name, current in results['stages'].items():
+        previous = baseline.get('stages', {}).get(name)
+        if previous is None or 'relative' not in previous:
+            continue
+        allowed = max(tolerance, NOISE_FACTOR * max(previous['spread'], current['spread']))
+        if current['relative'] > previous['relative'] * (1 + allowed):
+            # Expressed in this run's machine speed
+            expected = previous['relative'] * current['median_ms'] / current['relative']
+            regressions.append((name, expected, current['median_ms'], allowed))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', help='write the results JSON here')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.3, help='allowed slowdown, 0.3 = 30%%')
+    parser.add_argument('--repeat', type=int, default=21, help='timing runs per stage')
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the baseline')
+    parser.add_argument('--only', help='run only stages whose name starts with this prefix')
+    args = parser.parse_args()
+
+    # Importing the scraper creates scraper.log and the default stores in the working directory
+    workdir = tempfile.mkdtemp(prefix='bench_suite_')
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        import scraper as scraper_module
+        from html_document import default_backend
+        logging.getLogger().setLevel(logging.ERROR)
+
+        scraper, stages = build_stages(scraper_module, workdir)
+        reference = timeit.Timer(calibration)
+        reference = (reference, calls_per_run(reference))
+        results = {
+            'meta': {
+                'created': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'html_parser': default_backend(),
+                'calibration_ms': measure(calibration, args.repeat)['median_ms'],
+            },
+            'stages': {},
+        }
+        print(f"calibration {results['meta']['calibration_ms']:.3f} ms")
+        print(f"{'stage':<26} {'min':>10} {'median':>10} {'relative':>9} {'spread':>7}")
+        for name, func in stages.items():
+            if args.only and not name.startswith(args.only):
+                continue
+            result = measure(func, args.repeat, reference)
+            results['stages'][name] = result
+            print(f"{name:<26} {result['min_ms']:>7.3f} ms {result['median_ms']:>7.3f} ms {result['relative']:>9.3f} {result['spread']:>7.0%}")
+        # Let background segment compaction finish before the directory goes away
+        scraper.store.close()
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+        print(f"baseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; record one with --save-baseline")
+        return
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('meta', {}).get('html_parser') != results['meta']['html_parser']:
+        print(f"warning: baseline used the {baseline['meta'].get('html_parser')} parser, "
+              f"this run {results['meta']['html_parser']}")
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        for name, before, after, allowed in regressions:
+            print(f"REGRESSION {name}: expected {before:.3f} ms, took {after:.3f} ms "
+                  f"({after / before - 1:+.0%}, {allowed:.0%} allowed)")
+        sys.exit(1)
+    print(f"OK: no stage slower than baseline by more than {args.tolerance:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Simulate per-source polling against synthetic publish streams.
+GOV publishes in bursts after the Wednesday cabinet meeting, MAI several
+times a day and MS about once a day. Compares the single daily check, a
+fixed hourly poll and AdaptiveScheduler on a simulated clock: fetches made
+and how long new posts wait before a check finds them. Also checks that a
+restart from saved state does not make every source due at once, and
+that failed checks do not count as quiet ones.
+
+Usage: python benchmarks/sim_polling.py [--weeks 8] [--seed 1]
+"""
+
+import argparse
+import bisect
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import AdaptiveScheduler
+from scraper_config import ScraperConfig
+
+HOUR = 3600
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+
+
+def publish_times(source: str, weeks: int, rng: random.Random) -> list:
+    """Synthetic publication timestamps (seconds from a Monday 00:00)."""
+    times = []
+    for week in range(weeks):
+        start = week * WEEK
+        if source == 'gov':
+            # Wednesday meeting ends around 13:00, decisions follow within a few hours
+            meeting_end = start + 2 * DAY + 13 * HOUR
+            times += [meeting_end + rng.uniform(0, 4 * HOUR) for _ in range(rng.randint(5, 12))]
+            times += [start + rng.uniform(0, 5 * DAY) for _ in range(rng.randint(0, 2))]
+        else:
+            per_day = 6 if source == 'mai' else 1.5
+            for day in range(7):
+                count = sum(1 for _ in range(20) if rng.random() < per_day / 20)
+                times += [start + day * DAY + rng.uniform(8 * HOUR, 20 * HOUR) for _ in range(count)]
+    return sorted(times)
+
+
+def simulate(check_times: dict, streams: dict) -> tuple:
+    """Fetch count and detection delays for a fixed list of check times per source."""
+    fetches, delays = 0, []
+    for source, times in check_times.items():
+        fetches += len(times)
+        for published in streams[source]:
+            index = bisect.bisect_left(times, published)
+            if index < len(times):
+                delays.append(times[index] - published)
+    return fetches, delays
+
+
+def daily_checks(weeks: int) -> list:
+    hour, minute = (int(part) for part in ScraperConfig.DAILY_CHECK_TIME.split(':'))
+    return [day * DAY + hour * HOUR + minute * 60 for day in range(weeks * 7 + 1)]
+
+
+def adaptive_checks(sources: list, streams: dict, weeks: int) -> dict:
+    logging.getLogger().setLevel(logging.ERROR)
+    clock = [0.0]
+    scheduler = AdaptiveScheduler(sources, state_file='', clock=lambda: clock[0])
+    seen = {source: 0 for source in sources}
+    checks = {source: [] for source in sources}
+
+    def check(due: list) -> dict:
+        found = {}
+        for source in due:
+            published = bisect.bisect_right(streams[source], clock[0])
+            found[source] = published - seen[source]
+            seen[source] = published
+            checks[source].append(clock[0])
+        return found
+
+    while clock[0] < weeks * WEEK:
+        scheduler.run_once(check)
+        clock[0] += scheduler.seconds_until_next()
+    return checks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--weeks', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    sources = list(ScraperConfig.WEBSITES)
+    rng = random.Random(args.seed)
+    streams = {source: publish_times(source, args.weeks, rng) for source in sources}
+    print(f"posts over {args.weeks} weeks: " + ', '.join(f"{s} {len(t)}" for s, t in streams.items()))
+
+    daily = {source: daily_checks(args.weeks) for source in sources}
+    hourly = {source: [hour * HOUR for hour in range(args.weeks * WEEK // HOUR + 1)] for source in sources}
+    adaptive = adaptive_checks(sources, streams, args.weeks)
+
+    print(f"{'schedule':<10} {'source':<6} {'fetches':>8} {'mean delay':>11} {'p95 delay':>10}")
+    for name, check_times in (('daily', daily), ('hourly', hourly), ('adaptive', adaptive)):
+        for source in sources + ['all']:
+            picked = sources if source == 'all' else [source]
+            fetches, delays = simulate({s: check_times[s] for s in picked}, streams)
+            p95 = statistics.quantiles(delays, n=20)[-1] if len(delays) > 1 else 0
+            print(f"{name:<10} {source:<6} {fetches:>8} {statistics.mean(delays) / HOUR:>9.1f} h {p95 / HOUR:>8.1f} h")
+
+    # Restart: a scheduler built from saved state keeps the same timetable
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, 'state.json')
+        clock = [0.0]
+        first = AdaptiveScheduler(sources, state_file=state_file, clock=lambda: clock[0])
+        first.run_once(lambda due: {source: 0 for source in due})
+        clock[0] += 60
+        restarted = AdaptiveScheduler(sources, state_file=state_file, clock=lambda: clock[0])
+        if restarted.due():
+            print(f"FAIL: restart made {restarted.due()} due again")
+            sys.exit(1)
+        print(f"OK: after a restart the next check is in {restarted.seconds_until_next() / 60:.0f} min, nothing refetched")
+
+    # Outage: failed checks keep the learned rate and interval and retry at the source's minimum
+    clock = [0.0]
+    scheduler = AdaptiveScheduler(sources, state_file='', clock=lambda: clock[0])
+    before = {source: (state.rate, state.interval) for source, state in scheduler.states.items()}
+
+    def outage(due: list) -> dict:
+        raise ConnectionError("network is down")
+
+    for failing_check in (outage, lambda due: dict.fromkeys(due)):
+        clock[0] = max(state.next_run for state in scheduler.states.values())
+        scheduler.run_once(failing_check)
+        after = {source: (state.rate, state.interval) for source, state in scheduler.states.items()}
+        retry_in = {source: state.next_run - clock[0] for source, state in scheduler.states.items()}
+        if after != before or any(retry_in[s] > ScraperConfig.POLL_INTERVALS[s]['min'] for s in sources):
+            print(f"FAIL: a failed check changed the polling: {after} vs {before}, retry in {retry_in}")
+            sys.exit(1)
+    print(f"OK: failed checks keep the intervals and retry in "
+          f"{min(retry_in.values()) / 60:.0f}-{max(retry_in.values()) / 60:.0f} min")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Local stub of an OpenAI-compatible completion server for offline benchmarks.
+Answers /v1/chat/completions and /v1/completions after a configurable
+latency, and returns 429 with Retry-After when more requests are in
+flight than it allows or on every Nth request.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def fake_completion(prompt: str) -> str:
+    """A short 'simplified' answer built from the prompt's article text."""
+    text = prompt.split('Original text:', 1)[-1].split('Simplified version', 1)[0].strip()
+    return f"Pe scurt, pentru copii: {text[:120]} 😊"
+
+
+class StubLLMServer:
+    def __init__(self, latency: float = 0.2, max_in_flight: int = 0, rate_limit_every: int = 0,
+                 retry_after: int = 1):
+        self.latency = latency
+        self.max_in_flight = max_in_flight
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.counts = {'requests': 0, 'prompts': 0, 'rate_limited': 0, 'peak_in_flight': 0}
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}/v1"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, body: dict, headers: dict = None):
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                with stub._lock:
+                    stub.counts['requests'] += 1
+                    stub._in_flight += 1
+                    stub.counts['peak_in_flight'] = max(stub.counts['peak_in_flight'], stub._in_flight)
+                    limited = (
+                        (stub.max_in_flight and stub._in_flight > stub.max_in_flight)
+                        or (stub.rate_limit_every and stub.counts['requests'] % stub.rate_limit_every == 0)
+                    )
+                    if limited:
+                        stub.counts['rate_limited'] += 1
+                try:
+                    if limited:
+                        self._reply(429, {'error': {'message': 'rate limited'}}, {'Retry-After': str(stub.retry_after)})
+                        return
+                    time.sleep(stub.latency)
+                    if self.path.endswith('/chat/completions'):
+                        prompts = [request['messages'][-1]['content']]
+                        choices = [{'index': 0, 'message': {'role': 'assistant', 'content': fake_completion(prompts[0])}}]
+                    else:
+                        prompts = request['prompt'] if isinstance(request['prompt'], list) else [request['prompt']]
+                        choices = [{'index': i, 'text': fake_completion(p)} for i, p in enumerate(prompts)]
+                    with stub._lock:
+                        stub.counts['prompts'] += len(prompts)
+                    self._reply(200, {'choices': choices})
+                finally:
+                    with stub._lock:
+                        stub._in_flight -= 1
+
+        return Handler
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
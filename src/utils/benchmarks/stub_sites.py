@@ -0,0 +1,158 @@
+"""
+Local stub versions of gov.ro, mai.gov.ro and ms.ro for offline benchmarks.
+Each site runs on its own port (so it counts as its own host) and sleeps
+for a configurable latency before answering.
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper_config import ScraperConfig
+
+LISTING_PATHS = {
+    'gov': '/ro/guvernul/sedinte-guvern',
+    'mai': '/category/comunicate-de-presa/',
+    'ms': '/ro/informatii-de-interes-public/noutati/',
+}
+PAGE_SUFFIXES = {'gov': '?page={page}', 'mai': 'page/{page}/', 'ms': 'page/{page}/'}
+ROBOTS_TXT = "User-agent: *\nDisallow: /wp-admin/\n"
+
+GOV_DECISION = (
+    "HOTĂRÂRE DE GUVERN privind declanșarea procedurii de expropriere a imobilelor "
+    "proprietate privată situate pe amplasamentul lucrării de utilitate publică "
+    "Varianta de ocolire a municipiului Botoșani, cu finanțare din bugetul de stat.\n"
+    "NOTĂ privind situația școlilor și a spitalelor din județele afectate de inundații, "
+    "cu măsuri pentru elevi, profesori, medici și pacienți.\n"
+)
+
+
+FILLER_WORDS = (
+    "ministerul anunță măsuri program județ primărie spital școală elevi medici pompieri "
+    "poliția drum lucrări finanțare proiect cetățeni control inspecție echipaje intervenție "
+    "vaccinare campanie buget investiție energie mediu apă pădure sat oraș autostradă pod"
+).split()
+
+
+def unique_paragraph(source: str, number: int, words: int = 80) -> str:
+    """Deterministic filler so every stub article has its own text."""
+    rng = random.Random(f'{source}-{number}')
+    return ' '.join(rng.choice(FILLER_WORDS) for _ in range(words)) + '.'
+
+
+def listing_html(source: str, count: int, page: int = 1) -> str:
+    """Render a listing page in the markup each real site uses."""
+    items = []
+    for i in range((page - 1) * count + 1, page * count + 1):
+        if source == 'gov':
+            items.append(
+                f'<div class="sedinte_lista" id="sed_{i:02d}_Iun">'
+                f'<a href="/ro/guvernul/sedinte-guvern/informatie-{i}">Informaţie de presă {i}</a></div>'
+            )
+        elif source == 'mai':
+            items.append(
+                f'<div class="excerpt-big-article"><h2 class="title-big-article">'
+                f'<a href="/comunicat-{i}/">Comunicat de presă {i}</a></h2></div>'
+            )
+        else:
+            items.append(f'<article><h3><a href="/ro/noutati/stire-{i}/">Știre {i}</a></h3></article>')
+    body = ''.join(items)
+    if source == 'ms':
+        body = f'<div class="news-list">{body}</div>'
+    return f'<html><body><main>{body}</main></body></html>'
+
+
+def article_html(source: str, number: int, repeat: int = 4) -> str:
+    """Render a detail page with content under the site's primary selector."""
+    lines = [f'Comunicat {source.upper()} nr. {number}.', unique_paragraph(source, number)]
+    lines += (GOV_DECISION * repeat).split('\n')
+    paragraphs = ''.join(f'<p>{line}</p>' for line in lines if line)
+    wrapper = {'gov': 'pageDescription', 'mai': 'entry-content', 'ms': 'content'}[source]
+    # Only MS pages carry a publication date, as a <time> element
+    dated = f'<time datetime="{article_date(number)}">{article_date(number)}</time>' if source == 'ms' else ''
+    return (
+        f'<html><head><title>Articol {number}</title></head><body>'
+        f'<h1>Articol {number}</h1>{dated}<div class="{wrapper}">{paragraphs}</div></body></html>'
+    )
+
+
+def article_date(number: int) -> str:
+    """ISO publication date of stub article `number`."""
+    return f"2024-{number % 12 + 1:02d}-{number % 28 + 1:02d}"
+
+
+def make_handler(source: str, latency: float, count: int, pages: int, clamp: bool = False):
+    page_paths = {LISTING_PATHS[source]: 1}
+    page_paths.update({LISTING_PATHS[source] + PAGE_SUFFIXES[source].format(page=page): page
+                       for page in range(2, pages + 100)})
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            time.sleep(latency)
+            status, content_type = 200, 'text/html; charset=utf-8'
+            if self.path == '/robots.txt':
+                body, content_type = ROBOTS_TXT, 'text/plain'
+            elif self.path in page_paths:
+                page = page_paths[self.path]
+                if clamp:
+                    page = min(page, pages)
+                body = listing_html(source, count, page) if page <= pages else '<html><body>Not found</body></html>'
+                status = 200 if page <= pages else 404
+            else:
+                digits = ''.join(ch for ch in self.path if ch.isdigit()) or '0'
+                body = article_html(source, int(digits))
+            payload = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients killed mid-request are expected (bench_backfill does it on purpose)
+        pass
+
+
+def start_stub_sites(latency: float = 0.2, count: int = 10, pages: int = 1,
+                     clamp: bool = False) -> Dict[str, StubServer]:
+    """Start one stub server per source and point ScraperConfig at them.
+
+    Listings have `pages` pages of `count` articles; the pages after the last
+    are 404s, or with clamp repeat the last page, as some sites do.
+    """
+    # The stubs are local: benchmarks measure the pipeline, not the per-host politeness limits
+    ScraperConfig.RATE_LIMIT_MAX_PER_SECOND = ScraperConfig.RATE_LIMIT_INITIAL_PER_SECOND = 1000.0
+    servers = {}
+    for source in ('gov', 'mai', 'ms'):
+        server = StubServer(('127.0.0.1', 0), make_handler(source, latency, count, pages, clamp))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers[source] = server
+
+        base_url = f'http://127.0.0.1:{server.server_address[1]}'
+        ScraperConfig.WEBSITES[source]['base_url'] = base_url
+        ScraperConfig.WEBSITES[source]['news_url'] = base_url + LISTING_PATHS[source]
+        ScraperConfig.WEBSITES[source]['page_url'] = base_url + LISTING_PATHS[source] + PAGE_SUFFIXES[source]
+    return servers
+
+
+def stop_stub_sites(servers: Dict[str, StubServer]):
+    for server in servers.values():
+        server.shutdown()
+        server.server_close()
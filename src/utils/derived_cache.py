@@ -0,0 +1,138 @@
+"""
+Content-addressed cache for derived article data.
+Each stage (category, detailed points, simplified text, ...) is registered
+with the config sections it depends on. Entries are keyed by a hash of the
+stage, the hash of those sections and the input text, so changing a table
+invalidates exactly the stages that use it. The SQLite file is kept under
+a size budget by evicting the least recently used entries.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+
+from scraper_config import ScraperConfig
+
+
+def config_version(*sections: Any) -> str:
+    """Stable hash of config values (dicts, lists, sets, strings, numbers)."""
+    payload = json.dumps(
+        [ScraperConfig.DERIVED_CACHE_VERSION, *sections],
+        sort_keys=True, ensure_ascii=False, default=lambda value: sorted(value, key=str)
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class DerivedCache:
+    """SQLite cache of JSON values keyed by (stage, config version, input text)."""
+
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.path = path or ScraperConfig.DERIVED_CACHE_FILE
+        self.max_bytes = max_bytes if max_bytes is not None else ScraperConfig.DERIVED_CACHE_MAX_BYTES
+        self.versions: Dict[str, str] = {}
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS derived (
+                key TEXT PRIMARY KEY,
+                stage TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_derived_last_used ON derived(last_used)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS stage_versions (stage TEXT PRIMARY KEY, version TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self.total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM derived").fetchone()[0]
+
+    def register_stage(self, stage: str, *sections: Any):
+        """Declare a stage and the config it depends on; drops its entries if that config changed."""
+        version = config_version(*sections)
+        self.versions[stage] = version
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM stage_versions WHERE stage = ?", (stage,)).fetchone()
+            if row is not None and row[0] == version:
+                return
+            freed = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM derived WHERE stage = ?", (stage,)
+            ).fetchone()[0]
+            self._conn.execute("DELETE FROM derived WHERE stage = ?", (stage,))
+            self._conn.execute("INSERT OR REPLACE INTO stage_versions (stage, version) VALUES (?, ?)", (stage, version))
+            self._conn.commit()
+            self.total_bytes -= freed
+
+    def _key(self, stage: str, content: str) -> str:
+        digest = hashlib.sha256(f"{stage}\0{self.versions[stage]}\0".encode('utf-8'))
+        digest.update(content.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, stage: str, content: str) -> Optional[Any]:
+        """Cached value for this stage and input, or None."""
+        key = self._key(stage, content)
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM derived WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses[stage] += 1
+                return None
+            self._conn.execute("UPDATE derived SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits[stage] += 1
+        return json.loads(row[0])
+
+    def put(self, stage: str, content: str, value: Any):
+        """Store a JSON-serializable value, evicting old entries past the size budget."""
+        key = self._key(stage, content)
+        payload = json.dumps(value, ensure_ascii=False)
+        size = len(key) + len(payload.encode('utf-8'))
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM derived WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO derived (key, stage, value, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, stage, payload, size, time.time())
+            )
+            self.total_bytes += size - (previous[0] if previous else 0)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        # Evict down to 90% of the budget so a full cache does not evict on every put
+        target = self.max_bytes * 0.9
+        rows = self._conn.execute("SELECT key, size FROM derived ORDER BY last_used")
+        doomed = []
+        for key, size in rows:
+            if self.total_bytes <= target:
+                break
+            doomed.append((key,))
+            self.total_bytes -= size
+        self._conn.executemany("DELETE FROM derived WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+
+    def get_or_compute(self, stage: str, content: str, compute: Callable[[], Any]) -> Any:
+        value = self.get(stage, content)
+        if value is None:
+            value = compute()
+            self.put(stage, content, value)
+        return value
+
+    def report(self) -> str:
+        stages = sorted(set(self.hits) | set(self.misses))
+        parts = [f"{stage} {self.hits[stage]} hits / {self.misses[stage]} misses" for stage in stages]
+        return f"{', '.join(parts) or 'unused'}; {self.total_bytes / 1024:.0f} KiB, {self.evictions} evicted"
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
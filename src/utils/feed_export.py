@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Static JSON feed of the stored articles, for the dashboard and CDNs.
+Articles are split into shards by source, category and month (of
+scraped_at), each a JSON array, newest first, with gzip and brotli copies
+next to it for servers that send precompressed files (nginx gzip_static /
+brotli_static, most CDNs). A shard's file name carries a hash of its
+content, so a published file never changes and can be cached for good;
+manifest.json lists the current file of every shard with its hash,
+article count and sizes, and is the only file clients must revalidate.
+
+The scraper merges each saved batch into the shards it touches and leaves
+every other shard alone; an article saved again into another month or
+category is also removed from the shard it was in. A replaced shard file
+is kept for FEED_RETAIN_SECONDS so clients holding the previous manifest
+can still load it.
+
+Usage: python feed_export.py rebuild
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from article_store import article_to_record
+from models import Article
+from scraper_config import ScraperConfig
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+HASH_LENGTH = 12  # Hex digits of the SHA-256 used in shard file names
+ENCODING_SUFFIXES = {'gzip': '.gz', 'br': '.br'}
+
+
+def encode_record(record: dict) -> bytes:
+    # The article store's serialization, so stored lines can be copied as they are
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def shard_key(record: dict) -> str:
+    """'source/category/YYYY-MM' for a stored record."""
+    month = record.get('scraped_at', '')[:7]
+    if len(month) != 7:
+        month = 'undated'
+    return f"{record.get('source') or 'unknown'}/{record.get('category') or 'general'}/{month}"
+
+
+def write_atomic(path: str, data: bytes):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def available_encoders() -> Dict[str, Callable[[bytes], bytes]]:
+    """Compressors for FEED_COMPRESSIONS that can run here."""
+    encoders = {}
+    for name in ScraperConfig.FEED_COMPRESSIONS:
+        if name == 'gzip':
+            level = ScraperConfig.FEED_GZIP_LEVEL
+            # mtime=0 keeps the output identical for identical shards
+            encoders[name] = lambda data: gzip.compress(data, compresslevel=level, mtime=0)
+        elif name == 'br':
+            try:
+                import brotli
+            except ImportError:
+                logging.warning("brotli is not installed; the feed is written without .br copies")
+                continue
+            quality = ScraperConfig.FEED_BROTLI_QUALITY
+            encoders[name] = lambda data: brotli.compress(data, quality=quality)
+        else:
+            logging.warning(f"Unknown feed compression {name!r} ignored")
+    return encoders
+
+
+class FeedExporter:
+    """Writes and incrementally updates the sharded JSON feed in FEED_DIR."""
+
+    def __init__(self, feed_dir: Optional[str] = None):
+        self.feed_dir = feed_dir or ScraperConfig.FEED_DIR
+        self.manifest_path = os.path.join(self.feed_dir, MANIFEST_NAME)
+        self.encoders = available_encoders()
+        self.shards: Dict[str, dict] = {}
+        self._locations: Optional[Dict[str, str]] = None  # Article ID -> shard key, read on first update
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'rb') as f:
+                self.shards = json.loads(f.read()).get('shards', {})
+
+    def exists(self) -> bool:
+        return os.path.exists(self.manifest_path)
+
+    def read_shard(self, key: str) -> List[dict]:
+        entry = self.shards.get(key)
+        if entry is None:
+            return []
+        with open(os.path.join(self.feed_dir, entry['path']), 'rb') as f:
+            return json.loads(f.read())
+
+    def locations(self) -> Dict[str, str]:
+        """Shard key of every exported article ID; reads every shard once per process."""
+        if self._locations is None:
+            self._locations = {record['id']: key for key in self.shards for record in self.read_shard(key)}
+        return self._locations
+
+    def update(self, articles: Iterable[Article]) -> List[str]:
+        """Merge articles into their shards, replacing same-ID ones; returns the rewritten shard keys.
+
+        An article whose shard key changed (a re-save with a later
+        scraped_at month, or a new category) is removed from its old
+        shard, and a shard left empty is dropped.
+        """
+        locations = self.locations()
+        groups = defaultdict(list)
+        moved = defaultdict(set)
+        for article in articles:
+            record = article_to_record(article)
+            key = shard_key(record)
+            groups[key].append(record)
+            previous = locations.get(record['id'])
+            if previous is not None and previous != key:
+                moved[previous].add(record['id'])
+            locations[record['id']] = key
+
+        changed = []
+        gone = []
+        for key in [*groups, *(key for key in moved if key not in groups)]:
+            merged = {record['id']: record for record in self.read_shard(key) if record['id'] not in moved[key]}
+            merged.update((record['id'], record) for record in groups[key])
+            if not merged:
+                self.retire(self.shards.pop(key))
+                gone.append(key)
+                changed.append(key)
+                continue
+            entries = [(record.get('scraped_at', ''), encode_record(record)) for record in merged.values()]
+            if self.write_shard(key, entries):
+                changed.append(key)
+        if changed:
+            self.write_manifest()
+            self.remove_stale(gone)
+        return changed
+
+    def rebuild(self, lines: Iterable[bytes]) -> int:
+        """Rewrite the feed from stored record lines, newest first; the first copy of an ID wins.
+
+        Shards whose content did not change keep their file. Holds the
+        stored records in memory while grouping them.
+        """
+        groups = defaultdict(list)
+        locations = {}
+        for line in lines:
+            record = json.loads(line)
+            if record['id'] in locations:
+                continue
+            key = shard_key(record)
+            locations[record['id']] = key
+            groups[key].append((record.get('scraped_at', ''), bytes(line)))
+
+        self._locations = locations
+        for key, entries in groups.items():
+            self.write_shard(key, entries)
+        gone = set(self.shards) - set(groups)
+        for key in gone:
+            self.retire(self.shards.pop(key))
+        self.write_manifest()
+        self.remove_stale(gone)
+        return len(locations)
+
+    def write_shard(self, key: str, entries: List[Tuple[str, bytes]]) -> bool:
+        """Write (scraped_at, record) entries as the shard's new file; False when nothing changed."""
+        entries.sort(key=lambda entry: entry[0], reverse=True)
+        body = b'[\n' + b',\n'.join(line for _, line in entries) + b'\n]\n'
+        digest = hashlib.sha256(body).hexdigest()
+        previous = self.shards.get(key)
+        if previous is not None and previous['sha256'] == digest:
+            return False
+
+        path = f"{key}.{digest[:HASH_LENGTH]}.json"
+        full_path = os.path.join(self.feed_dir, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        write_atomic(full_path, body)
+        sizes = {}
+        for name, encode in self.encoders.items():
+            compressed = encode(body)
+            write_atomic(full_path + ENCODING_SUFFIXES[name], compressed)
+            sizes[name] = len(compressed)
+
+        self.shards[key] = {
+            'path': path,
+            'sha256': digest,
+            'articles': len(entries),
+            'newest': entries[0][0] if entries else '',
+            'bytes': len(body),
+            'encodings': sizes,
+        }
+        if previous is not None:
+            self.retire(previous)
+        return True
+
+    def retire(self, entry: dict):
+        """Mark a replaced shard's files with the replacement time; remove_stale deletes them later."""
+        now = time.time()
+        for suffix in ('', *ENCODING_SUFFIXES.values()):
+            try:
+                os.utime(os.path.join(self.feed_dir, entry['path'] + suffix), (now, now))
+            except FileNotFoundError:
+                pass
+
+    def write_manifest(self):
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'generated_at': datetime.now(timezone.utc).isoformat(),
+            'articles': sum(entry['articles'] for entry in self.shards.values()),
+            'shards': dict(sorted(self.shards.items())),
+        }
+        body = json.dumps(manifest, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        os.makedirs(self.feed_dir, exist_ok=True)
+        for name, encode in self.encoders.items():
+            write_atomic(self.manifest_path + ENCODING_SUFFIXES[name], encode(body))
+        write_atomic(self.manifest_path, body)
+
+    def remove_stale(self, removed_keys: Iterable[str] = ()):
+        """Delete shard files that were replaced more than FEED_RETAIN_SECONDS ago."""
+        current = {entry['path'].rsplit('/', 1)[1] for entry in self.shards.values()}
+        cutoff = time.time() - ScraperConfig.FEED_RETAIN_SECONDS
+        for directory in {key.rsplit('/', 1)[0] for key in (*self.shards, *removed_keys)}:
+            full_directory = os.path.join(self.feed_dir, directory)
+            if not os.path.isdir(full_directory):
+                continue
+            for name in os.listdir(full_directory):
+                base = name
+                for suffix in ENCODING_SUFFIXES.values():
+                    if base.endswith(suffix):
+                        base = base[:-len(suffix)]
+                if base in current or not base.endswith('.json'):
+                    continue
+                path = os.path.join(full_directory, name)
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the static JSON feed")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('rebuild', help="rewrite every shard from the article store")
+    parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    from article_store import ArticleStore
+    feed = FeedExporter()
+    started = time.perf_counter()
+    count = feed.rebuild(ArticleStore().iter_lines())
+    logging.info(f"Wrote {count} articles in {len(feed.shards)} shards to {feed.feed_dir} "
+                 f"in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
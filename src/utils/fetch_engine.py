@@ -0,0 +1,79 @@
+"""
+Concurrent fetch engine for the multi-website scraper.
+Runs blocking fetch jobs on a thread pool while capping both the total
+number of in-flight requests and the number of requests per host.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Optional
+from urllib.parse import urlparse
+
+from scraper_config import ScraperConfig
+
+
+def host_of(url: str) -> str:
+    """Return the lowercase host (netloc) part of a URL."""
+    return urlparse(url).netloc.lower()
+
+
+class ConcurrentFetcher:
+    """Thread-pool fetcher with a global limit and a per-host limit.
+
+    Jobs are queued per host and only handed to the pool while the host
+    has a free slot, so a site with many pages never ties up workers that
+    other hosts could use.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_per_host: Optional[int] = None):
+        self.max_workers = max_workers or ScraperConfig.MAX_CONCURRENT_REQUESTS
+        self.max_per_host = max_per_host or ScraperConfig.MAX_REQUESTS_PER_HOST
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='fetch')
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Deque[tuple]] = {}
+        self._active: Dict[str, int] = {}
+
+    def submit(self, url: str, func: Callable, *args, **kwargs) -> Future:
+        """Schedule func(*args, **kwargs) as a request against url's host."""
+        host = host_of(url)
+        future: Future = Future()
+        with self._lock:
+            self._pending.setdefault(host, deque()).append((future, func, args, kwargs))
+        self._dispatch(host)
+        return future
+
+    def _dispatch(self, host: str):
+        """Hand queued jobs for host to the pool while it has free slots."""
+        while True:
+            with self._lock:
+                queue = self._pending.get(host)
+                if not queue or self._active.get(host, 0) >= self.max_per_host:
+                    return
+                job = queue.popleft()
+                self._active[host] = self._active.get(host, 0) + 1
+            self._executor.submit(self._run, host, *job)
+
+    def _run(self, host: str, future: Future, func: Callable, args: tuple, kwargs: dict):
+        try:
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = func(*args, **kwargs)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+        finally:
+            with self._lock:
+                self._active[host] -= 1
+            self._dispatch(host)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker pool."""
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
@@ -0,0 +1,253 @@
+"""
+Parse-once HTML document model with pluggable parser backends.
+A page is parsed once into an HTMLDocument that serves content selection,
+the paragraph fallback and structured section text. Backends:
+selectolax (fastest), lxml (fast, needs cssselect) and BeautifulSoup's
+pure-Python html.parser as the always-available fallback.
+"""
+
+import re
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+from scraper_config import ScraperConfig
+
+# Text inside these elements is never page content (BeautifulSoup's get_text skips them too)
+NON_CONTENT_TAGS = frozenset(('script', 'style', 'template', 'noscript'))
+
+XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+def decode_html(content: bytes) -> str:
+    """Decode page bytes: UTF-8 first, then the declared charset, then cp1250."""
+    try:
+        return content.decode('utf-8')
+    except UnicodeDecodeError:
+        pass
+    match = META_CHARSET.search(content[:4096])
+    for encoding in ((match.group(1).decode('ascii'),) if match else ()) + ('cp1250',):
+        try:
+            return content.decode(encoding, errors='replace')
+        except LookupError:
+            continue
+    return content.decode('utf-8', errors='replace')
+
+
+def join_strings(strings: Iterator[str], separator: str, strip: bool) -> str:
+    """Join text nodes the way BeautifulSoup's get_text(separator, strip) does."""
+    if strip:
+        return separator.join(s for s in (s.strip() for s in strings) if s)
+    return separator.join(strings)
+
+
+class HTMLNode(ABC):
+    """Backend-neutral element interface."""
+
+    @abstractmethod
+    def select(self, css: str) -> List['HTMLNode']:
+        ...
+
+    def select_one(self, css: str) -> Optional['HTMLNode']:
+        found = self.select(css)
+        return found[0] if found else None
+
+    @abstractmethod
+    def get(self, attribute: str, default=None):
+        ...
+
+    @abstractmethod
+    def text(self, separator: str = '', strip: bool = False) -> str:
+        ...
+
+
+# -- BeautifulSoup (pure Python) ----------------------------------------------
+
+class SoupNode(HTMLNode):
+    __slots__ = ('tag',)
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    def select(self, css: str) -> List[HTMLNode]:
+        return [SoupNode(tag) for tag in self.tag.select(css)]
+
+    def select_one(self, css: str) -> Optional[HTMLNode]:
+        tag = self.tag.select_one(css)
+        return SoupNode(tag) if tag is not None else None
+
+    def get(self, attribute: str, default=None):
+        return self.tag.get(attribute, default)
+
+    def text(self, separator: str = '', strip: bool = False) -> str:
+        return self.tag.get_text(separator=separator, strip=strip)
+
+
+def parse_with_bs4(content: bytes) -> HTMLNode:
+    from bs4 import BeautifulSoup
+    return SoupNode(BeautifulSoup(content, 'html.parser'))
+
+
+# -- lxml ---------------------------------------------------------------------
+
+_lxml_selectors: Dict[str, Callable] = {}
+
+
+def _lxml_selector(css: str) -> Callable:
+    selector = _lxml_selectors.get(css)
+    if selector is None:
+        from lxml import etree
+        from cssselect import HTMLTranslator
+        # descendant:: (not descendant-or-self::) matches BeautifulSoup's select()
+        selector = etree.XPath(HTMLTranslator().css_to_xpath(css, prefix='descendant::'))
+        _lxml_selectors[css] = selector
+    return selector
+
+
+class LxmlNode(HTMLNode):
+    __slots__ = ('element',)
+
+    def __init__(self, element):
+        self.element = element
+
+    def select(self, css: str) -> List[HTMLNode]:
+        return [LxmlNode(element) for element in _lxml_selector(css)(self.element)]
+
+    def get(self, attribute: str, default=None):
+        return self.element.get(attribute, default)
+
+    def _strings(self, element) -> Iterator[str]:
+        if element.text:
+            yield element.text
+        for child in element:
+            # Comments and processing instructions have a non-string tag
+            if isinstance(child.tag, str) and child.tag not in NON_CONTENT_TAGS:
+                yield from self._strings(child)
+            if child.tail:
+                yield child.tail
+
+    def text(self, separator: str = '', strip: bool = False) -> str:
+        return join_strings(self._strings(self.element), separator, strip)
+
+
+def parse_with_lxml(content: bytes) -> HTMLNode:
+    import lxml.html
+    text = XML_DECLARATION.sub('', decode_html(content))
+    return LxmlNode(lxml.html.document_fromstring(text or '<html></html>'))
+
+
+# -- selectolax (lexbor) ------------------------------------------------------
+
+class SelectolaxNode(HTMLNode):
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+    def select(self, css: str) -> List[HTMLNode]:
+        return [SelectolaxNode(node) for node in self.node.css(css)]
+
+    def select_one(self, css: str) -> Optional[HTMLNode]:
+        node = self.node.css_first(css)
+        return SelectolaxNode(node) if node is not None else None
+
+    def get(self, attribute: str, default=None):
+        value = self.node.attributes.get(attribute, default)
+        return default if value is None else value
+
+    def _strings(self, node) -> Iterator[str]:
+        for child in node.iter(include_text=True):
+            if child.tag == '-text':
+                yield child.text_content
+            elif not child.tag.startswith('-') and child.tag not in NON_CONTENT_TAGS:
+                yield from self._strings(child)
+
+    def text(self, separator: str = '', strip: bool = False) -> str:
+        return join_strings(self._strings(self.node), separator, strip)
+
+
+def parse_with_selectolax(content: bytes) -> HTMLNode:
+    from selectolax.lexbor import LexborHTMLParser
+    tree = LexborHTMLParser(decode_html(content))
+    return SelectolaxNode(tree.root if tree.root is not None else LexborHTMLParser('<html></html>').root)
+
+
+BACKENDS: Dict[str, Callable[[bytes], HTMLNode]] = {
+    'selectolax': parse_with_selectolax,
+    'lxml': parse_with_lxml,
+    'bs4': parse_with_bs4,
+}
+BACKEND_REQUIREMENTS = {
+    'selectolax': ('selectolax',),
+    'lxml': ('lxml', 'cssselect'),
+    'bs4': ('bs4',),
+}
+
+
+def backend_available(name: str) -> bool:
+    import importlib.util
+    return all(importlib.util.find_spec(module) is not None for module in BACKEND_REQUIREMENTS[name])
+
+
+_resolved_backend: Optional[str] = None
+
+
+def default_backend() -> str:
+    """Backend named in ScraperConfig.HTML_PARSER, or the fastest installed one for 'auto'."""
+    global _resolved_backend
+    if _resolved_backend is None:
+        configured = ScraperConfig.HTML_PARSER
+        candidates = list(BACKENDS) if configured == 'auto' else [configured, 'bs4']
+        _resolved_backend = next(name for name in candidates if backend_available(name))
+    return _resolved_backend
+
+
+class HTMLDocument:
+    """A page parsed once, with cached lookups shared by every extraction step."""
+
+    def __init__(self, root: HTMLNode, backend: str):
+        self.root = root
+        self.backend = backend
+        self._select_one_cache: Dict[str, Optional[HTMLNode]] = {}
+        self._text_cache: Dict[tuple, str] = {}
+
+    def select(self, css: str) -> List[HTMLNode]:
+        return self.root.select(css)
+
+    def select_one(self, css: str) -> Optional[HTMLNode]:
+        if css not in self._select_one_cache:
+            self._select_one_cache[css] = self.root.select_one(css)
+        return self._select_one_cache[css]
+
+    def first_match(self, selectors: Sequence[str]) -> Optional[HTMLNode]:
+        """Return the node for the first selector that matches anything."""
+        for selector in selectors:
+            node = self.select_one(selector)
+            if node is not None:
+                return node
+        return None
+
+    def paragraphs(self) -> List[str]:
+        """Non-empty stripped text of every <p> element."""
+        return [text for text in (p.text(strip=True) for p in self.select('p')) if text]
+
+    def content_text(self, selectors: Sequence[str]) -> str:
+        """Main content text: first matching selector, else all paragraphs."""
+        node = self.first_match(selectors)
+        content = node.text(separator=' ', strip=True) if node is not None else ''
+        if not content:
+            content = ' '.join(self.paragraphs())
+        return re.sub(r'\s+', ' ', content).strip()
+
+    def full_text(self, separator: str = '\n') -> str:
+        """Stripped text of the whole page, one text node per separator."""
+        key = ('full', separator)
+        if key not in self._text_cache:
+            self._text_cache[key] = self.root.text(separator=separator, strip=True)
+        return self._text_cache[key]
+
+
+def parse_html(content: bytes, backend: Optional[str] = None) -> HTMLDocument:
+    """Parse page bytes once with the chosen (or default) backend."""
+    name = backend or default_backend()
+    return HTMLDocument(BACKENDS[name](content), name)
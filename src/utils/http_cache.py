@@ -0,0 +1,136 @@
+"""
+On-disk conditional-GET cache for listing pages.
+Stores ETag / Last-Modified validators, the body and the parsed result per
+URL so an unchanged listing can skip both the download and the parse.
+Parsed results are tagged with the parser version that produced them and are
+ignored once that version changes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from scraper_config import ScraperConfig
+
+
+@dataclass
+class CachedFetch:
+    content: bytes
+    unchanged: bool  # True on a 304 or when the body hash matches the cached one
+    parsed: Any = None  # Parsed result stored by the previous run, if any
+
+
+class HTTPCache:
+    """URL-keyed cache of validators, bodies and parsed listing results."""
+
+    def __init__(self, cache_dir: Optional[str] = None, parser_version: str = ''):
+        self.cache_dir = cache_dir or ScraperConfig.HTTP_CACHE_DIR
+        self.parser_version = parser_version
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _path(self, url: str, suffix: str) -> str:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.{suffix}")
+
+    def _load_meta(self, url: str) -> Optional[dict]:
+        try:
+            with open(self._path(url, 'json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            return meta if meta.get('url') == url else None
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path: str, data: bytes):
+        tmp_path = f"{path}.tmp.{threading.get_ident()}"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _parsed(self, meta: Optional[dict]) -> Any:
+        """The cached parsed result, unless a different parser version stored it."""
+        if not meta or meta.get('parser_version') != self.parser_version:
+            return None
+        return meta.get('parsed')
+
+    def _save_meta(self, meta: dict):
+        data = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+        self._write(self._path(meta['url'], 'json'), data)
+
+    def _record(self, label: str, hit: bool):
+        with self._lock:
+            counters = self.stats.setdefault(label, {'hits': 0, 'misses': 0})
+            counters['hits' if hit else 'misses'] += 1
+
+    def fetch(self, client, url: str, label: str = '') -> CachedFetch:
+        """Fetch url with conditional headers and report whether it changed."""
+        meta = self._load_meta(url)
+        headers = {}
+        if meta:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = client.get(url, headers=headers)
+
+        if response.status_code == 304 and meta:
+            try:
+                with open(self._path(url, 'body'), 'rb') as f:
+                    content = f.read()
+            except OSError as e:
+                # Without the body a 304 is useless; fetch the page as if it were not cached
+                logging.warning(f"Cached body of {url} is unreadable, fetching it again: {e}")
+                meta = None
+                response = client.get(url)
+            else:
+                self._record(label or url, hit=True)
+                return CachedFetch(content=content, unchanged=True, parsed=self._parsed(meta))
+
+        response.raise_for_status()
+        content = response.content
+        body_hash = hashlib.sha256(content).hexdigest()
+        unchanged = bool(meta) and meta.get('body_hash') == body_hash
+
+        new_meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'body_hash': body_hash,
+            'stored_at': datetime.now().isoformat(),
+            'parsed': self._parsed(meta) if unchanged else None,
+            'parser_version': self.parser_version
+        }
+        try:
+            if not unchanged:
+                self._write(self._path(url, 'body'), content)
+            self._save_meta(new_meta)
+        except OSError as e:
+            logging.warning(f"Could not update HTTP cache for {url}: {e}")
+
+        self._record(label or url, hit=unchanged)
+        return CachedFetch(content=content, unchanged=unchanged, parsed=new_meta['parsed'])
+
+    def store_parsed(self, url: str, parsed: Any):
+        """Remember the parsed result for the currently cached body of url."""
+        meta = self._load_meta(url)
+        if not meta:
+            return
+        meta['parsed'] = parsed
+        meta['parser_version'] = self.parser_version
+        try:
+            self._save_meta(meta)
+        except OSError as e:
+            logging.warning(f"Could not update HTTP cache for {url}: {e}")
+
+    def report(self) -> str:
+        """One-line hit/miss summary per label."""
+        with self._lock:
+            parts = [f"{label.upper()} {c['hits']} hit / {c['misses']} miss" for label, c in self.stats.items()]
+        return ', '.join(parts)
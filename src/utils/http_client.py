@@ -0,0 +1,169 @@
+"""
+Shared HTTP client for the scraper.
+Keeps one pooled requests.Session per host, retries transient failures
+with exponential backoff and jitter, and counts connection reuse. With a
+HostRateLimiter, every attempt waits for the host's rate and robots.txt.
+"""
+
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from scraper_config import ScraperConfig
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds to wait."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter for the given retry attempt (0-based)."""
+    ceiling = min(ScraperConfig.HTTP_BACKOFF_MAX, ScraperConfig.HTTP_BACKOFF_FACTOR * (2 ** attempt))
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+class HTTPClient:
+    """Pooled, retrying HTTP client used for every scraper request."""
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None, metrics=None, limiter=None):
+        self.headers = headers or ScraperConfig.REQUEST_HEADERS
+        # Optional ScraperMetrics; every attempt is reported with its latency and size
+        self.metrics = metrics
+        # Optional HostRateLimiter; told how every attempt went so it can adapt
+        self.limiter = limiter
+        if limiter is not None and limiter.robots.fetch is None:
+            limiter.robots.fetch = self.get
+        self.timeout = ScraperConfig.REQUEST_TIMEOUT
+        self.max_retries = ScraperConfig.HTTP_MAX_RETRIES
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+        self._counters = {'requests': 0, 'retries': 0, 'failures': 0}
+
+    def session_for(self, url: str) -> requests.Session:
+        """Return the pooled session for url's host, creating it on first use."""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                session.headers.update(self.headers)
+                adapter = HTTPAdapter(
+                    pool_connections=ScraperConfig.HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=ScraperConfig.HTTP_POOL_MAXSIZE,
+                    max_retries=0
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[host] = session
+            return session
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter for the given retry attempt (0-based)."""
+        return backoff_delay(attempt)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET url, retrying on timeouts, connection errors and retryable statuses."""
+        kwargs.setdefault('timeout', self.timeout)
+        session = self.session_for(url)
+
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                self.limiter.acquire(url)
+            self._count('requests')
+            started = time.perf_counter()
+            try:
+                response = session.get(url, **kwargs)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                self._observe(url, started, None)
+                if self.limiter is not None:
+                    self.limiter.observe(url, time.perf_counter() - started, None)
+                if attempt >= self.max_retries:
+                    self._count('failures')
+                    raise
+                delay = self.backoff_delay(attempt)
+                logging.warning(f"Request to {url} failed ({e}), retrying in {delay:.1f}s")
+            else:
+                self._observe(url, started, response)
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if self.limiter is not None:
+                    self.limiter.observe(url, time.perf_counter() - started, response.status_code, retry_after)
+                if response.status_code not in ScraperConfig.HTTP_RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+
+                delay = self.backoff_delay(attempt)
+                if retry_after is not None:
+                    delay = max(delay, min(retry_after, ScraperConfig.HTTP_RETRY_AFTER_MAX))
+                logging.warning(f"Got HTTP {response.status_code} from {url}, retrying in {delay:.1f}s")
+                response.close()
+
+            self._count('retries')
+            attempt += 1
+            time.sleep(delay)
+
+    def _observe(self, url: str, started: float, response: Optional[requests.Response]):
+        if self.metrics is None:
+            return
+        elapsed = time.perf_counter() - started
+        if response is None:
+            self.metrics.observe_fetch(url, elapsed, 0, ok=False)
+        else:
+            self.metrics.observe_fetch(url, elapsed, len(response.content), ok=response.status_code < 400)
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+    def stats(self) -> dict:
+        """Return request counters and per-host connection reuse counts."""
+        hosts = {}
+        with self._lock:
+            sessions = list(self._sessions.items())
+            counters = dict(self._counters)
+
+        for host, session in sessions:
+            opened = issued = 0
+            for adapter in set(session.adapters.values()):
+                pools = adapter.poolmanager.pools
+                for key in pools.keys():
+                    pool = pools.get(key)
+                    if pool is not None:
+                        opened += pool.num_connections
+                        issued += pool.num_requests
+            hosts[host] = {
+                'connections_opened': opened,
+                'connections_reused': max(0, issued - opened)
+            }
+
+        counters['connections_opened'] = sum(h['connections_opened'] for h in hosts.values())
+        counters['connections_reused'] = sum(h['connections_reused'] for h in hosts.values())
+        counters['hosts'] = hosts
+        return counters
+
+    def close(self):
+        """Close every pooled session."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
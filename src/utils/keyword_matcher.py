@@ -0,0 +1,83 @@
+"""
+Compiled multi-keyword matching.
+Keyword lists are compiled once into a trie-shaped regular expression so a
+single scan over the text finds every keyword occurrence.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, List
+
+from romanian_text import normalize_for_matching
+
+
+def build_trie_pattern(words: Iterable[str]) -> str:
+    """Build a regex alternation from words, factored as a trie.
+
+    Shared prefixes are matched once and longer words are tried before
+    their prefixes, so the leftmost match is always the longest keyword.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def render(node: dict) -> str:
+        terminal = '' in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if terminal:
+            return f'(?:{body})?' if len(branches) == 1 else body + '?'
+        return body
+
+    return render(trie)
+
+
+def is_acronym(keyword: str) -> bool:
+    """Short all-caps keywords (IT, UE, NATO) only match as whole words."""
+    return keyword.isupper() and len(keyword) <= 4
+
+
+class KeywordMatcher:
+    """Counts keyword hits per group in one pass over the text.
+
+    Keywords match at the start of a word and may be followed by a
+    Romanian inflection suffix (`școli` matches `școlile`); acronyms must
+    match a whole word.
+    """
+
+    def __init__(self, groups: Dict[str, List[str]]):
+        self.groups = list(groups)
+        self._keyword_groups: Dict[str, List[str]] = {}
+        words, acronyms = set(), set()
+
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                folded = normalize_for_matching(keyword)
+                self._keyword_groups.setdefault(folded, []).append(group)
+                (acronyms if is_acronym(keyword) else words).add(folded)
+
+        alternatives = []
+        if acronyms:
+            alternatives.append(build_trie_pattern(acronyms) + r'(?!\w)')
+        if words:
+            alternatives.append(build_trie_pattern(words))
+        self.pattern = re.compile(r'(?<!\w)(?:' + '|'.join(alternatives) + ')') if alternatives else None
+
+    @classmethod
+    def from_categories(cls, categories: Dict[str, dict]) -> 'KeywordMatcher':
+        return cls({key: data['keywords'] for key, data in categories.items()})
+
+    def count(self, text: str) -> Counter:
+        """Return keyword hit counts per group for text."""
+        counts: Counter = Counter()
+        if self.pattern is None:
+            return counts
+        for match in self.pattern.finditer(normalize_for_matching(text)):
+            for group in self._keyword_groups.get(match.group(0), ()):
+                counts[group] += 1
+        return counts
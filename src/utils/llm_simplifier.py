@@ -0,0 +1,265 @@
+"""
+LLM simplification stage.
+Articles are submitted from the scraper thread and simplified on a
+background asyncio loop: long texts are split into chunks that fit the
+token budget, prompts are batched when the API accepts several at once,
+concurrency is bounded and halved on rate limits (then grown back one
+request at a time), and any article that fails or runs past its deadline
+gets the rule-based text instead.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from derived_cache import DerivedCache
+from http_client import backoff_delay, parse_retry_after
+from scraper_config import ScraperConfig
+
+SENTENCE_END = re.compile(r'(?<=[.!?;])\s+')
+
+
+class RetryableLLMError(Exception):
+    """Rate limit or server error; the request may succeed later."""
+
+    def __init__(self, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"LLM API returned {status}")
+        self.retry_after = retry_after
+
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """Split text on paragraph and sentence boundaries into chunks within max_tokens."""
+    max_chars = max_tokens * ScraperConfig.LLM_CHARS_PER_TOKEN
+    pieces = []
+    for paragraph in text.split('\n'):
+        for sentence in SENTENCE_END.split(paragraph.strip()):
+            # A single overlong sentence is cut on whitespace
+            while len(sentence) > max_chars:
+                cut = sentence.rfind(' ', 0, max_chars)
+                cut = cut if cut > 0 else max_chars
+                pieces.append(sentence[:cut])
+                sentence = sentence[cut:].lstrip()
+            if sentence:
+                pieces.append(sentence)
+
+    chunks, current = [], ''
+    for piece in pieces:
+        if current and len(current) + 1 + len(piece) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class AdaptiveLimit:
+    """Concurrency limit that halves on rate limits and grows back additively (AIMD)."""
+
+    def __init__(self, maximum: int):
+        self.maximum = maximum
+        self.limit = float(maximum)
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, rate_limited: bool = False):
+        async with self._condition:
+            self.in_flight -= 1
+            if rate_limited:
+                self.limit = max(1.0, self.limit / 2)
+            else:
+                self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class OpenAICompatibleBackend:
+    """Blocking client for /chat/completions or /completions endpoints."""
+
+    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None,
+                 model: Optional[str] = None, style: Optional[str] = None):
+        self.base_url = (base_url or ScraperConfig.LLM_BASE_URL).rstrip('/')
+        self.model = model or ScraperConfig.AI_MODEL
+        self.style = style or ScraperConfig.LLM_API_STYLE
+        self.batch_size = ScraperConfig.LLM_BATCH_SIZE if self.style == 'completions' else 1
+
+        self.session = requests.Session()
+        api_key = api_key or ScraperConfig.OPENAI_API_KEY
+        if api_key:
+            self.session.headers['Authorization'] = f"Bearer {api_key}"
+        adapter = HTTPAdapter(pool_maxsize=ScraperConfig.LLM_MAX_CONCURRENCY, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def complete(self, prompts: List[str]) -> List[str]:
+        """Return one completion per prompt, in order."""
+        payload = {
+            'model': self.model,
+            'max_tokens': ScraperConfig.LLM_MAX_OUTPUT_TOKENS,
+            'temperature': ScraperConfig.LLM_TEMPERATURE,
+        }
+        if self.style == 'chat':
+            payload['messages'] = [{'role': 'user', 'content': prompts[0]}]
+            url = f"{self.base_url}/chat/completions"
+        else:
+            payload['prompt'] = prompts
+            url = f"{self.base_url}/completions"
+
+        response = self.session.post(url, json=payload, timeout=ScraperConfig.LLM_REQUEST_TIMEOUT)
+        if response.status_code == 429 or response.status_code >= 500:
+            raise RetryableLLMError(response.status_code, parse_retry_after(response.headers.get('Retry-After')))
+        response.raise_for_status()
+
+        choices = sorted(response.json()['choices'], key=lambda choice: choice.get('index', 0))
+        if self.style == 'chat':
+            return [choices[0]['message']['content']]
+        if len(choices) != len(prompts):
+            raise ValueError(f"Expected {len(prompts)} completions, got {len(choices)}")
+        return [choice['text'] for choice in choices]
+
+    def close(self):
+        self.session.close()
+
+
+class LLMSimplifier:
+    """Async, batched LLM simplification with a rule-based fallback."""
+
+    def __init__(self, fallback: Callable[[str, str], str], backend: Optional[OpenAICompatibleBackend] = None,
+                 cache: Optional[DerivedCache] = None):
+        self.fallback = fallback
+        self.backend = backend or OpenAICompatibleBackend()
+        # Only LLM output is cached (stage 'simplified_llm'), never the fallback text
+        self.cache = cache
+        self.stats = Counter()
+
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name='llm-simplifier', daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self.loop).result()
+
+    async def _start(self):
+        self._limit = AdaptiveLimit(ScraperConfig.LLM_MAX_CONCURRENCY)
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._batcher = asyncio.ensure_future(self._batch_prompts())
+
+    def submit(self, text: str, category: str) -> Future:
+        """Start simplifying an article; the future always resolves to text."""
+        if self.cache is not None:
+            cached = self.cache.get('simplified_llm', text)
+            if cached is not None:
+                future = Future()
+                future.set_result(cached)
+                return future
+        return asyncio.run_coroutine_threadsafe(self._simplify(text, category), self.loop)
+
+    def prompt_for(self, chunk: str) -> str:
+        return ScraperConfig.AI_PROMPT_TEMPLATE.format(text=chunk)
+
+    async def _simplify(self, text: str, category: str) -> str:
+        try:
+            chunks = chunk_text(text, ScraperConfig.LLM_CHUNK_TOKENS)
+            parts = await asyncio.wait_for(
+                asyncio.gather(*(self._complete(self.prompt_for(chunk)) for chunk in chunks)),
+                ScraperConfig.LLM_ARTICLE_TIMEOUT
+            )
+            self.stats['llm'] += 1
+            self.stats['chunks'] += len(chunks)
+            simplified = '\n\n'.join(part.strip() for part in parts)
+        except Exception as e:
+            reason = 'timed out' if isinstance(e, asyncio.TimeoutError) else str(e)
+            logging.warning(f"LLM simplification failed ({reason}), using rule-based text")
+            self.stats['fallback'] += 1
+            return self.fallback(text, category)
+        if self.cache is not None:
+            self.cache.put('simplified_llm', text, simplified)
+        return simplified
+
+    async def _complete(self, prompt: str) -> str:
+        future = self.loop.create_future()
+        await self._queue.put((prompt, future))
+        return await future
+
+    async def _batch_prompts(self):
+        """Collect queued prompts into batches and send each batch as its own task."""
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self.loop.time() + ScraperConfig.LLM_BATCH_WINDOW
+            while len(batch) < self.backend.batch_size:
+                remaining = deadline - self.loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            self.loop.create_task(self._send(batch))
+
+    async def _send(self, batch: List[Tuple[str, asyncio.Future]]):
+        error: Exception = RuntimeError("LLM request not attempted")
+        for attempt in range(ScraperConfig.LLM_MAX_RETRIES + 1):
+            # Prompts of articles that already timed out are not worth sending
+            batch = [(prompt, future) for prompt, future in batch if not future.done()]
+            if not batch:
+                return
+            await self._limit.acquire()
+            self.stats['requests'] += 1
+            try:
+                completions = await asyncio.to_thread(self.backend.complete, [prompt for prompt, _ in batch])
+            except RetryableLLMError as e:
+                await self._limit.release(rate_limited=True)
+                error = e
+                self.stats['retryable_errors'] += 1
+                if attempt < ScraperConfig.LLM_MAX_RETRIES:
+                    await asyncio.sleep(min(e.retry_after or backoff_delay(attempt), ScraperConfig.HTTP_RETRY_AFTER_MAX))
+                continue
+            except Exception as e:
+                await self._limit.release()
+                error = e
+                break
+            await self._limit.release()
+            for (_, future), completion in zip(batch, completions):
+                if not future.done():
+                    future.set_result(completion)
+            return
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    def report(self) -> str:
+        return (
+            f"{self.stats['llm']} simplified by LLM ({self.stats['chunks']} chunks, "
+            f"{self.stats['requests']} requests, {self.stats['retryable_errors']} rate-limited/failed), "
+            f"{self.stats['fallback']} fell back to rules"
+        )
+
+    def close(self):
+        """Cancel outstanding requests and stop the background loop."""
+        async def cancel_pending():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(cancel_pending(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+        self.backend.close()
+
+
+def llm_enabled() -> bool:
+    """Whether ScraperConfig selects the LLM backend."""
+    backend = ScraperConfig.SIMPLIFIER_BACKEND
+    return backend == 'llm' or (backend == 'auto' and bool(ScraperConfig.OPENAI_API_KEY))
@@ -0,0 +1,268 @@
+"""
+Run telemetry for the scraper.
+Collects fetch latency and bytes per host, time spent in each processing
+stage, and articles and errors per source. Counters for the life of the
+process are written as Prometheus text (or JSON) after every run, for a
+textfile collector or a dashboard, and one summary per run, shaped like
+the scraper_runs table, is appended to a JSON-lines file.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from fetch_engine import host_of
+from scraper_config import ScraperConfig
+
+
+class LatencyHistogram:
+    """Prometheus-style histogram with cumulative bucket counts."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class Tally:
+    """Counters for one scope: a single run or the life of the process."""
+
+    def __init__(self):
+        self.fetches = Counter()
+        self.fetch_seconds = Counter()
+        self.fetch_max: Dict[str, float] = {}
+        self.fetch_bytes = Counter()
+        self.fetch_errors = Counter()
+        self.stage_calls = Counter()
+        self.stage_seconds = Counter()
+        self.articles = Counter()
+        self.errors = Counter()
+
+    def add_fetch(self, host: str, seconds: float, size: int, ok: bool):
+        self.fetches[host] += 1
+        self.fetch_seconds[host] += seconds
+        self.fetch_max[host] = max(seconds, self.fetch_max.get(host, 0.0))
+        self.fetch_bytes[host] += size
+        if not ok:
+            self.fetch_errors[host] += 1
+
+    def hosts(self) -> Dict[str, dict]:
+        return {
+            host: {
+                'requests': self.fetches[host],
+                'errors': self.fetch_errors[host],
+                'bytes': self.fetch_bytes[host],
+                'avg_seconds': round(self.fetch_seconds[host] / self.fetches[host], 4),
+                'max_seconds': round(self.fetch_max[host], 4),
+            }
+            for host in sorted(self.fetches)
+        }
+
+    def stages(self) -> Dict[str, dict]:
+        return {
+            stage: {'calls': self.stage_calls[stage], 'seconds': round(self.stage_seconds[stage], 4)}
+            for stage in sorted(self.stage_calls)
+        }
+
+
+def escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_labels(labels: Dict[str, str]) -> str:
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in labels.items()) + '}'
+
+
+class ScraperMetrics:
+    """Thread-safe collector; fetch workers and the scraper thread report into it."""
+
+    def __init__(self, buckets: Optional[Sequence[float]] = None, clock=time.time):
+        self.buckets = tuple(buckets or ScraperConfig.METRICS_LATENCY_BUCKETS)
+        self.clock = clock
+        self.totals = Tally()
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.runs = Counter()
+        self.last_run: Optional[dict] = None
+
+        self._lock = threading.Lock()
+        self._run: Optional[Tally] = None
+        self._run_errors: List[str] = []
+        self._run_sources: List[str] = []
+        self._run_started = 0.0
+
+    def _tallies(self) -> Iterable[Tally]:
+        return (self.totals, self._run) if self._run is not None else (self.totals,)
+
+    def observe_fetch(self, url: str, seconds: float, size: int, ok: bool = True):
+        """Record one HTTP request (each retry attempt counts separately)."""
+        host = host_of(url)
+        with self._lock:
+            for tally in self._tallies():
+                tally.add_fetch(host, seconds, size, ok)
+            histogram = self.latency.get(host)
+            if histogram is None:
+                histogram = self.latency[host] = LatencyHistogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block as one call of a processing stage."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                for tally in self._tallies():
+                    tally.stage_calls[name] += 1
+                    tally.stage_seconds[name] += elapsed
+
+    def count_article(self, source: str):
+        with self._lock:
+            for tally in self._tallies():
+                tally.articles[source] += 1
+
+    def count_error(self, source: str, message: str):
+        with self._lock:
+            for tally in self._tallies():
+                tally.errors[source] += 1
+            if self._run is not None and len(self._run_errors) < ScraperConfig.METRICS_MAX_RUN_ERRORS:
+                self._run_errors.append(f"{source}: {message}")
+
+    def start_run(self, sources: List[str]):
+        with self._lock:
+            self._run = Tally()
+            self._run_errors = []
+            self._run_sources = list(sources)
+            self._run_started = self.clock()
+
+    def finish_run(self, articles_found: int, failed: bool = False) -> dict:
+        """Close the current run and return its summary."""
+        completed = self.clock()
+        with self._lock:
+            run, self._run = self._run or Tally(), None
+            duration = max(completed - self._run_started, 1e-9)
+            if failed:
+                status = 'failed'
+            else:
+                status = 'completed_with_errors' if self._run_errors else 'completed'
+            self.runs[status] += 1
+            self.last_run = {
+                # Same columns as the scraper_runs table, then the detail
+                'id': str(uuid.uuid4()),
+                'started_at': datetime.fromtimestamp(self._run_started, timezone.utc).isoformat(),
+                'completed_at': datetime.fromtimestamp(completed, timezone.utc).isoformat(),
+                'status': status,
+                'articles_found': articles_found,
+                'errors': list(self._run_errors),
+                'sources_scraped': self._run_sources,
+                'duration_seconds': round(duration, 3),
+                'articles_per_second': round(articles_found / duration, 4),
+                'articles_by_source': dict(run.articles),
+                'errors_by_source': dict(run.errors),
+                'stages': run.stages(),
+                'hosts': run.hosts(),
+            }
+            return self.last_run
+
+    def slow_hosts(self, summary: dict) -> List[str]:
+        limit = ScraperConfig.METRICS_SLOW_HOST_SECONDS
+        return [host for host, stats in summary['hosts'].items() if stats['avg_seconds'] > limit]
+
+    def render_prometheus(self) -> str:
+        """Counters for the life of the process in the Prometheus text format."""
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples: Iterable[tuple]):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for suffix, labels, value in samples:
+                lines.append(f"{name}{suffix}{prometheus_labels(labels) if labels else ''} {value:g}")
+
+        with self._lock:
+            totals = self.totals
+            histogram_samples = []
+            for host in sorted(self.latency):
+                histogram = self.latency[host]
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    histogram_samples.append(('_bucket', {'host': host, 'le': f'{bound:g}'}, count))
+                histogram_samples.append(('_bucket', {'host': host, 'le': '+Inf'}, histogram.count))
+                histogram_samples.append(('_sum', {'host': host}, histogram.total))
+                histogram_samples.append(('_count', {'host': host}, histogram.count))
+            metric('scraper_fetch_duration_seconds', 'histogram', 'Time to fetch a page, per host.', histogram_samples)
+            metric('scraper_fetch_bytes_total', 'counter', 'Response bytes received, per host.',
+                   [('', {'host': host}, totals.fetch_bytes[host]) for host in sorted(totals.fetches)])
+            metric('scraper_fetch_errors_total', 'counter', 'Requests that failed or returned an error status.',
+                   [('', {'host': host}, totals.fetch_errors[host]) for host in sorted(totals.fetches)])
+
+            stage_samples = []
+            for stage in sorted(totals.stage_calls):
+                stage_samples.append(('_sum', {'stage': stage}, totals.stage_seconds[stage]))
+                stage_samples.append(('_count', {'stage': stage}, totals.stage_calls[stage]))
+            metric('scraper_stage_duration_seconds', 'summary',
+                   'Time spent in each processing stage, summed over worker threads.', stage_samples)
+            metric('scraper_articles_total', 'counter', 'New articles processed, per source.',
+                   [('', {'source': source}, count) for source, count in sorted(totals.articles.items())])
+            metric('scraper_errors_total', 'counter', 'Errors while scraping, per source.',
+                   [('', {'source': source}, count) for source, count in sorted(totals.errors.items())])
+            metric('scraper_runs_total', 'counter', 'Finished runs, per status.',
+                   [('', {'status': status}, count) for status, count in sorted(self.runs.items())])
+
+            if self.last_run:
+                completed = datetime.fromisoformat(self.last_run['completed_at']).timestamp()
+                metric('scraper_last_run_timestamp_seconds', 'gauge', 'When the last run finished.',
+                       [('', {}, completed)])
+                metric('scraper_last_run_duration_seconds', 'gauge', 'Wall time of the last run.',
+                       [('', {}, self.last_run['duration_seconds'])])
+                metric('scraper_last_run_articles_per_second', 'gauge', 'Articles per second in the last run.',
+                       [('', {}, self.last_run['articles_per_second'])])
+        return '\n'.join(lines) + '\n'
+
+    def to_json(self) -> dict:
+        with self._lock:
+            return {
+                'updated_at': datetime.now(timezone.utc).isoformat(),
+                'hosts': self.totals.hosts(),
+                'stages': self.totals.stages(),
+                'articles_by_source': dict(self.totals.articles),
+                'errors_by_source': dict(self.totals.errors),
+                'runs': dict(self.runs),
+                'last_run': self.last_run,
+            }
+
+    def write(self, path: Optional[str] = None):
+        """Write the metrics atomically; a .json path gets JSON, anything else Prometheus text."""
+        path = path or ScraperConfig.METRICS_FILE
+        if path.endswith('.json'):
+            text = json.dumps(self.to_json(), indent=2, ensure_ascii=False)
+        else:
+            text = self.render_prometheus()
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+
+def append_run_summary(summary: dict, path: Optional[str] = None):
+    """Append one run summary as a JSON line."""
+    path = path or ScraperConfig.SCRAPER_RUNS_FILE
+    try:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(summary, ensure_ascii=False) + '\n')
+    except OSError as e:
+        logging.error(f"Error writing run summary to {path}: {e}")
@@ -0,0 +1,130 @@
+"""Data models shared by the scraper, the article store and the exporters."""
+
+import sys
+from array import array
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+# Fields with a handful of distinct values; interned on Article, coded in ArticleBatch
+CODED_FIELDS = ('source', 'category', 'category_emoji', 'category_name')
+TEXT_FIELDS = ('id', 'date', 'title', 'original_content', 'simplified_content', 'url', 'scraped_at')
+
+
+@dataclass(slots=True)
+class Article:
+    id: str
+    date: str
+    title: str
+    original_content: str
+    simplified_content: str
+    detailed_points: Tuple[str, ...]  # Any sequence is accepted and stored as a tuple
+    category: str
+    category_emoji: str
+    category_name: str
+    url: str
+    scraped_at: str
+    source: str  # Added source field
+    is_new: bool = True
+
+    def __post_init__(self):
+        # Articles decoded from JSON would otherwise each carry their own copy
+        self.source = sys.intern(self.source)
+        self.category = sys.intern(self.category)
+        self.category_emoji = sys.intern(self.category_emoji)
+        self.category_name = sys.intern(self.category_name)
+        self.detailed_points = tuple(self.detailed_points)
+
+
+class ArticleBatch(Sequence):
+    """Column-oriented container for many articles, e.g. a whole corpus in memory.
+
+    The repeated fields are stored as 2-byte codes into a small table per
+    field, all detailed points in one flat list with end offsets and is_new
+    as one byte; only the free text keeps a string per article. Indexing
+    builds the Article on demand, and column operations never build one.
+    """
+
+    def __init__(self, articles: Iterable[Article] = ()):
+        self._text: Dict[str, List[str]] = {name: [] for name in TEXT_FIELDS}
+        self._codes: Dict[str, array] = {name: array('H') for name in CODED_FIELDS}
+        self._values: Dict[str, List[str]] = {name: [] for name in CODED_FIELDS}
+        self._value_codes: Dict[str, Dict[str, int]] = {name: {} for name in CODED_FIELDS}
+        self._points: List[str] = []
+        self._point_ends = array('I')
+        self._is_new = bytearray()
+        self.extend(articles)
+
+    def _code(self, name: str, value: str) -> int:
+        codes = self._value_codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self._values[name])
+            self._values[name].append(value)
+            if code == 0x10000:
+                self._codes[name] = array('I', self._codes[name])
+        return code
+
+    def append(self, article: Article):
+        for name in TEXT_FIELDS:
+            self._text[name].append(getattr(article, name))
+        for name in CODED_FIELDS:
+            # _code may widen the array, so look it up only afterwards
+            code = self._code(name, getattr(article, name))
+            self._codes[name].append(code)
+        self._points.extend(article.detailed_points)
+        self._point_ends.append(len(self._points))
+        self._is_new.append(bool(article.is_new))
+
+    def extend(self, articles: Iterable[Article]):
+        for article in articles:
+            self.append(article)
+
+    def __len__(self) -> int:
+        return len(self._is_new)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Article, List[Article]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('article index out of range')
+        start = self._point_ends[index - 1] if index else 0
+        fields = {name: column[index] for name, column in self._text.items()}
+        fields.update((name, self._values[name][codes[index]]) for name, codes in self._codes.items())
+        return Article(detailed_points=self._points[start:self._point_ends[index]],
+                       is_new=bool(self._is_new[index]), **fields)
+
+    def __iter__(self) -> Iterator[Article]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def column(self, name: str) -> List:
+        """All values of one field, in order, without building Articles."""
+        if name in self._codes:
+            values = self._values[name]
+            return [values[code] for code in self._codes[name]]
+        if name == 'detailed_points':
+            starts = [0, *self._point_ends[:-1]]
+            return [tuple(self._points[start:end]) for start, end in zip(starts, self._point_ends)]
+        if name == 'is_new':
+            return [bool(flag) for flag in self._is_new]
+        return list(self._text[name])
+
+    def count_by(self, name: str) -> Counter:
+        """Articles per value of a coded field (source, category, ...)."""
+        values = self._values[name]
+        return Counter({values[code]: count for code, count in Counter(self._codes[name]).items()})
+
+    def indices(self, **criteria: str) -> List[int]:
+        """Positions of the articles whose coded fields equal the given values."""
+        selected = range(len(self))
+        for name, value in criteria.items():
+            code = self._value_codes[name].get(value)
+            if code is None:
+                return []
+            codes = self._codes[name]
+            selected = [index for index in selected if codes[index] == code]
+        return list(selected)
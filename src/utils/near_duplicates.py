@@ -0,0 +1,190 @@
+"""
+Near-duplicate detection across sources.
+Articles are reduced to a MinHash signature over word shingles of their
+text. Signatures are split into LSH bands stored in SQLite, so a lookup
+only compares against articles sharing at least one band bucket instead of
+scanning the whole corpus.
+"""
+
+import hashlib
+import random
+import re
+import sqlite3
+import threading
+from array import array
+from typing import Iterable, List, Optional, Set, Tuple
+
+from romanian_text import normalize_for_matching
+from scraper_config import ScraperConfig
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def shingles(text: str, size: int) -> Set[bytes]:
+    """Word n-grams of the normalized text (the whole text if it is shorter)."""
+    words = WORD_PATTERN.findall(normalize_for_matching(text))
+    if len(words) <= size:
+        return {' '.join(words).encode('utf-8')} if words else set()
+    return {' '.join(words[i:i + size]).encode('utf-8') for i in range(len(words) - size + 1)}
+
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """Pick (bands, rows) so candidates are likely at the threshold and rare well below it.
+
+    The LSH S-curve crosses 50% near (1/bands) ** (1/rows); take the most
+    selective split whose crossing point is still at or below the threshold.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+class MinHasher:
+    """MinHash signatures from universal hashes of 32-bit shingle hashes."""
+
+    def __init__(self, num_perm: int, shingle_size: int, seed: int = 1):
+        rng = random.Random(seed)
+        self.shingle_size = shingle_size
+        self.permutations = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME)) for _ in range(num_perm)
+        ]
+
+    def signature(self, text: str) -> Optional[array]:
+        """Signature of a text, or None when it has no words."""
+        hashes = [
+            int.from_bytes(hashlib.blake2b(shingle, digest_size=4).digest(), 'little')
+            for shingle in shingles(text, self.shingle_size)
+        ]
+        if not hashes:
+            return None
+        return array('Q', (
+            min((a * h + b) % MERSENNE_PRIME for h in hashes) & MAX_HASH
+            for a, b in self.permutations
+        ))
+
+
+def similarity(first: array, second: array) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+
+
+class NearDuplicateIndex:
+    """SQLite LSH index of MinHash signatures with a configurable similarity threshold."""
+
+    def __init__(self, path: Optional[str] = None, threshold: Optional[float] = None,
+                 num_perm: Optional[int] = None, shingle_size: Optional[int] = None):
+        self.path = path or ScraperConfig.NEAR_DUP_INDEX_FILE
+        self.threshold = threshold if threshold is not None else ScraperConfig.NEAR_DUP_THRESHOLD
+        num_perm = num_perm or ScraperConfig.NEAR_DUP_NUM_PERM
+        self.hasher = MinHasher(num_perm, shingle_size or ScraperConfig.NEAR_DUP_SHINGLE_SIZE)
+        self.bands, self.rows = choose_bands(num_perm, self.threshold)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        if self.path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS signatures (
+                article_id TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                signature BLOB NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS bands (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                article_id TEXT NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_bands_bucket ON bands(band, bucket)")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < 1:
+            # Indexes written before version 1 got a second set of bands for every re-added article
+            self._conn.execute(
+                "DELETE FROM bands WHERE rowid NOT IN "
+                "(SELECT MIN(rowid) FROM bands GROUP BY band, bucket, article_id)"
+            )
+            self._conn.execute("PRAGMA user_version = 1")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS duplicate_links (
+                url TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                duplicate_of TEXT NOT NULL,
+                similarity REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+
+    def signature(self, text: str) -> Optional[array]:
+        return self.hasher.signature(text)
+
+    def _buckets(self, signature: array) -> List[Tuple[int, int]]:
+        buckets = []
+        for band in range(self.bands):
+            rows = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            # SQLite integers are signed 64-bit
+            buckets.append((band, int.from_bytes(hashlib.blake2b(rows, digest_size=8).digest(), 'little', signed=True)))
+        return buckets
+
+    def find_similar(self, signature: Optional[array]) -> Optional[Tuple[str, float]]:
+        """Best (article_id, similarity) at or above the threshold, if any."""
+        if signature is None:
+            return None
+        with self._lock:
+            candidates = set()
+            for band, bucket in self._buckets(signature):
+                candidates.update(row[0] for row in self._conn.execute(
+                    "SELECT article_id FROM bands WHERE band = ? AND bucket = ?", (band, bucket)
+                ))
+            best = None
+            for article_id in candidates:
+                row = self._conn.execute(
+                    "SELECT signature FROM signatures WHERE article_id = ?", (article_id,)
+                ).fetchone()
+                score = similarity(signature, array('Q', row[0]))
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (article_id, score)
+        return best
+
+    def add(self, article_id: str, source: str, signature: Optional[array]):
+        self.add_many([(article_id, source, signature)])
+
+    def add_many(self, records: Iterable[tuple]):
+        """Index (article_id, source, signature) records in one transaction."""
+        rows = [(article_id, source, signature.tobytes(), self._buckets(signature))
+                for article_id, source, signature in records if signature is not None]
+
+        with self._lock:
+            band_rows = []
+            for article_id, source, blob, buckets in rows:
+                inserted = self._conn.execute(
+                    "INSERT OR IGNORE INTO signatures (article_id, source, signature) VALUES (?, ?, ?)",
+                    (article_id, source, blob)
+                ).rowcount
+                # An already indexed article (re-added by reprocess or backfill) keeps its bands
+                if inserted:
+                    band_rows.extend((band, bucket, article_id) for band, bucket in buckets)
+            self._conn.executemany("INSERT INTO bands (band, bucket, article_id) VALUES (?, ?, ?)", band_rows)
+            self._conn.commit()
+
+    def link(self, url: str, source: str, duplicate_of: str, score: float):
+        """Record that an article URL was skipped as a near-duplicate of a stored article."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO duplicate_links (url, source, duplicate_of, similarity) VALUES (?, ?, ?, ?)",
+                (url, source, duplicate_of, score)
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
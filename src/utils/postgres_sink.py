@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Bulk export of articles and run summaries to Postgres.
+Articles are mapped to the columns of the Supabase scraped_articles table
+(country, interests, tags and article_date included) and written in
+batches: each batch is COPYed into a temporary staging table, then
+changed rows are updated and new ones inserted by URL in one statement
+each. This needs no unique constraint on url, so it works against the
+schema as migrated and against any other Postgres with the same columns.
+Each scraper run becomes a scraper_runs row.
+
+Requires psycopg 3 (pip install "psycopg[binary]") and SCRAPER_POSTGRES_DSN.
+The scraper exports every batch it saves when the DSN is set; the export
+command loads the whole article store, e.g. to catch up after an outage.
+
+Usage: python postgres_sink.py export [--store-dir article_store] [--dsn postgresql://...]
+"""
+
+import argparse
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+from models import Article
+from romanian_text import normalize_for_matching
+from scraper_config import ScraperConfig
+
+# Columns filled from an Article, in COPY order; tags only on insert
+ARTICLE_COLUMNS = (
+    'country', 'source', 'title', 'original_content', 'simplified_content', 'detailed_points',
+    'category', 'category_emoji', 'category_name', 'url', 'interests', 'article_date', 'scraped_at',
+)
+# Rewritten when a stored URL comes back with different content; id, tags,
+# country, scraped_at and created_at keep their first values
+UPDATED_COLUMNS = (
+    'source', 'title', 'original_content', 'simplified_content', 'detailed_points',
+    'category', 'category_emoji', 'category_name', 'interests', 'article_date',
+)
+RUN_COLUMNS = ('id', 'started_at', 'completed_at', 'status', 'articles_found', 'errors', 'sources_scraped')
+
+
+def parse_scraped_at(value: str) -> datetime:
+    """Article.scraped_at is naive local time; Postgres needs the offset."""
+    try:
+        return datetime.fromisoformat(value).astimezone()
+    except (TypeError, ValueError):
+        return datetime.now().astimezone()
+
+
+def copy_text(value: str) -> str:
+    """Escape a value for COPY's text format."""
+    # Backslash first, so the backslashes of the later escapes are not doubled
+    for char, escaped in (('\\', '\\\\'), ('\t', '\\t'), ('\n', '\\n'), ('\r', '\\r')):
+        if char in value:
+            value = value.replace(char, escaped)
+    return value
+
+
+def array_literal(values: List[str]) -> str:
+    return '{' + ','.join('"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"' for value in values) + '}'
+
+
+def copy_line(row: tuple) -> str:
+    """One COPY text-format line; several times faster than psycopg's per-value dumpers."""
+    fields = []
+    for value in row:
+        if isinstance(value, list):
+            value = array_literal(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        fields.append(copy_text(value))
+    return '\t'.join(fields) + '\n'
+
+
+class PostgresSink:
+    """Writes articles and run summaries to the scraped_articles / scraper_runs tables in bulk."""
+
+    def __init__(self, dsn: Optional[str] = None, batch_size: Optional[int] = None):
+        import psycopg  # Optional dependency, only needed when exporting
+        from psycopg import sql
+        self._psycopg = psycopg
+        self.dsn = dsn or ScraperConfig.POSTGRES_DSN
+        if not self.dsn:
+            raise ValueError("No Postgres DSN; set SCRAPER_POSTGRES_DSN")
+        self.batch_size = batch_size or ScraperConfig.POSTGRES_BATCH_SIZE
+        self.interests = [(name, [normalize_for_matching(keyword) for keyword in keywords])
+                          for name, keywords in ScraperConfig.POSTGRES_INTERESTS.items()]
+        self._lock = threading.Lock()
+        self._conn = None
+
+        articles = sql.Identifier(ScraperConfig.POSTGRES_ARTICLES_TABLE)
+        columns = sql.SQL(', ').join(map(sql.Identifier, ARTICLE_COLUMNS))
+        staged = sql.SQL(', ').join(sql.Identifier('s', name) for name in ARTICLE_COLUMNS)
+        updated = sql.SQL(', ').join(map(sql.Identifier, UPDATED_COLUMNS))
+        self._lock_key = ScraperConfig.POSTGRES_ARTICLES_TABLE
+        self._create_staging = sql.SQL(
+            "CREATE TEMP TABLE article_staging ON COMMIT DROP AS SELECT {columns} FROM {articles} WITH NO DATA"
+        ).format(columns=columns, articles=articles)
+        self._copy = sql.SQL("COPY article_staging ({columns}) FROM STDIN").format(columns=columns)
+        self._update = sql.SQL(
+            "UPDATE {articles} AS t SET ({updated}) = ({new}) FROM article_staging AS s "
+            "WHERE t.url = s.url AND ({old}) IS DISTINCT FROM ({new})"
+        ).format(
+            articles=articles, updated=updated,
+            new=sql.SQL(', ').join(sql.Identifier('s', name) for name in UPDATED_COLUMNS),
+            old=sql.SQL(', ').join(sql.Identifier('t', name) for name in UPDATED_COLUMNS),
+        )
+        self._insert = sql.SQL(
+            "INSERT INTO {articles} ({columns}, tags) SELECT {staged}, %s FROM article_staging AS s "
+            "WHERE NOT EXISTS (SELECT 1 FROM {articles} AS t WHERE t.url = s.url)"
+        ).format(articles=articles, columns=columns, staged=staged)
+        self._insert_run = sql.SQL(
+            "INSERT INTO {runs} ({columns}) VALUES ({values}) ON CONFLICT (id) DO UPDATE SET "
+            "completed_at = EXCLUDED.completed_at, status = EXCLUDED.status, "
+            "articles_found = EXCLUDED.articles_found, errors = EXCLUDED.errors"
+        ).format(
+            runs=sql.Identifier(ScraperConfig.POSTGRES_RUNS_TABLE),
+            columns=sql.SQL(', ').join(map(sql.Identifier, RUN_COLUMNS)),
+            values=sql.SQL(', ').join(sql.Placeholder() * len(RUN_COLUMNS)),
+        )
+
+    def connection(self):
+        """The open connection, reconnecting after it was closed or broke."""
+        if self._conn is None or self._conn.closed or self._conn.broken:
+            self._conn = self._psycopg.connect(self.dsn, autocommit=True)
+        return self._conn
+
+    def detect_interests(self, text: str) -> List[str]:
+        """Interests with a keyword anywhere in text, substring matches as in the edge function."""
+        text = normalize_for_matching(text)
+        return [name for name, keywords in self.interests if any(keyword in text for keyword in keywords)]
+
+    def article_row(self, article: Article) -> tuple:
+        interests = self.detect_interests(f"{article.title} {article.original_content}")
+        return (
+            ScraperConfig.POSTGRES_COUNTRY, article.source, article.title, article.original_content,
+            article.simplified_content, list(article.detailed_points), article.category, article.category_emoji,
+            article.category_name, article.url, interests, article.date or article.scraped_at[:10],
+            parse_scraped_at(article.scraped_at),
+        )
+
+    def write_articles(self, articles: Iterable[Article]) -> Tuple[int, int]:
+        """Upsert articles by URL in batches; returns (inserted, updated) row counts."""
+        inserted = updated = 0
+        batch = {}
+        for article in articles:
+            batch[article.url] = article  # A URL seen twice keeps its last version
+            if len(batch) >= self.batch_size:
+                counts = self._write_batch(list(batch.values()))
+                inserted, updated = inserted + counts[0], updated + counts[1]
+                batch = {}
+        if batch:
+            counts = self._write_batch(list(batch.values()))
+            inserted, updated = inserted + counts[0], updated + counts[1]
+        return inserted, updated
+
+    def _write_batch(self, articles: List[Article]) -> Tuple[int, int]:
+        data = ''.join(copy_line(self.article_row(article)) for article in articles)
+        with self._lock:
+            conn = self.connection()
+            with conn.transaction(), conn.cursor() as cursor:
+                # Concurrent exports must not both insert the same new URL
+                cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (self._lock_key,))
+                cursor.execute(self._create_staging)
+                with cursor.copy(self._copy) as copy:
+                    copy.write(data)
+                cursor.execute(self._update)
+                updated = cursor.rowcount
+                cursor.execute(self._insert, (ScraperConfig.POSTGRES_NEW_TAGS,))
+                inserted = cursor.rowcount
+        return inserted, updated
+
+    def record_run(self, summary: dict):
+        """Insert (or complete) the scraper_runs row of a run summary from ScraperMetrics."""
+        with self._lock:
+            conn = self.connection()
+            with conn.transaction():
+                conn.execute(self._insert_run, [summary[name] for name in RUN_COLUMNS])
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export stored articles to Postgres")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    export_parser = subparsers.add_parser('export', help="upsert every stored article by URL")
+    export_parser.add_argument('--store-dir', default=ScraperConfig.ARTICLE_STORE_DIR)
+    export_parser.add_argument('--dsn', default=ScraperConfig.POSTGRES_DSN,
+                               help="Postgres connection string (default: $SCRAPER_POSTGRES_DSN)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    from article_store import ArticleStore, record_to_article
+    store = ArticleStore(args.store_dir)
+    sink = PostgresSink(args.dsn)
+    started = time.perf_counter()
+    # Oldest first, so a later copy of an article wins
+    inserted, updated = sink.write_articles(
+        record_to_article(record) for record in store.iter_records(newest_first=False)
+    )
+    elapsed = time.perf_counter() - started
+    sink.close()
+    logging.info(f"Exported to {ScraperConfig.POSTGRES_ARTICLES_TABLE}: {inserted} inserted, {updated} updated "
+                 f"in {elapsed:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
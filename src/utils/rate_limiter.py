@@ -0,0 +1,239 @@
+"""
+Per-host politeness for the scraper's HTTP client.
+Every request first checks the host's robots.txt (fetched once and cached
+for ROBOTS_TTL_SECONDS), then takes a token from the host's bucket. The
+bucket's rate adapts like TCP congestion control: it grows a little after
+every healthy response and is cut when the host answers 429/503 or gets
+much slower than usual. A robots.txt Crawl-delay or Request-rate caps the
+rate for that host.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+from scraper_config import ScraperConfig
+
+BACKOFF_STATUSES = {429, 503}
+
+
+class RobotsDisallowed(Exception):
+    """The URL is disallowed for us by the host's robots.txt."""
+
+
+def host_key(url: str) -> str:
+    """scheme://host[:port] of a URL; robots.txt and rates are tracked per key."""
+    parts = urlsplit(url)
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+
+def is_robots_url(url: str) -> bool:
+    return urlsplit(url).path == '/robots.txt'
+
+
+@dataclass
+class RobotsRules:
+    parser: RobotFileParser
+    expires: float
+    crawl_delay: Optional[float] = None  # Seconds between requests asked for by the site
+
+
+class RobotsCache:
+    """robots.txt per host, refetched after ROBOTS_TTL_SECONDS.
+
+    Follows RFC 9309: a missing robots.txt (4xx) allows everything, and an
+    unreachable one (5xx or network error) disallows everything until it can
+    be fetched again, unless an earlier copy is known, which is then kept.
+    """
+
+    def __init__(self, fetch: Optional[Callable[[str], requests.Response]] = None):
+        # GETs robots.txt; an HTTPClient given the limiter sets itself here, for its retries and metrics
+        self.fetch = fetch
+        self.user_agent = ScraperConfig.ROBOTS_USER_AGENT
+        self._rules: Dict[str, RobotsRules] = {}
+        self._lock = threading.Lock()
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self.fetches = 0
+
+    def rules_for(self, url: str) -> RobotsRules:
+        key = host_key(url)
+        with self._lock:
+            rules = self._rules.get(key)
+            if rules is not None and rules.expires > time.monotonic():
+                return rules
+            host_lock = self._host_locks.setdefault(key, threading.Lock())
+
+        # One fetch per host; other threads wait for it instead of fetching too
+        with host_lock:
+            with self._lock:
+                current = self._rules.get(key)
+            if current is not None and current.expires > time.monotonic():
+                return current
+            rules = self._load(key, current)
+            with self._lock:
+                self._rules[key] = rules
+            return rules
+
+    def _load(self, key: str, previous: Optional[RobotsRules]) -> RobotsRules:
+        robots_url = f"{key}/robots.txt"
+        parser = RobotFileParser(robots_url)
+        ttl = ScraperConfig.ROBOTS_TTL_SECONDS
+        self.fetches += 1
+        try:
+            response = self.fetch(robots_url)
+            status = response.status_code
+        except Exception as e:
+            logging.warning(f"Could not fetch {robots_url}: {e}")
+            status = None
+
+        if status is not None and 200 <= status < 300:
+            parser.parse(response.text.splitlines())
+        elif status is not None and 400 <= status < 500:
+            parser.allow_all = True
+        elif previous is not None:
+            logging.warning(f"{robots_url} unavailable (HTTP {status}), keeping the previous rules")
+            previous.expires = time.monotonic() + ScraperConfig.ROBOTS_ERROR_TTL_SECONDS
+            return previous
+        else:
+            logging.warning(f"{robots_url} unavailable (HTTP {status}), not crawling {key} for now")
+            parser.disallow_all = True
+            ttl = ScraperConfig.ROBOTS_ERROR_TTL_SECONDS
+
+        crawl_delay = None
+        delay = parser.crawl_delay(self.user_agent)
+        if delay is not None:
+            crawl_delay = float(delay)
+        request_rate = parser.request_rate(self.user_agent)
+        if request_rate is not None and request_rate.requests:
+            crawl_delay = max(crawl_delay or 0.0, request_rate.seconds / request_rate.requests)
+        if crawl_delay:
+            logging.info(f"{robots_url} asks for {crawl_delay:g}s between requests")
+        return RobotsRules(parser, time.monotonic() + ttl, crawl_delay)
+
+    def allowed(self, url: str) -> bool:
+        return self.rules_for(url).parser.can_fetch(self.user_agent, url)
+
+
+@dataclass
+class HostState:
+    rate: float  # Requests per second currently allowed
+    ceiling: float
+    tokens: float
+    updated: float
+    paused_until: float = 0.0
+    latency: Optional[float] = None  # Moving average of response time
+    baseline: Optional[float] = None  # What the host's response time usually is
+    last_decrease: float = 0.0
+    counters: Dict[str, int] = field(default_factory=lambda: {'requests': 0, 'slowdowns': 0, 'waited_ms': 0})
+
+
+class HostRateLimiter:
+    """Token bucket per host with additive-increase / multiplicative-decrease rates."""
+
+    def __init__(self, robots: Optional[RobotsCache] = None):
+        self.robots = robots if robots is not None else RobotsCache()
+        self.max_rate = ScraperConfig.RATE_LIMIT_MAX_PER_SECOND
+        self.initial_rate = ScraperConfig.RATE_LIMIT_INITIAL_PER_SECOND
+        self.respect_robots = ScraperConfig.RESPECT_ROBOTS_TXT
+        self._hosts: Dict[str, HostState] = {}
+        self._lock = threading.Lock()
+        self.blocked = 0
+
+    def _state(self, key: str, now: float, crawl_delay: Optional[float]) -> HostState:
+        state = self._hosts.get(key)
+        ceiling = self.max_rate if not crawl_delay else min(self.max_rate, 1.0 / crawl_delay)
+        if state is None:
+            rate = min(self.initial_rate, ceiling)
+            state = HostState(rate=rate, ceiling=ceiling, tokens=ScraperConfig.RATE_LIMIT_BURST, updated=now)
+            self._hosts[key] = state
+        elif state.ceiling != ceiling:
+            # robots.txt was refetched with a different delay
+            state.ceiling = ceiling
+            state.rate = min(state.rate, ceiling)
+        return state
+
+    def acquire(self, url: str):
+        """Block until a request to url may be sent; raises RobotsDisallowed if it may not."""
+        crawl_delay = None
+        # robots.txt itself is always allowed, and is what rules_for is fetching
+        if self.respect_robots and not is_robots_url(url):
+            rules = self.robots.rules_for(url)
+            if not rules.parser.can_fetch(self.robots.user_agent, url):
+                with self._lock:
+                    self.blocked += 1
+                raise RobotsDisallowed(f"{url} is disallowed by robots.txt")
+            crawl_delay = rules.crawl_delay
+
+        key = host_key(url)
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(key, now, crawl_delay)
+            burst = 1 if crawl_delay else ScraperConfig.RATE_LIMIT_BURST
+            state.tokens = min(burst, state.tokens + (now - state.updated) * state.rate)
+            state.updated = now
+            # Take the token now, going into debt, and sleep until the debt is paid
+            state.tokens -= 1
+            wait = max(0.0, -state.tokens / state.rate, state.paused_until - now)
+            state.counters['requests'] += 1
+            state.counters['waited_ms'] += int(wait * 1000)
+        if wait > 0:
+            time.sleep(wait)
+
+    def observe(self, url: str, seconds: float, status: Optional[int], retry_after: Optional[float] = None):
+        """Adapt the host's rate to how a request went; status None means it failed without a response."""
+        key = host_key(url)
+        with self._lock:
+            state = self._hosts.get(key)
+            if state is None:
+                return
+            now = time.monotonic()
+
+            if status in BACKOFF_STATUSES or status is None:
+                if retry_after:
+                    state.paused_until = max(state.paused_until, now + min(retry_after, ScraperConfig.HTTP_RETRY_AFTER_MAX))
+                self._decrease(key, state, now, f"HTTP {status}" if status else "request failed")
+                return
+
+            state.latency = seconds if state.latency is None else 0.8 * state.latency + 0.2 * seconds
+            if state.baseline is None or state.latency < state.baseline:
+                state.baseline = state.latency
+            else:
+                # Follow lasting changes in the host's normal response time slowly
+                state.baseline += 0.01 * (state.latency - state.baseline)
+
+            slow = (state.latency > ScraperConfig.RATE_LIMIT_SLOW_SECONDS
+                    and state.latency > state.baseline * ScraperConfig.RATE_LIMIT_SLOW_FACTOR)
+            if slow:
+                self._decrease(key, state, now, f"responses slowed to {state.latency:.1f}s")
+            elif status < 400:
+                state.rate = min(state.ceiling, state.rate + ScraperConfig.RATE_LIMIT_INCREASE)
+
+    def _decrease(self, key: str, state: HostState, now: float, reason: str):
+        # One cut per cooldown: a burst of errors from requests already in flight is one signal
+        if now - state.last_decrease < ScraperConfig.RATE_LIMIT_COOLDOWN_SECONDS:
+            return
+        state.last_decrease = now
+        state.rate = max(ScraperConfig.RATE_LIMIT_MIN_PER_SECOND, state.rate * ScraperConfig.RATE_LIMIT_DECREASE)
+        state.counters['slowdowns'] += 1
+        logging.warning(f"Slowing down to {state.rate:.2f} requests/s for {key}: {reason}")
+
+    def rates(self) -> Dict[str, float]:
+        with self._lock:
+            return {key: state.rate for key, state in self._hosts.items()}
+
+    def report(self) -> str:
+        with self._lock:
+            parts = [
+                f"{urlsplit(key).netloc} {state.rate:.2f}/s ({state.counters['slowdowns']} slowdowns, "
+                f"{state.counters['waited_ms'] / 1000:.1f}s waited)"
+                for key, state in self._hosts.items()
+            ]
+        if self.blocked:
+            parts.append(f"{self.blocked} requests blocked by robots.txt")
+        return ', '.join(parts) or 'no requests'
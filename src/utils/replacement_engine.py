@@ -0,0 +1,49 @@
+"""
+Single-pass glossary replacement.
+A replacement table is compiled once into one regular expression; the text
+is then rewritten in a single scan where the longest whole-word match wins,
+independent of the table's order.
+"""
+
+import re
+from typing import Dict
+
+from keyword_matcher import build_trie_pattern
+from romanian_text import fold_cedillas, normalize_for_matching
+
+
+class ReplacementEngine:
+    """Rewrites whole words and phrases from a table in one pass.
+
+    Table keys are lowercased, and the text is expected in lowercase too
+    (the simplifiers lowercase it first). Cedilla and comma-below diacritics
+    are treated as equal when matching; text outside a match keeps its
+    original spelling. Replacements are never rescanned, so one entry's
+    output cannot be rewritten by another entry.
+    """
+
+    def __init__(self, table: Dict[str, str]):
+        self.table = {normalize_for_matching(old): new for old, new in table.items()}
+        self.pattern = None
+        if self.table:
+            self.pattern = re.compile(r'(?<!\w)(?:' + build_trie_pattern(self.table) + r')(?!\w)')
+
+    def apply(self, text: str) -> str:
+        """Return text with every table entry replaced."""
+        if self.pattern is None or not text:
+            return text
+        folded = fold_cedillas(text)
+        if folded is text:
+            return self.pattern.sub(lambda match: self.table[match.group(0)], text)
+        # Folding maps one character to one, so match offsets in the folded
+        # text also hold in the original; text between matches is kept as is.
+        parts = []
+        end = 0
+        for match in self.pattern.finditer(folded):
+            parts.append(text[end:match.start()])
+            parts.append(self.table[match.group(0)])
+            end = match.end()
+        if not parts:
+            return text
+        parts.append(text[end:])
+        return ''.join(parts)
@@ -0,0 +1,217 @@
+"""
+Record and replay raw HTTP responses.
+While recording, every response the scraper receives is appended to an
+archive file as its own gzip member: one JSON header line (URL, status,
+headers, body length) followed by the body, much like a WARC record.
+Replaying serves those responses back by URL, so the whole pipeline runs
+offline, without retries or waiting on the network.
+"""
+
+import gzip
+import json
+import logging
+import threading
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import BinaryIO, Deque, Dict, Iterator, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from scraper_config import ScraperConfig
+
+CONDITIONAL_HEADERS = ('If-None-Match', 'If-Modified-Since')
+READ_SIZE = 64 * 1024
+
+
+@dataclass
+class ArchiveRecord:
+    url: str
+    status: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b''
+    error: Optional[str] = None  # Set when the request raised instead of returning
+    recorded_at: str = ''
+
+    def to_response(self) -> requests.Response:
+        response = requests.Response()
+        response.url = self.url
+        response.status_code = self.status
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.body
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+
+class ArchiveWriter:
+    """Appends records to an archive; safe to share between fetch threads."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or ScraperConfig.HTTP_ARCHIVE_FILE
+        self.records = 0
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'ab')
+
+    def write(self, record: ArchiveRecord):
+        header = {
+            'url': record.url,
+            'status': record.status,
+            'headers': record.headers,
+            'length': len(record.body),
+            'error': record.error,
+            'recorded_at': record.recorded_at or datetime.now().isoformat(),
+        }
+        # One gzip member per record, so the file can be appended to and read as one stream
+        member = gzip.compress(json.dumps(header, ensure_ascii=False).encode('utf-8') + b'\n' + record.body)
+        with self._lock:
+            self._file.write(member)
+            self._file.flush()
+            self.records += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def parse_member(data: bytes) -> ArchiveRecord:
+    """Decode one decompressed record: header line, then the body."""
+    line, _, body = data.partition(b'\n')
+    header = json.loads(line)
+    return ArchiveRecord(
+        url=header['url'],
+        status=header['status'],
+        headers=header.get('headers') or {},
+        body=body[:header['length']],
+        error=header.get('error'),
+        recorded_at=header.get('recorded_at', '')
+    )
+
+
+def iter_members(handle: BinaryIO) -> Iterator[Tuple[int, bytes]]:
+    """Yield (offset, decompressed data) for every gzip member in the file."""
+    handle.seek(0)
+    offset, pending = 0, b''
+    while True:
+        decompressor = zlib.decompressobj(wbits=31)
+        parts, consumed = [], 0
+        while not decompressor.eof:
+            chunk = pending or handle.read(READ_SIZE)
+            pending = b''
+            if not chunk:
+                if consumed:
+                    raise ValueError(f"Truncated archive record at offset {offset}")
+                return
+            parts.append(decompressor.decompress(chunk))
+            consumed += len(chunk)
+        pending = decompressor.unused_data
+        yield offset, b''.join(parts)
+        offset += consumed - len(pending)
+
+
+def read_archive(path: str) -> Iterator[ArchiveRecord]:
+    """Yield the records of an archive in the order they were recorded."""
+    with open(path, 'rb') as handle:
+        for _, data in iter_members(handle):
+            yield parse_member(data)
+
+
+def index_archive(path: str) -> Dict[str, int]:
+    """Offset of the last successful response recorded for each URL."""
+    offsets = {}
+    with open(path, 'rb') as handle:
+        for offset, data in iter_members(handle):
+            header = json.loads(data.partition(b'\n')[0])
+            if not header.get('error') and 200 <= header['status'] < 300:
+                offsets[header['url']] = offset
+    return offsets
+
+
+def read_record_at(handle: BinaryIO, offset: int) -> ArchiveRecord:
+    """Read the single record starting at offset (as found by index_archive)."""
+    handle.seek(offset)
+    decompressor = zlib.decompressobj(wbits=31)
+    parts = []
+    while not decompressor.eof:
+        chunk = handle.read(READ_SIZE)
+        if not chunk:
+            raise ValueError(f"Truncated archive record at offset {offset}")
+        parts.append(decompressor.decompress(chunk))
+    return parse_member(b''.join(parts))
+
+
+class RecordingHTTPClient:
+    """Wraps an HTTPClient and archives every final response (or error) it returns."""
+
+    def __init__(self, client, writer: ArchiveWriter):
+        self.client = client
+        self.writer = writer
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        # Full bodies only: a 304 would leave nothing to replay
+        headers = {
+            name: value for name, value in (kwargs.pop('headers', None) or {}).items()
+            if name not in CONDITIONAL_HEADERS
+        }
+        try:
+            response = self.client.get(url, headers=headers, **kwargs)
+        except Exception as e:
+            self.writer.write(ArchiveRecord(url=url, status=0, error=f"{type(e).__name__}: {e}"))
+            raise
+        self.writer.write(ArchiveRecord(
+            url=url, status=response.status_code, headers=dict(response.headers), body=response.content
+        ))
+        return response
+
+    def stats(self) -> dict:
+        return self.client.stats()
+
+    def close(self):
+        self.client.close()
+        self.writer.close()
+
+
+class ReplayHTTPClient:
+    """Serves archived responses by URL and never touches the network.
+
+    A URL recorded several times is replayed in recording order; once its
+    records run out the last one is served again.
+    """
+
+    def __init__(self, path: Optional[str] = None, metrics=None):
+        self.path = path or ScraperConfig.HTTP_ARCHIVE_FILE
+        self.metrics = metrics
+        self._records: Dict[str, Deque[ArchiveRecord]] = {}
+        self._lock = threading.Lock()
+        self._counters = {'requests': 0, 'missing': 0}
+        for record in read_archive(self.path):
+            self._records.setdefault(record.url, deque()).append(record)
+        logging.info(f"Loaded {sum(len(q) for q in self._records.values())} responses "
+                     f"for {len(self._records)} URLs from {self.path}")
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        with self._lock:
+            self._counters['requests'] += 1
+            queue = self._records.get(url)
+            if not queue:
+                self._counters['missing'] += 1
+                record = None
+            else:
+                record = queue.popleft() if len(queue) > 1 else queue[0]
+        if record is None:
+            raise requests.ConnectionError(f"{url} is not in the archive")
+        if self.metrics is not None:
+            self.metrics.observe_fetch(url, 0.0, len(record.body), ok=record.error is None and record.status < 400)
+        if record.error:
+            raise requests.ConnectionError(f"Recorded failure: {record.error}")
+        return record.to_response()
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+        counters.update({'retries': 0, 'connections_reused': 0, 'connections_opened': 0})
+        return counters
+
+    def close(self):
+        pass
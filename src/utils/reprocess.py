@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Bulk reprocessing of the stored corpus.
+After CATEGORIES, WORD_REPLACEMENTS, FUN_ENDINGS or POINT_RULES change,
+this re-runs categorization, point extraction and simplification over
+every stored article without scraping again. Records are streamed from
+the store in chunks to a pool of worker processes, and the results are
+appended in the original order to a new store next to the live one, which
+replaces it once every article is done. An interrupted run resumes from
+the records already written.
+
+Detailed points come from the page structure, which the stored text no
+longer has: they are recomputed only for articles whose page is in an
+HTTP archive recorded with `scraper.py --record` (pass --archive), and
+kept as they are otherwise.
+
+Usage: python reprocess.py [--workers N] [--chunk-size 500] [--fields category,points,simplified]
+                           [--archive http_archive.gz] [--store-dir article_store] [--restart]
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import shutil
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from article_store import ArticleStore
+from derived_cache import config_version
+from feed_export import FeedExporter
+from html_document import parse_html
+from replay_archive import index_archive, read_record_at
+from scraper import MultiWebsiteScraper
+from scraper_config import ScraperConfig
+from search_index import SearchIndex, latest_articles
+
+FIELDS = ('category', 'points', 'simplified')
+RECORD_ID = re.compile(rb'^\{"id":"((?:[^"\\]|\\.)*)"')
+
+# Per worker process, set up by init_worker
+_processor: Optional[MultiWebsiteScraper] = None
+_archive: Optional[BinaryIO] = None
+
+
+def record_id(line: bytes) -> str:
+    """The article ID of a stored line; records are written with the ID first."""
+    match = RECORD_ID.match(line)
+    return match.group(1).decode('utf-8') if match else json.loads(line).get('id')
+
+
+def processing_version() -> str:
+    """Hash of every config table the reprocessed fields depend on."""
+    preferences = {source: site.get('categories', []) for source, site in ScraperConfig.WEBSITES.items()}
+    return config_version(
+        ScraperConfig.CATEGORIES, preferences, ScraperConfig.CATEGORY_PREFERENCE_WEIGHT,
+        ScraperConfig.POINT_RULES, ScraperConfig.WORD_REPLACEMENTS, ScraperConfig.FUN_ENDINGS
+    )
+
+
+def store_fingerprint(store: ArticleStore) -> List[List[int]]:
+    """Segment numbers and sizes; any write to the store changes it."""
+    return [[number, os.path.getsize(store.segment_path(number))] for number in store.segment_numbers()]
+
+
+def init_worker(archive_path: Optional[str]):
+    global _processor, _archive
+    # Per-article info lines would dominate the run time
+    logging.getLogger().setLevel(logging.WARNING)
+    _processor = MultiWebsiteScraper(processing_only=True)
+    _archive = open(archive_path, 'rb') if archive_path else None
+
+
+def reprocess_record(record: dict, page_offset: Optional[int], fields: Tuple[str, ...]) -> Tuple[dict, bool]:
+    """Recompute the requested fields of one record; returns it and whether the page was used."""
+    source = record['source']
+    content = record.get('original_content', '')
+    if len(content) > ScraperConfig.MAX_CONTENT_LENGTH and content.endswith('...'):
+        content = content[:-3]
+
+    doc = None
+    if page_offset is not None:
+        doc = parse_html(read_record_at(_archive, page_offset).body)
+        content = doc.content_text(ScraperConfig.WEBSITES[source]['content_selectors']) or content
+
+    category = record['category']
+    if 'category' in fields:
+        category, record['category_emoji'], record['category_name'] = _processor.categorize_content(content, source)
+        record['category'] = category
+    if 'points' in fields and doc is not None:
+        record['detailed_points'] = _processor.points_from_structured_text(_processor.structured_text(doc, source), source)
+    if 'simplified' in fields:
+        record['simplified_content'] = _processor.simplify_text_for_kids(content, category)
+    return record, doc is not None
+
+
+def process_chunk(items: List[Tuple[bytes, Optional[int]]], fields: Tuple[str, ...]) -> Tuple[bytes, Counter]:
+    """Reprocess a chunk of stored lines in a worker; returns the serialized records."""
+    lines, counts = [], Counter()
+    for line, page_offset in items:
+        try:
+            record, used_page = reprocess_record(json.loads(line), page_offset, fields)
+            counts['from_page' if used_page else 'from_text'] += 1
+            lines.append(json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n')
+        except Exception as e:
+            # Keep the article as it was rather than lose it
+            logging.error(f"Error reprocessing {record_id(line)}: {e}")
+            counts['failed'] += 1
+            lines.append(bytes(line) + b'\n')
+    return b''.join(lines), counts
+
+
+class Reprocessor:
+    """Rebuilds the store at store_dir into store_dir + '.reprocess', then swaps it in."""
+
+    def __init__(self, store_dir: Optional[str] = None, fields: Tuple[str, ...] = FIELDS,
+                 archive: Optional[str] = None, workers: Optional[int] = None, chunk_size: Optional[int] = None):
+        self.store_dir = store_dir or ScraperConfig.ARTICLE_STORE_DIR
+        self.work_dir = self.store_dir.rstrip(os.sep) + '.reprocess'
+        self.checkpoint_file = os.path.join(self.work_dir, 'checkpoint.json')
+        self.fields = tuple(fields)
+        self.archive = os.path.abspath(archive) if archive else None
+        self.workers = workers or ScraperConfig.REPROCESS_WORKERS or os.cpu_count() or 1
+        self.chunk_size = chunk_size or ScraperConfig.REPROCESS_CHUNK_SIZE
+        self.counts = Counter()
+
+    def checkpoint(self, source: ArticleStore) -> dict:
+        return {
+            'fields': list(self.fields),
+            'config_version': processing_version(),
+            'archive': self.archive,
+            'source': store_fingerprint(source),
+        }
+
+    def prepare(self, source: ArticleStore, restart: bool) -> ArticleStore:
+        """Open the output store, starting over unless an identical run can be resumed."""
+        expected = self.checkpoint(source)
+        previous = None
+        if not restart and os.path.exists(self.checkpoint_file):
+            with open(self.checkpoint_file, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        if previous != expected:
+            if os.path.exists(self.work_dir):
+                logging.info(f"Discarding the previous reprocessing run in {self.work_dir}")
+                shutil.rmtree(self.work_dir)
+            os.makedirs(self.work_dir)
+            with open(self.checkpoint_file, 'w', encoding='utf-8') as f:
+                json.dump(expected, f)
+        return ArticleStore(os.path.join(self.work_dir, 'store'))
+
+    def latest_lines(self, source: ArticleStore, skip: int) -> Iterator[bytes]:
+        """Stored lines oldest first, one per article ID (its latest copy), after the first skip."""
+        latest: Dict[str, int] = {}
+        for position, line in enumerate(source.iter_lines(newest_first=False)):
+            latest[record_id(line)] = position
+        self.counts['total'] = len(latest)
+
+        kept = 0
+        for position, line in enumerate(source.iter_lines(newest_first=False)):
+            if latest[record_id(line)] != position:
+                continue
+            kept += 1
+            if kept > skip:
+                yield bytes(line)
+
+    def chunks(self, lines: Iterator[bytes], pages: Dict[str, int]) -> Iterator[List[Tuple[bytes, Optional[int]]]]:
+        chunk = []
+        for line in lines:
+            page_offset = None
+            if pages:
+                page_offset = pages.get(json.loads(line).get('url'))
+            chunk.append((line, page_offset))
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def run(self, restart: bool = False) -> Counter:
+        source = ArticleStore(self.store_dir)
+        output = self.prepare(source, restart)
+        done = sum(1 for _ in output.iter_lines())
+        if done:
+            logging.info(f"Resuming: {done} articles already reprocessed")
+
+        pages = index_archive(self.archive) if self.archive else {}
+        if self.archive:
+            logging.info(f"Indexed {len(pages)} recorded pages in {self.archive}")
+
+        fingerprint = store_fingerprint(source)
+        started = self.last_log = time.perf_counter()
+        processed = 0
+        chunks = self.chunks(self.latest_lines(source, done), pages)
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker, initargs=(self.archive,)) as pool:
+            # Keep a bounded window of chunks in flight and write results in order
+            in_flight = []
+            for chunk in chunks:
+                in_flight.append(pool.submit(process_chunk, chunk, self.fields))
+                if len(in_flight) >= self.workers * 2:
+                    processed += self.write(output, in_flight.pop(0).result())
+                    self.log_progress(done + processed, processed, started)
+            for future in in_flight:
+                processed += self.write(output, future.result())
+        output.close()
+
+        elapsed = time.perf_counter() - started
+        logging.info(
+            f"Reprocessed {processed} articles in {elapsed:.1f}s ({processed / max(elapsed, 1e-9):.0f}/s, "
+            f"{self.workers} workers): {self.counts['from_page']} from recorded pages, "
+            f"{self.counts['from_text']} from stored text, {self.counts['failed']} failed"
+        )
+
+        if store_fingerprint(source) != fingerprint:
+            raise RuntimeError(f"{self.store_dir} changed while reprocessing; stop the scraper and run again")
+        self.swap()
+        return self.counts
+
+    def write(self, output: ArticleStore, result: Tuple[bytes, Counter]) -> int:
+        payload, counts = result
+        self.counts.update(counts)
+        return output.append_lines([payload])
+
+    def log_progress(self, written: int, processed: int, started: float):
+        now = time.perf_counter()
+        if now - self.last_log >= ScraperConfig.REPROCESS_PROGRESS_SECONDS:
+            self.last_log = now
+            logging.info(f"Reprocessed {written} of {self.counts['total']} articles ({processed / (now - started):.0f}/s)")
+
+    def swap(self):
+        """Put the rebuilt store in place of the live one, keeping the old one as a backup."""
+        backup = f"{self.store_dir.rstrip(os.sep)}.before-reprocess-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        os.replace(self.store_dir, backup)
+        os.replace(os.path.join(self.work_dir, 'store'), self.store_dir)
+        shutil.rmtree(self.work_dir)
+        logging.info(f"Reprocessed store is live in {self.store_dir}; previous store kept in {backup}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-run categorization, points and simplification on stored articles")
+    parser.add_argument('--store-dir', default=ScraperConfig.ARTICLE_STORE_DIR)
+    parser.add_argument('--fields', default=','.join(FIELDS), help=f"comma-separated subset of {', '.join(FIELDS)}")
+    parser.add_argument('--archive', help="HTTP archive recorded with scraper.py --record, for detailed points")
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per core)")
+    parser.add_argument('--chunk-size', type=int, help="articles per task sent to a worker")
+    parser.add_argument('--restart', action='store_true', help="ignore an interrupted run instead of resuming it")
+    args = parser.parse_args()
+
+    fields = tuple(field.strip() for field in args.fields.split(',') if field.strip())
+    unknown = set(fields) - set(FIELDS)
+    if unknown:
+        parser.error(f"unknown fields: {', '.join(sorted(unknown))}")
+    if 'points' in fields and not args.archive:
+        logging.info("No --archive given: detailed points are kept as stored")
+
+    Reprocessor(args.store_dir, fields, args.archive, args.workers, args.chunk_size).run(restart=args.restart)
+    if args.store_dir == ScraperConfig.ARTICLE_STORE_DIR:
+        # Categories and points changed; the search filters and postings must follow
+        index = SearchIndex()
+        count = index.rebuild(latest_articles(ArticleStore(args.store_dir)))
+        index.close()
+        logging.info(f"Rebuilt the search index with {count} articles")
+        if ScraperConfig.FEED_ENABLED:
+            count = FeedExporter().rebuild(ArticleStore(args.store_dir).iter_lines())
+            logging.info(f"Rewrote the feed with {count} articles")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""Helpers for normalizing Romanian text before matching."""
+
+# Legacy cedilla forms (ş, ţ) are still common on gov.ro; fold them to the
+# comma-below forms (ș, ț) used in the config tables.
+CEDILLA_PAIRS = (
+    ('ş', 'ș'), ('Ş', 'Ș'),
+    ('ţ', 'ț'), ('Ţ', 'Ț'),
+)
+
+
+def fold_cedillas(text: str) -> str:
+    """Replace cedilla s/t with their comma-below equivalents."""
+    # str.replace is much faster than str.translate on non-ASCII text
+    for cedilla, comma in CEDILLA_PAIRS:
+        if cedilla in text:
+            text = text.replace(cedilla, comma)
+    return text
+
+
+def normalize_for_matching(text: str) -> str:
+    """Lowercase text and fold cedilla diacritics."""
+    return fold_cedillas(text.lower())
+
+
+# Search ignores diacritics altogether: "scoala" finds "școală" and "şcoală"
+DIACRITIC_PAIRS = (
+    ('ă', 'a'), ('â', 'a'), ('î', 'i'),
+    ('ș', 's'), ('ş', 's'), ('ț', 't'), ('ţ', 't'),
+)
+
+
+def fold_diacritics(text: str) -> str:
+    """Lowercase text and strip Romanian diacritics, cedilla forms included."""
+    text = text.lower()
+    for marked, plain in DIACRITIC_PAIRS:
+        if marked in text:
+            text = text.replace(marked, plain)
+    return text
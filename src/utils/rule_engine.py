@@ -0,0 +1,112 @@
+"""
+Declarative point rules.
+ScraperConfig.POINT_RULES is compiled once per source into a single keyword
+scanner; each section is scanned once and the highest-priority matching
+rule wins. Hits are counted per rule so rules that never fire show up.
+"""
+
+import logging
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Set
+
+from keyword_matcher import build_trie_pattern
+from romanian_text import normalize_for_matching
+
+RULE_FIELDS = {'id', 'sources', 'priority', 'any', 'all', 'text'}
+
+
+class CompiledRuleSet:
+    """The rules for one source, sorted by priority, with one keyword scanner."""
+
+    def __init__(self, rules: List[dict]):
+        self.rules = sorted(rules, key=lambda rule: rule['priority'])
+        keywords: Set[str] = set()
+        for rule in self.rules:
+            keywords.update(rule['any'])
+            keywords.update(rule['all'])
+
+        # Substring semantics: a keyword found inside a longer matched keyword counts too
+        self._contained = {
+            keyword: {other for other in keywords if other in keyword}
+            for keyword in keywords
+        }
+        self.pattern = re.compile(build_trie_pattern(keywords)) if keywords else None
+
+    def keywords_in(self, text: str) -> Set[str]:
+        found: Set[str] = set()
+        if self.pattern is None:
+            return found
+        text = normalize_for_matching(text)
+        # Resume one character after each match start rather than at its end, so
+        # keywords that overlap ("spital" and "lei" in "spitalei") are all found;
+        # a (?=...) lookahead would do the same but disables re's fast prefix scan
+        search = self.pattern.search
+        match = search(text)
+        while match is not None:
+            found |= self._contained[match.group()]
+            match = search(text, match.start() + 1)
+        return found
+
+    def first_match(self, text: str) -> Optional[dict]:
+        found = self.keywords_in(text)
+        for rule in self.rules:
+            if rule['all'] and not rule['all'] <= found:
+                continue
+            if rule['any'] and found.isdisjoint(rule['any']):
+                continue
+            return rule
+        return None
+
+
+class PointRuleEngine:
+    """Maps a content section to a kid-friendly point using data-driven rules."""
+
+    def __init__(self, rules: List[dict]):
+        by_source: Dict[str, List[dict]] = {}
+        seen_ids = set()
+        for raw in rules:
+            unknown = set(raw) - RULE_FIELDS
+            if unknown or 'id' not in raw or 'text' not in raw:
+                raise ValueError(f"Invalid point rule {raw.get('id', raw)!r}: unknown fields {sorted(unknown)}")
+            if raw['id'] in seen_ids:
+                raise ValueError(f"Duplicate point rule id {raw['id']!r}")
+            seen_ids.add(raw['id'])
+
+            rule = {
+                'id': raw['id'],
+                'priority': raw.get('priority', 500),
+                'any': frozenset(normalize_for_matching(k) for k in raw.get('any', [])),
+                'all': frozenset(normalize_for_matching(k) for k in raw.get('all', [])),
+                'text': raw['text'],
+            }
+            for source in raw.get('sources', []):
+                by_source.setdefault(source, []).append(rule)
+
+        self.rule_ids = [raw['id'] for raw in rules]
+        self.rule_sets = {source: CompiledRuleSet(source_rules) for source, source_rules in by_source.items()}
+        self.hits: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def apply(self, text: str, source: str) -> str:
+        """Return the winning rule's text for a section, or '' if no rule matches."""
+        rule_set = self.rule_sets.get(source)
+        rule = rule_set.first_match(text) if rule_set else None
+        if rule is None:
+            return ""
+        with self._lock:
+            self.hits[rule['id']] += 1
+        return rule['text']
+
+    def dead_rules(self) -> List[str]:
+        """IDs of rules that have not fired since the engine was built."""
+        return [rule_id for rule_id in self.rule_ids if not self.hits[rule_id]]
+
+    def log_stats(self):
+        with self._lock:
+            hits = ', '.join(f"{rule_id}={count}" for rule_id, count in self.hits.most_common())
+        logging.info(f"Point rule hits: {hits or 'none'}")
+        dead = self.dead_rules()
+        if dead:
+            logging.info(f"Point rules that never fired: {', '.join(dead)}")
@@ -0,0 +1,150 @@
+"""
+Adaptive per-source polling.
+Each source keeps its own next-run time and polling interval. After every
+check the source's publish rate (new articles per second) is updated as an
+exponential moving average, and the interval is set so a check finds about
+POLL_TARGET_NEW_PER_CHECK new articles, clamped to the source's bounds.
+State is saved after every check so a restart resumes the same timetable.
+"""
+
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+from scraper_config import ScraperConfig
+
+
+@dataclass
+class SourceState:
+    interval: float  # Seconds until the next check
+    rate: float  # Smoothed new articles per second
+    next_run: float  # Epoch seconds
+    last_run: Optional[float] = None
+    last_found: int = 0
+
+
+class AdaptiveScheduler:
+    """Keeps per-source next-run times and adapts intervals to publish rates."""
+
+    def __init__(self, sources: List[str], state_file: Optional[str] = None,
+                 clock: Callable[[], float] = time.time):
+        self.state_file = state_file if state_file is not None else ScraperConfig.SCHEDULER_STATE_FILE
+        self.clock = clock
+        self.bounds = {source: ScraperConfig.POLL_INTERVALS[source] for source in sources}
+        self.states: Dict[str, SourceState] = {}
+
+        saved = self._load()
+        now = self.clock()
+        for source in sources:
+            if source in saved:
+                self.states[source] = saved[source]
+            else:
+                # New sources start with the configured interval and are due right away
+                initial = self.bounds[source]['initial']
+                self.states[source] = SourceState(
+                    interval=initial,
+                    rate=ScraperConfig.POLL_TARGET_NEW_PER_CHECK / initial,
+                    next_run=now,
+                )
+
+    def _load(self) -> Dict[str, SourceState]:
+        if not self.state_file or not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {source: SourceState(**fields) for source, fields in data.items()}
+        except Exception as e:
+            logging.error(f"Error loading scheduler state, starting fresh: {e}")
+            return {}
+
+    def save(self):
+        """Write the state atomically."""
+        if not self.state_file:
+            return
+        tmp_path = self.state_file + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({source: asdict(state) for source, state in self.states.items()}, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.state_file)
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """Sources whose next run time has passed."""
+        now = self.clock() if now is None else now
+        return [source for source, state in self.states.items() if state.next_run <= now]
+
+    def seconds_until_next(self, now: Optional[float] = None) -> float:
+        now = self.clock() if now is None else now
+        return max(0.0, min(state.next_run for state in self.states.values()) - now)
+
+    def record(self, source: str, new_count: int, now: Optional[float] = None):
+        """Update a source's publish rate and interval after a check."""
+        now = self.clock() if now is None else now
+        state = self.states[source]
+        bounds = self.bounds[source]
+
+        elapsed = now - state.last_run if state.last_run is not None else state.interval
+        observed = new_count / max(elapsed, 1.0)
+        alpha = ScraperConfig.POLL_RATE_SMOOTHING
+        state.rate = alpha * observed + (1 - alpha) * state.rate
+
+        if state.rate > 0:
+            interval = ScraperConfig.POLL_TARGET_NEW_PER_CHECK / state.rate
+        else:
+            interval = bounds['max']
+        state.interval = min(max(interval, bounds['min']), bounds['max'])
+        state.last_run = now
+        state.last_found = new_count
+        state.next_run = now + state.interval
+
+    def retry(self, source: str, now: Optional[float] = None):
+        """Check a source again after a failed check, without touching its rate or interval."""
+        now = self.clock() if now is None else now
+        state = self.states[source]
+        state.next_run = now + min(state.interval, self.bounds[source]['min'])
+
+    def run_once(self, check: Callable[[List[str]], Dict[str, Optional[int]]],
+                 extra: Iterable[str] = ()) -> List[str]:
+        """Run every due source, plus the extra ones, in one check call and reschedule them.
+
+        check returns new article counts per source; a missing source found
+        nothing, and None marks a source whose check failed.
+        """
+        sources = self.due()
+        sources += [source for source in extra if source not in sources]
+        if not sources:
+            return []
+        try:
+            found = check(sources)
+        except Exception as e:
+            logging.error(f"Scheduled check for {', '.join(sources)} failed: {e}")
+            found = dict.fromkeys(sources)
+        now = self.clock()
+        for source in sources:
+            count = found.get(source, 0)
+            if count is None:
+                # An outage is not a quiet site: keep the publish rate and try again soon
+                self.retry(source, now)
+                logging.warning(
+                    f"{source.upper()}: check failed, "
+                    f"retrying in {(self.states[source].next_run - now) / 60:.0f} min"
+                )
+                continue
+            self.record(source, count, now)
+            logging.info(
+                f"{source.upper()}: {count} new, "
+                f"next check in {self.states[source].interval / 60:.0f} min"
+            )
+        self.save()
+        return sources
+
+    def run_forever(self, check: Callable[[List[str]], Dict[str, Optional[int]]],
+                    sleep: Callable[[float], None] = time.sleep):
+        """Check due sources, then sleep until the next one is due."""
+        while True:
+            self.run_once(check)
+            sleep(self.seconds_until_next())
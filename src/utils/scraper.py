@@ -6,18 +6,38 @@ Monitors multiple government websites for new articles
 and processes them with AI to make them kid-friendly.
 """
 
-import requests
-from bs4 import BeautifulSoup
+import argparse
 import time
 import json
 import os
 from datetime import datetime, timedelta
 import re
-from dataclasses import dataclass, asdict
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 import schedule
 import logging
+from concurrent.futures import as_completed
 from scraper_config import ScraperConfig
+from models import Article
+from article_store import ArticleStore, record_to_article
+from derived_cache import DerivedCache, config_version
+from feed_export import FeedExporter
+from fetch_engine import ConcurrentFetcher
+from http_client import HTTPClient
+from http_cache import HTTPCache
+from html_document import HTMLDocument, parse_html
+from keyword_matcher import KeywordMatcher
+from llm_simplifier import LLMSimplifier, llm_enabled
+from metrics import ScraperMetrics, append_run_summary
+from near_duplicates import NearDuplicateIndex
+from postgres_sink import PostgresSink
+from rate_limiter import HostRateLimiter
+from replacement_engine import ReplacementEngine
+from replay_archive import ArchiveWriter, RecordingHTTPClient, ReplayHTTPClient
+from romanian_text import fold_diacritics
+from rule_engine import PointRuleEngine
+from scheduler import AdaptiveScheduler
+from search_index import SearchIndex, latest_articles
+from seen_store import SeenArticleStore, content_fingerprint, make_article_id
 
 # Configure logging
 logging.basicConfig(
@@ -29,81 +49,155 @@ logging.basicConfig(
     ]
 )
 
-@dataclass
-class Article:
-    id: str
-    date: str
-    title: str
-    original_content: str
-    simplified_content: str
-    detailed_points: List[str]
-    category: str
-    category_emoji: str
-    category_name: str
-    url: str
-    scraped_at: str
-    source: str  # Added source field
-    is_new: bool = True
+class PendingArticles:
+    """Articles accepted since the last save, with what is needed to save and index them."""
+    
+    def __init__(self):
+        self.articles: List[Article] = []
+        self.fingerprints: List[str] = []
+        self.signatures: list = []
+        self.simplifications: list = []
+        self.by_fingerprint: Dict[str, str] = {}
+        self.near_duplicates = NearDuplicateIndex(':memory:')
+    
+    def __len__(self) -> int:
+        return len(self.articles)
 
 class MultiWebsiteScraper:
-    def __init__(self):
+    def __init__(self, processing_only: bool = False):
+        """With processing_only, set up just the text processing (no stores, caches or HTTP)."""
+        self.metrics = ScraperMetrics()
+        self.failed_listings = set()  # Sources whose listing could not be fetched in the current check
+        self.category_matcher = KeywordMatcher.from_categories(ScraperConfig.CATEGORIES)
+        self.word_replacer = ReplacementEngine(ScraperConfig.WORD_REPLACEMENTS)
+        self.point_rules = PointRuleEngine(ScraperConfig.POINT_RULES)
+        if processing_only:
+            return
+        
         self.data_file = ScraperConfig.DATA_FILE
-        self.last_article_ids = self.load_last_article_ids()
+        self.store = ArticleStore(legacy_file=self.data_file)
+        self.seen = SeenArticleStore()
+        self.seed_seen_store()
+        self.near_duplicates = NearDuplicateIndex()
+        self.seed_near_duplicates()
+        self.search_index = SearchIndex()
+        self.seed_search_index()
+        self.feed = FeedExporter() if ScraperConfig.FEED_ENABLED else None
+        self.seed_feed()
         self.headers = ScraperConfig.REQUEST_HEADERS
+        self.rate_limiter = HostRateLimiter()
+        self.http = HTTPClient(self.headers, metrics=self.metrics, limiter=self.rate_limiter)
+        # Through whichever client is current, so --record archives robots.txt too
+        self.rate_limiter.robots.fetch = lambda url: self.http.get(url)
+        self.listing_cache = HTTPCache(parser_version=config_version(
+            ScraperConfig.LISTING_PARSER_VERSION, ScraperConfig.WEBSITES, ScraperConfig.PUBLISHED_DATE_SELECTORS
+        ))
+        self.derived = DerivedCache()
+        self.register_derived_stages()
+        self.simplifier = LLMSimplifier(self.simplify_text_for_kids, cache=self.derived) if llm_enabled() else None
+        self.postgres = None
+        if ScraperConfig.POSTGRES_DSN:
+            try:
+                self.postgres = PostgresSink()
+            except ImportError as e:
+                logging.error(f"Postgres export disabled, psycopg is not installed: {e}")
+
+    def seed_seen_store(self):
+        """One-time import of already stored articles into an empty seen-article store."""
+        if len(self.seen):
+            return
+        try:
+            records = []
+            for item in self.store.iter_records():
+                content = item.get('original_content', '')
+                if len(content) > ScraperConfig.MAX_CONTENT_LENGTH and content.endswith('...'):
+                    content = content[:-3]
+                records.append((item['url'], item['source'], item['id'], self.fingerprint(content)))
+            if records:
+                self.seen.add_many(records)
+                logging.info(f"Seeded seen-article store with {len(records)} stored articles")
+        except Exception as e:
+            logging.error(f"Error seeding seen-article store: {e}")
+
+    def seed_near_duplicates(self):
+        """One-time import of stored articles into an empty near-duplicate index."""
+        if len(self.near_duplicates):
+            return
+        try:
+            records = [
+                (item['id'], item['source'], self.near_signature(item.get('original_content', '')))
+                for item in self.store.iter_records()
+            ]
+            if records:
+                self.near_duplicates.add_many(records)
+                logging.info(f"Seeded near-duplicate index with {len(records)} stored articles")
+        except Exception as e:
+            logging.error(f"Error seeding near-duplicate index: {e}")
 
-    def load_last_article_ids(self) -> dict:
-        """Load the last processed article IDs for each website."""
+    def seed_search_index(self):
+        """One-time indexing of already stored articles into an empty search index."""
+        if len(self.search_index) or not self.store.segment_numbers():
+            return
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    last_ids = {}
-                    for source in ScraperConfig.WEBSITES.keys():
-                        source_articles = [a for a in data if a.get('source') == source]
-                        if source_articles:
-                            last_ids[source] = source_articles[0]['id']
-                    return last_ids
+            count = self.search_index.rebuild(latest_articles(self.store))
+            logging.info(f"Indexed {count} stored articles for search")
         except Exception as e:
-            logging.error(f"Error loading last article IDs: {e}")
-        return {}
+            logging.error(f"Error seeding search index: {e}")
+
+    def seed_feed(self):
+        """One-time export of already stored articles when there is no feed yet."""
+        if self.feed is None or self.feed.exists() or not self.store.segment_numbers():
+            return
+        try:
+            count = self.feed.rebuild(self.store.iter_lines())
+            logging.info(f"Wrote {count} stored articles to the feed in {self.feed.feed_dir}")
+        except Exception as e:
+            logging.error(f"Error writing feed: {e}")
+
+    def near_signature(self, content: str):
+        """MinHash signature over the part of the text that gets stored."""
+        return self.near_duplicates.signature(content[:ScraperConfig.MAX_CONTENT_LENGTH])
+
+    def register_derived_stages(self):
+        """Tell the derived-data cache which config each processing stage depends on."""
+        preferences = {source: site.get('categories', []) for source, site in ScraperConfig.WEBSITES.items()}
+        self.derived.register_stage(
+            'category', ScraperConfig.CATEGORIES, preferences, ScraperConfig.CATEGORY_PREFERENCE_WEIGHT
+        )
+        self.derived.register_stage('points', ScraperConfig.POINT_RULES, ScraperConfig.WORD_REPLACEMENTS)
+        self.derived.register_stage('simplified', ScraperConfig.WORD_REPLACEMENTS, ScraperConfig.FUN_ENDINGS)
+        self.derived.register_stage(
+            'simplified_llm', ScraperConfig.AI_MODEL, ScraperConfig.AI_PROMPT_TEMPLATE,
+            ScraperConfig.LLM_CHUNK_TOKENS, ScraperConfig.LLM_CHARS_PER_TOKEN,
+            ScraperConfig.LLM_MAX_OUTPUT_TOKENS, ScraperConfig.LLM_TEMPERATURE
+        )
+
+    def fingerprint(self, content: str) -> str:
+        """Content fingerprint over the part of the text that gets stored."""
+        return content_fingerprint(content[:ScraperConfig.MAX_CONTENT_LENGTH])
 
     def categorize_content(self, text: str, source: str) -> Tuple[str, str, str]:
         """Categorize content based on keywords and source, return category info."""
-        text_lower = text.lower()
+        counts = self.category_matcher.count(text)
         
         # Get preferred categories for this source
         website_config = ScraperConfig.WEBSITES[source]
         preferred_categories = website_config.get('categories', [])
         
-        # Check preferred categories first
-        for category_key in preferred_categories:
-            if category_key == 'general':
+        # Rank by weighted keyword hits, then source preference, then config order
+        best_key, best_rank = 'general', None
+        for order, category_key in enumerate(ScraperConfig.CATEGORIES):
+            hits = counts.get(category_key, 0)
+            if category_key == 'general' or not hits:
                 continue
-            category_data = ScraperConfig.CATEGORIES[category_key]
-            keywords = category_data['keywords']
-            if any(keyword in text_lower for keyword in keywords):
-                return (
-                    category_key,
-                    category_data['emoji'],
-                    category_data['name']
-                )
-        
-        # Check all other categories
-        for category_key, category_data in ScraperConfig.CATEGORIES.items():
-            if category_key == 'general' or category_key in preferred_categories:
-                continue
-                
-            keywords = category_data['keywords']
-            if any(keyword in text_lower for keyword in keywords):
-                return (
-                    category_key,
-                    category_data['emoji'],
-                    category_data['name']
-                )
-        
-        # Default to general category
-        general_cat = ScraperConfig.CATEGORIES['general']
-        return ('general', general_cat['emoji'], general_cat['name'])
+            preferred = category_key in preferred_categories
+            score = hits * (ScraperConfig.CATEGORY_PREFERENCE_WEIGHT if preferred else 1)
+            rank = (score, preferred, -order)
+            if best_rank is None or rank > best_rank:
+                best_key, best_rank = category_key, rank
+        
+        category_data = ScraperConfig.CATEGORIES[best_key]
+        return (best_key, category_data['emoji'], category_data['name'])
 
     def get_latest_articles_gov(self) -> List[tuple]:
         """Scrape gov.ro for latest articles."""
@@ -111,39 +205,21 @@ class MultiWebsiteScraper:
             website_config = ScraperConfig.WEBSITES['gov']
             logging.info(f"Fetching GOV articles from: {website_config['news_url']}")
             
-            response = requests.get(website_config['news_url'], headers=self.headers, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find all sedinte_lista divs
-            meeting_divs = soup.find_all('div', class_='sedinte_lista')
-            links = []
+            listing = self.listing_cache.fetch(self.http, website_config['news_url'], 'gov')
+            if listing.unchanged and listing.parsed is not None:
+                logging.info("GOV listing unchanged since last run, skipping parse")
+                return [tuple(link) for link in listing.parsed]
             
-            for div in meeting_divs:
-                # Extract date from ID (e.g., sed_04_Iun -> 04_Iun)
-                div_id = div.get('id', '')
-                if div_id.startswith('sed_'):
-                    date_part = div_id.replace('sed_', '')
-                    
-                    # Look for links within this div
-                    link_elements = div.find_all('a', href=True)
-                    for link in link_elements:
-                        href = link['href']
-                        if href.startswith('/'):
-                            full_url = website_config['base_url'] + href
-                        else:
-                            full_url = href
-                            
-                        title = link.get_text(strip=True)
-                        if title and 'informatie' in title.lower():
-                            links.append((div_id, full_url, title, date_part, 'gov'))
+            links = self.listing_links('gov', parse_html(listing.content))
             
             logging.info(f"Found {len(links)} GOV articles")
+            self.listing_cache.store_parsed(website_config['news_url'], links)
             return links
             
         except Exception as e:
             logging.error(f"Error fetching GOV articles: {e}")
+            self.metrics.count_error('gov', f"Error fetching articles: {e}")
+            self.failed_listings.add('gov')
             return []
 
     def get_latest_articles_mai(self) -> List[tuple]:
@@ -152,38 +228,21 @@ class MultiWebsiteScraper:
             website_config = ScraperConfig.WEBSITES['mai']
             logging.info(f"Fetching MAI articles from: {website_config['news_url']}")
             
-            response = requests.get(website_config['news_url'], headers=self.headers, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find articles using the specified selector
-            article_divs = soup.select(website_config['article_selector'])
-            links = []
+            listing = self.listing_cache.fetch(self.http, website_config['news_url'], 'mai')
+            if listing.unchanged and listing.parsed is not None:
+                logging.info("MAI listing unchanged since last run, skipping parse")
+                return [tuple(link) for link in listing.parsed]
             
-            for i, div in enumerate(article_divs[:10]):  # Limit to latest 10
-                # Extract title and link
-                title_element = div.select_one(website_config['title_selector'])
-                if title_element:
-                    href = title_element.get('href', '')
-                    title = title_element.get_text(strip=True)
-                    
-                    if href.startswith('/'):
-                        full_url = website_config['base_url'] + href
-                    else:
-                        full_url = href
-                    
-                    # Generate ID and date
-                    article_id = f"mai_{i+1}_{datetime.now().strftime('%d_%b')}"
-                    date_part = datetime.now().strftime('%d %B %Y')
-                    
-                    links.append((article_id, full_url, title, date_part, 'mai'))
+            links = self.listing_links('mai', parse_html(listing.content), limit=10)  # Limit to latest 10
             
             logging.info(f"Found {len(links)} MAI articles")
+            self.listing_cache.store_parsed(website_config['news_url'], links)
             return links
             
         except Exception as e:
             logging.error(f"Error fetching MAI articles: {e}")
+            self.metrics.count_error('mai', f"Error fetching articles: {e}")
+            self.failed_listings.add('mai')
             return []
 
     def get_latest_articles_ms(self) -> List[tuple]:
@@ -192,107 +251,159 @@ class MultiWebsiteScraper:
             website_config = ScraperConfig.WEBSITES['ms']
             logging.info(f"Fetching MS articles from: {website_config['news_url']}")
             
-            response = requests.get(website_config['news_url'], headers=self.headers, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            listing = self.listing_cache.fetch(self.http, website_config['news_url'], 'ms')
+            if listing.unchanged and listing.parsed is not None:
+                logging.info("MS listing unchanged since last run, skipping parse")
+                return [tuple(link) for link in listing.parsed]
             
-            # Find articles using the specified selector
-            article_elements = soup.select(website_config['article_selector'])
-            links = []
-            
-            for i, article in enumerate(article_elements[:10]):  # Limit to latest 10
-                # Extract title and link
-                title_element = article.select_one(website_config['title_selector'])
-                if title_element:
-                    href = title_element.get('href', '')
-                    title = title_element.get_text(strip=True)
-                    
-                    if href.startswith('/'):
-                        full_url = website_config['base_url'] + href
-                    else:
-                        full_url = href
-                    
-                    # Generate ID and date
-                    article_id = f"ms_{i+1}_{datetime.now().strftime('%d_%b')}"
-                    date_part = datetime.now().strftime('%d %B %Y')
-                    
-                    links.append((article_id, full_url, title, date_part, 'ms'))
+            links = self.listing_links('ms', parse_html(listing.content), limit=10)  # Limit to latest 10
             
             logging.info(f"Found {len(links)} MS articles")
+            self.listing_cache.store_parsed(website_config['news_url'], links)
             return links
             
         except Exception as e:
             logging.error(f"Error fetching MS articles: {e}")
+            self.metrics.count_error('ms', f"Error fetching articles: {e}")
+            self.failed_listings.add('ms')
             return []
 
-    def scrape_article_content(self, url: str, source: str) -> Tuple[str, BeautifulSoup]:
-        """Scrape the full content from an article page and return both text and soup."""
+    def listing_links(self, source: str, doc: HTMLDocument, limit: Optional[int] = None,
+                      crawl_date: bool = True) -> List[tuple]:
+        """Article links (id, url, title, date, source) on a parsed listing page.
+        
+        MAI and MS items without a marked-up date get today's with crawl_date,
+        which fits the newest page only; otherwise the date is left empty for
+        build_article to take from the article page.
+        """
+        website_config = ScraperConfig.WEBSITES[source]
+        links = []
+        
+        if source == 'gov':
+            # Find all sedinte_lista divs
+            meeting_divs = doc.select('div.sedinte_lista')
+            
+            for div in meeting_divs:
+                # Extract date from ID (e.g., sed_04_Iun -> 04_Iun)
+                div_id = div.get('id', '')
+                if div_id.startswith('sed_'):
+                    date_part = div_id.replace('sed_', '')
+                    
+                    # Look for links within this div
+                    link_elements = div.select('a[href]')
+                    for link in link_elements:
+                        href = link.get('href')
+                        if href.startswith('/'):
+                            full_url = website_config['base_url'] + href
+                        else:
+                            full_url = href
+                            
+                        title = link.text(strip=True)
+                        # gov.ro writes "Informaţie" with a cedilla, older pages without diacritics
+                        if title and 'informatie' in fold_diacritics(title):
+                            links.append((make_article_id('gov', full_url), full_url, title, date_part, 'gov'))
+            return links[:limit]
+        
+        # MAI and MS: find articles using the specified selector
+        article_elements = doc.select(website_config['article_selector'])
+        
+        for element in article_elements[:limit]:
+            # Extract title and link
+            title_element = element.select_one(website_config['title_selector'])
+            if title_element:
+                href = title_element.get('href', '')
+                title = title_element.text(strip=True)
+                
+                if href.startswith('/'):
+                    full_url = website_config['base_url'] + href
+                else:
+                    full_url = href
+                
+                # Generate a stable ID from the URL
+                article_id = make_article_id(source, full_url)
+                date_part = self.published_date(element)
+                if not date_part and crawl_date:
+                    date_part = datetime.now().strftime('%d %B %Y')
+                
+                links.append((article_id, full_url, title, date_part, source))
+        
+        return links
+
+    def published_date(self, node) -> str:
+        """Publication date marked up in a listing item or page ('%d %B %Y' when ISO), or ''."""
+        for selector in ScraperConfig.PUBLISHED_DATE_SELECTORS:
+            element = node.select_one(selector)
+            if element is None:
+                continue
+            value = (element.get('content') or element.get('datetime') or element.text(strip=True) or '').strip()
+            if not value:
+                continue
+            try:
+                return datetime.fromisoformat(value[:10]).strftime('%d %B %Y')
+            except ValueError:
+                return value
+        return ''
+
+    def scrape_article_content(self, url: str, source: str) -> Tuple[str, Optional[HTMLDocument]]:
+        """Scrape the full content from an article page and return both text and parsed document."""
         try:
             logging.info(f"Scraping {source.upper()} article content from: {url}")
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = self.http.get(url)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Get content selectors for this source
-            website_config = ScraperConfig.WEBSITES[source]
-            content_selectors = website_config['content_selectors']
-            
-            # Try different selectors for content
-            content = ""
-            for selector in content_selectors:
-                content_div = soup.select_one(selector)
-                if content_div:
-                    content = content_div.get_text(separator=' ', strip=True)
-                    break
-            
-            # If no specific content div found, try to get all paragraphs
-            if not content:
-                paragraphs = soup.find_all('p')
-                content = ' '.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-            
-            # Clean up the content
-            content = re.sub(r'\s+', ' ', content)  # Replace multiple spaces with single space
-            content = content.strip()
+            with self.metrics.stage('parse'):
+                # Parse once; the document is reused for structured point extraction
+                doc = parse_html(response.content)
+                
+                # Try the source's content selectors, falling back to all paragraphs
+                website_config = ScraperConfig.WEBSITES[source]
+                content = doc.content_text(website_config['content_selectors'])
             
             logging.info(f"Extracted {len(content)} characters of content from {source.upper()}")
-            return content, soup
+            return content, doc
             
         except Exception as e:
             logging.error(f"Error scraping {source.upper()} article content: {e}")
+            self.metrics.count_error(source, f"Error scraping {url}: {e}")
             return "", None
 
     # ... keep existing code (extract_detailed_points_from_structured_content, parse_government_sections, simplify_government_decision, extract_detailed_points, simplify_sentence, simplify_text_for_kids methods)
 
-    def extract_detailed_points_from_structured_content(self, soup: BeautifulSoup, source: str) -> List[str]:
+    def extract_detailed_points_from_structured_content(self, doc: HTMLDocument, source: str) -> List[str]:
         """Extract detailed points from the structured content based on source."""
-        points = []
-        
+        return self.points_from_structured_text(self.structured_text(doc, source), source)
+
+    def structured_text(self, doc: HTMLDocument, source: str) -> str:
+        """The part of the page detailed points are extracted from, one block per line."""
         if source == 'gov':
             # Use existing logic for government content
-            page_desc = soup.find('div', class_='pageDescription')
+            page_desc = doc.select_one('div.pageDescription')
             if not page_desc:
                 logging.warning("No pageDescription div found, trying alternative selectors")
-                for selector in ScraperConfig.CONTENT_SELECTORS:
-                    page_desc = soup.select_one(selector)
-                    if page_desc:
-                        break
+                page_desc = doc.first_match(ScraperConfig.CONTENT_SELECTORS)
             
-            if page_desc:
-                content_text = page_desc.get_text(separator='\n', strip=True)
-                logging.info(f"Found pageDescription content: {len(content_text)} characters")
-                
-                sections = self.parse_government_sections(content_text)
-                
-                for section in sections:
-                    simplified_point = self.simplify_government_decision(section)
-                    if simplified_point:
-                        points.append(simplified_point)
+            if not page_desc:
+                return ""
+            content_text = page_desc.text(separator='\n', strip=True)
+            logging.info(f"Found pageDescription content: {len(content_text)} characters")
+            return content_text
+        
+        # For MAI and MS, extract from paragraphs and structure
+        return doc.full_text(separator='\n')
+
+    def points_from_structured_text(self, content_text: str, source: str) -> List[str]:
+        """Turn structured page text into kid-friendly points."""
+        points = []
+        
+        if source == 'gov':
+            sections = self.parse_government_sections(content_text)
+            
+            for section in sections:
+                simplified_point = self.simplify_government_decision(section)
+                if simplified_point:
+                    points.append(simplified_point)
         
         else:
-            # For MAI and MS, extract from paragraphs and structure
-            content_text = soup.get_text(separator='\n', strip=True)
             sections = content_text.split('\n')
             
             for section in sections:
@@ -311,29 +422,7 @@ class MultiWebsiteScraper:
 
     def simplify_content_by_source(self, content: str, source: str) -> str:
         """Simplify content based on the source website."""
-        content_lower = content.lower()
-        
-        if source == 'mai':
-            if any(word in content_lower for word in ['poliție', 'poliția', 'policist']):
-                return "Poliția lucrează să ne protejeze și să ne țină în siguranță! 👮‍♂️🚔"
-            elif any(word in content_lower for word in ['pompieri', 'incendiu', 'foc']):
-                return "Pompierii se pregătesc să stingă focurile și să ne salveze! 🚒👨‍🚒"
-            elif any(word in content_lower for word in ['jandarmerie', 'jandarmi']):
-                return "Jandarmii păzesc orașul și ne ajută când avem evenimente! 🛡️👮‍♀️"
-            elif any(word in content_lower for word in ['securitate', 'siguranța']):
-                return "Lucrează ca să fim toți în siguranță în casele noastre! 🏠🔒"
-        
-        elif source == 'ms':
-            if any(word in content_lower for word in ['spital', 'spitale', 'medici']):
-                return "Doctorii din spitale vor putea să ne ajute și mai bine! 🏥👩‍⚕️"
-            elif any(word in content_lower for word in ['medicament', 'medicamente', 'pastile']):
-                return "Vor fi mai multe medicamente ca să ne facă bine când suntem bolnavi! 💊💚"
-            elif any(word in content_lower for word in ['vaccinare', 'vaccin', 'imunizare']):
-                return "Doctorilor le place să ne dea vaccinuri ca să nu ne îmbolnăvim! 💉🛡️"
-            elif any(word in content_lower for word in ['sănătate', 'îngrijire']):
-                return "Se gândesc cum să ne țină sănătoși și fericiți! 😊💚"
-        
-        return ""
+        return self.point_rules.apply(content, source)
 
     def get_default_points_by_source(self, source: str) -> List[str]:
         """Get default points based on source when no specific content found."""
@@ -400,45 +489,7 @@ class MultiWebsiteScraper:
 
     def simplify_government_decision(self, section: str) -> str:
         """Simplify a government decision section for kids."""
-        section_lower = section.lower()
-        
-        # Identify the type and create appropriate simplification
-        if 'expropriere' in section_lower and 'botoşani' in section_lower:
-            return "Au hotărât să construiască un drum nou în jurul orașului Botoșani ca să nu mai fie aglomerat centrul! 🛣️💰"
-        
-        elif 'pompieri' in section_lower or 'situaţii de urgenţă' in section_lower:
-            return "Au planuit să construiască o casă nouă pentru pompierii care ne salvează când avem probleme! 🚒👨‍🚒"
-        
-        elif 'agricultură' in section_lower or 'fermieri' in section_lower:
-            return "Au luat măsuri să ajute fermierii să crească legume și fructe mai frumoase! 🚜🥕"
-        
-        elif 'buget' in section_lower or 'bani' in section_lower or 'lei' in section_lower:
-            return "Au hotărât cum să cheltuie banii țării pentru lucruri importante care ne ajută pe toți! 💰📊"
-        
-        elif 'școli' in section_lower or 'educație' in section_lower:
-            return "Au planuit să facă școlile și mai frumoase pentru toți copiii! 🎓📚"
-        
-        elif 'spital' in section_lower or 'sănătate' in section_lower:
-            return "Au gândit cum să facă spitalele mai bune ca doctorii să ne ajute mai repede! 🏥👩‍⚕️"
-        
-        elif 'drum' in section_lower or 'infrastructură' in section_lower:
-            return "Au planuit să construiască drumuri noi și mai frumoase! 🛣️🚧"
-        
-        elif 'mediu' in section_lower or 'natură' in section_lower:
-            return "Au făcut reguli noi ca să păstrăm natura verde și frumoasă! 🌱🌳"
-        
-        elif 'energie' in section_lower:
-            return "Au hotărât să folosim energie curată ca să nu poluăm aerul! ⚡🌍"
-        
-        elif 'digitalizare' in section_lower or 'tehnologie' in section_lower:
-            return "Au planuit să folosim mai multe computere ca să facă totul mai ușor! 💻🚀"
-        
-        else:
-            # Generic simplification based on keywords
-            if any(word in section_lower for word in ['adoptat', 'aprobat', 'hotărât']):
-                return "Au luat o decizie importantă care ne va ajuta pe toți! ✨🏛️"
-            else:
-                return "Au discutat despre lucruri importante pentru țara noastră! 💭🇷🇴"
+        return self.point_rules.apply(section, 'gov')
 
     def extract_detailed_points(self, content: str) -> List[str]:
         """Extract detailed points from content and convert to kid-friendly format."""
@@ -471,8 +522,7 @@ class MultiWebsiteScraper:
         sentence_lower = sentence.lower()
         
         # Apply word replacements
-        for old_word, new_word in ScraperConfig.WORD_REPLACEMENTS.items():
-            sentence_lower = sentence_lower.replace(old_word, new_word)
+        sentence_lower = self.word_replacer.apply(sentence_lower)
         
         # Add appropriate emojis based on content
         if any(word in sentence_lower for word in ['bani', 'buget', 'finanțare']):
@@ -503,8 +553,7 @@ class MultiWebsiteScraper:
         simplified = text.lower()
         
         # Apply word replacements
-        for old, new in ScraperConfig.WORD_REPLACEMENTS.items():
-            simplified = simplified.replace(old, new)
+        simplified = self.word_replacer.apply(simplified)
         
         # Add category-specific fun ending
         if category in ScraperConfig.FUN_ENDINGS:
@@ -518,135 +567,308 @@ class MultiWebsiteScraper:
         return simplified
 
     def save_articles(self, articles: List[Article]):
-        """Save articles to JSON file."""
+        """Append new articles (newest first) to the article store."""
         try:
-            articles_dict = [asdict(article) for article in articles]
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(articles_dict, f, ensure_ascii=False, indent=2)
-            logging.info(f"Saved {len(articles)} articles to {self.data_file}")
+            self.store.append(reversed(articles))
+            logging.info(f"Saved {len(articles)} articles to {self.store.store_dir}")
         except Exception as e:
             logging.error(f"Error saving articles: {e}")
+            self.metrics.count_error('store', f"Error saving articles: {e}")
+
+    def export_json(self, path: Optional[str] = None):
+        """Export the stored corpus to the legacy JSON file format."""
+        self.store.export_json(path or self.data_file)
+
+    def get_latest_articles(self, source: str) -> List[tuple]:
+        """Fetch the listing page for a source and return its article links."""
+        with self.metrics.stage('listing'):
+            if source == 'gov':
+                return self.get_latest_articles_gov()
+            elif source == 'mai':
+                return self.get_latest_articles_mai()
+            elif source == 'ms':
+                return self.get_latest_articles_ms()
+        return []
+
+    def select_new_links(self, source: str, links: List[tuple]) -> List[tuple]:
+        """Return the links whose URL has not been processed yet."""
+        new_links = []
+        queued_urls = set()
+        
+        for link in links:
+            url = link[1]
+            if url in queued_urls or self.seen.has_url(url):
+                continue
+            queued_urls.add(url)
+            new_links.append(link)
+        
+        logging.info(f"{source.upper()}: {len(new_links)} of {len(links)} listed articles are new")
+        return new_links
 
-    def check_for_new_articles(self) -> List[Article]:
-        """Check for new articles from all sources and process them."""
-        logging.info("Checking for new articles from all sources...")
+    def build_article(self, link: tuple, original_content: str, doc: Optional[HTMLDocument],
+                      simplify: bool = True) -> Article:
+        """Categorize, extract points and simplify scraped content into an Article.
+        With simplify=False the simplified text is left empty for the LLM stage to fill in."""
+        article_id, url, title, date_part, source = link
+        
+        # Categorize content
+        with self.metrics.stage('categorize'):
+            category, category_emoji, category_name = self.derived.get_or_compute(
+                'category', f"{source}\n{original_content}",
+                lambda: self.categorize_content(original_content, source)
+            )
+        
+        # Extract detailed points using the new structured method
+        with self.metrics.stage('points'):
+            if doc:
+                structured = self.structured_text(doc, source)
+                detailed_points = self.derived.get_or_compute(
+                    'points', f"{source}\n{structured}",
+                    lambda: self.points_from_structured_text(structured, source)
+                )
+            else:
+                detailed_points = self.derived.get_or_compute(
+                    'points', f"text\n{original_content}",
+                    lambda: self.extract_detailed_points(original_content)
+                )
         
-        all_new_articles = []
+        # Simplify for kids
+        simplified_content = ""
+        if simplify:
+            with self.metrics.stage('simplify'):
+                simplified_content = self.derived.get_or_compute(
+                    'simplified', f"{category}\n{original_content}",
+                    lambda: self.simplify_text_for_kids(original_content, category)
+                )
         
-        # Check each website
-        for source in ['gov', 'mai', 'ms']:
+        # Truncate original content if too long
+        display_content = original_content[:ScraperConfig.MAX_CONTENT_LENGTH]
+        if len(original_content) > ScraperConfig.MAX_CONTENT_LENGTH:
+            display_content += "..."
+        
+        if not date_part and doc is not None:
+            date_part = self.published_date(doc)
+        
+        return Article(
+            id=article_id,
+            date=date_part,
+            title=title,
+            original_content=display_content,
+            simplified_content=simplified_content,
+            detailed_points=detailed_points,
+            category=category,
+            category_emoji=category_emoji,
+            category_name=category_name,
+            url=url,
+            scraped_at=datetime.now().isoformat(),
+            source=source,
+            is_new=True
+        )
+
+    def check_for_new_articles(self, sources: Optional[List[str]] = None) -> List[Article]:
+        """Check for new articles from the given sources (all by default) and process them."""
+        sources = sources or list(ScraperConfig.WEBSITES)
+        self.failed_listings = set()
+        self.metrics.start_run(sources)
+        try:
+            new_articles = self.process_sources(sources)
+        except Exception as e:
+            self.metrics.count_error('run', str(e))
+            self.record_run(0, failed=True)
+            raise
+        self.record_run(len(new_articles))
+        return new_articles
+
+    def record_run(self, articles_found: int, failed: bool = False):
+        """Close the run's metrics: log a summary, rewrite the metrics file and append the run."""
+        summary = self.metrics.finish_run(articles_found, failed=failed)
+        logging.info(
+            f"Run {summary['status']}: {articles_found} articles in {summary['duration_seconds']:.1f}s "
+            f"({summary['articles_per_second']:.2f}/s), {len(summary['errors'])} errors"
+        )
+        for host in self.metrics.slow_hosts(summary):
+            logging.warning(f"Slow site {host}: {summary['hosts'][host]['avg_seconds']:.1f}s per request on average")
+        try:
+            self.metrics.write()
+        except OSError as e:
+            logging.error(f"Error writing metrics: {e}")
+        append_run_summary(summary)
+        if self.postgres is not None:
             try:
-                if source == 'gov':
-                    links = self.get_latest_articles_gov()
-                elif source == 'mai':
-                    links = self.get_latest_articles_mai()
-                elif source == 'ms':
-                    links = self.get_latest_articles_ms()
-                else:
+                self.postgres.record_run(summary)
+            except Exception as e:
+                logging.error(f"Error recording run in Postgres: {e}")
+
+    def process_sources(self, sources: List[str]) -> List[Article]:
+        """Fetch, deduplicate, process and save new articles from the given sources."""
+        logging.info(f"Checking for new articles from {', '.join(s.upper() for s in sources)}...")
+        
+        pending = PendingArticles()
+        
+        with ConcurrentFetcher() as fetcher:
+            # Fetch every listing at once and queue detail pages as soon as
+            # each listing arrives, so slow sites overlap with fast ones
+            listing_futures = {
+                fetcher.submit(ScraperConfig.WEBSITES[source]['news_url'], self.get_latest_articles, source): source
+                for source in sources
+            }
+            detail_jobs = {source: [] for source in sources}
+            
+            for future in as_completed(listing_futures):
+                source = listing_futures[future]
+                try:
+                    links = future.result()
+                except Exception as e:
+                    logging.error(f"Error processing {source.upper()} articles: {e}")
+                    self.metrics.count_error(source, f"Error processing listing: {e}")
+                    self.failed_listings.add(source)
                     continue
                 
-                new_articles = []
-                last_id = self.last_article_ids.get(source)
-                
-                for article_id, url, title, date_part, article_source in links:
-                    # Check if this is a new article for this source
-                    if last_id and article_id == last_id:
-                        logging.info(f"Reached last processed article for {source.upper()}: {article_id}")
-                        break
-                        
-                    # Scrape the article content
-                    original_content, soup = self.scrape_article_content(url, source)
-                    if not original_content:
-                        logging.warning(f"No content found for {source.upper()} article: {url}")
-                        continue
-                    
-                    # Categorize content
-                    category, category_emoji, category_name = self.categorize_content(original_content, source)
-                    
-                    # Extract detailed points using the new structured method
-                    if soup:
-                        detailed_points = self.extract_detailed_points_from_structured_content(soup, source)
-                    else:
-                        detailed_points = self.extract_detailed_points(original_content)
-                    
-                    # Simplify for kids
-                    simplified_content = self.simplify_text_for_kids(original_content, category)
-                    
-                    # Truncate original content if too long
-                    display_content = original_content[:ScraperConfig.MAX_CONTENT_LENGTH]
-                    if len(original_content) > ScraperConfig.MAX_CONTENT_LENGTH:
-                        display_content += "..."
-                    
-                    # Create article object
-                    article = Article(
-                        id=article_id,
-                        date=date_part,
-                        title=title,
-                        original_content=display_content,
-                        simplified_content=simplified_content,
-                        detailed_points=detailed_points,
-                        category=category,
-                        category_emoji=category_emoji,
-                        category_name=category_name,
-                        url=url,
-                        scraped_at=datetime.now().isoformat(),
-                        source=source,
-                        is_new=True
+                for link in self.select_new_links(source, links):
+                    url = link[1]
+                    detail_jobs[source].append(
+                        (link, fetcher.submit(url, self.scrape_article_content, url, source))
                     )
-                    
-                    new_articles.append(article)
-                    logging.info(f"Processed new {source.upper()} article: {article_id} (Category: {category_name})")
-                    logging.info(f"Extracted {len(detailed_points)} detailed points")
-                    
-                    # Update last article ID for this source
-                    if not self.last_article_ids.get(source):
-                        self.last_article_ids[source] = article_id
-                
-                all_new_articles.extend(new_articles)
-                
-                # Sleep between sources to be respectful
-                time.sleep(ScraperConfig.SLEEP_BETWEEN_REQUESTS)
-                
-            except Exception as e:
-                logging.error(f"Error processing {source.upper()} articles: {e}")
-                continue
-        
-        if all_new_articles:
-            # Load existing articles and merge
-            existing_articles = self.load_existing_articles()
-            all_articles = all_new_articles + existing_articles
-            self.save_articles(all_articles)
             
-            # Update last article IDs to the newest ones
-            for article in all_new_articles:
-                if not self.last_article_ids.get(article.source):
-                    self.last_article_ids[article.source] = article.id
-        
-        logging.info(f"Found {len(all_new_articles)} new articles across all sources")
+            # Process results in the same source and listing order as before
+            for source in sources:
+                for link, future in detail_jobs[source]:
+                    url = link[1]
+                    try:
+                        original_content, doc = future.result()
+                        if not original_content:
+                            logging.warning(f"No content found for {source.upper()} article: {url}")
+                            continue
+                        self.accept_article(link, original_content, doc, pending)
+                    except Exception as e:
+                        logging.error(f"Error processing {source.upper()} article {url}: {e}")
+                        self.metrics.count_error(source, f"Error processing {url}: {e}")
+        
+        all_new_articles = self.save_pending(pending)
+        
+        http_stats = self.http.stats()
+        logging.info(
+            f"HTTP: {http_stats['requests']} requests, {http_stats['retries']} retries, "
+            f"{http_stats['connections_reused']} reused / {http_stats['connections_opened']} opened connections"
+        )
+        logging.info(f"Rate limits: {self.rate_limiter.report()}")
+        logging.info(f"Listing cache: {self.listing_cache.report()}")
+        if self.simplifier:
+            logging.info(f"LLM simplification: {self.simplifier.report()}")
+        logging.info(f"Derived cache: {self.derived.report()}")
+        self.point_rules.log_stats()
+        logging.info(f"Found {len(all_new_articles)} new articles across {len(sources)} sources")
         return all_new_articles
 
+    def accept_article(self, link: tuple, original_content: str, doc: Optional[HTMLDocument],
+                       pending: PendingArticles) -> Optional[Article]:
+        """Build an article from scraped content unless it copies one already stored or pending."""
+        article_id, url, source = link[0], link[1], link[4]
+        
+        # Same text already stored under another URL
+        fingerprint = self.fingerprint(original_content)
+        duplicate_id = pending.by_fingerprint.get(fingerprint) or self.seen.find_fingerprint(fingerprint)
+        if duplicate_id:
+            logging.info(f"Skipping {source.upper()} article {url}: same content as {duplicate_id}")
+            self.seen.add(url, source, article_id, fingerprint)
+            return None
+        
+        # Lightly edited copy of a pending or already stored article
+        signature = self.near_signature(original_content)
+        match = pending.near_duplicates.find_similar(signature) or self.near_duplicates.find_similar(signature)
+        if match:
+            duplicate_id, score = match
+            logging.info(f"Skipping {source.upper()} article {url}: {score:.0%} similar to {duplicate_id}")
+            self.near_duplicates.link(url, source, duplicate_id, score)
+            self.seen.add(url, source, article_id, fingerprint)
+            return None
+        
+        article = self.build_article(link, original_content, doc, simplify=self.simplifier is None)
+        
+        pending.articles.append(article)
+        self.metrics.count_article(source)
+        if self.simplifier:
+            # Simplified in the background while the remaining pages are processed
+            pending.simplifications.append((article, self.simplifier.submit(original_content, article.category)))
+        pending.fingerprints.append(fingerprint)
+        pending.signatures.append(signature)
+        pending.by_fingerprint[fingerprint] = article_id
+        pending.near_duplicates.add(article_id, source, signature)
+        logging.info(f"Processed new {source.upper()} article: {article_id} (Category: {article.category_name})")
+        logging.info(f"Extracted {len(article.detailed_points)} detailed points")
+        return article
+
+    def save_pending(self, pending: PendingArticles) -> List[Article]:
+        """Finish simplifying, save and index the pending articles; returns them."""
+        if pending.simplifications:
+            with self.metrics.stage('simplify_llm_wait'):
+                for article, future in pending.simplifications:
+                    article.simplified_content = future.result()
+        
+        if pending.articles:
+            with self.metrics.stage('save'):
+                self.save_articles(pending.articles)
+            
+            # Remember the new URLs only once they are safely stored
+            self.seen.add_many(
+                (article.url, article.source, article.id, fingerprint)
+                for article, fingerprint in zip(pending.articles, pending.fingerprints)
+            )
+            self.near_duplicates.add_many(
+                (article.id, article.source, signature)
+                for article, signature in zip(pending.articles, pending.signatures)
+            )
+            try:
+                with self.metrics.stage('index'):
+                    self.search_index.add_many(pending.articles)
+            except Exception as e:
+                logging.error(f"Error indexing articles for search: {e}")
+                self.metrics.count_error('search', f"Error indexing articles: {e}")
+            if self.feed is not None:
+                try:
+                    with self.metrics.stage('feed'):
+                        shards = self.feed.update(pending.articles)
+                    logging.info(f"Updated {len(shards)} feed shards")
+                except Exception as e:
+                    logging.error(f"Error updating feed: {e}")
+                    self.metrics.count_error('feed', f"Error updating feed: {e}")
+            if self.postgres is not None:
+                try:
+                    with self.metrics.stage('postgres'):
+                        inserted, updated = self.postgres.write_articles(pending.articles)
+                    logging.info(f"Exported to Postgres: {inserted} inserted, {updated} updated")
+                except Exception as e:
+                    # Still in the article store; `postgres_sink.py export` catches up
+                    logging.error(f"Error exporting articles to Postgres: {e}")
+                    self.metrics.count_error('postgres', f"Error exporting articles: {e}")
+        pending.near_duplicates.close()
+        return pending.articles
+
     def load_existing_articles(self) -> List[Article]:
         """Load existing articles from storage."""
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return [Article(**item) for item in data]
+            return [record_to_article(record) for record in self.store.iter_records()]
         except Exception as e:
             logging.error(f"Error loading existing articles: {e}")
         return []
 
-    def run_daily_check(self):
-        """Run the daily check for new articles from all sources."""
-        logging.info("Running daily check for all sources...")
-        new_articles = self.check_for_new_articles()
+    def run_check(self, sources: Optional[List[str]] = None) -> Dict[str, Optional[int]]:
+        """Check the given sources (all by default) and return new article counts per source."""
+        return self.report_new_articles(self.check_for_new_articles(sources))
+
+    def report_new_articles(self, new_articles: List[Article]) -> Dict[str, Optional[int]]:
+        """Log what a check found and return new article counts per source.
+        
+        A source whose listing could not be fetched maps to None: the check
+        says nothing about how often it publishes.
+        """
+        by_source = {}
+        for article in new_articles:
+            if article.source not in by_source:
+                by_source[article.source] = []
+            by_source[article.source].append(article)
         
         if new_articles:
-            by_source = {}
-            for article in new_articles:
-                if article.source not in by_source:
-                    by_source[article.source] = []
-                by_source[article.source].append(article)
             
             logging.info(f"✅ Found {len(new_articles)} new articles total!")
             for source, articles in by_source.items():
@@ -656,11 +878,98 @@ class MultiWebsiteScraper:
                     logging.info(f"    - {article.title} ({article.id}) - {article.category_emoji} {article.category_name}")
         else:
             logging.info("ℹ️  No new articles found from any source.")
+        
+        counts = {source: len(articles) for source, articles in by_source.items()}
+        counts.update(dict.fromkeys(self.failed_listings))
+        return counts
+
+    def close(self):
+        """Close the stores and clients, e.g. when a long-running service stops."""
+        for resource in (self.store, self.seen, self.near_duplicates, self.search_index, self.derived,
+                         self.http, self.simplifier, self.postgres):
+            if resource is None:
+                continue
+            try:
+                resource.close()
+            except Exception as e:
+                logging.error(f"Error closing {type(resource).__name__}: {e}")
+
+    def run_daily_check(self):
+        """Run the daily check for new articles from all sources."""
+        logging.info("Running daily check for all sources...")
+        self.run_check()
 
 def main():
     """Main function to run the multi-website scraper."""
+    parser = argparse.ArgumentParser(description="Romanian government website scraper")
+    subparsers = parser.add_subparsers(dest='command')
+    export_parser = subparsers.add_parser('export-json', help="export stored articles as a single JSON file")
+    export_parser.add_argument('path', nargs='?', default=ScraperConfig.DATA_FILE)
+    replay_parser = subparsers.add_parser('replay', help="re-run the pipeline offline from a recorded HTTP archive")
+    replay_parser.add_argument('archive', nargs='?', default=ScraperConfig.HTTP_ARCHIVE_FILE)
+    replay_parser.add_argument('--output-dir', default=ScraperConfig.REPLAY_OUTPUT_DIR,
+                               help="empty directory for the stores the replayed run writes")
+    parser.add_argument('--daily', action='store_true',
+                        help=f"check every source once a day at {ScraperConfig.DAILY_CHECK_TIME} instead of adaptive polling")
+    parser.add_argument('--record', nargs='?', const=ScraperConfig.HTTP_ARCHIVE_FILE, metavar='ARCHIVE',
+                        help="append every HTTP response to an archive for later replay")
+    args = parser.parse_args()
+    
+    if args.command == 'replay':
+        run_replay(args.archive, args.output_dir)
+        return
+    
     scraper = MultiWebsiteScraper()
     
+    if args.command == 'export-json':
+        scraper.export_json(args.path)
+        return
+    
+    if args.record:
+        scraper.http = RecordingHTTPClient(scraper.http, ArchiveWriter(args.record))
+        logging.info(f"Recording HTTP responses to {args.record}")
+    
+    if args.daily:
+        run_daily_schedule(scraper)
+        return
+    
+    scheduler = AdaptiveScheduler(list(ScraperConfig.WEBSITES))
+    
+    logging.info("Multi-website scraper is running with adaptive per-source polling.")
+    for source, state in scheduler.states.items():
+        wait = max(0.0, state.next_run - time.time())
+        logging.info(f"  {source.upper()}: every {state.interval / 60:.0f} min, next check in {wait / 60:.0f} min")
+    logging.info("Press Ctrl+C to stop.")
+    
+    try:
+        scheduler.run_forever(scraper.run_check)
+    except KeyboardInterrupt:
+        logging.info("Multi-website scraper stopped by user.")
+
+def run_replay(archive: str, output_dir: str) -> List[Article]:
+    """Run one check of every source fed from a recorded archive, with fresh stores in output_dir."""
+    archive = os.path.abspath(archive)
+    if os.path.isdir(output_dir) and os.listdir(output_dir):
+        logging.error(f"Replay output directory {output_dir} is not empty; choose another with --output-dir")
+        return []
+    os.makedirs(output_dir, exist_ok=True)
+    # Every store path in ScraperConfig is relative, so the replay gets its own copies
+    os.chdir(output_dir)
+    # A replay never reaches the network, the LLM API and Postgres included
+    ScraperConfig.SIMPLIFIER_BACKEND = 'rules'
+    ScraperConfig.POSTGRES_DSN = None
+    
+    scraper = MultiWebsiteScraper()
+    scraper.http = ReplayHTTPClient(archive, metrics=scraper.metrics)
+    articles = scraper.check_for_new_articles()
+    missing = scraper.http.stats()['missing']
+    if missing:
+        logging.warning(f"{missing} requests were not in the archive")
+    logging.info(f"Replayed {len(articles)} articles from {archive} into {os.getcwd()}")
+    return articles
+
+def run_daily_schedule(scraper: MultiWebsiteScraper):
+    """Previous behaviour: check every source together once a day."""
     # Schedule daily checks at 9 AM
     schedule.every().day.at(ScraperConfig.DAILY_CHECK_TIME).do(scraper.run_daily_check)
     
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Full-text search over stored articles.
+Titles, text and detailed points are tokenized with Romanian diacritics
+folded away and stopwords dropped, then indexed in a contentless SQLite
+FTS5 table: only delta-encoded postings are kept on disk, not a second
+copy of the text. Queries are ranked with BM25 (fields weighted by
+SEARCH_FIELD_WEIGHTS) and can be filtered by source, category and
+scraped_at. The scraper adds every article it saves.
+
+Scoring costs about a microsecond per matching article, so a word found in
+most of a million articles would take a second to rank. A query matching
+more than SEARCH_MAX_RANKED articles therefore ranks only the newest
+SEARCH_MAX_RANKED of its matches; finding that cutoff only walks document
+IDs, which is far cheaper than scoring. Source, category and date filters
+apply within that window, which is widened when it holds too few hits.
+
+Usage: python search_index.py search "spitale judetene" [--source ms] [--category health]
+                                     [--since 2024-01-01] [--limit 20]
+       python search_index.py rebuild
+"""
+
+import argparse
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, List, Optional, Union
+
+from models import Article
+from romanian_text import fold_diacritics
+from scraper_config import ScraperConfig
+
+TOKEN_PATTERN = re.compile(r'\w+')
+FIELDS = ('title', 'content', 'points')
+
+# Folded forms; they occur in nearly every article and only bloat the postings
+STOPWORDS = frozenset("""
+a acea aceasta aceste acest acesta acestea acestei acestor acolo acum ai al ale alt alte altor am ar are as asa
+asta astfel au avea avem aveti ca cand care cat cate catre ce cea cei cel cele celor ci cine cu da dar daca
+de deci deja desi despre din dintre doar dupa e ea ei el ele era este eu fara fi fie fost iar ii il im in
+inca insa intr intre isi la le li lor lui m ma mi mult multe ne ni nici noi nu o or ori pana pe pentru
+poate prin sa sau se si sub sunt te tot toti toate un una unde unei unui unor va vor
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Folded, stopword-free tokens of a text; hyphenated clitics (într-o) split apart."""
+    return [token for token in TOKEN_PATTERN.findall(fold_diacritics(text))
+            if token not in STOPWORDS and (len(token) > 1 or token.isdigit())]
+
+
+def index_text(text: str) -> str:
+    return ' '.join(tokenize(text))
+
+
+@dataclass
+class SearchHit:
+    article_id: str
+    score: float  # BM25, higher is better
+    title: str
+    url: str
+    source: str
+    category: str
+    scraped_at: str
+
+
+class SearchIndex:
+    """BM25 full-text index of articles in SQLite FTS5, with metadata filters."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or ScraperConfig.SEARCH_INDEX_FILE
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        if self.path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS documents (
+                doc INTEGER PRIMARY KEY AUTOINCREMENT,  -- Never reused: old postings of a replaced article stay dead
+                article_id TEXT NOT NULL UNIQUE,
+                title TEXT NOT NULL,
+                url TEXT NOT NULL,
+                source TEXT NOT NULL,
+                category TEXT NOT NULL,
+                scraped_at TEXT NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_scraped_at ON documents(scraped_at)")
+        # Contentless: the text lives in the article store, positions are needed for BM25
+        self._conn.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS postings USING fts5({', '.join(FIELDS)}, "
+            "content='', tokenize='unicode61 remove_diacritics 0', detail=full)"
+        )
+        self._conn.commit()
+        self.weights = tuple(ScraperConfig.SEARCH_FIELD_WEIGHTS[field] for field in FIELDS)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    @staticmethod
+    def _rows(articles: Iterable[Article]) -> list:
+        return [
+            (article, index_text(article.title), index_text(article.original_content),
+             index_text(' '.join(article.detailed_points)))
+            for article in articles
+        ]
+
+    def add_many(self, articles: Iterable[Article]) -> int:
+        """Index articles in one transaction; an article indexed before is replaced."""
+        rows = self._rows(articles)
+        with self._lock:
+            for article, title, content, points in rows:
+                # Postings of a contentless table cannot be deleted; dropping the
+                # document row hides them until the next rebuild
+                self._conn.execute("DELETE FROM documents WHERE article_id = ?", (article.id,))
+                doc = self._conn.execute(
+                    "INSERT INTO documents (article_id, title, url, source, category, scraped_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (article.id, article.title, article.url, article.source, article.category, article.scraped_at)
+                ).lastrowid
+                self._conn.execute(
+                    "INSERT INTO postings (rowid, title, content, points) VALUES (?, ?, ?, ?)",
+                    (doc, title, content, points)
+                )
+            self._conn.commit()
+        return len(rows)
+
+    def search(self, query: str, source: Optional[str] = None, category: Optional[str] = None,
+               since: Optional[Union[str, datetime]] = None, until: Optional[Union[str, datetime]] = None,
+               limit: Optional[int] = None) -> List[SearchHit]:
+        """Best matches containing every query word; a trailing * makes a word a prefix.
+
+        since/until bound scraped_at (inclusive since, exclusive until), as in ArticleStore.query.
+        """
+        terms = []
+        for word in query.split():
+            tokens = [f'"{token}"' for token in tokenize(word)]
+            if tokens and word.endswith('*'):
+                tokens[-1] += '*'
+            terms.extend(tokens)
+        if not terms:
+            return []
+
+        since = since.isoformat() if isinstance(since, datetime) else since
+        until = until.isoformat() if isinstance(until, datetime) else until
+        match = ' '.join(terms)
+        conditions, params = ["postings MATCH ?"], [match]
+        for clause, value in (("d.source = ?", source), ("d.category = ?", category),
+                              ("d.scraped_at >= ?", since), ("d.scraped_at < ?", until)):
+            if value:
+                conditions.append(clause)
+                params.append(value)
+        limit = limit or ScraperConfig.SEARCH_DEFAULT_LIMIT
+        window = ScraperConfig.SEARCH_MAX_RANKED
+
+        with self._lock:
+            while True:
+                # The newest window-th match of the words; None when there are fewer
+                cutoff = self._conn.execute(
+                    "SELECT rowid FROM postings WHERE postings MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+                    (match, window - 1)
+                ).fetchone()
+                where, bounded = conditions, params
+                if cutoff:
+                    where, bounded = conditions + ["postings.rowid >= ?"], params + [cutoff[0]]
+                rows = self._conn.execute(
+                    "SELECT d.article_id, bm25(postings, ?, ?, ?) AS rank, d.title, d.url, d.source, d.category, "
+                    f"d.scraped_at FROM postings JOIN documents d ON d.doc = postings.rowid "
+                    f"WHERE {' AND '.join(where)} ORDER BY rank LIMIT ?",
+                    (*self.weights, *bounded, limit)
+                ).fetchall()
+                # Filters may leave too few of the newest matches: look further back
+                if not cutoff or len(rows) >= limit:
+                    break
+                window *= 4
+        # FTS5 reports BM25 negated so that ascending order is best first
+        return [SearchHit(article_id, -rank, *rest) for article_id, rank, *rest in rows]
+
+    def rebuild(self, articles: Iterable[Article], batch_size: int = 1000) -> int:
+        """Replace the whole index with the given articles, newest first; the first copy of an ID wins.
+
+        Starting from empty also reclaims the postings of replaced articles.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM documents")
+            self._conn.execute("INSERT INTO postings (postings) VALUES ('delete-all')")
+            self._conn.commit()
+        # Numbered down from 0 so that newer articles keep the higher numbers the
+        # recency window relies on; articles added later continue above 0
+        doc, batch = 0, []
+        for article in articles:
+            batch.append(article)
+            if len(batch) >= batch_size:
+                doc = self._add_older(batch, doc)
+                batch = []
+        doc = self._add_older(batch, doc)
+        self.optimize()
+        return -doc
+
+    def _add_older(self, articles: List[Article], doc: int) -> int:
+        """Index articles older than all indexed ones, numbering them down from doc and
+        skipping IDs already indexed; returns the next number."""
+        rows = self._rows(articles)
+        with self._lock:
+            for article, title, content, points in rows:
+                inserted = self._conn.execute(
+                    "INSERT OR IGNORE INTO documents (doc, article_id, title, url, source, category, scraped_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (doc, article.id, article.title, article.url, article.source, article.category, article.scraped_at)
+                ).rowcount
+                if inserted:
+                    self._conn.execute(
+                        "INSERT INTO postings (rowid, title, content, points) VALUES (?, ?, ?, ?)",
+                        (doc, title, content, points)
+                    )
+                    doc -= 1
+            self._conn.commit()
+        return doc
+
+    def optimize(self):
+        """Merge the FTS5 segments into one for the fastest queries."""
+        with self._lock:
+            self._conn.execute("INSERT INTO postings (postings) VALUES ('optimize')")
+            self._conn.commit()
+            # The merge rewrote most of the file through the WAL
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def latest_articles(store) -> Iterable[Article]:
+    """Stored articles newest first, as SearchIndex.rebuild takes them."""
+    from article_store import record_to_article
+    for record in store.iter_records():
+        yield record_to_article(record)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the stored articles")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    search_parser = subparsers.add_parser('search', help="print the best matches for a query")
+    search_parser.add_argument('query')
+    search_parser.add_argument('--source', choices=sorted(ScraperConfig.WEBSITES))
+    search_parser.add_argument('--category', choices=sorted(ScraperConfig.CATEGORIES))
+    search_parser.add_argument('--since', help="earliest scraped_at (ISO date)")
+    search_parser.add_argument('--until', help="scraped_at before this (ISO date)")
+    search_parser.add_argument('--limit', type=int, default=ScraperConfig.SEARCH_DEFAULT_LIMIT)
+    subparsers.add_parser('rebuild', help="index the article store from scratch")
+    args = parser.parse_args()
+
+    index = SearchIndex()
+    if args.command == 'rebuild':
+        from article_store import ArticleStore
+        count = index.rebuild(latest_articles(ArticleStore()))
+        print(f"Indexed {count} articles in {index.path}")
+    else:
+        for hit in index.search(args.query, args.source, args.category, args.since, args.until, args.limit):
+            print(f"{hit.score:6.2f}  {hit.scraped_at[:10]}  {hit.source:<4} {hit.category:<15} {hit.title}  {hit.url}")
+    index.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Persistent store of already-processed articles.
+Keyed by normalized URL and by content fingerprint in SQLite, with an
+in-memory Bloom filter in front so most lookups never touch the disk.
+"""
+
+import hashlib
+import math
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from scraper_config import ScraperConfig
+
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid')
+DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of an article URL used for identity checks."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or 'https'
+    host = (parts.hostname or '').lower()
+    if parts.port and str(parts.port) != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r'/{2,}', '/', parts.path) or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+def content_fingerprint(text: str) -> str:
+    """Fingerprint of article text that ignores case and whitespace changes."""
+    normalized = ' '.join(text.casefold().split())
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+def make_article_id(source: str, url: str) -> str:
+    """Stable article ID derived from the source and normalized URL."""
+    digest = hashlib.sha1(normalize_url(url).encode('utf-8')).hexdigest()
+    return f"{source}_{digest[:12]}"
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.sha1(key.encode('utf-8')).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:16], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class SeenArticleStore:
+    """SQLite-backed "already processed?" index with a Bloom filter front."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or ScraperConfig.SEEN_STORE_FILE
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS seen_articles (
+                url_key TEXT PRIMARY KEY,
+                fingerprint TEXT,
+                source TEXT NOT NULL,
+                article_id TEXT NOT NULL,
+                first_seen TEXT NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_fingerprint ON seen_articles(fingerprint)")
+        self._conn.commit()
+
+        self._url_filter = BloomFilter(ScraperConfig.BLOOM_CAPACITY, ScraperConfig.BLOOM_ERROR_RATE)
+        self._fingerprint_filter = BloomFilter(ScraperConfig.BLOOM_CAPACITY, ScraperConfig.BLOOM_ERROR_RATE)
+        for url_key, fingerprint in self._conn.execute("SELECT url_key, fingerprint FROM seen_articles"):
+            self._url_filter.add(url_key)
+            if fingerprint:
+                self._fingerprint_filter.add(fingerprint)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seen_articles").fetchone()[0]
+
+    def has_url(self, url: str) -> bool:
+        """Return True if an article with this (normalized) URL was processed."""
+        url_key = normalize_url(url)
+        if url_key not in self._url_filter:
+            return False
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM seen_articles WHERE url_key = ?", (url_key,)).fetchone()
+        return row is not None
+
+    def find_fingerprint(self, fingerprint: str) -> Optional[str]:
+        """Return the article ID already stored with this content fingerprint."""
+        if fingerprint not in self._fingerprint_filter:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT article_id FROM seen_articles WHERE fingerprint = ? LIMIT 1", (fingerprint,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def add(self, url: str, source: str, article_id: str, fingerprint: Optional[str] = None):
+        """Mark an article as processed."""
+        self.add_many([(url, source, article_id, fingerprint)])
+
+    def add_many(self, records: Iterable[tuple]):
+        """Mark (url, source, article_id, fingerprint) records as processed in one transaction."""
+        rows = []
+        now = datetime.now().isoformat()
+        for url, source, article_id, fingerprint in records:
+            url_key = normalize_url(url)
+            rows.append((url_key, fingerprint, source, article_id, now))
+            self._url_filter.add(url_key)
+            if fingerprint:
+                self._fingerprint_filter.add(fingerprint)
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen_articles (url_key, fingerprint, source, article_id, first_seen) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
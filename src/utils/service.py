@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Long-running scraper service with a small local HTTP API.
+Runs the adaptive per-source polling of scraper.py on an asyncio event
+loop, each check in a worker thread, and serves on SERVICE_HOST:SERVICE_PORT:
+
+  GET  /health                      state, current run and next checks; 503 unless running
+  GET  /articles?source=&category=&limit=
+                                    latest articles, newest first, from an in-memory hot set
+                                    of the SERVICE_HOT_SET_SIZE newest per source and category
+  POST /run?source=gov,mai          check the given sources (all by default) now
+  GET  /metrics[?format=json]       run metrics, Prometheus text or JSON
+
+The port is bound right away; the scraper, and with it requests, the HTML
+parsers and the stores, is imported and opened in the background, so
+/health answers "starting" within a fraction of a second. SIGINT or
+SIGTERM stops taking requests, lets a run in progress finish (up to
+SERVICE_SHUTDOWN_TIMEOUT) and closes the stores; a second Ctrl+C exits at
+once.
+
+Usage: python service.py [--host 127.0.0.1] [--port 8750]
+"""
+
+import argparse
+import asyncio
+import heapq
+import json
+import logging
+import signal
+import threading
+import time
+from collections import deque
+from itertools import islice
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from scheduler import AdaptiveScheduler
+from scraper_config import ScraperConfig
+
+REASONS = {
+    200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found',
+    405: 'Method Not Allowed', 500: 'Internal Server Error', 503: 'Service Unavailable',
+}
+JSON_TYPE = 'application/json; charset=utf-8'
+PROMETHEUS_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+MAX_BODY_BYTES = 64 * 1024
+
+Response = Tuple[int, str, bytes]
+
+
+def encode_json(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def json_response(status: int, data) -> Response:
+    return status, JSON_TYPE, encode_json(data)
+
+
+def run_in_daemon_thread(function: Callable, *args) -> asyncio.Future:
+    """Run function in a daemon thread, so a stuck run cannot keep the process from exiting."""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def settle(result, error):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def target():
+        try:
+            result, error = function(*args), None
+        except BaseException as e:
+            result, error = None, e
+        try:
+            loop.call_soon_threadsafe(settle, result, error)
+        except RuntimeError:
+            pass  # The loop is already closed
+
+    threading.Thread(target=target, name=getattr(function, '__name__', 'worker'), daemon=True).start()
+    return future
+
+
+class HotSet:
+    """The newest stored records per (source, category), kept serialized for the API."""
+
+    def __init__(self, size: Optional[int] = None):
+        self.size = size or ScraperConfig.SERVICE_HOT_SET_SIZE
+        # Newest first: (scraped_at, id, record as compact JSON)
+        self.buckets: Dict[Tuple[str, str], Deque[Tuple[str, str, bytes]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(bucket) for bucket in self.buckets.values())
+
+    def _bucket(self, buckets: dict, record: dict) -> Deque[Tuple[str, str, bytes]]:
+        key = (record.get('source') or 'unknown', record.get('category') or 'general')
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = deque(maxlen=self.size)
+        return bucket
+
+    def seed(self, lines: Iterable[bytes]) -> int:
+        """Replace the buckets with stored record lines, newest first; the first copy of an ID wins.
+
+        Stops once every configured source and category has a full bucket.
+        """
+        wanted = len(ScraperConfig.WEBSITES) * len(ScraperConfig.CATEGORIES)
+        buckets = {}
+        seen = set()
+        full = 0
+        for line in lines:
+            record = json.loads(line)
+            if record['id'] in seen:
+                continue
+            seen.add(record['id'])
+            bucket = self._bucket(buckets, record)
+            if len(bucket) == self.size:
+                continue
+            bucket.append((record.get('scraped_at', ''), record['id'], bytes(line)))
+            if len(bucket) == self.size:
+                full += 1
+                if full >= wanted:
+                    break
+        with self._lock:
+            self.buckets = buckets
+        return len(seen)
+
+    def add(self, articles: Iterable) -> int:
+        """Put freshly saved articles in front; an article replaces a held one with its ID."""
+        from article_store import article_to_record
+        records = sorted((article_to_record(article) for article in articles),
+                         key=lambda record: record.get('scraped_at', ''))
+        with self._lock:
+            for record in records:
+                bucket = self._bucket(self.buckets, record)
+                for entry in bucket:
+                    if entry[1] == record['id']:
+                        bucket.remove(entry)
+                        break
+                line = encode_json(record)
+                bucket.appendleft((record.get('scraped_at', ''), record['id'], line))
+        return len(records)
+
+    def latest(self, source: Optional[str] = None, category: Optional[str] = None,
+               limit: int = 20) -> List[bytes]:
+        """The newest records matching the filters, as JSON."""
+        with self._lock:
+            buckets = [list(bucket) for (bucket_source, bucket_category), bucket in self.buckets.items()
+                       if (source is None or bucket_source == source)
+                       and (category is None or bucket_category == category)]
+        merged = heapq.merge(*buckets, key=lambda entry: entry[0], reverse=True)
+        return [line for _, _, line in islice(merged, limit)]
+
+
+class ScraperService:
+    """Adaptive polling plus the HTTP API, on one asyncio event loop."""
+
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None):
+        self.host = host or ScraperConfig.SERVICE_HOST
+        self.port = ScraperConfig.SERVICE_PORT if port is None else port
+        self.hot = HotSet()
+        self.scraper = None  # MultiWebsiteScraper, once loaded
+        self.scheduler: Optional[AdaptiveScheduler] = None
+        self.state = 'starting'  # starting, running, stopping, failed
+        self.started = time.time()
+        self.running: List[str] = []  # Sources of the check in progress
+        self.requested: Set[str] = set()  # Sources queued through POST /run
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.wakeup = asyncio.Event()
+        self.stop_requested = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def serve(self):
+        """Serve until stop() or a signal, then shut down."""
+        self._loop = asyncio.get_running_loop()
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        logging.info(f"Serving on http://{self.host}:{self.port} ({time.time() - self.started:.2f}s after start)")
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self._loop.add_signal_handler(signum, self.stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass  # Not the main thread, or no signal support (Windows); Ctrl+C still interrupts
+
+        runner = None
+        try:
+            await run_in_daemon_thread(self.load)
+        except Exception as e:
+            logging.error(f"Error starting the scraper: {e}")
+            self.state = 'failed'
+            self.stop_requested.set()
+        if not self.stop_requested.is_set():
+            self.state = 'running'
+            logging.info(f"Service ready in {time.time() - self.started:.1f}s, "
+                         f"{len(self.hot)} articles in the hot set")
+            runner = asyncio.create_task(self.run_scheduler())
+        await self.stop_requested.wait()
+        await self.shutdown(runner)
+
+    def load(self):
+        """Import and open the scraper and its stores; runs in a worker thread."""
+        from scraper import MultiWebsiteScraper  # requests, the HTML parsers and every store
+        scraper = MultiWebsiteScraper()
+        self.hot.seed(scraper.store.iter_lines())
+        self.scheduler = AdaptiveScheduler(list(ScraperConfig.WEBSITES))
+        self.scraper = scraper
+
+    def stop(self):
+        """Begin a graceful shutdown; safe to call more than once."""
+        if self.stop_requested.is_set():
+            return
+        if self.running:
+            logging.info(f"Stopping after the run of {', '.join(self.running)}; press Ctrl+C again to exit at once")
+        else:
+            logging.info("Stopping...")
+        if self.state != 'failed':
+            self.state = 'stopping'
+        if self._loop is not None:
+            # Let a second signal interrupt the process as usual
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    self._loop.remove_signal_handler(signum)
+                except (NotImplementedError, RuntimeError, ValueError):
+                    pass
+        self.stop_requested.set()
+        self.wakeup.set()
+
+    async def shutdown(self, runner: Optional[asyncio.Task]):
+        self.server.close()
+        finished = True
+        if runner is not None:
+            done, _ = await asyncio.wait({runner}, timeout=ScraperConfig.SERVICE_SHUTDOWN_TIMEOUT)
+            if not done:
+                finished = False
+                runner.cancel()
+                logging.warning(f"Run of {', '.join(self.running)} still going after "
+                                f"{ScraperConfig.SERVICE_SHUTDOWN_TIMEOUT}s; exiting without it")
+        await self.server.wait_closed()
+        if self.scraper is not None and finished:
+            self.scraper.close()
+        logging.info("Service stopped.")
+
+    async def run_scheduler(self):
+        """Run due and requested sources one check at a time until stopped."""
+        while not self.stop_requested.is_set():
+            self.wakeup.clear()
+            requested, self.requested = sorted(self.requested), set()
+            try:
+                if requested or self.scheduler.due():
+                    await run_in_daemon_thread(self.scheduler.run_once, self.check, requested)
+                    continue
+                await asyncio.wait_for(self.wakeup.wait(), self.scheduler.seconds_until_next())
+            except asyncio.TimeoutError:
+                pass
+            except Exception as e:
+                logging.error(f"Error in the service scheduler: {e}")
+                await asyncio.sleep(1)
+
+    def check(self, sources: List[str]) -> Dict[str, Optional[int]]:
+        """One check, in a worker thread; new articles go to the hot set."""
+        self.running = list(sources)
+        try:
+            articles = self.scraper.check_for_new_articles(sources)
+            self.hot.add(articles)
+            return self.scraper.report_new_articles(articles)
+        finally:
+            self.running = []
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answer one HTTP/1.1 request per connection."""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), ScraperConfig.SERVICE_REQUEST_TIMEOUT)
+            request_line, *header_lines = head.decode('latin-1').split('\r\n')
+            method, target, _ = request_line.split(' ', 2)
+            for header in header_lines:
+                name, _, value = header.partition(':')
+                if name.strip().lower() == 'content-length' and value.strip().isdigit():
+                    # POST /run takes its parameters from the query string; drain any body
+                    await asyncio.wait_for(reader.readexactly(min(int(value), MAX_BODY_BYTES)),
+                                           ScraperConfig.SERVICE_REQUEST_TIMEOUT)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError,
+                ConnectionError, ValueError):
+            writer.close()
+            return
+
+        url = urlsplit(target)
+        try:
+            status, content_type, body = self.route(method, url.path, parse_qs(url.query))
+        except Exception as e:
+            logging.error(f"Error answering {method} {url.path}: {e}")
+            status, content_type, body = json_response(500, {'error': str(e)})
+        head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Cache-Control: no-store\r\n"
+                f"Connection: close\r\n\r\n")
+        try:
+            writer.write(head.encode('latin-1') + body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def route(self, method: str, path: str, params: Dict[str, List[str]]) -> Response:
+        routes = {
+            '/health': ('GET', self.health),
+            '/articles': ('GET', self.articles),
+            '/run': ('POST', self.trigger_run),
+            '/metrics': ('GET', self.metrics),
+        }
+        if path not in routes:
+            return json_response(404, {'error': f"no such endpoint: {path}", 'endpoints': sorted(routes)})
+        allowed, handler = routes[path]
+        if method != allowed:
+            return json_response(405, {'error': f"{path} takes {allowed}"})
+        return handler(params)
+
+    def health(self, params: Dict[str, List[str]]) -> Response:
+        now = time.time()
+        body = {
+            'status': self.state,
+            'uptime_seconds': round(now - self.started, 1),
+            'running': self.running,
+            'queued': sorted(self.requested),
+            'hot_set_articles': len(self.hot),
+        }
+        if self.scheduler is not None:
+            body['next_check_seconds'] = {
+                source: round(max(0.0, state.next_run - now)) for source, state in self.scheduler.states.items()
+            }
+        last_run = self.scraper.metrics.last_run if self.scraper is not None else None
+        if last_run:
+            body['last_run'] = {name: last_run[name] for name in
+                                ('completed_at', 'status', 'articles_found', 'sources_scraped', 'duration_seconds')}
+        return json_response(200 if self.state == 'running' else 503, body)
+
+    def articles(self, params: Dict[str, List[str]]) -> Response:
+        if self.scraper is None:
+            return json_response(503, {'error': f"service is {self.state}"})
+        source = params.get('source', [None])[0]
+        category = params.get('category', [None])[0]
+        if source is not None and source not in ScraperConfig.WEBSITES:
+            return json_response(400, {'error': f"unknown source {source!r}"})
+        if category is not None and category not in ScraperConfig.CATEGORIES:
+            return json_response(400, {'error': f"unknown category {category!r}"})
+        try:
+            limit = int(params.get('limit', [ScraperConfig.SEARCH_DEFAULT_LIMIT])[0])
+        except ValueError:
+            return json_response(400, {'error': "limit must be a number"})
+        limit = min(max(limit, 1), ScraperConfig.SERVICE_MAX_LIMIT)
+        lines = self.hot.latest(source, category, limit)
+        return 200, JSON_TYPE, b'[' + b','.join(lines) + b']'
+
+    def trigger_run(self, params: Dict[str, List[str]]) -> Response:
+        if self.state != 'running':
+            return json_response(503, {'error': f"service is {self.state}"})
+        sources = [source for value in params.get('source', []) for source in value.split(',') if source]
+        unknown = sorted(set(sources) - set(ScraperConfig.WEBSITES))
+        if unknown:
+            return json_response(400, {'error': f"unknown sources: {', '.join(unknown)}"})
+        self.requested.update(sources or ScraperConfig.WEBSITES)
+        self.wakeup.set()
+        return json_response(202, {'queued': sorted(self.requested), 'running': self.running})
+
+    def metrics(self, params: Dict[str, List[str]]) -> Response:
+        if self.scraper is None:
+            return json_response(503, {'error': f"service is {self.state}"})
+        if params.get('format', [''])[0] == 'json':
+            return json_response(200, self.scraper.metrics.to_json())
+        return 200, PROMETHEUS_TYPE, self.scraper.metrics.render_prometheus().encode('utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the scraper as a service with a local HTTP API")
+    parser.add_argument('--host', default=ScraperConfig.SERVICE_HOST)
+    parser.add_argument('--port', type=int, default=ScraperConfig.SERVICE_PORT)
+    args = parser.parse_args()
+    # Same setup scraper.py does on import, which happens later here
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(ScraperConfig.LOG_FILE),
+            logging.StreamHandler()
+        ]
+    )
+
+    try:
+        asyncio.run(ScraperService(args.host, args.port).serve())
+    except KeyboardInterrupt:
+        logging.info("Service stopped by user.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+UTILS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(UTILS_DIR, 'benchmarks', 'fixtures')
+# The scraper modules are imported script-style, and the tests reuse the benchmarks' fixtures
+sys.path.insert(0, UTILS_DIR)
+sys.path.insert(0, os.path.join(UTILS_DIR, 'benchmarks'))
+
+# scraper.py opens scraper.log on import and every store path in ScraperConfig is relative
+SCRATCH_DIR = tempfile.mkdtemp(prefix='scraper_tests_')
+os.chdir(SCRATCH_DIR)
+
+
+def pytest_unconfigure(config):
+    os.chdir(UTILS_DIR)
+    shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
+
+
+def read_fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    """A MultiWebsiteScraper with fresh stores in tmp_path."""
+    from scraper import MultiWebsiteScraper
+    monkeypatch.chdir(tmp_path)
+    instance = MultiWebsiteScraper()
+    yield instance
+    instance.close()
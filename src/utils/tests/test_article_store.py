@@ -0,0 +1,114 @@
+"""
+ArticleStore appends survive a torn final write and an interrupted
+compaction, compaction keeps only the latest copy of each ID, and reads
+and queries see records in append order (or its reverse).
+"""
+
+import json
+import os
+from dataclasses import replace
+
+import pytest
+
+from article_store import ArticleStore
+from bench_storage_ingest import make_article
+from scraper_config import ScraperConfig
+
+
+def ids(store, newest_first=True):
+    return [record['id'] for record in store.iter_records(newest_first)]
+
+
+@pytest.fixture
+def small_segments(monkeypatch):
+    # A few hundred bytes per segment, so every append seals one
+    monkeypatch.setattr(ScraperConfig, 'STORE_SEGMENT_MAX_BYTES', 1)
+    monkeypatch.setattr(ScraperConfig, 'STORE_COMPACT_MIN_SEGMENTS', 3)
+
+
+def test_append_and_read_order(tmp_path):
+    store = ArticleStore(str(tmp_path / 'store'))
+    assert store.append([make_article(1), make_article(2)]) == 2
+    store.append([make_article(3)])
+    assert ids(store) == [make_article(n).id for n in (3, 2, 1)]
+    assert ids(store, newest_first=False) == [make_article(n).id for n in (1, 2, 3)]
+    assert store.append([]) == 0
+    store.close()
+
+
+def test_torn_final_line_is_cut_on_open(tmp_path):
+    path = str(tmp_path / 'store')
+    store = ArticleStore(path)
+    store.append([make_article(1), make_article(2)])
+    segment = store.segment_path(store.segment_numbers()[-1])
+    with open(segment, 'ab') as f:
+        f.write(b'{"id":"gov_torn","tit')
+    (tmp_path / 'store' / 'seg-000001.jsonl.tmp').write_bytes(b'half a compaction')
+
+    reopened = ArticleStore(path)
+    assert ids(reopened) == [make_article(2).id, make_article(1).id]
+    assert not any(name.endswith('.tmp') for name in os.listdir(path))
+    reopened.append([make_article(3)])
+    assert ids(reopened)[0] == make_article(3).id
+
+
+def test_compaction_keeps_latest_copy_in_place(tmp_path, small_segments):
+    store = ArticleStore(str(tmp_path / 'store'))
+    store.append([make_article(1)])
+    store.append([make_article(2)])
+    store.append([replace(make_article(1), title='corectat')])
+    store.append([make_article(3)])
+    store.append([make_article(4)])  # Active segment, never compacted
+    store.close()
+
+    assert len(store.segment_numbers()) < 5
+    records = list(store.iter_records(newest_first=False))
+    assert [r['id'] for r in records] == [make_article(n).id for n in (2, 1, 3, 4)]
+    assert records[1]['title'] == 'corectat'
+
+
+def test_interrupted_compaction_is_finished_on_open(tmp_path, small_segments, monkeypatch):
+    monkeypatch.setattr(ScraperConfig, 'STORE_COMPACT_MIN_SEGMENTS', 100)
+    path = str(tmp_path / 'store')
+    store = ArticleStore(path)
+    for n in range(4):
+        store.append([make_article(n)])
+    store.close()
+
+    # Crash after the merged segment replaced segment 3 but before 1 and 2 were removed
+    merged = [json.dumps({'_compacted_from': 1}).encode('utf-8') + b'\n']
+    for number in (1, 2, 3):
+        with open(store.segment_path(number), 'rb') as f:
+            merged.extend(line for line in f if not line.startswith(b'{"_'))
+    with open(store.segment_path(3), 'wb') as f:
+        f.writelines(merged)
+
+    reopened = ArticleStore(path)
+    assert reopened.segment_numbers() == [3, 4]
+    assert ids(reopened, newest_first=False) == [make_article(n).id for n in range(4)]
+
+
+def test_query_filters_and_limit(tmp_path):
+    store = ArticleStore(str(tmp_path / 'store'))
+    store.append([
+        replace(make_article(1), scraped_at='2025-06-01T09:00:00'),
+        replace(make_article(2), source='ms', category='health', scraped_at='2025-06-02T09:00:00'),
+        replace(make_article(3), scraped_at='2025-06-03T09:00:00', title='"source":"ms" in the title'),
+    ])
+    assert [a.id for a in store.query(source='gov')] == [make_article(3).id, make_article(1).id]
+    assert [a.id for a in store.query(category='health')] == [make_article(2).id]
+    assert [a.id for a in store.query(since='2025-06-02', until='2025-06-03')] == [make_article(2).id]
+    assert [a.id for a in store.query(limit=1, newest_first=False)] == [make_article(1).id]
+    assert list(store.query(limit=0)) == []
+    assert [a.id for a in store.query(source='ms')] == [make_article(2).id]
+
+
+def test_legacy_json_import_and_export(tmp_path):
+    legacy = tmp_path / 'scraped_articles.json'
+    store = ArticleStore(str(tmp_path / 'first'))
+    store.append([make_article(1), make_article(2)])
+    assert store.export_json(str(legacy)) == 2
+
+    imported = ArticleStore(str(tmp_path / 'second'), legacy_file=str(legacy))
+    assert ids(imported) == ids(store)
+    assert list(imported.iter_lines()) == list(store.iter_lines())
@@ -0,0 +1,55 @@
+"""
+ArticleStore.query streams records: peak Python heap usage (tracemalloc)
+for a filtered full scan and for a limited query stays under a fixed bound
+whatever the corpus size.
+"""
+
+import tracemalloc
+
+import pytest
+
+from article_store import ArticleStore
+from bench_storage_ingest import make_article
+
+SIZES = (5000, 50000)
+MAX_PEAK_BYTES = 512 * 1024  # A handful of records plus bookkeeping
+
+
+def peak_of(func) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.fixture(scope='module')
+def corpus(tmp_path_factory):
+    """The store and how many articles it holds so far."""
+    store = ArticleStore(str(tmp_path_factory.mktemp('memory') / 'article_store'))
+    loaded = {'store': store, 'count': 0}
+    yield loaded
+    store.close()
+
+
+@pytest.fixture(scope='module', params=SIZES, ids=lambda size: f'{size}-articles')
+def store(request, corpus):
+    """The same store, grown to each size in turn."""
+    store = corpus['store']
+    while corpus['count'] < request.param:
+        chunk = [make_article(n) for n in range(corpus['count'], min(request.param, corpus['count'] + 5000))]
+        store.append(chunk)
+        corpus['count'] += len(chunk)
+    store.close()
+    return store
+
+
+def test_filtered_scan_peak_is_bounded(store):
+    peak = peak_of(lambda: sum(1 for _ in store.query(source='gov', category='budget')))
+    assert peak < MAX_PEAK_BYTES, f"filtered scan peaked at {peak / 1024:.0f} KiB"
+
+
+def test_newest_query_peak_is_bounded(store):
+    peak = peak_of(lambda: list(store.query(limit=10)))
+    assert peak < MAX_PEAK_BYTES, f"newest-10 query peaked at {peak / 1024:.0f} KiB"
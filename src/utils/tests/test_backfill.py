@@ -0,0 +1,103 @@
+"""
+The backfill frontier queues each normalized URL once, hands out pending
+items oldest first, records what listing pages listed and carries failed
+and unfinished work over to the next run.
+"""
+
+from backfill import Frontier, next_page_link, page_url
+from html_document import parse_html
+from scraper_config import ScraperConfig
+from seen_store import normalize_url
+
+
+def link(url, title='Titlu'):
+    return (title, url, '2025-06-04')
+
+
+def drain(frontier):
+    items = []
+    while (item := frontier.next()) is not None:
+        items.append(item)
+    return items
+
+
+def test_page_url():
+    assert page_url('mai', 1) == ScraperConfig.WEBSITES['mai']['news_url']
+    assert page_url('mai', 3) == ScraperConfig.WEBSITES['mai']['page_url'].format(page=3)
+
+
+def test_next_page_link_prefers_the_pages_own_link():
+    doc = parse_html(b'<html><body><ul><li class="pager-next"><a href="?page=2">&raquo;</a></li></ul></body></html>')
+    assert next_page_link(doc, 'https://gov.ro/stiri') == 'https://gov.ro/stiri?page=2'
+    assert next_page_link(parse_html(b'<html><body><p>x</p></body></html>'), 'https://gov.ro/') is None
+
+
+def test_seed_is_idempotent(tmp_path):
+    frontier = Frontier(str(tmp_path / 'frontier.db'))
+    frontier.seed(['gov', 'mai'])
+    frontier.seed(['gov'])
+    items = drain(frontier)
+    assert [(item.source, item.kind, item.page) for item in items] == [('gov', 'listing', 1), ('mai', 'listing', 1)]
+
+
+def test_finish_listing_queues_articles_once(tmp_path):
+    frontier = Frontier(str(tmp_path / 'frontier.db'))
+    frontier.seed(['mai'])
+    listing = frontier.next()
+    links = [link('https://mai.gov.ro/a/?utm_source=x'), link('https://mai.gov.ro/b')]
+    frontier.finish_listing(listing, links + [link('https://MAI.gov.ro/a')], 2,
+                            listed=[normalize_url(url) for _, url, _ in links])
+
+    items = drain(frontier)
+    assert [(item.kind, item.url) for item in items] == [
+        ('article', 'https://mai.gov.ro/a/?utm_source=x'),
+        ('article', 'https://mai.gov.ro/b'),
+        ('listing', page_url('mai', 2)),
+    ]
+    assert items[0].link == links[0]
+    assert items[2].page == 2
+    assert frontier.counts() == {'done': 1, 'pending': 3}
+    assert frontier.listed([normalize_url('https://mai.gov.ro/b'), 'https://mai.gov.ro/c']) == {'https://mai.gov.ro/b'}
+    assert frontier.listed([]) == set()
+
+
+def test_finish_listing_uses_the_next_url(tmp_path):
+    frontier = Frontier(str(tmp_path / 'frontier.db'))
+    frontier.seed(['gov'])
+    frontier.finish_listing(frontier.next(), [], 2, next_url='https://gov.ro/stiri?p=2')
+    assert frontier.next().url == 'https://gov.ro/stiri?p=2'
+
+
+def test_claims_come_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(ScraperConfig, 'BACKFILL_CLAIM_SIZE', 2)
+    frontier = Frontier(str(tmp_path / 'frontier.db'))
+    frontier.seed(['gov'])
+    frontier.finish_listing(frontier.next(), [link(f'https://gov.ro/{i}') for i in range(5)], None)
+    assert [item.url for item in drain(frontier)] == [f'https://gov.ro/{i}' for i in range(5)]
+
+
+def test_failed_items_are_retried_up_to_max_attempts(tmp_path):
+    frontier = Frontier(str(tmp_path / 'frontier.db'))
+    frontier.seed(['gov'])
+    item = frontier.next()
+    for attempt in range(2):
+        frontier.mark_failed(item)
+        assert frontier.requeue_failed(max_attempts=2) == (1 if attempt == 0 else 0)
+    assert frontier.counts() == {'failed': 1}
+
+
+def test_a_new_run_resumes_pending_work(tmp_path):
+    path = str(tmp_path / 'frontier.db')
+    frontier = Frontier(path)
+    frontier.seed(['ms'])
+    frontier.finish_listing(frontier.next(), [link('https://ms.ro/a'), link('https://ms.ro/b')], None,
+                            listed=['https://ms.ro/a', 'https://ms.ro/b'])
+    first = frontier.next()
+    frontier.mark_done([first.seq])
+    frontier.close()
+
+    reopened = Frontier(path)
+    reopened.seed(['ms'])
+    assert [item.url for item in drain(reopened)] == ['https://ms.ro/b']
+    assert reopened.listed(['https://ms.ro/a']) == {'https://ms.ro/a'}
+    reopened.close()
@@ -0,0 +1,93 @@
+"""
+DerivedCache drops a stage's entries when its config changes, keeps
+total_bytes in step with the table and evicts the least recently used
+entries once the size budget is exceeded.
+"""
+
+import itertools
+
+import pytest
+
+import derived_cache
+from derived_cache import DerivedCache, config_version
+
+
+@pytest.fixture(autouse=True)
+def ticking_clock(monkeypatch):
+    # Every put and get gets its own timestamp, so LRU order is exact
+    ticks = itertools.count(1)
+    monkeypatch.setattr(derived_cache.time, 'time', lambda: float(next(ticks)))
+
+
+def open_cache(tmp_path, max_bytes=10**9, name='derived.db'):
+    cache = DerivedCache(str(tmp_path / name), max_bytes=max_bytes)
+    cache.register_stage('category', {'a': ['x']})
+    cache.register_stage('points', ['rule'])
+    return cache
+
+
+def stored_bytes(cache):
+    return cache._conn.execute("SELECT COALESCE(SUM(size), 0) FROM derived").fetchone()[0]
+
+
+def test_config_version_is_order_independent_for_sets_and_dicts():
+    assert config_version({'b': 1, 'a': {2, 1}}) == config_version({'a': {1, 2}, 'b': 1})
+    assert config_version(['a']) != config_version(['b'])
+
+
+def test_get_or_compute_caches(tmp_path):
+    cache = open_cache(tmp_path)
+    calls = []
+    compute = lambda: calls.append(1) or ['points']
+    assert cache.get_or_compute('points', 'text', compute) == ['points']
+    assert cache.get_or_compute('points', 'text', compute) == ['points']
+    assert len(calls) == 1
+    assert cache.get('category', 'text') is None
+    assert (cache.hits['points'], cache.misses['points'], cache.misses['category']) == (1, 1, 1)
+    cache.close()
+
+
+def test_changed_config_invalidates_only_that_stage(tmp_path):
+    cache = open_cache(tmp_path)
+    cache.put('category', 'text', 'sanatate')
+    cache.put('points', 'text', ['a'])
+    cache.close()
+
+    reopened = DerivedCache(str(tmp_path / 'derived.db'))
+    reopened.register_stage('category', {'a': ['x', 'y']})
+    reopened.register_stage('points', ['rule'])
+    assert reopened.get('category', 'text') is None
+    assert reopened.get('points', 'text') == ['a']
+    assert reopened.total_bytes == stored_bytes(reopened)
+    reopened.close()
+
+
+def test_replacing_an_entry_keeps_size_accounting(tmp_path):
+    cache = open_cache(tmp_path)
+    cache.put('points', 'text', ['short'])
+    cache.put('points', 'text', ['a much longer list of points'] * 3)
+    assert cache.total_bytes == stored_bytes(cache)
+    cache.close()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    probe = open_cache(tmp_path, name='probe.db')
+    probe.put('points', 'text 0', 'x' * 100)
+    entry_size = probe.total_bytes
+    probe.close()
+
+    cache = open_cache(tmp_path, max_bytes=entry_size * 10)
+    for i in range(10):
+        cache.put('points', f"text {i}", 'x' * 100)
+    assert cache.evictions == 0
+    cache.get('points', 'text 0')  # Now the most recently used
+    cache.put('points', 'text 10', 'x' * 100)
+
+    # Over budget: evict down to 90%, oldest first
+    assert cache.evictions == 2
+    assert cache.get('points', 'text 1') is None
+    assert cache.get('points', 'text 2') is None
+    assert cache.get('points', 'text 0') == 'x' * 100
+    assert cache.get('points', 'text 10') == 'x' * 100
+    assert cache.total_bytes == stored_bytes(cache) <= entry_size * 10
+    cache.close()
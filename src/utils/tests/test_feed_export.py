@@ -0,0 +1,163 @@
+"""
+FeedExporter merges saved articles into their source/category/month shards,
+names each shard file by its content hash, and deletes replaced files only
+once FEED_RETAIN_SECONDS have passed.
+"""
+
+import gzip
+import json
+import os
+import time
+from dataclasses import replace
+
+import pytest
+
+import feed_export
+from bench_storage_ingest import make_article
+from feed_export import FeedExporter, encode_record, shard_key
+from scraper_config import ScraperConfig
+
+JUNE = 'gov/budget/2025-06'
+
+
+def article(number, scraped_at='2025-06-04T09:00:00', **changes):
+    return replace(make_article(number), scraped_at=scraped_at, **changes)
+
+
+def line(item):
+    return encode_record(feed_export.article_to_record(item))
+
+
+class Clock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock()
+    monkeypatch.setattr(feed_export.time, 'time', fake)
+    return fake
+
+
+@pytest.fixture
+def feed(tmp_path, clock):
+    return FeedExporter(str(tmp_path / 'feed'))
+
+
+def shard_ids(feed, key):
+    return [record['id'] for record in feed.read_shard(key)]
+
+
+def files(feed):
+    return sorted(
+        os.path.relpath(os.path.join(root, name), feed.feed_dir)
+        for root, _, names in os.walk(feed.feed_dir) for name in names
+    )
+
+
+def test_shard_key():
+    assert shard_key({'source': 'ms', 'category': 'health', 'scraped_at': '2025-06-04T09:00:00'}) == 'ms/health/2025-06'
+    assert shard_key({'scraped_at': ''}) == 'unknown/general/undated'
+
+
+def test_update_writes_sorted_hashed_shards(feed):
+    changed = feed.update([article(1, '2025-06-01T09:00:00'), article(2, '2025-06-09T09:00:00'),
+                           article(3, '2025-07-01T09:00:00')])
+    assert sorted(changed) == [JUNE, 'gov/budget/2025-07']
+    assert shard_ids(feed, JUNE) == [make_article(2).id, make_article(1).id]
+
+    entry = feed.shards[JUNE]
+    path = os.path.join(feed.feed_dir, entry['path'])
+    with open(path, 'rb') as f:
+        body = f.read()
+    assert entry['path'].startswith(JUNE + '.') and entry['sha256'][:12] in entry['path']
+    assert entry['articles'] == 2 and entry['newest'] == '2025-06-09T09:00:00' and entry['bytes'] == len(body)
+    with gzip.open(path + '.gz', 'rb') as f:
+        assert f.read() == body
+
+    manifest = json.loads(open(feed.manifest_path, 'rb').read())
+    assert manifest['articles'] == 3 and set(manifest['shards']) == set(changed)
+    assert FeedExporter(feed.feed_dir).shards == feed.shards
+
+
+def test_update_merges_and_replaces_by_id(feed):
+    feed.update([article(1), article(2)])
+    assert feed.update([article(2, title='corectat'), article(3, '2025-06-05T09:00:00')]) == [JUNE]
+    records = feed.read_shard(JUNE)
+    assert [r['id'] for r in records] == [make_article(3).id, make_article(1).id, make_article(2).id]
+    assert records[2]['title'] == 'corectat'
+
+
+def test_unchanged_update_rewrites_nothing(feed):
+    feed.update([article(1)])
+    before = files(feed)
+    assert feed.update([article(1)]) == []
+    assert files(feed) == before
+
+
+def test_replaced_files_are_kept_for_the_retention_time(feed, clock):
+    feed.update([article(1)])
+    old_path = feed.shards[JUNE]['path']
+    feed.update([article(2)])
+    assert os.path.exists(os.path.join(feed.feed_dir, old_path + '.gz'))
+
+    clock.now += ScraperConfig.FEED_RETAIN_SECONDS - 60
+    feed.update([article(3)])
+    assert os.path.exists(os.path.join(feed.feed_dir, old_path))
+
+    clock.now += 120
+    feed.update([article(4)])
+    assert not any(name.startswith(old_path) for name in files(feed))
+    assert os.path.exists(os.path.join(feed.feed_dir, feed.shards[JUNE]['path']))
+
+
+def test_rebuild_keeps_first_copy_and_unchanged_files(feed):
+    lines = [line(article(2, title='corectat')), line(article(1)), line(article(2))]
+    assert feed.rebuild(lines) == 2
+    assert [r['title'] for r in feed.read_shard(JUNE)] == ['corectat', make_article(1).title]
+    paths = {key: entry['path'] for key, entry in feed.shards.items()}
+    before = files(feed)
+    feed.rebuild(lines)
+    assert {key: entry['path'] for key, entry in feed.shards.items()} == paths
+    assert files(feed) == before
+
+
+def test_rebuild_drops_empty_shards_after_retention(feed, clock):
+    feed.update([article(1), article(2, '2025-07-01T09:00:00')])
+    july = feed.shards['gov/budget/2025-07']['path']
+    feed.rebuild([line(article(1))])
+    assert set(feed.shards) == {JUNE}
+    assert os.path.exists(os.path.join(feed.feed_dir, july))
+
+    clock.now += ScraperConfig.FEED_RETAIN_SECONDS + 1
+    feed.rebuild([line(article(1))])
+    assert not os.path.exists(os.path.join(feed.feed_dir, july))
+
+
+def test_update_moves_a_resaved_article_out_of_its_old_shard(feed, clock):
+    feed.update([article(1), article(2)])
+    july = 'gov/budget/2025-07'
+    assert feed.update([article(2, '2025-07-02T09:00:00')]) == [july, JUNE]
+    assert shard_ids(feed, JUNE) == [make_article(1).id]
+    assert shard_ids(feed, july) == [make_article(2).id]
+
+    # A fresh exporter finds the old shard from the files on disk
+    reopened = FeedExporter(feed.feed_dir)
+    reopened.update([article(1, '2025-07-03T09:00:00', category='health')])
+    assert set(reopened.shards) == {july, 'gov/health/2025-07'}
+    manifest = json.loads(open(reopened.manifest_path, 'rb').read())
+    assert manifest['articles'] == 2 and JUNE not in manifest['shards']
+
+    clock.now += ScraperConfig.FEED_RETAIN_SECONDS + 1
+    reopened.update([article(3, '2025-07-04T09:00:00')])
+    assert not any(name.startswith(JUNE) for name in files(reopened))
+
+
+def test_rebuild_indexes_articles_for_later_updates(feed):
+    feed.rebuild([line(article(1))])
+    feed.update([article(1, '2025-07-01T09:00:00')])
+    assert set(feed.shards) == {'gov/budget/2025-07'}
@@ -0,0 +1,79 @@
+"""
+ConcurrentFetcher runs jobs on a shared pool but never more than
+max_per_host at once against one host, so other hosts keep their workers.
+"""
+
+import threading
+import time
+
+import pytest
+
+from fetch_engine import ConcurrentFetcher, host_of
+
+
+class Probe:
+    """Job that records how many calls per host run at the same time."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = {}
+        self.peak = {}
+
+    def __call__(self, host, value, delay=0.02):
+        with self.lock:
+            self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        time.sleep(delay)
+        with self.lock:
+            self.active[host] -= 1
+        return value
+
+
+def test_host_of():
+    assert host_of('https://WWW.Gov.ro:443/stiri?x=1') == 'www.gov.ro:443'
+
+
+def test_per_host_limit_and_results():
+    probe = Probe()
+    with ConcurrentFetcher(max_workers=6, max_per_host=2) as fetcher:
+        futures = [fetcher.submit(f'https://{host}/{i}', probe, host, i)
+                   for i in range(6) for host in ('gov.ro', 'ms.ro')]
+        results = [future.result(timeout=5) for future in futures]
+    assert results == [i for i in range(6) for _ in range(2)]
+    assert probe.peak == {'gov.ro': 2, 'ms.ro': 2}
+
+
+def test_a_busy_host_does_not_block_others():
+    probe = Probe()
+    with ConcurrentFetcher(max_workers=4, max_per_host=1) as fetcher:
+        slow = [fetcher.submit(f'https://gov.ro/{i}', probe, 'gov.ro', i, 0.05) for i in range(4)]
+        started = time.perf_counter()
+        fetcher.submit('https://ms.ro/a', probe, 'ms.ro', 'a').result(timeout=5)
+        assert time.perf_counter() - started < 0.15
+        assert [future.result(timeout=5) for future in slow] == [0, 1, 2, 3]
+    assert probe.peak['gov.ro'] == 1
+
+
+def test_exceptions_reach_the_future_and_free_the_slot():
+    def fail():
+        raise ValueError('boom')
+
+    with ConcurrentFetcher(max_workers=2, max_per_host=1) as fetcher:
+        failed = fetcher.submit('https://gov.ro/a', fail)
+        after = fetcher.submit('https://gov.ro/b', lambda: 'ok')
+        with pytest.raises(ValueError):
+            failed.result(timeout=5)
+        assert after.result(timeout=5) == 'ok'
+
+
+def test_cancelled_jobs_are_skipped():
+    gate = threading.Event()
+    calls = []
+    with ConcurrentFetcher(max_workers=2, max_per_host=1) as fetcher:
+        first = fetcher.submit('https://gov.ro/a', gate.wait, 5)
+        queued = fetcher.submit('https://gov.ro/b', calls.append, 'b')
+        assert queued.cancel()
+        gate.set()
+        assert first.result(timeout=5) is True
+        assert fetcher.submit('https://gov.ro/c', lambda: 'c').result(timeout=5) == 'c'
+    assert calls == []
@@ -0,0 +1,48 @@
+"""
+HTMLNode is the abstract interface every parser backend implements; the
+installed backends agree on selection and text over the fixture pages.
+"""
+
+import pytest
+
+from conftest import read_fixture
+from html_document import BACKENDS, HTMLNode, backend_available, decode_html, parse_html
+
+INSTALLED = [name for name in BACKENDS if backend_available(name)]
+
+
+def test_html_node_is_abstract():
+    with pytest.raises(TypeError):
+        HTMLNode()
+
+    class Partial(HTMLNode):
+        def select(self, css):
+            return []
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+@pytest.mark.parametrize('backend', INSTALLED)
+def test_backend_nodes_implement_the_interface(backend):
+    doc = parse_html(b'<html><body><p class="a">One <b>two</b></p><p></p></body></html>', backend)
+    assert isinstance(doc.root, HTMLNode)
+    node = doc.select_one('p')
+    assert node.get('class') in ('a', ['a'])
+    assert node.get('missing', 'x') == 'x'
+    assert node.text(separator=' ', strip=True) == 'One two'
+    assert doc.paragraphs() == ['Onetwo']  # strip=True without a separator, as in get_text
+    assert doc.select_one('table') is None
+
+
+@pytest.mark.parametrize('name', ['gov_article.html', 'mai_article.html', 'ms_article.html'])
+def test_backends_agree_on_fixture_pages(name):
+    content = read_fixture(name)
+    texts = {backend: parse_html(content, backend).content_text(['article', 'main']) for backend in INSTALLED}
+    assert len(set(texts.values())) == 1, texts
+
+
+def test_decode_html_falls_back_to_declared_charset():
+    content = '<meta charset="iso-8859-2"><p>Bucureşti</p>'.encode('iso-8859-2')
+    assert 'Bucureşti' in decode_html(content)
+    assert decode_html('ţară'.encode('utf-8')) == 'ţară'
@@ -0,0 +1,78 @@
+"""
+HTTPCache reuses a parsed listing only while the body and the parser
+version that produced it are unchanged.
+"""
+
+import hashlib
+
+from http_cache import HTTPCache
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeClient:
+    """Serves one body with an ETag and answers 304 when the ETag is sent back."""
+
+    def __init__(self, content):
+        self.content = content
+        self.requests = []
+
+    def get(self, url, headers=None):
+        headers = headers or {}
+        self.requests.append(headers)
+        etag = hashlib.sha256(self.content).hexdigest()
+        if headers.get('If-None-Match') == etag:
+            return FakeResponse(304)
+        return FakeResponse(200, self.content, {'ETag': etag})
+
+
+URL = 'https://example.ro/stiri'
+
+
+def test_unchanged_listing_returns_parsed_result(tmp_path):
+    client = FakeClient(b'<html>v1</html>')
+    cache = HTTPCache(str(tmp_path), parser_version='a')
+    first = cache.fetch(client, URL)
+    assert not first.unchanged and first.parsed is None
+    cache.store_parsed(URL, [['id', URL]])
+
+    again = HTTPCache(str(tmp_path), parser_version='a').fetch(client, URL)
+    assert again.unchanged
+    assert again.content == b'<html>v1</html>'
+    assert again.parsed == [['id', URL]]
+    assert client.requests[-1]['If-None-Match']
+
+
+def test_changed_body_drops_parsed_result(tmp_path):
+    client = FakeClient(b'<html>v1</html>')
+    cache = HTTPCache(str(tmp_path), parser_version='a')
+    cache.fetch(client, URL)
+    cache.store_parsed(URL, ['old'])
+
+    client.content = b'<html>v2</html>'
+    changed = cache.fetch(client, URL)
+    assert not changed.unchanged and changed.parsed is None
+    assert changed.content == b'<html>v2</html>'
+
+
+def test_new_parser_version_ignores_parsed_result(tmp_path):
+    client = FakeClient(b'<html>v1</html>')
+    old = HTTPCache(str(tmp_path), parser_version='a')
+    old.fetch(client, URL)
+    old.store_parsed(URL, ['parsed by a'])
+
+    new = HTTPCache(str(tmp_path), parser_version='b')
+    listing = new.fetch(client, URL)
+    assert listing.unchanged and listing.parsed is None
+    new.store_parsed(URL, ['parsed by b'])
+    assert new.fetch(client, URL).parsed == ['parsed by b']
+    assert HTTPCache(str(tmp_path), parser_version='a').fetch(client, URL).parsed is None
@@ -0,0 +1,131 @@
+"""
+HTTPClient retries timeouts, connection errors and retryable statuses with
+capped exponential backoff, honours Retry-After up to HTTP_RETRY_AFTER_MAX
+and gives up after HTTP_MAX_RETRIES.
+"""
+
+import io
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+import http_client
+from http_client import HTTPClient, backoff_delay, parse_retry_after
+from scraper_config import ScraperConfig
+
+URL = 'https://example.ro/page'
+
+
+def make_response(status_code, headers=None, content=b'ok'):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = content
+    response.raw = io.BytesIO(content)
+    response.url = URL
+    return response
+
+
+class FakeSession:
+    """Plays back a list of responses or exceptions, one per request."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(http_client.time, 'sleep', delays.append)
+    return delays
+
+
+def client_with(monkeypatch, outcomes):
+    client = HTTPClient()
+    session = FakeSession(outcomes)
+    monkeypatch.setattr(client, 'session_for', lambda url: session)
+    return client, session
+
+
+@pytest.mark.parametrize('value, expected', [
+    (None, None),
+    ('', None),
+    ('7', 7.0),
+    (' 0 ', 0.0),
+    ('soon', None),
+    ('Wed, 21 Oct 2015 07:28:00 GMT', 0.0),  # In the past
+])
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=60)
+    assert 55 <= parse_retry_after(format_datetime(when, usegmt=True)) <= 60
+
+
+def test_backoff_is_capped_and_jittered():
+    for attempt in range(12):
+        ceiling = min(ScraperConfig.HTTP_BACKOFF_MAX, ScraperConfig.HTTP_BACKOFF_FACTOR * 2 ** attempt)
+        for _ in range(20):
+            assert ceiling / 2 <= backoff_delay(attempt) <= ceiling
+
+
+def test_retries_retryable_status_then_succeeds(monkeypatch, sleeps):
+    client, session = client_with(monkeypatch, [make_response(503), make_response(502), make_response(200)])
+    assert client.get(URL).status_code == 200
+    assert session.calls == 3
+    assert len(sleeps) == 2
+    stats = client.stats()
+    assert (stats['requests'], stats['retries'], stats['failures']) == (3, 2, 0)
+
+
+def test_non_retryable_status_is_returned_at_once(monkeypatch, sleeps):
+    client, session = client_with(monkeypatch, [make_response(404)])
+    assert client.get(URL).status_code == 404
+    assert session.calls == 1 and sleeps == []
+
+
+def test_retry_after_lengthens_the_delay(monkeypatch, sleeps):
+    client, _ = client_with(monkeypatch, [make_response(429, {'Retry-After': '45'}), make_response(200)])
+    client.get(URL)
+    assert sleeps == [45.0]
+
+
+def test_retry_after_is_capped(monkeypatch, sleeps):
+    client, _ = client_with(monkeypatch, [make_response(503, {'Retry-After': '86400'}), make_response(200)])
+    client.get(URL)
+    assert sleeps == [ScraperConfig.HTTP_RETRY_AFTER_MAX]
+
+
+def test_last_retryable_response_is_returned(monkeypatch, sleeps):
+    responses = [make_response(503) for _ in range(ScraperConfig.HTTP_MAX_RETRIES + 1)]
+    client, session = client_with(monkeypatch, responses)
+    assert client.get(URL).status_code == 503
+    assert session.calls == ScraperConfig.HTTP_MAX_RETRIES + 1
+    assert len(sleeps) == ScraperConfig.HTTP_MAX_RETRIES
+
+
+def test_connection_errors_are_retried_then_raised(monkeypatch, sleeps):
+    errors = [requests.ConnectionError('reset')] * ScraperConfig.HTTP_MAX_RETRIES + [requests.Timeout('slow')]
+    client, session = client_with(monkeypatch, errors)
+    with pytest.raises(requests.Timeout):
+        client.get(URL)
+    assert session.calls == ScraperConfig.HTTP_MAX_RETRIES + 1
+    assert client.stats()['failures'] == 1
+
+
+def test_connection_error_then_success(monkeypatch, sleeps):
+    client, _ = client_with(monkeypatch, [requests.ConnectionError('reset'), make_response(200)])
+    assert client.get(URL).content == b'ok'
+    assert len(sleeps) == 1
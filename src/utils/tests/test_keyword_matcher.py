@@ -0,0 +1,61 @@
+"""
+KeywordMatcher counts one hit per keyword occurrence that starts a word,
+inflection suffixes allowed; acronyms need the whole word. build_trie_pattern
+matches exactly its words, longest first.
+"""
+
+import re
+
+import pytest
+
+from keyword_matcher import KeywordMatcher, build_trie_pattern
+from scraper_config import ScraperConfig
+
+
+@pytest.mark.parametrize('words', [
+    ['școli'], ['a', 'ab', 'abc'], ['spital', 'spitale', 'sport', 'sănătate'], ['c++', 'a.b', '(x)'],
+])
+def test_trie_pattern_matches_exactly_its_words(words):
+    pattern = re.compile(build_trie_pattern(words))
+    for word in words:
+        assert pattern.fullmatch(word)
+        assert pattern.match(word + 'zz').group(0) == word  # Longest word wins
+    assert not pattern.fullmatch('zz')
+
+
+@pytest.fixture
+def matcher():
+    return KeywordMatcher({
+        'education': ['școli', 'elevi', 'IT'],
+        'health': ['spital', 'medici', 'medicină'],
+        'safety': ['situații de urgență', 'UE'],
+        'shared': ['spital'],
+    })
+
+
+def test_counts_hits_per_group(matcher):
+    counts = matcher.count('Spitalele și spitalul județean; medicii din spital.')
+    assert counts == {'health': 4, 'shared': 3}
+
+
+def test_prefix_of_word_only(matcher):
+    assert matcher.count('Școlile și elevii') == {'education': 2}
+    assert matcher.count('preșcolile, coelevii') == {}
+
+
+def test_acronyms_match_whole_words_only(matcher):
+    assert matcher.count('Firme IT din UE') == {'education': 1, 'safety': 1}
+    assert matcher.count('ITALIA și UEFA') == {}
+
+
+
+def test_cedilla_forms_match(matcher):
+    assert matcher.count('Situaţii de urgenţă și situații de urgență') == {'safety': 2}
+
+
+def test_config_keywords_compile():
+    matcher = KeywordMatcher.from_categories(ScraperConfig.CATEGORIES)
+    assert set(matcher.groups) == set(ScraperConfig.CATEGORIES)
+    for key, data in ScraperConfig.CATEGORIES.items():
+        for keyword in data['keywords']:
+            assert matcher.count(f"Text despre {keyword}.")[key] >= 1, keyword
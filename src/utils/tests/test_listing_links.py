@@ -0,0 +1,57 @@
+"""
+Listing pages give their article links, gov.ro's cedilla spelling included,
+and backfill finds the next listing page.
+"""
+
+import pytest
+
+from backfill import next_page_link, page_url
+from conftest import read_fixture
+from html_document import parse_html
+from scraper_config import ScraperConfig
+
+
+@pytest.mark.parametrize('source', ['gov', 'mai', 'ms'])
+def test_fixture_listings_give_links(scraper, source):
+    links = scraper.listing_links(source, parse_html(read_fixture(f'{source}_listing.html')))
+    assert links
+    base_url = ScraperConfig.WEBSITES[source]['base_url']
+    assert all(url.startswith(base_url) and link_source == source for _, url, _, _, link_source in links)
+
+
+def test_gov_listing_matches_cedilla_titles(scraper):
+    links = scraper.listing_links('gov', parse_html(read_fixture('gov_listing.html')))
+    assert len(links) == 12
+    assert all(title.startswith('Informaţie de presă') for _, _, title, _, _ in links)
+    assert links[0][3] == '28_Iun'
+
+
+@pytest.mark.parametrize('title', ['Informaţie de presă', 'Informație de presă', 'Informatie de presa', 'INFORMAŢIE'],
+                         ids=['cedilla', 'comma-below', 'plain', 'uppercase'])
+def test_gov_title_filter_ignores_diacritics(scraper, title):
+    html = f'<div class="sedinte_lista" id="sed_04_Iun"><a href="/ro/stire-1">{title}</a></div>'
+    assert len(scraper.listing_links('gov', parse_html(html.encode('utf-8')))) == 1
+
+
+def test_gov_listing_skips_other_links(scraper):
+    html = '<div class="sedinte_lista" id="sed_04_Iun"><a href="/ro/agenda-1">Agenda</a></div>'
+    assert scraper.listing_links('gov', parse_html(html.encode('utf-8'))) == []
+
+
+def test_page_url():
+    assert page_url('gov', 1) == ScraperConfig.WEBSITES['gov']['news_url']
+    assert page_url('gov', 3) == 'https://gov.ro/ro/guvernul/sedinte-guvern?page=3'
+
+
+@pytest.mark.parametrize('markup', [
+    '<link rel="next" href="?page=2">',
+    '<ul class="pager"><li class="pager-next"><a href="/ro/guvernul/sedinte-guvern?page=2">›</a></li></ul>',
+], ids=['link-rel-next', 'pager-next'])
+def test_next_page_link_is_followed(markup):
+    url = ScraperConfig.WEBSITES['gov']['news_url']
+    doc = parse_html(f'<html><head></head><body>{markup}</body></html>'.encode('utf-8'))
+    assert next_page_link(doc, url) == 'https://gov.ro/ro/guvernul/sedinte-guvern?page=2'
+
+
+def test_no_next_page_link():
+    assert next_page_link(parse_html(read_fixture('gov_listing.html')), 'https://gov.ro/') is None
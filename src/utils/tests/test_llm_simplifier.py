@@ -0,0 +1,161 @@
+"""
+LLMSimplifier: chunks stay within the token budget, prompts are batched up
+to the backend's batch size, rate limits are retried, and any failure or
+timeout resolves to the rule-based text. Only LLM output is cached.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from derived_cache import DerivedCache
+from llm_simplifier import AdaptiveLimit, LLMSimplifier, RetryableLLMError, chunk_text
+from scraper_config import ScraperConfig
+
+
+def fallback(text, category):
+    return f"rules:{category}"
+
+
+class FakeBackend:
+    """Answers each prompt with its length; fails as scripted first."""
+
+    def __init__(self, batch_size=1, failures=(), delay=0.0):
+        self.batch_size = batch_size
+        self.failures = list(failures)
+        self.delay = delay
+        self.batches = []
+        self._lock = threading.Lock()
+        self.closed = False
+
+    def complete(self, prompts):
+        with self._lock:
+            self.batches.append(len(prompts))
+            failure = self.failures.pop(0) if self.failures else None
+        time.sleep(self.delay)
+        if failure is not None:
+            raise failure
+        return [f"llm:{len(prompt)}" for prompt in prompts]
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def quick_retries(monkeypatch):
+    monkeypatch.setattr(ScraperConfig, 'HTTP_BACKOFF_FACTOR', 0.001)
+    monkeypatch.setattr(ScraperConfig, 'HTTP_BACKOFF_MAX', 0.01)
+
+
+def simplifier_with(backend, cache=None):
+    return LLMSimplifier(fallback, backend=backend, cache=cache)
+
+
+@pytest.mark.parametrize('text', [
+    'Propoziție scurtă.',
+    'Prima frază. A doua frază! A treia? ' * 200,
+    'cuvânt ' * 5000,  # No sentence ends at all
+    'paragraf unu.\n\nparagraf doi.\n' * 100,
+])
+def test_chunks_fit_the_budget_and_keep_every_word(text):
+    chunks = chunk_text(text, max_tokens=100)
+    assert all(0 < len(chunk) <= 100 * ScraperConfig.LLM_CHARS_PER_TOKEN for chunk in chunks)
+    assert ' '.join(chunks).split() == text.split()
+
+
+def test_adaptive_limit_halves_and_grows_back():
+    async def scenario():
+        limit = AdaptiveLimit(8)
+        await limit.acquire()
+        await limit.release(rate_limited=True)
+        assert limit.limit == 4
+        for _ in range(40):
+            await limit.acquire()
+            await limit.release()
+        assert limit.limit == 8
+        for _ in range(10):
+            await limit.acquire()
+            await limit.release(rate_limited=True)
+        assert limit.limit == 1
+
+    asyncio.run(scenario())
+
+
+def test_long_article_is_chunked_and_joined():
+    backend = FakeBackend()
+    simplifier = simplifier_with(backend)
+    try:
+        text = 'Frază lungă despre buget. ' * 1000
+        result = simplifier.submit(text, 'budget').result(5)
+        chunks = chunk_text(text, ScraperConfig.LLM_CHUNK_TOKENS)
+        assert len(chunks) > 1
+        assert result.count('llm:') == len(chunks)
+        assert simplifier.stats['chunks'] == len(chunks) and simplifier.stats['fallback'] == 0
+    finally:
+        simplifier.close()
+    assert backend.closed
+
+
+def test_prompts_are_batched():
+    backend = FakeBackend(batch_size=4, delay=0.01)
+    simplifier = simplifier_with(backend)
+    try:
+        futures = [simplifier.submit(f"Articolul {n}.", 'general') for n in range(8)]
+        assert all(future.result(5).startswith('llm:') for future in futures)
+        assert sum(backend.batches) == 8 and max(backend.batches) <= 4 and len(backend.batches) < 8
+    finally:
+        simplifier.close()
+
+
+def test_rate_limits_are_retried():
+    backend = FakeBackend(failures=[RetryableLLMError(429, retry_after=0.01), RetryableLLMError(503)])
+    simplifier = simplifier_with(backend)
+    try:
+        assert simplifier.submit('Un text.', 'general').result(5).startswith('llm:')
+        assert simplifier.stats['retryable_errors'] == 2 and simplifier.stats['requests'] == 3
+    finally:
+        simplifier.close()
+
+
+def test_failures_fall_back_to_rules(monkeypatch):
+    monkeypatch.setattr(ScraperConfig, 'LLM_MAX_RETRIES', 1)
+    backend = FakeBackend(failures=[RetryableLLMError(429)] * 2 + [ValueError('bad answer')])
+    simplifier = simplifier_with(backend)
+    try:
+        assert simplifier.submit('Primul text.', 'health').result(5) == 'rules:health'
+        assert simplifier.submit('Al doilea text.', 'safety').result(5) == 'rules:safety'
+        assert simplifier.stats['fallback'] == 2
+    finally:
+        simplifier.close()
+
+
+def test_timeout_falls_back_to_rules(monkeypatch):
+    monkeypatch.setattr(ScraperConfig, 'LLM_ARTICLE_TIMEOUT', 0.05)
+    simplifier = simplifier_with(FakeBackend(delay=0.5))
+    try:
+        assert simplifier.submit('Un text lent.', 'general').result(5) == 'rules:general'
+    finally:
+        simplifier.close()
+
+
+def test_only_llm_output_is_cached(tmp_path):
+    cache = DerivedCache(str(tmp_path / 'derived.db'))
+    cache.register_stage('simplified_llm')
+    failing = simplifier_with(FakeBackend(failures=[ValueError('down')]), cache)
+    try:
+        assert failing.submit('Text.', 'general').result(5) == 'rules:general'
+    finally:
+        failing.close()
+    assert cache.get('simplified_llm', 'Text.') is None
+
+    backend = FakeBackend()
+    simplifier = simplifier_with(backend, cache)
+    try:
+        first = simplifier.submit('Text.', 'general').result(5)
+        assert simplifier.submit('Text.', 'general').result(5) == first
+        assert backend.batches == [1]
+    finally:
+        simplifier.close()
+        cache.close()
@@ -0,0 +1,145 @@
+"""
+ScraperMetrics keeps process totals and per-run tallies, closes a run into
+a scraper_runs-shaped summary and renders the totals as Prometheus text or
+JSON.
+"""
+
+import json
+
+from metrics import LatencyHistogram, ScraperMetrics, append_run_summary, escape_label
+from scraper_config import ScraperConfig
+
+
+class Clock:
+    def __init__(self, now: float = 1_750_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_histogram_counts_are_cumulative():
+    histogram = LatencyHistogram((1, 0.1, 0.5))
+    for value in (0.05, 0.3, 0.7, 2.0):
+        histogram.observe(value)
+    assert histogram.buckets == (0.1, 0.5, 1)
+    assert histogram.counts == [1, 2, 3]
+    assert histogram.count == 4
+    assert histogram.total == 3.05
+
+
+def test_run_tally_is_separate_from_totals():
+    metrics = ScraperMetrics(clock=Clock())
+    metrics.observe_fetch('https://gov.ro/a', 0.2, 100)
+    metrics.count_article('gov')
+
+    metrics.start_run(['gov', 'ms'])
+    metrics.observe_fetch('https://GOV.ro/b', 0.4, 300, ok=False)
+    metrics.count_article('ms')
+    summary = metrics.finish_run(articles_found=1)
+
+    assert summary['hosts'] == {'gov.ro': {'requests': 1, 'errors': 1, 'bytes': 300,
+                                           'avg_seconds': 0.4, 'max_seconds': 0.4}}
+    assert summary['articles_by_source'] == {'ms': 1}
+    assert summary['sources_scraped'] == ['gov', 'ms']
+    assert metrics.totals.hosts()['gov.ro']['requests'] == 2
+    assert metrics.totals.articles == {'gov': 1, 'ms': 1}
+
+
+def test_finish_run_summary_and_status():
+    clock = Clock()
+    metrics = ScraperMetrics(clock=clock)
+    metrics.start_run(['gov'])
+    clock.now += 4
+    summary = metrics.finish_run(articles_found=10)
+    assert summary['status'] == 'completed'
+    assert summary['duration_seconds'] == 4
+    assert summary['articles_per_second'] == 2.5
+    assert summary['started_at'] == '2025-06-15T15:06:40+00:00'
+    assert summary['completed_at'] == '2025-06-15T15:06:44+00:00'
+
+    metrics.start_run(['gov'])
+    metrics.count_error('gov', 'timeout')
+    assert metrics.finish_run(articles_found=0)['status'] == 'completed_with_errors'
+
+    metrics.start_run(['gov'])
+    assert metrics.finish_run(articles_found=0, failed=True)['status'] == 'failed'
+    assert metrics.runs == {'completed': 1, 'completed_with_errors': 1, 'failed': 1}
+
+
+def test_run_errors_are_capped(monkeypatch):
+    monkeypatch.setattr(ScraperConfig, 'METRICS_MAX_RUN_ERRORS', 2)
+    metrics = ScraperMetrics(clock=Clock())
+    metrics.start_run(['gov'])
+    for i in range(5):
+        metrics.count_error('gov', f'error {i}')
+    summary = metrics.finish_run(articles_found=0)
+    assert summary['errors'] == ['gov: error 0', 'gov: error 1']
+    assert summary['errors_by_source'] == {'gov': 5}
+
+
+def test_stage_counts_calls_even_when_the_block_raises():
+    metrics = ScraperMetrics(clock=Clock())
+    with metrics.stage('parse'):
+        pass
+    try:
+        with metrics.stage('parse'):
+            raise ValueError
+    except ValueError:
+        pass
+    assert metrics.totals.stages()['parse']['calls'] == 2
+
+
+def test_slow_hosts(monkeypatch):
+    monkeypatch.setattr(ScraperConfig, 'METRICS_SLOW_HOST_SECONDS', 1)
+    metrics = ScraperMetrics(clock=Clock())
+    metrics.start_run(['gov', 'ms'])
+    metrics.observe_fetch('https://gov.ro/a', 3.0, 10)
+    metrics.observe_fetch('https://ms.ro/a', 0.5, 10)
+    assert metrics.slow_hosts(metrics.finish_run(articles_found=0)) == ['gov.ro']
+
+
+def test_render_prometheus():
+    metrics = ScraperMetrics(buckets=(0.5, 1), clock=Clock())
+    metrics.start_run(['gov'])
+    metrics.observe_fetch('https://gov.ro/a', 0.2, 100)
+    metrics.observe_fetch('https://gov.ro/b', 0.8, 50)
+    metrics.count_article('gov')
+    metrics.finish_run(articles_found=1)
+    lines = metrics.render_prometheus().splitlines()
+
+    assert '# TYPE scraper_fetch_duration_seconds histogram' in lines
+    assert 'scraper_fetch_duration_seconds_bucket{host="gov.ro",le="0.5"} 1' in lines
+    assert 'scraper_fetch_duration_seconds_bucket{host="gov.ro",le="1"} 2' in lines
+    assert 'scraper_fetch_duration_seconds_bucket{host="gov.ro",le="+Inf"} 2' in lines
+    assert 'scraper_fetch_duration_seconds_count{host="gov.ro"} 2' in lines
+    assert 'scraper_fetch_bytes_total{host="gov.ro"} 150' in lines
+    assert 'scraper_articles_total{source="gov"} 1' in lines
+    assert 'scraper_runs_total{status="completed"} 1' in lines
+    assert 'scraper_last_run_timestamp_seconds 1.75e+09' in lines
+
+
+def test_escape_label():
+    assert escape_label('a"b\\c\nd') == 'a\\"b\\\\c\\nd'
+
+
+def test_write_picks_format_from_the_extension(tmp_path):
+    metrics = ScraperMetrics(clock=Clock())
+    metrics.count_article('gov')
+
+    metrics.write(str(tmp_path / 'metrics.json'))
+    data = json.loads((tmp_path / 'metrics.json').read_text(encoding='utf-8'))
+    assert data['articles_by_source'] == {'gov': 1}
+
+    metrics.write(str(tmp_path / 'metrics.prom'))
+    text = (tmp_path / 'metrics.prom').read_text(encoding='utf-8')
+    assert 'scraper_articles_total{source="gov"} 1' in text
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_append_run_summary(tmp_path):
+    path = str(tmp_path / 'runs.jsonl')
+    append_run_summary({'id': 'a'}, path)
+    append_run_summary({'id': 'b'}, path)
+    with open(path, encoding='utf-8') as f:
+        assert [json.loads(line)['id'] for line in f] == ['a', 'b']
@@ -0,0 +1,60 @@
+"""
+Article keeps its constructor and asdict() output; ArticleBatch gives back
+exactly the articles put in, by index, slice and column.
+"""
+
+from dataclasses import asdict, replace
+
+import pytest
+
+from bench_storage_ingest import make_article
+from models import Article, ArticleBatch
+
+
+def sample():
+    return [
+        make_article(0),
+        replace(make_article(1), source='ms', category='health', detailed_points=[], is_new=False),
+        replace(make_article(2), detailed_points=('unu', 'doi')),
+        replace(make_article(3), source='mai', category='safety', detailed_points=['trei']),
+    ]
+
+
+def test_article_fields_round_trip():
+    article = make_article(5)
+    record = asdict(article)
+    assert isinstance(article.detailed_points, tuple)
+    assert Article(**record) == article
+    with pytest.raises(AttributeError):
+        article.unknown = 1  # Slotted
+
+
+def test_batch_round_trip():
+    articles = sample()
+    batch = ArticleBatch(articles)
+    assert len(batch) == 4
+    assert list(batch) == articles
+    assert batch[-1] == articles[-1]
+    assert batch[1:3] == articles[1:3]
+    with pytest.raises(IndexError):
+        batch[4]
+
+
+def test_columns_without_building_articles():
+    articles = sample()
+    batch = ArticleBatch(articles)
+    assert batch.column('source') == [a.source for a in articles]
+    assert batch.column('title') == [a.title for a in articles]
+    assert batch.column('detailed_points') == [tuple(a.detailed_points) for a in articles]
+    assert batch.column('is_new') == [True, False, True, True]
+    assert batch.count_by('source') == {'gov': 2, 'ms': 1, 'mai': 1}
+    assert batch.indices(source='gov') == [0, 2]
+    assert batch.indices(source='gov', category='health') == []
+    assert batch.indices(source='bbc') == []
+
+
+def test_more_distinct_values_than_two_byte_codes():
+    articles = [replace(make_article(n), category_name=f"name {n}") for n in range(0x10000 + 5)]
+    batch = ArticleBatch(articles)
+    assert batch[0x10000 + 4].category_name == f"name {0x10000 + 4}"
+    assert batch[3] == articles[3]
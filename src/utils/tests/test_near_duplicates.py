@@ -0,0 +1,103 @@
+"""
+MinHash signatures estimate shingle similarity, and the LSH index finds a
+lightly edited copy while leaving unrelated articles alone.
+"""
+
+import random
+
+import pytest
+
+from near_duplicates import MinHasher, NearDuplicateIndex, choose_bands, shingles, similarity
+
+WORDS = ('guvernul ministerul sănătății spitalul județean fonduri europene program național '
+         'școli elevi profesori drumuri poduri autostrada pompierii intervenție incendiu '
+         'poliția rutieră control trafic vaccinare campanie medicamente compensate buget').split()
+
+
+def article(seed, length=120):
+    rng = random.Random(seed)
+    return ' '.join(rng.choice(WORDS) + str(rng.randrange(40)) for _ in range(length))
+
+
+def edit(text, fraction, seed=0):
+    rng = random.Random(seed)
+    words = text.split()
+    for i in rng.sample(range(len(words)), int(len(words) * fraction)):
+        words[i] = f"modificat{i}"
+    return ' '.join(words)
+
+
+def exact_jaccard(first, second, size=3):
+    a, b = shingles(first, size), shingles(second, size)
+    return len(a & b) / len(a | b)
+
+
+def test_shingles_fold_case_and_cedillas():
+    assert shingles('Situaţii de URGENȚĂ', 3) == shingles('situații de urgență', 3)
+    assert shingles('unu doi', 3) == {b'unu doi'}
+    assert shingles('  ', 3) == set()
+    assert len(shingles('a b c d e', 3)) == 3
+
+
+@pytest.mark.parametrize('num_perm, threshold', [(64, 0.7), (128, 0.5), (32, 0.9)])
+def test_choose_bands_fits_signature(num_perm, threshold):
+    bands, rows = choose_bands(num_perm, threshold)
+    assert bands * rows <= num_perm
+    assert (1 / bands) ** (1 / rows) <= threshold
+
+
+def test_signature_estimates_jaccard():
+    hasher = MinHasher(num_perm=256, shingle_size=3)
+    original = article(1)
+    for fraction in (0.0, 0.05, 0.2, 0.5):
+        copy = edit(original, fraction)
+        estimate = similarity(hasher.signature(original), hasher.signature(copy))
+        assert estimate == pytest.approx(exact_jaccard(original, copy), abs=0.1)
+    assert hasher.signature('') is None
+
+
+def test_signatures_are_stable_across_instances():
+    text = article(2)
+    assert MinHasher(64, 3).signature(text) == MinHasher(64, 3).signature(text)
+
+
+@pytest.fixture
+def index():
+    instance = NearDuplicateIndex(':memory:', threshold=0.7, num_perm=64, shingle_size=3)
+    yield instance
+    instance.close()
+
+
+def test_finds_edited_copy_and_ignores_others(index):
+    originals = {f"gov_{i}": article(i) for i in range(30)}
+    index.add_many((article_id, 'gov', index.signature(text)) for article_id, text in originals.items())
+    assert len(index) == 30
+
+    match = index.find_similar(index.signature(edit(originals['gov_7'], 0.03)))
+    assert match is not None and match[0] == 'gov_7' and match[1] >= 0.7
+    assert index.find_similar(index.signature(article(999))) is None
+    assert index.find_similar(None) is None
+
+
+def test_readding_keeps_one_set_of_bands(index):
+    signature = index.signature(article(3))
+    index.add('ms_1', 'ms', signature)
+    index.add('ms_1', 'ms', signature)
+    index.add('ms_2', 'ms', None)
+    assert len(index) == 1
+    bands = index._conn.execute("SELECT COUNT(*) FROM bands").fetchone()[0]
+    assert bands == index.bands
+
+
+def test_index_survives_reopen(tmp_path):
+    path = str(tmp_path / 'near.db')
+    text = article(4)
+    first = NearDuplicateIndex(path)
+    first.add('mai_1', 'mai', first.signature(text))
+    first.close()
+
+    reopened = NearDuplicateIndex(path)
+    try:
+        assert reopened.find_similar(reopened.signature(edit(text, 0.02)))[0] == 'mai_1'
+    finally:
+        reopened.close()
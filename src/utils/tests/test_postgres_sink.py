@@ -0,0 +1,79 @@
+"""
+copy_line writes COPY text-format lines that Postgres decodes back to the
+original values, arrays included. The decoders below follow the COPY and
+array input rules of the Postgres manual.
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from postgres_sink import array_literal, copy_line, copy_text, parse_scraped_at
+
+COPY_ESCAPES = {'\\': '\\', 't': '\t', 'n': '\n', 'r': '\r'}
+TRICKY = [
+    '', 'plain', 'tab\there', 'line\nbreak', 'cr\r\nlf', 'back\\slash', '\\N', 'trailing\\',
+    'quote "inside"', 'comma, {braces}', 'NULL', 'ă î ș ț 🚒', '\\t literal',
+]
+
+
+def decode_copy_line(line):
+    assert line.endswith('\n') and line.count('\n') == 1
+    fields = line[:-1].split('\t')
+    assert '\\N' not in fields  # No value may be read as NULL
+    return [re.sub(r'\\(.)', lambda m: COPY_ESCAPES[m.group(1)], field) for field in fields]
+
+
+def decode_array(literal):
+    assert literal.startswith('{') and literal.endswith('}')
+    body = literal[1:-1]
+    if not body:
+        return []
+    elements = re.findall(r'"((?:[^"\\]|\\.)*)"(?:,|$)', body)
+    assert ','.join(f'"{element}"' for element in elements) == body
+    return [re.sub(r'\\(.)', r'\1', element) for element in elements]
+
+
+@pytest.mark.parametrize('value', TRICKY)
+def test_copy_text_round_trip(value):
+    assert decode_copy_line(copy_text(value) + '\n') == [value]
+
+
+def test_array_literal_round_trip():
+    assert array_literal([]) == '{}'
+    assert decode_array(array_literal(TRICKY)) == TRICKY
+
+
+def test_copy_line_round_trip():
+    scraped_at = datetime(2025, 6, 4, 9, 0, tzinfo=timezone(timedelta(hours=3)))
+    row = ('RO', 'gov', 'Titlu\tcu tab', 'Text\npe\\rânduri', TRICKY, [], scraped_at)
+    fields = decode_copy_line(copy_line(row))
+    assert fields[:4] == ['RO', 'gov', 'Titlu\tcu tab', 'Text\npe\\rânduri']
+    assert decode_array(fields[4]) == TRICKY
+    assert decode_array(fields[5]) == []
+    assert datetime.fromisoformat(fields[6]) == scraped_at
+
+
+def test_parse_scraped_at_adds_local_offset():
+    parsed = parse_scraped_at('2025-06-04T09:00:00')
+    assert parsed.tzinfo is not None
+    assert parsed.replace(tzinfo=None) == datetime(2025, 6, 4, 9, 0)
+    assert parse_scraped_at('not a date').tzinfo is not None
+
+
+def test_article_row_matches_copy_columns():
+    pytest.importorskip('psycopg')
+    from bench_storage_ingest import make_article
+    from postgres_sink import ARTICLE_COLUMNS, PostgresSink
+
+    sink = PostgresSink('postgresql://unused')  # Connects only when writing
+    article = make_article(1)
+    fields = decode_copy_line(copy_line(sink.article_row(article)))
+    row = dict(zip(ARTICLE_COLUMNS, fields))
+    assert len(fields) == len(ARTICLE_COLUMNS)
+    assert row['url'] == article.url and row['source'] == 'gov'
+    assert decode_array(row['detailed_points']) == list(article.detailed_points)
+    assert decode_array(row['interests']) == sink.detect_interests(f"{article.title} {article.original_content}")
+    assert row['article_date'] == article.date
+    assert datetime.fromisoformat(row['scraped_at']).tzinfo is not None
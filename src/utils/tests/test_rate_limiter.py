@@ -0,0 +1,167 @@
+"""
+RobotsCache follows RFC 9309 for missing and unreachable robots.txt files
+and reads Crawl-delay / Request-rate; HostRateLimiter blocks disallowed
+URLs, caps a host at its crawl delay and adapts the rate to responses.
+"""
+
+import threading
+import time
+
+import pytest
+
+import rate_limiter
+from rate_limiter import HostRateLimiter, RobotsCache, RobotsDisallowed, host_key
+from scraper_config import ScraperConfig
+
+ROBOTS = """
+User-agent: *
+Allow: /admin/public
+Disallow: /admin/
+Crawl-delay: 4
+
+User-agent: OtherBot
+Disallow: /
+"""
+
+
+class FakeResponse:
+    def __init__(self, status_code, text=''):
+        self.status_code = status_code
+        self.text = text
+
+
+class FakeFetch:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.urls = []
+
+    def __call__(self, url):
+        self.urls.append(url)
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock()
+    monkeypatch.setattr(rate_limiter.time, 'monotonic', fake.monotonic)
+    monkeypatch.setattr(rate_limiter.time, 'sleep', fake.sleep)
+    return fake
+
+
+def test_host_key():
+    assert host_key('HTTPS://Gov.RO:8443/a?b') == 'https://gov.ro:8443'
+
+
+def test_rules_and_crawl_delay(clock):
+    robots = RobotsCache(FakeFetch(FakeResponse(200, ROBOTS)))
+    assert robots.allowed('https://gov.ro/ro/stiri')
+    assert not robots.allowed('https://gov.ro/admin/users')
+    assert robots.allowed('https://gov.ro/admin/public')
+    assert robots.rules_for('https://gov.ro/').crawl_delay == 4.0
+    assert robots.fetch.urls == ['https://gov.ro/robots.txt']
+
+
+def test_request_rate_sets_the_delay(clock):
+    robots = RobotsCache(FakeFetch(FakeResponse(200, "User-agent: *\nRequest-rate: 1/10\n")))
+    assert robots.rules_for('https://ms.ro/').crawl_delay == 10.0
+
+
+def test_missing_robots_allows_everything(clock):
+    robots = RobotsCache(FakeFetch(FakeResponse(404)))
+    assert robots.allowed('https://ms.ro/admin/')
+    assert robots.rules_for('https://ms.ro/').crawl_delay is None
+
+
+@pytest.mark.parametrize('failure', [FakeResponse(503), ConnectionError('down')])
+def test_unreachable_robots_disallows_until_retried(clock, failure):
+    robots = RobotsCache(FakeFetch(failure, FakeResponse(200, ROBOTS)))
+    assert not robots.allowed('https://mai.gov.ro/stiri')
+    clock.now += ScraperConfig.ROBOTS_ERROR_TTL_SECONDS - 1
+    assert not robots.allowed('https://mai.gov.ro/stiri')
+    clock.now += 2
+    assert robots.allowed('https://mai.gov.ro/stiri')
+    assert robots.fetches == 2
+
+
+def test_unreachable_robots_keeps_previous_rules(clock):
+    robots = RobotsCache(FakeFetch(FakeResponse(200, ROBOTS), FakeResponse(500)))
+    assert robots.allowed('https://gov.ro/a')
+    clock.now += ScraperConfig.ROBOTS_TTL_SECONDS + 1
+    assert robots.allowed('https://gov.ro/a')
+    assert not robots.allowed('https://gov.ro/admin/x')
+    assert robots.fetches == 2
+
+
+def test_robots_fetched_once_per_host_under_concurrency():
+    started = threading.Event()
+
+    def slow_fetch(url):
+        started.wait(1)
+        time.sleep(0.05)
+        return FakeResponse(200, ROBOTS)
+
+    robots = RobotsCache(slow_fetch)
+    threads = [threading.Thread(target=robots.allowed, args=('https://gov.ro/x',)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    started.set()
+    for thread in threads:
+        thread.join()
+    assert robots.fetches == 1
+
+
+def test_limiter_blocks_disallowed_urls(clock):
+    limiter = HostRateLimiter(RobotsCache(FakeFetch(FakeResponse(200, ROBOTS))))
+    with pytest.raises(RobotsDisallowed):
+        limiter.acquire('https://gov.ro/admin/users')
+    assert limiter.blocked == 1
+    limiter.acquire('https://gov.ro/robots.txt')  # Never checked against itself
+
+
+def test_crawl_delay_caps_the_rate(clock):
+    limiter = HostRateLimiter(RobotsCache(FakeFetch(FakeResponse(200, ROBOTS))))
+    for _ in range(3):
+        limiter.acquire('https://gov.ro/a')
+    assert limiter.rates()['https://gov.ro'] == 0.25
+    assert clock.slept == [pytest.approx(4.0), pytest.approx(8.0)]
+    for _ in range(50):
+        limiter.observe('https://gov.ro/a', 0.1, 200)
+    assert limiter.rates()['https://gov.ro'] == 0.25
+
+
+def test_rate_adapts_to_responses(clock):
+    limiter = HostRateLimiter(RobotsCache(FakeFetch(FakeResponse(404))))
+    url = 'https://ms.ro/a'
+    limiter.acquire(url)
+    for _ in range(100):
+        limiter.observe(url, 0.1, 200)
+    assert limiter.rates()['https://ms.ro'] == ScraperConfig.RATE_LIMIT_MAX_PER_SECOND
+
+    limiter.observe(url, 0.1, 429, retry_after=30)
+    limiter.observe(url, 0.1, 503)  # Same cooldown window: one cut only
+    assert limiter.rates()['https://ms.ro'] == ScraperConfig.RATE_LIMIT_MAX_PER_SECOND * ScraperConfig.RATE_LIMIT_DECREASE
+
+    clock.slept.clear()
+    limiter.acquire(url)
+    assert clock.slept == [pytest.approx(30.0)]  # Retry-After pauses the host
+
+    clock.now += ScraperConfig.RATE_LIMIT_COOLDOWN_SECONDS + 1
+    limiter.observe(url, 0.0, None)
+    assert limiter.rates()['https://ms.ro'] == pytest.approx(
+        ScraperConfig.RATE_LIMIT_MAX_PER_SECOND * ScraperConfig.RATE_LIMIT_DECREASE ** 2
+    )
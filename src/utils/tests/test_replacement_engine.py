@@ -0,0 +1,59 @@
+"""
+ReplacementEngine output is independent of the table's order, the longest
+whole-word match wins, and replacements are never rescanned.
+"""
+
+import random
+
+import pytest
+
+from bench_replacements import SAMPLE
+from replacement_engine import ReplacementEngine
+from scraper_config import ScraperConfig
+
+
+def test_output_does_not_depend_on_table_order():
+    items = list(ScraperConfig.WORD_REPLACEMENTS.items())
+    expected = ReplacementEngine(dict(items)).apply(SAMPLE)
+    rng = random.Random(42)
+    for _ in range(25):
+        rng.shuffle(items)
+        assert ReplacementEngine(dict(items)).apply(SAMPLE) == expected
+
+
+@pytest.mark.parametrize('table', [
+    {'a': 'x', 'a b': 'y', 'a b c': 'z'},
+    {'a b c': 'z', 'a b': 'y', 'a': 'x'},
+    {'a b': 'y', 'a b c': 'z', 'a': 'x'},
+])
+def test_longest_match_wins_in_any_order(table):
+    assert ReplacementEngine(table).apply('a b c, a b d, a') == 'z, y d, x'
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('o hotărâre de guvern nouă', 'o decizia echipei care conduce țara nouă'),
+    ('implementarea planului', 'să pună în practică planului'),
+    ('hotărâre de guvernare', 'decizie de guvernare'),
+])
+def test_longest_glossary_entry_wins(text, expected):
+    assert ReplacementEngine(ScraperConfig.WORD_REPLACEMENTS).apply(text) == expected
+
+
+@pytest.mark.parametrize('text', ['bugetul anual', 'spitalul județean', 'subministru'])
+def test_only_whole_words_are_replaced(text):
+    assert ReplacementEngine(ScraperConfig.WORD_REPLACEMENTS).apply(text) == text
+
+
+def test_cedilla_forms_match():
+    engine = ReplacementEngine(ScraperConfig.WORD_REPLACEMENTS)
+    assert engine.apply('situaţii de urgenţă') == 'când se întâmplă lucruri rele'
+
+
+def test_unmatched_text_keeps_cedillas():
+    engine = ReplacementEngine(ScraperConfig.WORD_REPLACEMENTS)
+    assert engine.apply('ţara în situaţii de urgenţă, aşa') == 'ţara în când se întâmplă lucruri rele, aşa'
+    assert engine.apply('aşa şi aşa') == 'aşa şi aşa'
+
+
+def test_replacements_are_not_rescanned():
+    assert ReplacementEngine({'a': 'b', 'b': 'c'}).apply('a b') == 'b c'
@@ -0,0 +1,114 @@
+"""
+Responses written by RecordingHTTPClient come back byte for byte from
+read_archive, index_archive and ReplayHTTPClient, in recording order.
+"""
+
+import gzip
+
+import pytest
+import requests
+
+from replay_archive import (ArchiveRecord, ArchiveWriter, RecordingHTTPClient, ReplayHTTPClient,
+                            index_archive, read_archive, read_record_at)
+
+BINARY_BODY = bytes(range(256)) * 300 + b'\n\nheader-like line\n'
+
+
+class FakeClient:
+    def __init__(self, responses):
+        self.responses = responses
+        self.sent_headers = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.sent_headers.append(headers)
+        outcome = self.responses[url].pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        response = requests.Response()
+        response.url = url
+        response.status_code, response._content = outcome
+        response.headers['Content-Type'] = 'text/html; charset=utf-8'
+        return response
+
+    def stats(self):
+        return {}
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = str(tmp_path / 'archive.gz')
+    client = FakeClient({
+        'https://gov.ro/': [(200, 'Ştiri de azi'.encode('utf-8')), (200, b'second visit')],
+        'https://ms.ro/bin': [(200, BINARY_BODY)],
+        'https://mai.gov.ro/': [(503, b'busy'), requests.ConnectionError('reset')],
+    })
+    recorder = RecordingHTTPClient(client, ArchiveWriter(path))
+    recorder.get('https://gov.ro/', headers={'If-None-Match': '"abc"', 'Accept': 'text/html'})
+    recorder.get('https://ms.ro/bin')
+    recorder.get('https://mai.gov.ro/')
+    with pytest.raises(requests.ConnectionError):
+        recorder.get('https://mai.gov.ro/')
+    recorder.get('https://gov.ro/')
+    assert recorder.writer.records == 5
+    recorder.close()
+    assert client.sent_headers[0] == {'Accept': 'text/html'}  # Conditional headers are dropped
+    return path
+
+
+def test_records_round_trip(archive):
+    records = list(read_archive(archive))
+    assert [(r.url, r.status) for r in records] == [
+        ('https://gov.ro/', 200), ('https://ms.ro/bin', 200), ('https://mai.gov.ro/', 503),
+        ('https://mai.gov.ro/', 0), ('https://gov.ro/', 200),
+    ]
+    assert records[0].body == 'Ştiri de azi'.encode('utf-8')
+    assert records[1].body == BINARY_BODY
+    assert records[3].error == 'ConnectionError: reset' and records[3].body == b''
+    assert records[0].headers['Content-Type'] == 'text/html; charset=utf-8'
+    assert all(r.recorded_at for r in records)
+
+
+def test_archive_is_a_plain_gzip_stream(archive):
+    with gzip.open(archive, 'rb') as f:
+        assert BINARY_BODY in f.read()
+
+
+def test_index_points_at_last_good_response(archive):
+    offsets = index_archive(archive)
+    assert set(offsets) == {'https://gov.ro/', 'https://ms.ro/bin'}
+    with open(archive, 'rb') as handle:
+        assert read_record_at(handle, offsets['https://gov.ro/']).body == b'second visit'
+        assert read_record_at(handle, offsets['https://ms.ro/bin']).body == BINARY_BODY
+
+
+def test_replay_serves_in_recording_order(archive):
+    replay = ReplayHTTPClient(archive)
+    first = replay.get('https://gov.ro/')
+    assert first.text == 'Ştiri de azi'
+    assert replay.get('https://gov.ro/').content == b'second visit'
+    assert replay.get('https://gov.ro/').content == b'second visit'  # The last record repeats
+    assert replay.get('https://mai.gov.ro/').status_code == 503
+    with pytest.raises(requests.ConnectionError, match='Recorded failure'):
+        replay.get('https://mai.gov.ro/')
+    with pytest.raises(requests.ConnectionError, match='not in the archive'):
+        replay.get('https://example.ro/')
+    assert replay.stats()['missing'] == 1
+
+
+def test_appending_to_an_existing_archive(archive):
+    writer = ArchiveWriter(archive)
+    writer.write(ArchiveRecord(url='https://gov.ro/new', status=200, body=b'appended'))
+    writer.close()
+    assert [r.body for r in read_archive(archive)][-1] == b'appended'
+
+
+def test_truncated_archive_is_reported(archive):
+    with open(archive, 'rb') as f:
+        data = f.read()
+    with open(archive, 'wb') as f:
+        f.write(data[:-10])
+    with pytest.raises(ValueError, match='Truncated'):
+        list(read_archive(archive))
@@ -0,0 +1,95 @@
+"""
+Reprocessor writes one recomputed record per article, in store order,
+resumes an interrupted run from its checkpoint, starts over when the run's
+settings change, and only swaps the new store in when the live one is
+untouched.
+"""
+
+import glob
+import json
+import os
+from dataclasses import replace
+
+import pytest
+
+from article_store import ArticleStore
+from bench_storage_ingest import make_article
+from reprocess import Reprocessor
+
+STALE = 'stale'
+
+
+@pytest.fixture
+def store_dir(tmp_path):
+    path = str(tmp_path / 'store')
+    store = ArticleStore(path)
+    store.append([replace(make_article(n), category='general', simplified_content=STALE) for n in range(12)])
+    # A re-stored copy of article 0; only this one may survive
+    store.append([replace(make_article(0), title='corectat', simplified_content=STALE)])
+    store.close()
+    return path
+
+
+def records(path):
+    store = ArticleStore(path)
+    try:
+        return [json.loads(line) for line in store.iter_lines(newest_first=False)]
+    finally:
+        store.close()
+
+
+def test_run_recomputes_and_swaps(store_dir):
+    counts = Reprocessor(store_dir, workers=1, chunk_size=5).run()
+    result = records(store_dir)
+    assert [r['id'] for r in result] == [make_article(n).id for n in range(1, 12)] + [make_article(0).id]
+    assert result[-1]['title'] == 'corectat'
+    assert all(r['category'] == 'budget' and r['simplified_content'] != STALE for r in result)
+    assert (counts['total'], counts['from_text'], counts['failed']) == (12, 12, 0)
+
+    assert not os.path.exists(store_dir + '.reprocess')
+    backups = glob.glob(store_dir + '.before-reprocess-*')
+    assert len(backups) == 1 and len(records(backups[0])) == 13
+
+
+def test_interrupted_run_resumes(store_dir):
+    reprocessor = Reprocessor(store_dir, workers=1, chunk_size=5)
+    output = reprocessor.prepare(ArticleStore(store_dir), restart=False)
+    first = replace(make_article(1), title='already done')
+    output.append([first])
+    output.close()
+
+    counts = Reprocessor(store_dir, workers=1, chunk_size=5).run()
+    result = records(store_dir)
+    assert len(result) == 12 and len({r['id'] for r in result}) == 12
+    assert result[0]['title'] == 'already done'  # Kept, not reprocessed again
+    assert counts['from_text'] == 11
+
+
+@pytest.mark.parametrize('change', ['fields', 'restart'])
+def test_changed_run_starts_over(store_dir, change):
+    reprocessor = Reprocessor(store_dir, fields=('category',), workers=1)
+    output = reprocessor.prepare(ArticleStore(store_dir), restart=False)
+    output.append([replace(make_article(1), title='from an older run')])
+    output.close()
+
+    fields = ('category', 'simplified') if change == 'fields' else ('category',)
+    Reprocessor(store_dir, fields=fields, workers=1).run(restart=change == 'restart')
+    result = records(store_dir)
+    assert len(result) == 12
+    assert 'from an older run' not in {r['title'] for r in result}
+
+
+def test_store_written_during_run_is_not_replaced(store_dir, monkeypatch):
+    original_write = Reprocessor.write
+
+    def write_and_touch_live_store(self, output, result):
+        live = ArticleStore(store_dir)
+        live.append([make_article(99)])
+        live.close()
+        return original_write(self, output, result)
+
+    monkeypatch.setattr(Reprocessor, 'write', write_and_touch_live_store)
+    with pytest.raises(RuntimeError, match='changed while reprocessing'):
+        Reprocessor(store_dir, workers=1).run()
+    assert len(records(store_dir)) == 14
+    assert not glob.glob(store_dir + '.before-reprocess-*')
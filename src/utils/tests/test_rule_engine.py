@@ -0,0 +1,94 @@
+"""
+PointRuleEngine finds the same keywords and picks the same rule as checking
+each keyword with `in` on the folded text, which is what the if/elif chains
+it replaced did. Hits are counted per rule, so dead rules can be listed.
+"""
+
+import pytest
+
+from conftest import read_fixture
+from html_document import parse_html
+from romanian_text import normalize_for_matching
+from rule_engine import PointRuleEngine
+from scraper_config import ScraperConfig
+
+FIXTURES = ['gov_article.html', 'mai_article.html', 'ms_article.html',
+            'gov_listing.html', 'mai_listing.html', 'ms_listing.html']
+
+
+def fixture_sections():
+    sections = []
+    for name in FIXTURES:
+        doc = parse_html(read_fixture(name))
+        sections.append(doc.select_one('body').text(separator=' '))
+        sections.extend(node.text(strip=True) for node in doc.select('p, li, h1, h2, h3, a'))
+    return [section for section in sections if section]
+
+
+def keywords_by_in(rule_set, text):
+    folded = normalize_for_matching(text)
+    return {keyword for keyword in rule_set._contained if keyword in folded}
+
+
+def first_match_by_in(rule_set, text):
+    found = keywords_by_in(rule_set, text)
+    for rule in rule_set.rules:
+        if rule['all'] <= found and (not rule['any'] or found & rule['any']):
+            return rule
+    return None
+
+
+@pytest.fixture(scope='module')
+def engine():
+    return PointRuleEngine(ScraperConfig.POINT_RULES)
+
+
+def test_matches_per_keyword_in_checks_on_fixture_corpus(engine):
+    sections = fixture_sections()
+    assert len(sections) > 50
+    for rule_set in engine.rule_sets.values():
+        for section in sections:
+            assert rule_set.keywords_in(section) == keywords_by_in(rule_set, section)
+            assert rule_set.first_match(section) is first_match_by_in(rule_set, section)
+
+
+@pytest.mark.parametrize('source, text, keywords', [
+    ('gov', 'spitalei', {'spital', 'lei'}),
+    ('gov', 'sănătatehnologie', {'sănătate', 'tehnologie'}),
+    ('mai', 'pompierincendiu', {'pompieri', 'incendiu'}),
+    ('ms', 'medicimunizare', {'medici', 'imunizare'}),
+])
+def test_overlapping_keywords_are_all_found(engine, source, text, keywords):
+    rule_set = engine.rule_sets[source]
+    assert keywords <= rule_set.keywords_in(text)
+    assert rule_set.keywords_in(text) == keywords_by_in(rule_set, text)
+
+
+def test_cedilla_text_matches_comma_below_keywords(engine):
+    assert 'situații de urgență' in engine.rule_sets['gov'].keywords_in('Situaţii de Urgenţă')
+
+
+def test_hits_and_dead_rules():
+    rules = [
+        {'id': 'fire', 'sources': ['mai'], 'priority': 10, 'any': ['incendiu'], 'text': 'fire'},
+        {'id': 'police', 'sources': ['mai'], 'priority': 20, 'any': ['poliția'], 'text': 'police'},
+        {'id': 'both', 'sources': ['mai'], 'priority': 5, 'all': ['incendiu', 'poliția'], 'text': 'both'},
+    ]
+    engine = PointRuleEngine(rules)
+    assert engine.dead_rules() == ['fire', 'police', 'both']
+    assert engine.apply('Un incendiu mare', 'mai') == 'fire'
+    assert engine.apply('Poliția și un incendiu', 'mai') == 'both'
+    assert engine.apply('Nimic de raportat', 'mai') == ''
+    assert engine.apply('Un incendiu', 'ms') == ''
+    assert engine.hits == {'fire': 1, 'both': 1}
+    assert engine.dead_rules() == ['police']
+
+
+@pytest.mark.parametrize('rules', [
+    [{'id': 'a', 'text': 'x', 'colour': 'red'}],
+    [{'id': 'a', 'text': 'x'}, {'id': 'a', 'text': 'y'}],
+    [{'text': 'x'}],
+])
+def test_invalid_tables_are_rejected(rules):
+    with pytest.raises(ValueError):
+        PointRuleEngine(rules)
@@ -0,0 +1,123 @@
+"""
+AdaptiveScheduler keeps each source's interval within its POLL_INTERVALS
+bounds, retries failed checks without touching the publish rate, and
+resumes the same timetable from its state file.
+"""
+
+import json
+
+import pytest
+
+from scheduler import AdaptiveScheduler
+from scraper_config import ScraperConfig
+
+SOURCES = ['gov', 'mai', 'ms']
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def make_scheduler(tmp_path, clock):
+    return AdaptiveScheduler(SOURCES, state_file=str(tmp_path / 'state.json'), clock=clock)
+
+
+def test_new_sources_are_due_at_once(tmp_path, clock):
+    scheduler = make_scheduler(tmp_path, clock)
+    assert scheduler.due() == SOURCES
+    assert scheduler.states['mai'].interval == ScraperConfig.POLL_INTERVALS['mai']['initial']
+
+
+def test_busy_source_is_clamped_to_min(tmp_path, clock):
+    scheduler = make_scheduler(tmp_path, clock)
+    for _ in range(10):
+        clock.now += 60
+        scheduler.record('mai', 50)
+    state = scheduler.states['mai']
+    assert state.interval == ScraperConfig.POLL_INTERVALS['mai']['min']
+    assert state.next_run == clock.now + state.interval
+
+
+def test_quiet_source_is_clamped_to_max(tmp_path, clock):
+    scheduler = make_scheduler(tmp_path, clock)
+    for _ in range(40):
+        clock.now += scheduler.states['gov'].interval
+        scheduler.record('gov', 0)
+    assert scheduler.states['gov'].interval == ScraperConfig.POLL_INTERVALS['gov']['max']
+
+
+def test_interval_tracks_publish_rate(tmp_path, clock):
+    scheduler = make_scheduler(tmp_path, clock)
+    # One new article every two hours settles at one check per hour for a 0.5 target
+    for _ in range(60):
+        clock.now += 3600
+        scheduler.record('ms', 1 if int(clock.now // 3600) % 2 else 0)
+    expected = ScraperConfig.POLL_TARGET_NEW_PER_CHECK / (1 / 7200)
+    assert scheduler.states['ms'].interval == pytest.approx(expected, rel=0.35)
+
+
+def test_failed_check_keeps_rate(tmp_path, clock):
+    scheduler = make_scheduler(tmp_path, clock)
+    before = scheduler.states['gov'].rate, scheduler.states['gov'].interval
+    ran = scheduler.run_once(lambda sources: {'gov': None, 'mai': 2})
+    assert ran == SOURCES
+    gov = scheduler.states['gov']
+    assert (gov.rate, gov.interval) == before
+    assert gov.next_run == clock.now + ScraperConfig.POLL_INTERVALS['gov']['min']
+    assert scheduler.states['mai'].last_found == 2
+    assert scheduler.states['ms'].last_found == 0
+
+
+def test_raising_check_counts_as_failure(tmp_path, clock):
+    scheduler = make_scheduler(tmp_path, clock)
+
+    def check(sources):
+        raise RuntimeError('network down')
+
+    scheduler.run_once(check)
+    assert all(state.last_run is None for state in scheduler.states.values())
+    assert scheduler.due() == []
+
+
+def test_nothing_due_runs_nothing(tmp_path, clock):
+    scheduler = make_scheduler(tmp_path, clock)
+    scheduler.run_once(lambda sources: {})
+    calls = []
+    assert scheduler.run_once(lambda sources: calls.append(sources) or {}) == []
+    assert calls == []
+    assert scheduler.run_once(lambda sources: {}, extra=['ms']) == ['ms']
+
+
+def test_state_file_round_trip(tmp_path, clock):
+    scheduler = make_scheduler(tmp_path, clock)
+    scheduler.run_once(lambda sources: {'gov': 3})
+    saved = json.loads((tmp_path / 'state.json').read_text(encoding='utf-8'))
+    assert set(saved) == set(SOURCES)
+    assert not (tmp_path / 'state.json.tmp').exists()
+
+    resumed = make_scheduler(tmp_path, Clock(clock.now + 5))
+    assert resumed.states == scheduler.states
+    assert resumed.seconds_until_next() == pytest.approx(
+        min(state.next_run for state in scheduler.states.values()) - clock.now - 5
+    )
+
+
+def test_corrupt_state_file_starts_fresh(tmp_path, clock):
+    (tmp_path / 'state.json').write_text('{not json', encoding='utf-8')
+    scheduler = make_scheduler(tmp_path, clock)
+    assert scheduler.due() == SOURCES
+
+
+def test_added_source_starts_fresh(tmp_path, clock):
+    AdaptiveScheduler(['gov'], state_file=str(tmp_path / 'state.json'), clock=clock).run_once(lambda s: {'gov': 1})
+    scheduler = make_scheduler(tmp_path, clock)
+    assert scheduler.due() == ['mai', 'ms']
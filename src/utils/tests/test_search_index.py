@@ -0,0 +1,135 @@
+"""
+SearchIndex: re-adding or rebuilding keeps one copy of each article, and a
+rebuilt index ranks exactly like one built from the latest copies alone.
+Queries ignore diacritics, case and stopwords, need every word, and honour
+the metadata filters.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from article_store import ArticleStore
+from models import Article
+from scraper_config import ScraperConfig
+from search_index import SearchIndex, latest_articles, tokenize
+
+
+def make(article_id: str, title: str, content: str, scraped_at: str = '2025-01-01T09:00:00',
+         source: str = 'ms', category: str = 'health') -> Article:
+    return Article(id=article_id, date='', title=title, original_content=content, simplified_content='',
+                   detailed_points=[], category=category, category_emoji='', category_name='',
+                   url=f'https://example.ro/{article_id}', scraped_at=scraped_at, source=source)
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex(':memory:')
+    yield index
+    index.close()
+
+
+def ranking(index: SearchIndex, query: str) -> list:
+    return [(hit.article_id, round(hit.score, 9)) for hit in index.search(query)]
+
+
+OLDER = [
+    make('a', 'Spitalul județean', 'Medicii din spitalul județean au primit aparatură.', '2025-01-01T09:00:00'),
+    make('b', 'Școala din sat', 'Elevii și medicii școlari se întorc la școală.', '2025-01-02T09:00:00'),
+    make('c', 'Spitalul municipal', 'Spitalul municipal, spitalul cel mare, are medicii noi.', '2025-01-03T09:00:00'),
+]
+CORRECTED_C = make('c', 'Dispensarul municipal', 'Medicii din dispensar au program nou.', '2025-01-03T09:00:00')
+
+
+def test_readding_an_article_replaces_it(index):
+    index.add_many(OLDER)
+    index.add_many([CORRECTED_C])
+    assert len(index) == 3
+    assert [hit.article_id for hit in index.search('dispensar')] == ['c']
+    assert [hit.article_id for hit in index.search('municipal')] == ['c']
+    assert 'c' not in {hit.article_id for hit in index.search('spitalul')}
+
+
+def test_rebuild_keeps_the_first_copy_and_ranks_like_a_fresh_index(index):
+    # Newest first, with the stale copy of c behind the corrected one
+    count = index.rebuild([CORRECTED_C, OLDER[1], OLDER[0], OLDER[2]])
+    fresh = SearchIndex(':memory:')
+    fresh.rebuild([CORRECTED_C, OLDER[1], OLDER[0]])
+
+    assert count == 3 and len(index) == 3
+    for query in ('medicii', 'spitalul', 'dispensar', 'municipal', 'scoala'):
+        assert ranking(index, query) == ranking(fresh, query), query
+    assert [hit.article_id for hit in index.search('spitalul')] == ['a']
+    fresh.close()
+
+
+def test_rebuild_from_the_store_uses_the_latest_copy(index, tmp_path):
+    store = ArticleStore(str(tmp_path / 'article_store'))
+    store.append(OLDER)
+    store.append([CORRECTED_C])
+    store.close()
+
+    assert index.rebuild(latest_articles(store)) == 3
+    assert [hit.title for hit in index.search('municipal')] == ['Dispensarul municipal']
+    store.close()
+
+
+def test_newest_articles_stay_in_the_ranking_window(index, monkeypatch):
+    index.rebuild(reversed(OLDER))
+    monkeypatch.setattr(ScraperConfig, 'SEARCH_MAX_RANKED', 1)
+    # Only the newest match is ranked, although a and b mention medicii too
+    assert [hit.article_id for hit in index.search('medicii', limit=1)] == ['c']
+    index.add_many([make('d', 'Medicii de familie', 'Medicii de familie.', '2025-01-04T09:00:00')])
+    assert [hit.article_id for hit in index.search('medicii', limit=1)] == ['d']
+
+
+def test_tokenize_folds_diacritics_and_drops_stopwords():
+    assert tokenize('Şcoala și ȘCOALA într-o zi de 1 iunie') == ['scoala', 'scoala', 'zi', '1', 'iunie']
+
+
+@pytest.mark.parametrize('query', ['școala', 'şcoala', 'scoala', 'SCOALA', 'școal*'])
+def test_queries_ignore_diacritics_and_case(index, query):
+    index.add_many(OLDER)
+    assert [hit.article_id for hit in index.search(query)] == ['b']
+
+
+def test_every_query_word_must_match(index):
+    index.add_many(OLDER)
+    assert {hit.article_id for hit in index.search('medicii')} == {'a', 'b', 'c'}
+    assert [hit.article_id for hit in index.search('medicii municipal')] == ['c']
+    assert index.search('medicii dispensar') == []
+    assert index.search('și de la') == []  # Only stopwords
+
+
+def test_title_matches_rank_higher(index):
+    index.add_many([
+        make('body', 'Anunț', 'Vaccinarea continuă în toate județele.'),
+        make('title', 'Vaccinarea continuă', 'Campania merge mai departe în toate județele.'),
+    ])
+    assert [hit.article_id for hit in index.search('vaccinarea')] == ['title', 'body']
+
+
+def test_filters(index):
+    index.add_many(OLDER + [make('d', 'Spitalul de urgență', 'Pompierii și medicii.', '2025-02-01T09:00:00',
+                                 source='mai', category='safety')])
+    assert {hit.article_id for hit in index.search('medicii', source='ms')} == {'a', 'b', 'c'}
+    assert [hit.article_id for hit in index.search('medicii', category='safety')] == ['d']
+    assert {hit.article_id for hit in index.search('medicii', since='2025-01-02', until='2025-02-01')} == {'b', 'c'}
+    assert [hit.article_id for hit in index.search('medicii', since=datetime(2025, 1, 15))] == ['d']
+
+
+def test_filtered_search_widens_the_ranking_window(index, monkeypatch):
+    index.rebuild(reversed(OLDER))
+    monkeypatch.setattr(ScraperConfig, 'SEARCH_MAX_RANKED', 1)
+    # The newest match is c; the window grows until it reaches a
+    assert [hit.article_id for hit in index.search('medicii', since='2025-01-01', until='2025-01-02')] == ['a']
+
+
+def test_index_persists_on_disk(tmp_path):
+    path = str(tmp_path / 'search.db')
+    first = SearchIndex(path)
+    first.add_many(OLDER)
+    first.close()
+    reopened = SearchIndex(path)
+    assert [hit.article_id for hit in reopened.search('sat')] == ['b']
+    reopened.close()
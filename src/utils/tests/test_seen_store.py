@@ -0,0 +1,86 @@
+"""
+SeenArticleStore answers "already processed?" by normalized URL and by
+content fingerprint. Its Bloom filters never give a false negative and are
+rebuilt from SQLite when the store is reopened.
+"""
+
+import pytest
+
+from seen_store import BloomFilter, SeenArticleStore, content_fingerprint, make_article_id, normalize_url
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('HTTPS://Gov.RO/ro/stiri/', 'https://gov.ro/ro/stiri'),
+    ('https://gov.ro:443//ro//stiri', 'https://gov.ro/ro/stiri'),
+    ('http://gov.ro:8080/a', 'http://gov.ro:8080/a'),
+    ('https://gov.ro/a?b=2&a=1', 'https://gov.ro/a?a=1&b=2'),
+    ('https://gov.ro/a?utm_source=x&id=3&fbclid=y#top', 'https://gov.ro/a?id=3'),
+    ('https://gov.ro', 'https://gov.ro/'),
+])
+def test_normalize_url(url, expected):
+    assert normalize_url(url) == expected
+
+
+def test_article_id_ignores_url_noise():
+    assert make_article_id('ms', 'https://ms.ro/stire/?utm_campaign=z') == make_article_id('ms', 'https://MS.ro/stire')
+    assert make_article_id('ms', 'https://ms.ro/a') != make_article_id('mai', 'https://ms.ro/a')
+
+
+def test_fingerprint_ignores_case_and_whitespace():
+    assert content_fingerprint('Guvernul  a adoptat\n o HOTĂRÂRE') == content_fingerprint('guvernul a adoptat o hotărâre')
+    assert content_fingerprint('a b') != content_fingerprint('a c')
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    keys = [f"https://gov.ro/stire-{i}" for i in range(2000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"https://mai.gov.ro/other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300  # 1% expected
+
+
+@pytest.fixture
+def store(tmp_path):
+    instance = SeenArticleStore(str(tmp_path / 'seen.db'))
+    yield instance
+    instance.close()
+
+
+def test_lookup_by_url_and_fingerprint(store):
+    assert not store.has_url('https://gov.ro/a')
+    store.add('https://gov.ro/a/?utm_source=fb', 'gov', 'gov_1', 'fp1')
+    assert store.has_url('https://GOV.ro/a')
+    assert not store.has_url('https://gov.ro/b')
+    assert store.find_fingerprint('fp1') == 'gov_1'
+    assert store.find_fingerprint('fp2') is None
+    assert len(store) == 1
+
+
+def test_first_record_wins(store):
+    store.add_many([('https://gov.ro/a', 'gov', 'gov_1', 'fp1'), ('https://gov.ro/a/', 'gov', 'gov_2', 'fp2')])
+    assert len(store) == 1
+    assert store.find_fingerprint('fp1') == 'gov_1'
+
+
+def test_records_without_fingerprint(store):
+    store.add('https://ms.ro/a', 'ms', 'ms_1')
+    assert store.has_url('https://ms.ro/a')
+    assert store.find_fingerprint('') is None
+
+
+def test_filters_are_rebuilt_on_reopen(tmp_path):
+    path = str(tmp_path / 'seen.db')
+    first = SeenArticleStore(path)
+    first.add_many((f"https://mai.gov.ro/{i}", 'mai', f"mai_{i}", f"fp{i}") for i in range(50))
+    first.close()
+
+    reopened = SeenArticleStore(path)
+    try:
+        assert len(reopened) == 50
+        assert all(reopened.has_url(f"https://mai.gov.ro/{i}") for i in range(50))
+        assert reopened.find_fingerprint('fp49') == 'mai_49'
+        assert not reopened.has_url('https://mai.gov.ro/50')
+    finally:
+        reopened.close()
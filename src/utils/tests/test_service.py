@@ -0,0 +1,123 @@
+"""
+ScraperService routes: status codes while starting and running, parameter
+validation, the hot set's newest-first merge, queued runs and metrics, and
+one request answered over a real socket.
+"""
+
+import asyncio
+import json
+from dataclasses import replace
+
+import pytest
+
+from bench_storage_ingest import make_article
+from scheduler import AdaptiveScheduler
+from scraper_config import ScraperConfig
+from service import HotSet, ScraperService
+
+
+def article(number, source='gov', category='budget', minute=0):
+    return replace(make_article(number), id=f"{source}_{number}", source=source, category=category,
+                   scraped_at=f"2025-06-04T09:{minute:02d}:00")
+
+
+def get(service, path, method='GET', **params):
+    status, content_type, body = service.route(method, path, {name: [value] for name, value in params.items()})
+    return status, json.loads(body) if content_type.startswith('application/json') else body.decode('utf-8')
+
+
+@pytest.fixture
+def service(scraper):
+    instance = ScraperService(port=0)
+    instance.scraper = scraper
+    instance.scheduler = AdaptiveScheduler(list(ScraperConfig.WEBSITES), state_file='')
+    instance.state = 'running'
+    instance.hot.add([article(1, minute=1), article(2, 'ms', 'health', minute=2),
+                      article(3, minute=3), article(4, 'mai', 'safety', minute=4)])
+    return instance
+
+
+def test_starting_service_answers_health_only():
+    starting = ScraperService(port=0)
+    status, body = get(starting, '/health')
+    assert status == 503 and body['status'] == 'starting'
+    assert get(starting, '/articles')[0] == 503
+    assert get(starting, '/metrics')[0] == 503
+    assert get(starting, '/run', 'POST')[0] == 503
+
+
+def test_unknown_path_and_wrong_method(service):
+    status, body = get(service, '/nope')
+    assert status == 404 and '/health' in body['endpoints']
+    assert get(service, '/run')[0] == 405
+    assert get(service, '/articles', 'POST')[0] == 405
+
+
+def test_health_when_running(service):
+    status, body = get(service, '/health')
+    assert status == 200 and body['status'] == 'running'
+    assert body['hot_set_articles'] == 4
+    assert set(body['next_check_seconds']) == set(ScraperConfig.WEBSITES)
+
+
+def test_articles_newest_first_with_filters(service):
+    status, body = get(service, '/articles')
+    assert status == 200 and [a['id'] for a in body] == ['mai_4', 'gov_3', 'ms_2', 'gov_1']
+    assert [a['id'] for a in get(service, '/articles', source='gov')[1]] == ['gov_3', 'gov_1']
+    assert [a['id'] for a in get(service, '/articles', category='health')[1]] == ['ms_2']
+    assert [a['id'] for a in get(service, '/articles', limit='2')[1]] == ['mai_4', 'gov_3']
+    assert len(get(service, '/articles', limit='0')[1]) == 1  # Clamped to at least one
+
+
+@pytest.mark.parametrize('params', [{'source': 'bbc'}, {'category': 'sport'}, {'limit': 'many'}])
+def test_articles_rejects_bad_parameters(service, params):
+    assert get(service, '/articles', **params)[0] == 400
+
+
+def test_run_queues_sources(service):
+    status, body = get(service, '/run', 'POST', source='gov,ms')
+    assert status == 202 and body['queued'] == ['gov', 'ms']
+    assert service.wakeup.is_set()
+    assert get(service, '/run', 'POST', source='gov,bbc')[0] == 400
+    assert get(service, '/run', 'POST')[1]['queued'] == sorted(ScraperConfig.WEBSITES)
+
+
+def test_metrics_formats(service):
+    status, text = get(service, '/metrics')
+    assert status == 200 and '# TYPE' in text
+    status, body = get(service, '/metrics', format='json')
+    assert status == 200 and 'stages' in body
+
+
+def test_hot_set_seed_and_add():
+    hot = HotSet(size=2)
+    lines = [json.dumps({'id': f"gov_{n}", 'source': 'gov', 'category': 'budget',
+                         'scraped_at': f"2025-06-0{9 - n}"}).encode('utf-8') for n in range(4)]
+    assert hot.seed([lines[0], lines[0], lines[1], lines[2], lines[3]]) == 4
+    assert [json.loads(line)['id'] for line in hot.latest()] == ['gov_0', 'gov_1']  # Bucket holds 2
+
+    hot.add([replace(article(1), id='gov_1', title='corectat', scraped_at='2025-06-10')])
+    records = [json.loads(line) for line in hot.latest()]
+    assert [record['id'] for record in records] == ['gov_1', 'gov_0']
+    assert records[0]['title'] == 'corectat'
+    assert len(hot) == 2
+
+
+def test_request_over_a_socket(service):
+    async def exchange():
+        server = await asyncio.start_server(service.handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b"POST /run?source=mai HTTP/1.1\r\nHost: x\r\nContent-Length: 5\r\n\r\nhello")
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return response
+
+    response = asyncio.run(exchange())
+    head, _, body = response.partition(b'\r\n\r\n')
+    assert head.startswith(b'HTTP/1.1 202 Accepted')
+    assert b'Content-Length: %d' % len(body) in head
+    assert json.loads(body)['queued'] == ['mai']